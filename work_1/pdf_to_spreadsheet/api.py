@@ -5,26 +5,44 @@ PDF to Spreadsheet - REST API
 FastAPI-based REST API for PDF processing.
 """
 
+import hashlib
+import json
 import os
 import shutil
 import tempfile
 import uuid
+import zipfile
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Callable, List, Optional, Tuple
 
-from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
+# Streaming multipart parser (the one Starlette uses for form data)
+try:
+    import python_multipart as multipart
+    from python_multipart.exceptions import MultipartParseError
+    from python_multipart.multipart import parse_options_header
+except ModuleNotFoundError:
+    import multipart
+    from multipart.exceptions import MultipartParseError
+    from multipart.multipart import parse_options_header
+
 # Add parent to path for imports
 import sys
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.config import load_config
-from src.pipeline import Pipeline
+from src.job_events import JobEventBroker
+from src.compression import compressed_variant, etag_matches, is_compressible, negotiate_encoding, remove_variants
+from src.exporters.row_index import index_path_for, read_page
+from src.job_store import JobStore
+from src.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsStore
 
 
 # Initialize FastAPI app
@@ -51,8 +69,24 @@ OUTPUT_DIR = Path("output")
 UPLOAD_DIR.mkdir(exist_ok=True)
 OUTPUT_DIR.mkdir(exist_ok=True)
 
-# In-memory job storage (use Redis/DB in production)
-jobs = {}
+# Persistent job queue shared with the worker processes (see worker.py).
+# Its SQLite calls block: async endpoints run them in the threadpool
+JOBS_DB = Path(os.environ.get("PDF2SHEET_JOBS_DB", "jobs.db"))
+job_store = JobStore(JOBS_DB)
+
+# Counters and histograms recorded by the workers (and optionally the watcher)
+metrics = MetricsStore(os.environ.get("PDF2SHEET_METRICS_DB", JOBS_DB))
+
+# Shared poller that pushes job progress to SSE subscribers
+job_events = JobEventBroker(job_store)
+
+# Upload limits: a file is rejected as soon as it exceeds MAX_UPLOAD_BYTES
+# while being received; zip members are extracted in chunks of this size
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+MAX_UPLOAD_BYTES = int(os.environ.get("PDF2SHEET_MAX_UPLOAD_MB", "100")) * 1024 * 1024
+
+# Largest page served by the preview endpoint
+MAX_PREVIEW_ROWS = 1000
 
 
 # -------------- Models --------------
@@ -65,9 +99,11 @@ class JobStatus(BaseModel):
     parser_type: str
     output_format: str
     progress: int = 0
+    stage: Optional[str] = None  # current pipeline stage (extract_text, parse, ...)
     result: Optional[dict] = None
     error: Optional[str] = None
     output_file: Optional[str] = None
+    files: Optional[List[dict]] = None  # per-file progress for batch jobs
 
 
 class ProcessingOptions(BaseModel):
@@ -77,57 +113,166 @@ class ProcessingOptions(BaseModel):
     validate: bool = True
 
 
-# -------------- Background Tasks --------------
+# -------------- Upload Helpers --------------
+
+@dataclass
+class ReceivedFile:
+    """A file part written to disk by ``receive_files``."""
+    filename: str  # base name sent by the client
+    path: Path     # temporary .part file in the destination directory
+    sha256: str = ""
+    size: int = 0
+
+
+def _file_part_name(headers: List[Tuple[bytes, bytes]]) -> Optional[str]:
+    """Base name of a multipart part's file, or None for plain form fields."""
+    for name, value in headers:
+        if name.lower() == b"content-disposition":
+            _, options = parse_options_header(value)
+            if b"filename" in options:
+                return os.path.basename(options[b"filename"].decode("utf-8", "replace"))
+    return None
 
-def process_pdf_task(job_id: str, file_path: str, options: dict):
-    """Background task to process PDF."""
+
+async def receive_files(
+    request: Request,
+    destination: Path,
+    check_name: Callable[[str], None]
+) -> List[ReceivedFile]:
+    """
+    Stream the file parts of a multipart request straight to disk.
+    
+    The body is read from ``request.stream()`` and parsed as it arrives,
+    so each file is written once, hashed while it is received and
+    rejected with 413 as soon as it exceeds MAX_UPLOAD_BYTES (instead of
+    after Starlette has spooled the whole body). ``check_name`` is called
+    with each file name before any of its data is written and may raise
+    HTTPException to reject it. Plain form fields are ignored.
+    
+    Returns:
+        The received files, as ``.part`` files in ``destination`` that the
+        caller renames or removes.
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload")
+    
+    received: List[ReceivedFile] = []
+    headers: List[Tuple[bytes, bytes]] = []
+    header = {"field": b"", "value": b""}
+    # Parser callbacks are synchronous: they queue events handled after each chunk
+    events: List[Tuple[str, Any]] = []
+    
+    def on_header_field(data: bytes, start: int, end: int) -> None:
+        header["field"] += data[start:end]
+    
+    def on_header_value(data: bytes, start: int, end: int) -> None:
+        header["value"] += data[start:end]
+    
+    def on_header_end() -> None:
+        headers.append((header["field"], header["value"]))
+        header["field"] = header["value"] = b""
+    
+    def on_headers_finished() -> None:
+        events.append(("begin", _file_part_name(headers)))
+        headers.clear()
+    
+    def on_part_data(data: bytes, start: int, end: int) -> None:
+        events.append(("data", data[start:end]))
+    
+    def on_part_end() -> None:
+        events.append(("end", None))
+    
+    parser = multipart.MultipartParser(params[b"boundary"], {
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+    })
+    
+    current = None  # (ReceivedFile, open file, digest) of the part being written
+    
+    async def handle_events() -> None:
+        nonlocal current
+        for kind, value in events:
+            if kind == "begin" and value is not None:
+                check_name(value)
+                path = destination / f"_{uuid.uuid4().hex[:8]}.part"
+                handle = await run_in_threadpool(open, path, "wb")
+                current = (ReceivedFile(filename=value, path=path), handle, hashlib.sha256())
+                received.append(current[0])
+            elif kind == "data" and current is not None:
+                upload, handle, digest = current
+                upload.size += len(value)
+                if upload.size > MAX_UPLOAD_BYTES:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"{upload.filename} exceeds the {MAX_UPLOAD_BYTES // (1024 * 1024)} MB limit"
+                    )
+                digest.update(value)
+                await run_in_threadpool(handle.write, value)
+            elif kind == "end" and current is not None:
+                upload, handle, digest = current
+                await run_in_threadpool(handle.close)
+                upload.sha256 = digest.hexdigest()
+                current = None
+        events.clear()
+    
     try:
-        jobs[job_id]["status"] = "processing"
-        jobs[job_id]["progress"] = 10
-        
-        # Load config
-        config = load_config("config.yaml")
-        
-        jobs[job_id]["progress"] = 20
-        
-        # Create pipeline
-        pipeline = Pipeline(
-            config=config,
-            output_format=options.get("output_format", "csv"),
-            parser_type=options.get("parser_type", "auto") if options.get("parser_type") != "auto" else None,
-            dry_run=False
-        )
-        
-        jobs[job_id]["progress"] = 30
-        
-        # Process file
-        result = pipeline.process_file(file_path, str(OUTPUT_DIR))
+        async for chunk in request.stream():
+            parser.write(chunk)
+            await handle_events()
+        parser.finalize()
+        await handle_events()
         
-        jobs[job_id]["progress"] = 90
-        
-        # Update job status
-        jobs[job_id]["status"] = "completed"
-        jobs[job_id]["progress"] = 100
-        jobs[job_id]["result"] = {
-            "total_rows": result.get("total_rows", 0),
-            "errors": result.get("errors", 0),
-            "warnings": result.get("warnings", 0),
-            "elapsed_time": result.get("elapsed_time", 0)
-        }
-        
-        if result.get("output_file"):
-            jobs[job_id]["output_file"] = str(result["output_file"])
-        
-    except Exception as e:
-        jobs[job_id]["status"] = "failed"
-        jobs[job_id]["error"] = str(e)
+        if current is not None:
+            raise HTTPException(status_code=400, detail="Incomplete multipart upload")
+    except BaseException as e:
+        if current is not None:
+            await run_in_threadpool(current[1].close)
+        for upload in received:
+            upload.path.unlink(missing_ok=True)
+        if isinstance(e, MultipartParseError):
+            raise HTTPException(status_code=400, detail=f"Malformed multipart upload: {e}")
+        raise
     
-    finally:
-        # Clean up uploaded file
-        try:
-            os.remove(file_path)
-        except:
-            pass
+    return received
+
+
+def extract_pdfs_from_zip(archive_path: Path, destination: Path, start_index: int = 0) -> List[str]:
+    """
+    Extract the PDFs contained in a zip archive into a flat directory.
+    
+    Member paths are reduced to their base name (no path traversal), and
+    members larger than MAX_UPLOAD_BYTES are rejected. Extracted files are
+    numbered from ``start_index`` so names stay unique within a batch.
+    
+    Returns:
+        Names of the extracted PDF files.
+    """
+    extracted = []
+    
+    with zipfile.ZipFile(archive_path) as archive:
+        for member in archive.infolist():
+            name = os.path.basename(member.filename)
+            
+            if member.is_dir() or not name.lower().endswith(".pdf"):
+                continue
+            
+            if member.file_size > MAX_UPLOAD_BYTES:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"{name} exceeds the {MAX_UPLOAD_BYTES // (1024 * 1024)} MB limit"
+                )
+            
+            target_name = f"{start_index + len(extracted):04d}_{name}"
+            with archive.open(member) as source, open(destination / target_name, "wb") as target:
+                shutil.copyfileobj(source, target, UPLOAD_CHUNK_SIZE)
+            extracted.append(target_name)
+    
+    return extracted
 
 
 # -------------- API Endpoints --------------
@@ -138,81 +283,216 @@ async def health_check():
     return {"status": "healthy", "timestamp": datetime.now().isoformat()}
 
 
-@app.post("/api/upload", response_model=JobStatus)
+def _multipart_body(field: str, many: bool = False) -> dict:
+    """OpenAPI request body for endpoints that parse multipart uploads themselves."""
+    schema = {"type": "string", "format": "binary"}
+    if many:
+        schema = {"type": "array", "items": schema}
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {"type": "object", "properties": {field: schema}, "required": [field]}
+                }
+            }
+        }
+    }
+
+
+@app.post("/api/upload", response_model=JobStatus, openapi_extra=_multipart_body("file"))
 async def upload_pdf(
-    background_tasks: BackgroundTasks,
-    file: UploadFile = File(...),
+    request: Request,
     parser_type: str = "auto",
     output_format: str = "csv"
 ):
     """
-    Upload a PDF file for processing.
+    Upload a PDF file (multipart field ``file``) for processing.
     
+    The file is only queued here; worker processes pick it up.
+    Re-uploading identical content with the same options returns the
+    existing job instead of processing it again.
     Returns a job ID to track processing status.
     """
-    # Validate file type
-    if not file.filename.lower().endswith('.pdf'):
-        raise HTTPException(status_code=400, detail="Only PDF files are accepted")
-    
-    # Generate job ID
-    job_id = str(uuid.uuid4())[:8]
+    # Reject oversized uploads before reading the body when possible
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > MAX_UPLOAD_BYTES + UPLOAD_CHUNK_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File exceeds the {MAX_UPLOAD_BYTES // (1024 * 1024)} MB limit"
+        )
     
-    # Save uploaded file
-    file_path = UPLOAD_DIR / f"{job_id}_{file.filename}"
+    def check_name(name: str) -> None:
+        if not name.lower().endswith(".pdf"):
+            raise HTTPException(status_code=400, detail="Only PDF files are accepted")
     
     try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        received = await receive_files(request, UPLOAD_DIR, check_name)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to save file: {str(e)}")
     
-    # Create job entry
-    jobs[job_id] = {
-        "job_id": job_id,
-        "status": "pending",
-        "created_at": datetime.now().isoformat(),
-        "filename": file.filename,
-        "parser_type": parser_type,
-        "output_format": output_format,
-        "progress": 0,
-        "result": None,
-        "error": None,
-        "output_file": None
-    }
+    if len(received) != 1:
+        for upload in received:
+            await run_in_threadpool(upload.path.unlink, True)
+        raise HTTPException(status_code=400, detail="Upload exactly one PDF file")
+    
+    upload = received[0]
     
-    # Start background processing
-    background_tasks.add_task(
-        process_pdf_task,
-        job_id,
-        str(file_path),
-        {"parser_type": parser_type, "output_format": output_format}
+    # Short-circuit duplicate uploads to the existing job
+    existing = await run_in_threadpool(job_store.find_duplicate, upload.sha256, parser_type, output_format)
+    if existing is not None:
+        await run_in_threadpool(upload.path.unlink, True)
+        await run_in_threadpool(metrics.inc, "pdf2sheet_cache_hits_total", source="api")
+        return JobStatus(**existing)
+    
+    job_id = uuid.uuid4().hex[:8]
+    file_path = UPLOAD_DIR / f"{job_id}_{upload.filename}"
+    await run_in_threadpool(os.replace, upload.path, file_path)
+    
+    # Enqueue job for the workers
+    job = await run_in_threadpool(
+        job_store.create_job,
+        filename=upload.filename,
+        file_path=str(file_path.resolve()),
+        parser_type=parser_type,
+        output_format=output_format,
+        job_id=job_id,
+        content_hash=upload.sha256
     )
     
-    return JobStatus(**jobs[job_id])
+    return JobStatus(**job)
+
+
+@app.post("/api/batch", response_model=JobStatus, openapi_extra=_multipart_body("files", many=True))
+async def upload_batch(
+    request: Request,
+    parser_type: str = "auto",
+    output_format: str = "csv",
+    combine: bool = True
+):
+    """
+    Upload many PDFs (or zip archives of PDFs) to process as one job.
+    
+    Files (multipart field ``files``) are processed in parallel by a
+    worker, deduplicated across the whole batch and exported as one
+    combined file, or as per-file exports bundled in a zip when
+    ``combine=false``. Per-file progress is reported in the job's
+    ``files`` field.
+    """
+    job_id = uuid.uuid4().hex[:8]
+    batch_dir = UPLOAD_DIR / job_id
+    batch_dir.mkdir(parents=True, exist_ok=True)
+    
+    def check_name(name: str) -> None:
+        if not name.lower().endswith((".pdf", ".zip")):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Only PDF or ZIP files are accepted: {name}"
+            )
+    
+    pdf_names = []
+    
+    try:
+        for upload in await receive_files(request, batch_dir, check_name):
+            if upload.filename.lower().endswith(".pdf"):
+                target_name = f"{len(pdf_names):04d}_{upload.filename}"
+                await run_in_threadpool(os.replace, upload.path, batch_dir / target_name)
+                pdf_names.append(target_name)
+                continue
+            
+            try:
+                extracted = await run_in_threadpool(
+                    extract_pdfs_from_zip, upload.path, batch_dir, len(pdf_names)
+                )
+            except zipfile.BadZipFile:
+                raise HTTPException(status_code=400, detail=f"Invalid zip archive: {upload.filename}")
+            finally:
+                upload.path.unlink(missing_ok=True)
+            
+            pdf_names.extend(extracted)
+        
+        if not pdf_names:
+            raise HTTPException(status_code=400, detail="No PDF files found in the upload")
+    
+    except HTTPException:
+        await run_in_threadpool(shutil.rmtree, batch_dir, True)
+        raise
+    except Exception as e:
+        await run_in_threadpool(shutil.rmtree, batch_dir, True)
+        raise HTTPException(status_code=500, detail=f"Failed to save files: {str(e)}")
+    
+    job = await run_in_threadpool(
+        job_store.create_job,
+        filename=f"batch ({len(pdf_names)} files)",
+        file_path=str(batch_dir.resolve()),
+        parser_type=parser_type,
+        output_format=output_format,
+        options={"batch": True, "combine": combine},
+        job_id=job_id
+    )
+    
+    return JobStatus(**job)
 
 
 @app.get("/api/jobs/{job_id}", response_model=JobStatus)
-async def get_job_status(job_id: str):
+def get_job_status(job_id: str):
     """Get the status of a processing job."""
-    if job_id not in jobs:
+    job = job_store.get_job(job_id)
+    
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return JobStatus(**job)
+
+
+@app.get("/api/jobs/{job_id}/events")
+async def job_events_stream(job_id: str):
+    """
+    Stream job progress as Server-Sent Events.
+    
+    Each event carries status, progress, stage and (for batches) per-file
+    status. The stream ends once the job completes or fails.
+    """
+    if await run_in_threadpool(job_store.get_job, job_id) is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    return JobStatus(**jobs[job_id])
+    async def event_stream():
+        async for event in job_events.subscribe(job_id):
+            if event is None:
+                # Comment line keeps proxies from closing an idle connection
+                yield ": keep-alive\n\n"
+            else:
+                yield f"data: {json.dumps(event)}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @app.get("/api/jobs")
-async def list_jobs():
+def list_jobs():
     """List all jobs."""
-    return {"jobs": list(jobs.values())}
+    return {"jobs": job_store.list_jobs()}
 
 
 @app.get("/api/download/{job_id}")
-async def download_result(job_id: str):
-    """Download the processed result file."""
-    if job_id not in jobs:
-        raise HTTPException(status_code=404, detail="Job not found")
+async def download_result(job_id: str, request: Request):
+    """
+    Download the processed result file.
+    
+    Honors Accept-Encoding (zstd/gzip variants are compressed once and
+    cached next to the output), answers If-None-Match with 304 (weak
+    comparison, ``*`` included) and supports Range/If-Range so
+    interrupted downloads can resume; If-Range needs the strong ETag.
+    """
+    job = await run_in_threadpool(job_store.get_job, job_id)
     
-    job = jobs[job_id]
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
     
     if job["status"] != "completed":
         raise HTTPException(status_code=400, detail="Job not completed yet")
@@ -220,23 +500,52 @@ async def download_result(job_id: str):
     if not job["output_file"] or not os.path.exists(job["output_file"]):
         raise HTTPException(status_code=404, detail="Output file not found")
     
+    output_file = job["output_file"]
+    headers = {"Vary": "Accept-Encoding", "Cache-Control": "private, no-cache"}
+    
+    encoding = None
+    if is_compressible(output_file):
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    
+    served_file = output_file
+    if encoding:
+        served_file = await run_in_threadpool(compressed_variant, output_file, encoding)
+        headers["Content-Encoding"] = encoding
+    
+    # Each encoding is a distinct representation with its own validator
+    stat = os.stat(output_file)
+    etag = f'"{stat.st_size:x}-{stat.st_mtime_ns:x}{"-" + encoding if encoding else ""}"'
+    headers["ETag"] = etag
+    
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    
     return FileResponse(
-        job["output_file"],
+        served_file,
         media_type="application/octet-stream",
-        filename=os.path.basename(job["output_file"])
+        filename=os.path.basename(output_file),
+        headers=headers
     )
 
 
 @app.get("/api/preview/{job_id}")
-async def preview_result(job_id: str, limit: int = 20):
-    """Preview the first N rows of the result."""
-    import csv
-    import json
+async def preview_result(
+    job_id: str,
+    offset: int = 0,
+    limit: int = 20,
+    columns: Optional[str] = None
+):
+    """
+    Preview a page of rows of the result.
     
-    if job_id not in jobs:
-        raise HTTPException(status_code=404, detail="Job not found")
+    Pages are read through the row-offset index written at export time,
+    so any page costs O(limit) regardless of the file size. ``columns``
+    is an optional comma-separated projection.
+    """
+    job = await run_in_threadpool(job_store.get_job, job_id)
     
-    job = jobs[job_id]
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
     
     if job["status"] != "completed":
         raise HTTPException(status_code=400, detail="Job not completed yet")
@@ -245,62 +554,87 @@ async def preview_result(job_id: str, limit: int = 20):
         raise HTTPException(status_code=404, detail="Output file not found")
     
     output_file = job["output_file"]
+    file_format = Path(output_file).suffix.lower().lstrip(".")
     
-    # Read based on format
-    if output_file.endswith('.csv'):
-        with open(output_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            rows = []
-            for i, row in enumerate(reader):
-                if i >= limit:
-                    break
-                # Clean row - remove internal fields
-                clean_row = {k: v for k, v in row.items() if not k.startswith('_')}
-                rows.append(clean_row)
-        
-        return {
-            "format": "csv",
-            "total_preview": len(rows),
-            "columns": list(rows[0].keys()) if rows else [],
-            "rows": rows
-        }
+    if file_format not in ("csv", "json"):
+        return {"error": "Unknown format"}
     
-    elif output_file.endswith('.json'):
-        with open(output_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        if isinstance(data, list):
-            return {
-                "format": "json",
-                "total_preview": min(len(data), limit),
-                "rows": data[:limit]
-            }
-        
-        return {"format": "json", "data": data}
+    if offset < 0 or not 0 < limit <= MAX_PREVIEW_ROWS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"offset must be >= 0 and limit between 1 and {MAX_PREVIEW_ROWS}"
+        )
+    
+    selected = [c.strip() for c in columns.split(",") if c.strip()] if columns else None
+    page = await run_in_threadpool(read_page, output_file, offset, limit, selected)
     
-    return {"error": "Unknown format"}
+    rows = page["rows"]
+    page_columns = page["columns"]
+    if not selected:
+        # Hide internal fields (_source_file, ...)
+        page_columns = [c for c in page_columns if not c.startswith("_")]
+        rows = [
+            {k: v for k, v in row.items() if not k.startswith("_")} if isinstance(row, dict) else row
+            for row in rows
+        ]
+    
+    total_rows = page["total_rows"]
+    has_more = (offset + len(rows) < total_rows) if total_rows is not None else len(rows) == limit
+    
+    return {
+        "format": file_format,
+        "offset": offset,
+        "limit": limit,
+        "total_rows": total_rows,
+        "total_preview": len(rows),
+        "next_offset": offset + len(rows) if has_more else None,
+        "columns": page_columns,
+        "rows": rows
+    }
 
 
 @app.delete("/api/jobs/{job_id}")
-async def delete_job(job_id: str):
+def delete_job(job_id: str):
     """Delete a job and its output file."""
-    if job_id not in jobs:
-        raise HTTPException(status_code=404, detail="Job not found")
+    job = job_store.get_job(job_id)
     
-    job = jobs[job_id]
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
     
-    # Delete output file if exists
-    if job.get("output_file") and os.path.exists(job["output_file"]):
-        try:
-            os.remove(job["output_file"])
-        except:
-            pass
+    # Delete output file (and its preview index) if exists
+    if job.get("output_file"):
+        for path in (job["output_file"], index_path_for(job["output_file"])):
+            if os.path.exists(path):
+                try:
+                    os.remove(path)
+                except:
+                    pass
+        remove_variants(job["output_file"])
     
-    del jobs[job_id]
+    job_store.delete_job(job_id)
     
     return {"message": "Job deleted successfully"}
 
 
+@app.get("/api/metrics")
+async def get_metrics():
+    """
+    Expose pipeline and queue metrics in Prometheus text format.
+    
+    Counters and histograms are written by the worker processes (and
+    the watcher, when pointed at the same database); job counts by
+    status are read at scrape time. Throughput is derived in Prometheus,
+    e.g. ``rate(pdf2sheet_pages_total[5m])`` for pages/sec.
+    """
+    def render() -> str:
+        counts = job_store.count_by_status()
+        return metrics.render({
+            "pdf2sheet_jobs": [({"status": status}, total) for status, total in counts.items()]
+        })
+    
+    return Response(await run_in_threadpool(render), media_type=METRICS_CONTENT_TYPE)
+
+
 @app.get("/api/parsers")
 async def list_parsers():
     """List available parsers."""
@@ -343,6 +677,9 @@ if __name__ == "__main__":
     print()
     print("  API Docs:    http://localhost:8000/api/docs")
     print("  Dashboard:   http://localhost:8000/")
+    print(f"  Job DB:      {JOBS_DB}")
+    print()
+    print("  Start workers with: python worker.py --workers 2")
     print()
     
     uvicorn.run(app, host="0.0.0.0", port=8000)
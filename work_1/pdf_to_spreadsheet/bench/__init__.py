@@ -0,0 +1,24 @@
+"""
+Benchmarks
+==========
+
+Suite de rendimiento por etapa del pipeline.
+
+Genera un corpus sintetico escalable (facturas, reportes tabulares de
+varias paginas y estados financieros), mide tiempo y memoria pico de cada
+componente y escribe un JSON comparable entre commits:
+
+    python -m bench run --invoices 50 --report-pages 20 -o bench.json
+    python -m bench compare baseline.json bench.json
+"""
+
+from .compare import compare_results
+from .corpus import generate_corpus
+from .runner import run_benchmark
+
+
+__all__ = [
+    "compare_results",
+    "generate_corpus",
+    "run_benchmark",
+]
@@ -0,0 +1,156 @@
+"""
+Benchmark CLI
+=============
+
+    python -m bench run [opciones] -o resultados.json
+    python -m bench compare referencia.json resultados.json
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from loguru import logger
+
+from src.config import load_config
+
+from .compare import compare_results, same_corpus
+from .corpus import generate_corpus
+from .runner import run_benchmark
+
+
+def _format_change(change):
+    return "-" if change is None else f"{change:+.1%}"
+
+
+def run(args: argparse.Namespace) -> int:
+    """Genera el corpus, ejecuta el benchmark y escribe el JSON."""
+    config = load_config(args.config)
+
+    with tempfile.TemporaryDirectory(prefix="pdf2sheet_corpus_") as tmp_dir:
+        corpus_dir = Path(args.corpus_dir) if args.corpus_dir else Path(tmp_dir)
+        corpus = generate_corpus(
+            corpus_dir,
+            invoices=args.invoices,
+            invoice_items=args.invoice_items,
+            reports=args.reports,
+            report_pages=args.report_pages,
+            rows_per_page=args.rows_per_page,
+            statements=args.statements,
+            statement_items=args.statement_items,
+            seed=args.seed,
+        )
+        results = run_benchmark(
+            corpus,
+            config,
+            repeat=args.repeat,
+            memory=not args.no_memory,
+            exporters=args.exporter or None,
+        )
+
+    results["corpus"]["params"] = {
+        "invoices": args.invoices,
+        "invoice_items": args.invoice_items,
+        "reports": args.reports,
+        "report_pages": args.report_pages,
+        "rows_per_page": args.rows_per_page,
+        "statements": args.statements,
+        "statement_items": args.statement_items,
+        "seed": args.seed,
+    }
+
+    print(f"{'Etapa':<26}{'Segundos':>10}{'Throughput':>18}{'Memoria pico':>16}")
+    for stage, values in results["stages"].items():
+        throughput = f"{values['throughput'] or 0:,.1f} {values['unit']}/s"
+        peak = values["peak_memory_bytes"]
+        memory = "-" if peak is None else f"{peak / 1024 / 1024:,.1f} MB"
+        print(f"{stage:<26}{values['seconds']:>10.4f}{throughput:>18}{memory:>16}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"\nResultados: {args.output}")
+
+    return 0
+
+
+def compare(args: argparse.Namespace) -> int:
+    """Compara dos resultados; retorna 1 si hay regresiones."""
+    baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+    current = json.loads(Path(args.current).read_text(encoding="utf-8"))
+
+    if not same_corpus(baseline, current):
+        print("Advertencia: los resultados no usan el mismo corpus")
+
+    print(f"{baseline.get('commit') or '?'} -> {current.get('commit') or '?'}\n")
+    print(f"{'Etapa':<26}{'Antes':>10}{'Despues':>10}{'Tiempo':>10}{'Memoria':>10}")
+
+    comparison = compare_results(baseline, current, args.threshold, args.min_seconds)
+    for entry in comparison:
+        mark = "  REGRESION" if entry["regression"] else ""
+        print(
+            f"{entry['stage']:<26}{entry['baseline_seconds']:>10.4f}{entry['current_seconds']:>10.4f}"
+            f"{_format_change(entry['time_change']):>10}{_format_change(entry['memory_change']):>10}{mark}"
+        )
+
+    return 1 if any(entry["regression"] for entry in comparison) else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m bench",
+        description="Benchmarks por etapa de PDF to Spreadsheet"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Ejecutar el benchmark")
+    run_parser.add_argument("-o", "--output", help="Archivo JSON de resultados")
+    run_parser.add_argument("-c", "--config", default="config.yaml", help="Archivo de configuracion")
+    run_parser.add_argument("--corpus-dir", help="Conservar el corpus generado en este directorio")
+    run_parser.add_argument("--invoices", type=int, default=20, help="Numero de facturas")
+    run_parser.add_argument("--invoice-items", type=int, default=5, help="Conceptos por factura")
+    run_parser.add_argument("--reports", type=int, default=2, help="Numero de reportes tabulares")
+    run_parser.add_argument("--report-pages", type=int, default=10, help="Paginas por reporte")
+    run_parser.add_argument("--rows-per-page", type=int, default=30, help="Filas por pagina de reporte")
+    run_parser.add_argument("--statements", type=int, default=2, help="Numero de estados financieros")
+    run_parser.add_argument("--statement-items", type=int, default=30, help="Partidas por estado financiero")
+    run_parser.add_argument("--seed", type=int, default=0, help="Semilla de los datos")
+    run_parser.add_argument("--repeat", type=int, default=3, help="Ejecuciones cronometradas por etapa")
+    run_parser.add_argument("--no-memory", action="store_true", help="No medir memoria pico")
+    run_parser.add_argument(
+        "--exporter",
+        action="append",
+        choices=["csv", "json", "excel"],
+        help="Exportador a medir (repetible; por defecto todos los disponibles)"
+    )
+    run_parser.set_defaults(func=run)
+
+    compare_parser = subparsers.add_parser("compare", help="Comparar dos resultados")
+    compare_parser.add_argument("baseline", help="Resultados de referencia")
+    compare_parser.add_argument("current", help="Resultados a evaluar")
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Cambio relativo que cuenta como regresion (default: 0.10)"
+    )
+    compare_parser.add_argument(
+        "--min-seconds",
+        type=float,
+        default=0.001,
+        help="Diferencia minima de tiempo que cuenta como regresion (default: 0.001)"
+    )
+    compare_parser.set_defaults(func=compare)
+
+    args = parser.parse_args()
+
+    # Solo advertencias: los logs por documento distorsionan los tiempos
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+Benchmark Comparison
+====================
+
+Compara dos resultados de ``python -m bench run`` etapa por etapa.
+"""
+
+from typing import Any, Dict, List, Optional
+
+
+def _change(baseline: Optional[float], current: Optional[float]) -> Optional[float]:
+    """Cambio relativo (0.25 = 25% mas lento o mas memoria)."""
+    if not baseline or current is None:
+        return None
+    return round(current / baseline - 1, 4)
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = 0.10,
+    min_seconds: float = 0.001,
+    min_bytes: int = 64 * 1024
+) -> List[Dict[str, Any]]:
+    """
+    Compara los tiempos y la memoria pico de cada etapa.
+
+    Args:
+        baseline: Resultados de referencia.
+        current: Resultados a evaluar.
+        threshold: Cambio relativo a partir del cual una etapa se marca
+            como regresion (0.10 = 10%).
+        min_seconds: Diferencia absoluta minima para que un cambio de
+            tiempo cuente como regresion (las etapas de microsegundos
+            son ruidosas).
+        min_bytes: Diferencia absoluta minima de memoria pico.
+
+    Returns:
+        Una entrada por etapa presente en ambos resultados con
+        ``stage``, ``baseline_seconds``, ``current_seconds``,
+        ``time_change``, ``memory_change`` y ``regression``.
+    """
+    comparison = []
+    current_stages = current.get("stages", {})
+
+    for stage, before in baseline.get("stages", {}).items():
+        after = current_stages.get(stage)
+        if after is None:
+            continue
+
+        time_change = _change(before.get("seconds"), after.get("seconds"))
+        memory_change = _change(before.get("peak_memory_bytes"), after.get("peak_memory_bytes"))
+
+        slower = (
+            time_change is not None and time_change > threshold
+            and after["seconds"] - before["seconds"] > min_seconds
+        )
+        more_memory = (
+            memory_change is not None and memory_change > threshold
+            and after["peak_memory_bytes"] - before["peak_memory_bytes"] > min_bytes
+        )
+
+        comparison.append({
+            "stage": stage,
+            "baseline_seconds": before.get("seconds"),
+            "current_seconds": after.get("seconds"),
+            "time_change": time_change,
+            "memory_change": memory_change,
+            "regression": slower or more_memory,
+        })
+
+    return comparison
+
+
+def same_corpus(baseline: Dict[str, Any], current: Dict[str, Any]) -> bool:
+    """Indica si ambos resultados se midieron sobre el mismo corpus."""
+    before = baseline.get("corpus", {})
+    after = current.get("corpus", {})
+    return all(before.get(key) == after.get(key) for key in ("params", "files", "pages"))
@@ -0,0 +1,255 @@
+"""
+Synthetic Corpus
+================
+
+Generador de PDFs sinteticos para los benchmarks.
+
+Los documentos imitan a los de ``generate_sample_pdfs.py`` pero con
+tamanos configurables: numero de facturas y de conceptos por factura,
+paginas y filas por pagina de los reportes, y partidas de los estados
+financieros. Con la misma semilla se generan los mismos datos, de modo
+que dos commits se miden sobre el mismo corpus.
+
+Requiere: reportlab (pip install reportlab)
+"""
+
+import random
+from pathlib import Path
+from typing import Dict, List, Union
+
+try:
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+    REPORTLAB_AVAILABLE = True
+except ImportError:
+    REPORTLAB_AVAILABLE = False
+
+
+PRODUCTS = [
+    "Licencia Software Enterprise",
+    "Horas de Consultoria",
+    "Modulo Adicional Premium",
+    "Soporte Anual",
+    "Capacitacion (horas)",
+    "Servidor Dedicado",
+    "Almacenamiento en la Nube",
+    "Auditoria de Seguridad",
+]
+
+SELLERS = [
+    "Juan Perez", "Maria Garcia", "Carlos Lopez", "Ana Martinez",
+    "Roberto Sanchez", "Laura Hernandez", "Pedro Gomez", "Sofia Ruiz",
+]
+
+REGIONS = ["Norte", "Sur", "Centro", "Este", "Oeste"]
+
+BALANCE_ITEMS = [
+    "Efectivo y equivalentes", "Cuentas por cobrar", "Inventarios",
+    "Propiedades, planta y equipo", "Activos intangibles", "Inversiones",
+]
+
+RESULT_ITEMS = [
+    "Ingresos por ventas", "Costo de ventas", "Gastos de operacion",
+    "Gastos financieros", "Otros ingresos", "Impuestos a la utilidad",
+]
+
+GRID_STYLE = TableStyle([
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("FONTSIZE", (0, 0), (-1, -1), 8),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 2),
+    ("TOPPADDING", (0, 0), (-1, -1), 2),
+    ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
+]) if REPORTLAB_AVAILABLE else None
+
+
+def _money(value: float) -> str:
+    return f"${value:,.2f}"
+
+
+def create_invoice(output_path: Path, number: int, items: int, rng: random.Random) -> None:
+    """
+    Crea una factura con ``items`` conceptos.
+
+    Args:
+        output_path: Ruta del PDF.
+        number: Numero de factura.
+        items: Conceptos en la tabla de la factura.
+        rng: Generador de numeros aleatorios.
+    """
+    styles = getSampleStyleSheet()
+    elements = [Paragraph("FACTURA", styles["Heading1"]), Spacer(1, 12)]
+
+    info = [
+        ["Numero de Factura:", f"INV-2024-{number:05d}"],
+        ["Fecha:", f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/2024"],
+        ["Proveedor:", "TechCorp Solutions S.A. de C.V."],
+        ["RFC:", "TCS123456ABC"],
+        ["Cliente:", f"Empresa Cliente {number} SA"],
+        ["RFC Cliente:", f"ECL{number:05d}XYZ"],
+    ]
+    elements += [Table(info), Spacer(1, 12)]
+
+    rows = [["Cant.", "Descripcion", "Precio Unit.", "Total"]]
+    subtotal = 0.0
+    for _ in range(items):
+        qty = rng.randint(1, 20)
+        price = round(rng.uniform(50, 2500), 2)
+        subtotal += qty * price
+        rows.append([str(qty), rng.choice(PRODUCTS), _money(price), _money(qty * price)])
+
+    items_table = Table(rows, repeatRows=1)
+    items_table.setStyle(GRID_STYLE)
+    elements += [items_table, Spacer(1, 12)]
+
+    iva = subtotal * 0.16
+    elements.append(Table([
+        ["", "Subtotal:", _money(subtotal)],
+        ["", "IVA (16%):", _money(iva)],
+        ["", "TOTAL:", _money(subtotal + iva)],
+    ]))
+
+    SimpleDocTemplate(str(output_path), pagesize=letter).build(elements)
+
+
+def create_report(output_path: Path, pages: int, rows_per_page: int, rng: random.Random) -> None:
+    """
+    Crea un reporte de ventas con una tabla por pagina.
+
+    Args:
+        output_path: Ruta del PDF.
+        pages: Paginas del reporte.
+        rows_per_page: Filas de cada tabla (con mas de ~45 filas la
+            tabla continua en la pagina siguiente).
+        rng: Generador de numeros aleatorios.
+    """
+    styles = getSampleStyleSheet()
+    elements = [
+        Paragraph("REPORTE DE VENTAS MENSUAL", styles["Heading1"]),
+        Paragraph("Periodo: Enero 2024", styles["Normal"]),
+        Spacer(1, 12),
+    ]
+
+    row_id = 1
+    for page in range(pages):
+        rows = [["ID", "Vendedor", "Region", "Ventas", "Comision", "Fecha"]]
+        for _ in range(rows_per_page):
+            sales = round(rng.uniform(10000, 90000), 2)
+            rows.append([
+                f"V{row_id:05d}",
+                rng.choice(SELLERS),
+                rng.choice(REGIONS),
+                _money(sales),
+                _money(sales * 0.1),
+                f"{rng.randint(1, 28):02d}/01/2024",
+            ])
+            row_id += 1
+
+        table = Table(rows, repeatRows=1)
+        table.setStyle(GRID_STYLE)
+        elements.append(table)
+        if page < pages - 1:
+            elements.append(PageBreak())
+
+    SimpleDocTemplate(str(output_path), pagesize=letter).build(elements)
+
+
+def create_financial_statement(output_path: Path, line_items: int, rng: random.Random) -> None:
+    """
+    Crea estados financieros con balance general y estado de resultados.
+
+    Args:
+        output_path: Ruta del PDF.
+        line_items: Partidas de cada estado.
+        rng: Generador de numeros aleatorios.
+    """
+    styles = getSampleStyleSheet()
+    elements = [
+        Paragraph("ESTADOS FINANCIEROS CONSOLIDADOS", styles["Heading1"]),
+        Paragraph("Cifras expresadas en miles de pesos", styles["Normal"]),
+        Paragraph("Ejercicio terminado el 31 de diciembre de 2024", styles["Normal"]),
+        Spacer(1, 12),
+    ]
+
+    sections = [
+        ("Balance General", ["Concepto", "2024", "2023"], ["Activo", "Pasivo", "Patrimonio"], BALANCE_ITEMS),
+        ("Estado de Resultados", ["Concepto", "2024", "2023"], ["Ingresos", "Gastos", "Utilidad"], RESULT_ITEMS),
+    ]
+
+    for title, header, groups, items in sections:
+        rows = [header]
+        for index in range(line_items):
+            group = groups[index * len(groups) // line_items]
+            current = rng.uniform(-50000, 900000)
+            previous = rng.uniform(-50000, 900000)
+            rows.append([
+                f"{group} - {rng.choice(items)}",
+                f"({abs(current):,.0f})" if current < 0 else f"{current:,.0f}",
+                f"({abs(previous):,.0f})" if previous < 0 else f"{previous:,.0f}",
+            ])
+
+        table = Table(rows, repeatRows=1)
+        table.setStyle(GRID_STYLE)
+        elements += [Paragraph(title, styles["Heading2"]), table, Spacer(1, 12)]
+
+    SimpleDocTemplate(str(output_path), pagesize=letter).build(elements)
+
+
+def generate_corpus(
+    output_dir: Union[str, Path],
+    invoices: int = 10,
+    invoice_items: int = 5,
+    reports: int = 1,
+    report_pages: int = 5,
+    rows_per_page: int = 30,
+    statements: int = 1,
+    statement_items: int = 20,
+    seed: int = 0
+) -> Dict[str, List[Path]]:
+    """
+    Genera el corpus sintetico.
+
+    Args:
+        output_dir: Directorio donde se escriben los PDFs.
+        invoices: Numero de facturas.
+        invoice_items: Conceptos por factura.
+        reports: Numero de reportes tabulares.
+        report_pages: Paginas por reporte.
+        rows_per_page: Filas por pagina de reporte.
+        statements: Numero de estados financieros.
+        statement_items: Partidas por estado financiero.
+        seed: Semilla de los datos aleatorios.
+
+    Returns:
+        PDFs generados por tipo de parser (``invoice``, ``report``,
+        ``financial_report``).
+
+    Raises:
+        ImportError: Si reportlab no esta instalado.
+    """
+    if not REPORTLAB_AVAILABLE:
+        raise ImportError("Se requiere reportlab para generar el corpus. Instala con: pip install reportlab")
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+
+    corpus: Dict[str, List[Path]] = {"invoice": [], "report": [], "financial_report": []}
+
+    for number in range(1, invoices + 1):
+        path = output_dir / f"factura_{number:05d}.pdf"
+        create_invoice(path, number, invoice_items, rng)
+        corpus["invoice"].append(path)
+
+    for number in range(1, reports + 1):
+        path = output_dir / f"reporte_{number:03d}.pdf"
+        create_report(path, report_pages, rows_per_page, rng)
+        corpus["report"].append(path)
+
+    for number in range(1, statements + 1):
+        path = output_dir / f"estados_financieros_{number:03d}.pdf"
+        create_financial_statement(path, statement_items, rng)
+        corpus["financial_report"].append(path)
+
+    return corpus
@@ -0,0 +1,238 @@
+"""
+Benchmark Runner
+================
+
+Mide tiempo y memoria pico de cada componente del pipeline por separado.
+
+Cada etapa recibe la salida de la anterior (texto y tablas, filas
+parseadas, normalizadas, validadas) y se ejecuta ``repeat`` veces; se
+reporta el mejor tiempo y la mediana. La memoria pico se mide en una
+ejecucion adicional con ``tracemalloc`` para no distorsionar los tiempos.
+Solo cuenta memoria asignada desde Python (incluye los objetos de
+pdfminer, no buffers de extensiones en C).
+"""
+
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.exporters import CSVExporter, ExcelExporter, JSONExporter
+from src.exporters.excel_exporter import OPENPYXL_AVAILABLE
+from src.extractors import PageAnalyzer, TableExtractor, TextExtractor
+from src.normalizer import DataNormalizer
+from src.parsers import DocumentClassifier, get_parser
+from src.validator import DataValidator
+
+
+# Version del formato de resultados
+SCHEMA_VERSION = 1
+
+
+def _measure(func: Callable[[], Any], repeat: int, memory: bool) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Ejecuta ``func`` varias veces y resume tiempos y memoria pico.
+
+    Returns:
+        Tupla con (resultado de la primera ejecucion, metricas).
+    """
+    result = None
+    times = []
+
+    for run in range(max(1, repeat)):
+        started = time.perf_counter()
+        value = func()
+        times.append(time.perf_counter() - started)
+        if run == 0:
+            result = value
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return result, {
+        "seconds": round(min(times), 6),
+        "median_seconds": round(statistics.median(times), 6),
+        "runs": len(times),
+        "peak_memory_bytes": peak,
+    }
+
+
+def _stage(metrics: Dict[str, Any], unit: str, items: int) -> Dict[str, Any]:
+    """Agrega el volumen procesado y el throughput a las metricas de una etapa."""
+    seconds = metrics["seconds"]
+    metrics.update({
+        "unit": unit,
+        "items": items,
+        "throughput": round(items / seconds, 3) if seconds > 0 else None,
+    })
+    return metrics
+
+
+def _git_commit() -> Optional[str]:
+    """Commit actual del repositorio (None fuera de git)."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True, text=True, check=True, timeout=10
+        )
+        return result.stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_benchmark(
+    corpus: Dict[str, List[Path]],
+    config: Dict[str, Any],
+    repeat: int = 3,
+    memory: bool = True,
+    exporters: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Ejecuta el benchmark por etapa sobre un corpus.
+
+    Args:
+        corpus: PDFs por tipo de parser (ver ``generate_corpus``).
+        config: Configuracion del sistema (parsers, normalizacion,
+            validacion y salida).
+        repeat: Ejecuciones cronometradas por etapa.
+        memory: Si es True, mide la memoria pico con tracemalloc.
+        exporters: Formatos a medir (por defecto csv, json y excel si
+            openpyxl esta instalado).
+
+    Returns:
+        Resultados serializables a JSON: metadatos (commit, python,
+        plataforma, corpus) y ``stages`` con ``seconds`` (mejor tiempo),
+        ``median_seconds``, ``runs``, ``peak_memory_bytes``, ``unit``,
+        ``items`` y ``throughput`` (items por segundo).
+    """
+    if exporters is None:
+        exporters = ["csv", "json"] + (["excel"] if OPENPYXL_AVAILABLE else [])
+
+    files = [(kind, path) for kind, paths in corpus.items() for path in paths]
+    stages: Dict[str, Dict[str, Any]] = {}
+
+    # Extraccion de texto (cuenta paginas con el callback de progreso)
+    page_counts: Dict[Path, int] = {}
+    text_extractor = TextExtractor()
+
+    def extract_text() -> Dict[Path, str]:
+        texts = {}
+        for _, path in files:
+            def on_page(page: int, total: int, path: Path = path) -> None:
+                page_counts[path] = total
+            texts[path] = text_extractor.extract(path, on_page)
+        return texts
+
+    texts, metrics = _measure(extract_text, repeat, memory)
+    total_pages = sum(page_counts.values())
+    stages["extract_text"] = _stage(metrics, "pages", total_pages)
+
+    table_extractor = TableExtractor()
+    tables, metrics = _measure(
+        lambda: {path: table_extractor.extract(path) for _, path in files}, repeat, memory
+    )
+    stages["extract_tables"] = _stage(metrics, "pages", total_pages)
+
+    # Texto, palabras y tablas en una sola pasada (lo que usa el pipeline)
+    analyzer = PageAnalyzer(text_extractor, table_extractor)
+    _, metrics = _measure(lambda: [analyzer.analyze(path) for _, path in files], repeat, memory)
+    stages["analyze"] = _stage(metrics, "pages", total_pages)
+
+    extracted = {
+        path: {
+            "text": texts[path],
+            "tables": tables[path],
+            "metadata": {"file_name": path.name, "extraction_method": "tables" if tables[path] else "text"}
+        }
+        for _, path in files
+    }
+
+    classifier = DocumentClassifier(config)
+    _, metrics = _measure(lambda: [classifier.detect(extracted[path]) for _, path in files], repeat, memory)
+    stages["detect"] = _stage(metrics, "files", len(files))
+
+    # Cada parser sobre los documentos de su tipo
+    parsers_config = config.get("parsers", {})
+
+    # Campos del encabezado de factura: indice de etiquetas contra un
+    # re.search por campo (la referencia)
+    invoice_parser = get_parser("invoice", parsers_config.get("invoice", {}))
+    invoice_texts = [invoice_parser.clean_text(texts[path]) for path in corpus.get("invoice", [])]
+    if invoice_texts:
+        _, metrics = _measure(
+            lambda: [invoice_parser._extract_header_fields(text) for text in invoice_texts], repeat, memory
+        )
+        stages["invoice_fields"] = _stage(metrics, "files", len(invoice_texts))
+
+        _, metrics = _measure(
+            lambda: [
+                {field: invoice_parser.extract_pattern(text, invoice_parser.PATTERNS[field])
+                 for field in invoice_parser.HEADER_FIELDS}
+                for text in invoice_texts
+            ],
+            repeat, memory
+        )
+        stages["invoice_fields_per_field"] = _stage(metrics, "files", len(invoice_texts))
+    parsed: List[Tuple[Any, List[Dict[str, Any]]]] = []
+
+    for kind, paths in corpus.items():
+        if not paths:
+            continue
+
+        parser = get_parser(kind, parsers_config.get(kind, {}))
+        rows, metrics = _measure(lambda: [parser.parse(extracted[path]) for path in paths], repeat, memory)
+        parsed.extend((parser, document_rows) for document_rows in rows)
+        stages[f"parse_{kind}"] = _stage(metrics, "rows", sum(len(document_rows) for document_rows in rows))
+
+    parsed_rows = sum(len(rows) for _, rows in parsed)
+
+    normalizer = DataNormalizer(config.get("normalization", {}))
+    normalized, metrics = _measure(
+        lambda: [(parser, normalizer.normalize(rows)) for parser, rows in parsed if rows], repeat, memory
+    )
+    stages["normalize"] = _stage(metrics, "rows", parsed_rows)
+
+    validator = DataValidator(config.get("validation", {}))
+    validated, metrics = _measure(
+        lambda: [validator.validate(rows, parser.get_validation_rules())[0] for parser, rows in normalized],
+        repeat, memory
+    )
+    all_rows = [row for rows in validated for row in rows]
+    stages["validate"] = _stage(metrics, "rows", sum(len(rows) for _, rows in normalized))
+
+    # Exportadores sobre todas las filas validadas
+    exporter_classes = {"csv": CSVExporter, "json": JSONExporter, "excel": ExcelExporter}
+    output_config = config.get("output", {})
+
+    with tempfile.TemporaryDirectory(prefix="pdf2sheet_bench_") as output_dir:
+        for name in exporters:
+            exporter = exporter_classes[name](output_config.get(name, {}))
+            _, metrics = _measure(lambda: exporter.export(all_rows, output_dir, f"bench_{name}"), repeat, memory)
+            stages[f"export_{name}"] = _stage(metrics, "rows", len(all_rows))
+
+    return {
+        "schema": SCHEMA_VERSION,
+        "created_at": datetime.now().isoformat(),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "corpus": {
+            "files": {kind: len(paths) for kind, paths in corpus.items()},
+            "pages": total_pages,
+            "bytes": sum(path.stat().st_size for _, path in files),
+            "rows": len(all_rows),
+        },
+        "stages": stages,
+    }
@@ -8,6 +8,7 @@ const API_BASE = '/api';
 // State
 let currentJobId = null;
 let pollInterval = null;
+let jobEvents = null;
 
 // DOM Elements
 const dropZone = document.getElementById('dropZone');
@@ -121,8 +122,8 @@ async function uploadFile(file) {
         progressTitle.textContent = 'Processing...';
         progressStatus.textContent = 'Queued';
 
-        // Start polling for status
-        startPolling(job.job_id);
+        // Follow progress events for the job
+        trackJob(job.job_id);
 
     } catch (error) {
         progressTitle.textContent = 'Upload Failed';
@@ -132,51 +133,103 @@ async function uploadFile(file) {
 }
 
 // ============================================
-// Job Status Polling
+// Job Progress (Server-Sent Events)
 // ============================================
 
-function startPolling(jobId) {
+const STAGE_LABELS = {
+    extract_text: 'Extracting text',
+    extract_tables: 'Extracting tables',
+    ocr: 'Running OCR',
+    parse: 'Parsing',
+    normalize: 'Normalizing',
+    validate: 'Validating',
+    dedup: 'Removing duplicates',
+    export: 'Exporting',
+    batch: 'Processing files',
+    done: 'Finishing'
+};
+
+function stopTracking() {
+    if (jobEvents) {
+        jobEvents.close();
+        jobEvents = null;
+    }
     if (pollInterval) {
         clearInterval(pollInterval);
+        pollInterval = null;
     }
+}
 
-    pollInterval = setInterval(async () => {
-        try {
-            const response = await fetch(`${API_BASE}/jobs/${jobId}`);
-            const job = await response.json();
+function trackJob(jobId) {
+    stopTracking();
 
-            // Update progress
-            progressBar.style.width = `${job.progress}%`;
-            progressStatus.textContent = capitalizeFirst(job.status);
+    if (!window.EventSource) {
+        startPolling(jobId);
+        return;
+    }
 
-            if (job.status === 'processing') {
-                progressTitle.textContent = 'Processing PDF...';
-            }
+    jobEvents = new EventSource(`${API_BASE}/jobs/${jobId}/events`);
 
-            if (job.status === 'completed') {
-                clearInterval(pollInterval);
-                progressTitle.textContent = 'Completed!';
-                progressBar.style.width = '100%';
+    jobEvents.onmessage = (message) => {
+        handleJobUpdate(jobId, JSON.parse(message.data));
+    };
 
-                setTimeout(() => {
-                    progressSection.style.display = 'none';
-                    loadJobs();
-                    showNotification(`Extracted ${job.result.total_rows} rows`, 'success');
-                }, 1500);
-            }
+    jobEvents.onerror = () => {
+        // Stream dropped (proxy, server restart...): fall back to polling
+        if (jobEvents) {
+            startPolling(jobId);
+        }
+    };
+}
 
-            if (job.status === 'failed') {
-                clearInterval(pollInterval);
-                progressTitle.textContent = 'Processing Failed';
-                showNotification(job.error || 'Unknown error', 'error');
-            }
+function startPolling(jobId) {
+    stopTracking();
 
+    pollInterval = setInterval(async () => {
+        try {
+            const response = await fetch(`${API_BASE}/jobs/${jobId}`);
+            handleJobUpdate(jobId, await response.json());
         } catch (error) {
             console.error('Polling error:', error);
         }
     }, 1000);
 }
 
+async function handleJobUpdate(jobId, job) {
+    // Update progress
+    progressBar.style.width = `${job.progress || 0}%`;
+    progressStatus.textContent = capitalizeFirst(job.status);
+
+    if (job.status === 'processing') {
+        const stage = STAGE_LABELS[job.stage] || 'Processing PDF';
+        progressTitle.textContent = `${stage}...`;
+    }
+
+    if (job.status === 'completed') {
+        stopTracking();
+        progressTitle.textContent = 'Completed!';
+        progressBar.style.width = '100%';
+
+        // Events carry no result summary; fetch it once
+        if (!job.result) {
+            const response = await fetch(`${API_BASE}/jobs/${jobId}`);
+            job = await response.json();
+        }
+
+        setTimeout(() => {
+            progressSection.style.display = 'none';
+            loadJobs();
+            showNotification(`Extracted ${job.result.total_rows} rows`, 'success');
+        }, 1500);
+    }
+
+    if (job.status === 'failed') {
+        stopTracking();
+        progressTitle.textContent = 'Processing Failed';
+        showNotification(job.error || 'Unknown error', 'error');
+    }
+}
+
 // ============================================
 // Load Jobs
 // ============================================
@@ -327,6 +380,9 @@ async function showPreview(jobId, filename) {
         const data = await response.json();
 
         previewTitle.textContent = `Preview: ${filename}`;
+        if (data.total_rows != null && data.rows) {
+            previewTitle.textContent += ` (${data.rows.length} of ${data.total_rows} rows)`;
+        }
 
         if (data.rows && data.rows.length > 0) {
             const columns = data.columns || Object.keys(data.rows[0]);
@@ -12,6 +12,7 @@ import sys
 import os
 from pathlib import Path
 from datetime import datetime
+from typing import Optional, Tuple
 
 import click
 from loguru import logger
@@ -64,7 +65,28 @@ def print_summary(results: dict) -> None:
     print(f"  Filas extraidas:    {results.get('total_rows', 0):>5}")
     print(f"  Errores:            {results.get('errors', 0):>5}")
     print(f"  Advertencias:       {results.get('warnings', 0):>5}")
+    if results.get("timeouts"):
+        print(f"  Tiempo excedido:    {results['timeouts']:>5}")
     print(f"  Tiempo total:       {results.get('elapsed_time', 0):.2f}s")
+    
+    incremental = results.get("incremental")
+    if incremental:
+        print(f"  Sin cambios:        {incremental['unchanged']:>5}")
+        print(f"  Eliminados:         {incremental['removed']:>5}")
+    
+    timings = results.get("timings") or {}
+    if timings.get("stages"):
+        print("-" * 50)
+        print(f"  Paginas:            {timings.get('pages', 0):>5}")
+        if results.get("table_pages_skipped"):
+            print(f"  Paginas sin tablas: {results['table_pages_skipped']:>5}")
+        print(f"  Bytes leidos:       {timings.get('input_bytes', 0):>12,}")
+        print(f"  Bytes escritos:     {timings.get('output_bytes', 0):>12,}")
+        print(f"  {'Etapa':<18}{'Tiempo':>10}{'Paginas':>10}")
+        for stage, values in timings["stages"].items():
+            pages = values.get("pages") or ""
+            print(f"  {stage:<18}{values['seconds']:>9.3f}s{pages:>10}")
+    
     print("=" * 50)
     
     if results.get("output_file"):
@@ -120,6 +142,41 @@ def print_summary(results: dict) -> None:
     default=False,
     help="Ejecutar sin escribir archivos de salida"
 )
+@click.option(
+    "--incremental",
+    is_flag=True,
+    default=False,
+    help="Procesar solo PDFs nuevos o modificados y actualizar el archivo combinado"
+)
+@click.option(
+    "--workers", "-w",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Procesos para los PDFs de un directorio (default: 1)"
+)
+@click.option(
+    "--include",
+    multiple=True,
+    help="Patron glob de PDFs a incluir (repetible; default: config discovery.include)"
+)
+@click.option(
+    "--exclude",
+    multiple=True,
+    help="Patron glob de archivos o carpetas a omitir (repetible)"
+)
+@click.option(
+    "--profile",
+    "profile_dir",
+    type=click.Path(),
+    default=None,
+    help="Guardar un perfil por PDF en este directorio (cProfile/pyinstrument)"
+)
+@click.option(
+    "--profiler",
+    type=click.Choice(["cprofile", "pyinstrument"], case_sensitive=False),
+    default="cprofile",
+    help="Herramienta de perfilado para --profile (default: cprofile)"
+)
 def main(
     input_path: str,
     output_path: str,
@@ -127,7 +184,13 @@ def main(
     parser: str,
     config_file: str,
     verbose: bool,
-    dry_run: bool
+    dry_run: bool,
+    incremental: bool,
+    workers: int,
+    include: Tuple[str, ...],
+    exclude: Tuple[str, ...],
+    profile_dir: Optional[str],
+    profiler: str
 ) -> None:
     """
     PDF to Spreadsheet Automation
@@ -139,6 +202,14 @@ def main(
         python main.py --input input/ --output output/ --format csv
         
         python main.py -i factura.pdf -o output/ -f json --verbose
+        
+        python main.py -i input/ -o output/ --incremental
+        
+        python main.py -i input/ -o output/ --workers 4
+        
+        python main.py -i input/ -o output/ --include "factura_*.pdf" --exclude "archivo/*"
+        
+        python main.py -i input/ -o output/ --profile logs/profiles/
     """
     try:
         # Cargar configuracion
@@ -147,6 +218,13 @@ def main(
         # Configurar logging
         setup_logging(config, verbose)
         
+        if profile_dir:
+            config["profiling"] = {
+                "enabled": True,
+                "output_dir": profile_dir,
+                "tool": profiler.lower()
+            }
+        
         logger.info("Iniciando PDF to Spreadsheet Automation")
         logger.info(f"Input: {input_path}")
         logger.info(f"Output: {output_path}")
@@ -170,7 +248,14 @@ def main(
         if input_path_obj.is_file():
             results = pipeline.process_file(input_path_obj, output_dir)
         else:
-            results = pipeline.process_directory(input_path_obj, output_dir)
+            results = pipeline.process_directory(
+                input_path_obj,
+                output_dir,
+                max_workers=workers,
+                incremental=incremental,
+                include=list(include) or None,
+                exclude=list(exclude) or None
+            )
         
         # Mostrar resumen
         print_summary(results)
@@ -0,0 +1,183 @@
+"""
+Compression
+===========
+
+Variantes comprimidas (gzip/zstd) de los archivos de salida para
+descargas.
+
+Cada variante se genera una sola vez junto al archivo original
+(``<archivo>.gz`` / ``<archivo>.zst``) y se regenera si el original
+cambia, de modo que las descargas repetidas o reanudadas con Range
+sirven siempre los mismos bytes.
+"""
+
+import gzip
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from loguru import logger
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+
+# Extension de la variante por encoding HTTP
+ENCODING_SUFFIXES = {
+    "zstd": ".zst",
+    "gzip": ".gz",
+}
+
+# Archivos que no vale la pena comprimir
+ALREADY_COMPRESSED = (".zip", ".gz", ".zst", ".xlsx")
+MIN_COMPRESS_BYTES = 1024
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def available_encodings() -> List[str]:
+    """Encodings soportados, en orden de preferencia."""
+    encodings = ["zstd"] if ZSTD_AVAILABLE else []
+    return encodings + ["gzip"]
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Elige el encoding a partir del header Accept-Encoding.
+
+    Args:
+        accept_encoding: Valor del header (p.ej. "gzip, zstd;q=0.9").
+
+    Returns:
+        "zstd", "gzip" o None (sin compresion).
+    """
+    if not accept_encoding:
+        return None
+
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+
+        weights[name] = weight
+
+    best = None
+    best_weight = 0.0
+
+    # Ante igual peso gana el primero en orden de preferencia
+    for encoding in available_encodings():
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+
+    return best
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Evalua If-None-Match contra el ETag de la representacion servida.
+
+    Usa la comparacion debil de RFC 9110: ``W/"x"`` coincide con ``"x"``.
+    ``*`` coincide con cualquier representacion existente.
+
+    Args:
+        if_none_match: Valor del header (p.ej. 'W/"a1", "b2"' o "*").
+        etag: ETag de la respuesta (fuerte o debil).
+
+    Returns:
+        True si la respuesta puede ser un 304.
+    """
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    def opaque(tag: str) -> str:
+        tag = tag.strip()
+        return tag[2:] if tag.startswith("W/") else tag
+
+    return opaque(etag) in {opaque(tag) for tag in if_none_match.split(",")}
+
+
+def is_compressible(file_path: Union[str, Path]) -> bool:
+    """Indica si vale la pena servir una variante comprimida."""
+    file_path = Path(file_path)
+
+    if file_path.suffix.lower() in ALREADY_COMPRESSED:
+        return False
+
+    return file_path.stat().st_size >= MIN_COMPRESS_BYTES
+
+
+def variant_path(file_path: Union[str, Path], encoding: str) -> Path:
+    """Ruta de la variante comprimida de un archivo."""
+    file_path = Path(file_path)
+    return file_path.with_name(file_path.name + ENCODING_SUFFIXES[encoding])
+
+
+def compressed_variant(file_path: Union[str, Path], encoding: str) -> Path:
+    """
+    Obtiene (generandola si hace falta) la variante comprimida.
+
+    La variante se escribe en un archivo temporal y se renombra, asi un
+    lector concurrente nunca ve un archivo a medio escribir.
+
+    Args:
+        file_path: Archivo original.
+        encoding: "gzip" o "zstd".
+
+    Returns:
+        Ruta de la variante comprimida.
+    """
+    file_path = Path(file_path)
+    target = variant_path(file_path, encoding)
+
+    source_mtime = file_path.stat().st_mtime_ns
+    if target.exists() and target.stat().st_mtime_ns == source_mtime:
+        return target
+
+    fd, tmp_name = tempfile.mkstemp(dir=str(file_path.parent), suffix=".tmp")
+    try:
+        with open(file_path, "rb") as src, os.fdopen(fd, "wb") as dst:
+            if encoding == "zstd":
+                zstandard.ZstdCompressor(level=10).copy_stream(src, dst)
+            else:
+                # mtime=0: misma entrada -> mismos bytes (ETag estable)
+                with gzip.GzipFile(fileobj=dst, mode="wb", compresslevel=6, mtime=0) as gz:
+                    shutil.copyfileobj(src, gz, _CHUNK_SIZE)
+
+        # La variante hereda el mtime del original para detectar cambios
+        os.utime(tmp_name, ns=(source_mtime, source_mtime))
+        os.replace(tmp_name, target)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.remove(tmp_name)
+        raise
+
+    logger.debug(f"Variante {encoding} generada: {target}")
+    return target
+
+
+def remove_variants(file_path: Union[str, Path]) -> None:
+    """Elimina las variantes comprimidas de un archivo."""
+    for encoding in ENCODING_SUFFIXES:
+        try:
+            os.remove(variant_path(file_path, encoding))
+        except OSError:
+            pass
@@ -77,8 +77,19 @@ def _validate_config(config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
     
     config["extraction"].setdefault("strategy", "auto")
     config["extraction"].setdefault("prefer_tables", True)
+    config["extraction"].setdefault("table_strategy", "auto")
+    config["extraction"].setdefault("table_strategy_learn_pages", 3)
+    config["extraction"].setdefault("table_prefilter", True)
+    config["extraction"].setdefault("demand_driven", True)
+    config["extraction"].setdefault("templates", {})
+    config["extraction"]["templates"].setdefault("enabled", False)
+    config["extraction"]["templates"].setdefault("store", "./output/.layout_templates.json")
+    config["extraction"]["templates"].setdefault("learn", True)
     config["extraction"].setdefault("ocr_fallback", True)
     config["extraction"].setdefault("ocr_language", "spa+eng")
+    config["extraction"].setdefault("max_pages", 100)
+    config["extraction"].setdefault("timeout_seconds", 60)
+    config["extraction"].setdefault("max_memory_mb", 2048)
     
     # Valores por defecto para parsers
     if "parsers" not in config:
@@ -87,6 +98,11 @@ def _validate_config(config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
             "report": {"enabled": True}
         }
     
+    # Valores por defecto para deteccion de parser
+    if "detection" not in config:
+        config["detection"] = {}
+    config["detection"].setdefault("sample_kb", 32)
+    
     # Valores por defecto para normalizacion
     if "normalization" not in config:
         config["normalization"] = {}
@@ -100,6 +116,21 @@ def _validate_config(config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         config["validation"] = {}
     config["validation"].setdefault("enabled", True)
     config["validation"].setdefault("on_error", "warn")
+    config["validation"].setdefault("pattern_timeout_ms", 250)
+    config["validation"].setdefault("pattern_warn_ms", 50)
+    
+    # Valores por defecto para procesamiento por lotes
+    if "batch" not in config:
+        config["batch"] = {}
+    config["batch"].setdefault("max_workers", 4)
+    
+    # Valores por defecto para descubrimiento de PDFs
+    if "discovery" not in config:
+        config["discovery"] = {}
+    config["discovery"].setdefault("recursive", True)
+    config["discovery"].setdefault("include", ["*.pdf"])
+    config["discovery"].setdefault("exclude", [])
+    config["discovery"].setdefault("order_window", 1000)
     
     # Valores por defecto para logging
     if "logging" not in config:
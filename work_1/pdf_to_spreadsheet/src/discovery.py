@@ -0,0 +1,131 @@
+"""
+Discovery
+=========
+
+Descubrimiento perezoso de PDFs en arboles de directorios.
+
+Recorre con ``os.scandir`` (una sola pasada, sin materializar la lista)
+y entrega cada archivo en cuanto lo encuentra, de modo que el
+procesamiento puede empezar antes de terminar el recorrido.
+"""
+
+import fnmatch
+import heapq
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Sequence, Tuple, Union
+
+
+DEFAULT_INCLUDE = ("*.pdf",)
+
+
+def _matches(rel_path: str, name: str, patterns: Sequence[str]) -> bool:
+    """
+    Indica si la ruta relativa o el nombre coinciden con algun patron.
+
+    La comparacion no distingue mayusculas (``*.pdf`` acepta ``.PDF``
+    y ``.Pdf``).
+    """
+    rel_path = rel_path.lower()
+    name = name.lower()
+
+    for pattern in patterns:
+        pattern = pattern.lower()
+        if fnmatch.fnmatchcase(name, pattern) or fnmatch.fnmatchcase(rel_path, pattern):
+            return True
+
+    return False
+
+
+def iter_pdfs(
+    root: Union[str, Path],
+    recursive: bool = True,
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None
+) -> Iterator[Tuple[Path, int]]:
+    """
+    Recorre ``root`` y entrega los PDFs encontrados con su tamano.
+
+    Args:
+        root: Directorio raiz.
+        recursive: Descender en subdirectorios.
+        include: Patrones glob de archivos a incluir (default: ``*.pdf``).
+        exclude: Patrones glob de archivos o directorios a omitir; se
+            comparan con el nombre y con la ruta relativa a ``root``
+            (con ``/``; como en ``fnmatch``, ``*`` tambien abarca ``/``).
+
+    Yields:
+        Tuplas (ruta, tamano en bytes) en orden de recorrido.
+    """
+    include = tuple(include or DEFAULT_INCLUDE)
+    exclude = tuple(exclude or ())
+    root = str(root)
+
+    pending_dirs = [root]
+
+    while pending_dirs:
+        directory = pending_dirs.pop()
+
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            continue
+
+        with entries:
+            for entry in entries:
+                rel_path = os.path.relpath(entry.path, root).replace(os.sep, "/")
+
+                if exclude and _matches(rel_path, entry.name, exclude):
+                    continue
+
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            pending_dirs.append(entry.path)
+                        continue
+
+                    if not entry.is_file() or not _matches(rel_path, entry.name, include):
+                        continue
+
+                    size = entry.stat().st_size
+                except OSError:
+                    # Archivo eliminado durante el recorrido
+                    continue
+
+                yield Path(entry.path), size
+
+
+def largest_first(
+    files: Iterable[Tuple[Path, int]],
+    window: Optional[int] = 1000
+) -> Iterator[Path]:
+    """
+    Reordena los archivos para empezar por los mas grandes.
+
+    Mantiene una ventana de hasta ``window`` archivos y entrega siempre
+    el mayor de ella, asi el primer archivo sale sin esperar a que
+    termine el recorrido. Con ``window=None`` se ordena todo el lote y
+    con ``window=0`` se conserva el orden de recorrido.
+
+    Args:
+        files: Tuplas (ruta, tamano).
+        window: Tamano de la ventana de reordenamiento.
+
+    Yields:
+        Rutas de archivos.
+    """
+    if window == 0:
+        for path, _ in files:
+            yield path
+        return
+
+    heap = []
+
+    # El contador desempata tamanos iguales sin comparar rutas
+    for counter, (path, size) in enumerate(files):
+        heapq.heappush(heap, (-size, counter, path))
+        if window is not None and len(heap) > window:
+            yield heapq.heappop(heap)[2]
+
+    while heap:
+        yield heapq.heappop(heap)[2]
@@ -9,6 +9,7 @@ from .csv_exporter import CSVExporter
 from .json_exporter import JSONExporter
 from .gsheet_exporter import GSheetExporter
 from .excel_exporter import ExcelExporter
+from .row_index import RowIndex, read_page
 
 
 __all__ = [
@@ -16,5 +17,7 @@ __all__ = [
     "JSONExporter",
     "GSheetExporter",
     "ExcelExporter",
+    "RowIndex",
+    "read_page",
 ]
 
@@ -12,6 +12,8 @@ from typing import Any, Dict, List, Optional, Union
 
 from loguru import logger
 
+from .row_index import CountingWriter, RowIndex, RowIndexWriter, index_path_for
+
 
 class CSVExporter:
     """
@@ -22,6 +24,7 @@ class CSVExporter:
     - Encoding configurable
     - Headers automaticos
     - Manejo de valores especiales
+    - Indice de offsets por fila para previsualizacion paginada
     """
     
     def __init__(self, config: Optional[Dict[str, Any]] = None):
@@ -36,6 +39,7 @@ class CSVExporter:
         self.delimiter = self.config.get("delimiter", ",")
         self.encoding = self.config.get("encoding", "utf-8")
         self.include_header = self.config.get("include_header", True)
+        self.row_index = self.config.get("row_index", True)
         
         # Configuracion de quoting
         quoting_map = {
@@ -80,8 +84,19 @@ class CSVExporter:
         if not self.config.get("include_internal_fields", False):
             headers = [h for h in headers if not h.startswith("_")]
         
+        index = None
+        if self.row_index:
+            index = RowIndexWriter(
+                output_file,
+                "csv",
+                columns=headers,
+                encoding=self.encoding,
+                delimiter=self.delimiter
+            )
+        
         try:
-            with open(output_file, 'w', newline='', encoding=self.encoding) as f:
+            with open(output_file, 'wb') as raw:
+                f = CountingWriter(raw, self.encoding)
                 writer = csv.DictWriter(
                     f,
                     fieldnames=headers,
@@ -96,7 +111,13 @@ class CSVExporter:
                 for row in data:
                     # Convertir valores especiales
                     clean_row = self._clean_row(row, headers)
+                    start = f.position
                     writer.writerow(clean_row)
+                    if index:
+                        index.add(start, f.position)
+            
+            if index:
+                index.save()
             
             logger.info(f"CSV exportado: {output_file} ({len(data)} filas)")
             return output_file
@@ -105,6 +126,80 @@ class CSVExporter:
             logger.error(f"Error exportando CSV: {e}")
             raise
     
+    def append(
+        self,
+        data: List[Dict[str, Any]],
+        output_dir: Union[str, Path],
+        base_name: str
+    ) -> Optional[Path]:
+        """
+        Agrega filas al final de un CSV exportado antes.
+        
+        Las filas se escriben con las columnas del archivo existente; el
+        indice de filas se extiende si estaba al dia.
+        
+        Args:
+            data: Filas a agregar.
+            output_dir: Directorio de salida.
+            base_name: Nombre base del archivo (sin extension).
+            
+        Returns:
+            Ruta al archivo, o None si no existe o las filas traen columnas
+            que el archivo no tiene (hay que exportar todo de nuevo).
+        """
+        output_file = Path(output_dir) / f"{base_name}.csv"
+        
+        if not output_file.exists():
+            return None
+        
+        columns = self._existing_columns(output_file)
+        headers = self._get_all_headers(data)
+        if not self.config.get("include_internal_fields", False):
+            headers = [h for h in headers if not h.startswith("_")]
+        
+        if columns is None or any(h not in columns for h in headers):
+            return None
+        
+        if not data:
+            return output_file
+        
+        index = RowIndexWriter.resume(output_file) if self.row_index else None
+        
+        with open(output_file, 'ab') as raw:
+            f = CountingWriter(raw, self.encoding, position=raw.tell())
+            writer = csv.DictWriter(
+                f,
+                fieldnames=columns,
+                delimiter=self.delimiter,
+                quoting=self.quoting,
+                extrasaction='ignore'
+            )
+            
+            for row in data:
+                clean_row = self._clean_row(row, columns)
+                start = f.position
+                writer.writerow(clean_row)
+                if index:
+                    index.add(start, f.position)
+        
+        if index:
+            index.save()
+        else:
+            # Un indice que no cubre las filas nuevas ya no sirve
+            index_path_for(output_file).unlink(missing_ok=True)
+        
+        logger.info(f"CSV: agregadas {len(data)} filas a {output_file}")
+        return output_file
+    
+    def _existing_columns(self, output_file: Path) -> Optional[List[str]]:
+        """Columnas de un CSV existente (header o indice), o None si no se conocen."""
+        if self.include_header:
+            with open(output_file, 'r', encoding=self.encoding, newline='') as f:
+                return next(csv.reader(f, delimiter=self.delimiter), None)
+        
+        index = RowIndex.open(output_file)
+        return index.columns if index and index.columns else None
+    
     def _get_all_headers(self, data: List[Dict[str, Any]]) -> List[str]:
         """
         Obtiene la lista de todos los headers presentes en los datos.
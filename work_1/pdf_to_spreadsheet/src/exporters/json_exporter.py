@@ -8,10 +8,12 @@ Exporta datos a formato JSON.
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from loguru import logger
 
+from .row_index import CountingWriter, RowIndexWriter, index_path_for
+
 
 class JSONExporter:
     """
@@ -21,6 +23,7 @@ class JSONExporter:
     - Indentacion configurable
     - Diferentes orientaciones (records, columns)
     - Manejo de tipos especiales (datetime, bytes)
+    - Indice de offsets por registro (orient=records) para previsualizacion
     """
     
     def __init__(self, config: Optional[Dict[str, Any]] = None):
@@ -35,6 +38,7 @@ class JSONExporter:
         self.indent = self.config.get("indent", 2)
         self.ensure_ascii = self.config.get("ensure_ascii", False)
         self.orient = self.config.get("orient", "records")  # records, index, columns
+        self.row_index = self.config.get("row_index", True)
     
     def export(
         self,
@@ -88,14 +92,17 @@ class JSONExporter:
             output_data = data
         
         try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(
-                    output_data,
-                    f,
-                    indent=self.indent,
-                    ensure_ascii=self.ensure_ascii,
-                    default=self._json_serializer
-                )
+            if self.orient == "records" and self.row_index:
+                self._write_indexed_records(output_data, output_file)
+            else:
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    json.dump(
+                        output_data,
+                        f,
+                        indent=self.indent,
+                        ensure_ascii=self.ensure_ascii,
+                        default=self._json_serializer
+                    )
             
             logger.info(f"JSON exportado: {output_file} ({len(data)} registros)")
             return output_file
@@ -104,6 +111,135 @@ class JSONExporter:
             logger.error(f"Error exportando JSON: {e}")
             raise
     
+    def _write_indexed_records(self, records: List[Dict[str, Any]], output_file: Path) -> None:
+        """
+        Escribe la lista de registros registrando el offset de cada uno.
+        
+        El resultado es identico al de ``json.dump`` con la misma
+        indentacion; cada registro se serializa por separado para
+        conocer sus limites en bytes.
+        
+        Args:
+            records: Registros a escribir.
+            output_file: Archivo de salida.
+        """
+        index = RowIndexWriter(output_file, "json", encoding="utf-8")
+        prefix, separator, closing = self._records_layout()
+        
+        with open(output_file, 'wb') as raw:
+            f = CountingWriter(raw, "utf-8")
+            f.write(prefix)
+            
+            for i, record in enumerate(records):
+                if i:
+                    f.write(separator)
+                
+                start = f.position
+                f.write(self._record_text(record))
+                index.add(start, f.position)
+            
+            f.write(closing)
+        
+        index.save()
+    
+    def append(
+        self,
+        data: List[Dict[str, Any]],
+        output_dir: Union[str, Path],
+        base_name: str
+    ) -> Optional[Path]:
+        """
+        Agrega registros al final de un JSON (orient=records) exportado antes.
+        
+        El cierre de la lista se reemplaza por los registros nuevos: el
+        resultado es el mismo que exportar todo junto. El indice de filas
+        se extiende si estaba al dia.
+        
+        Args:
+            data: Registros a agregar.
+            output_dir: Directorio de salida.
+            base_name: Nombre base del archivo (sin extension).
+            
+        Returns:
+            Ruta al archivo, o None si no existe, esta vacio o no tiene
+            el formato de esta configuracion (hay que exportar todo de nuevo).
+        """
+        output_file = Path(output_dir) / f"{base_name}.json"
+        
+        if self.orient != "records" or not output_file.exists():
+            return None
+        
+        prefix, separator, closing = self._records_layout()
+        closing_bytes = closing.encode("utf-8")
+        size = output_file.stat().st_size
+        
+        # Una lista vacia ("[]") o con otra indentacion se reescribe completa
+        if size <= len(prefix) + len(closing_bytes):
+            return None
+        with open(output_file, 'rb') as f:
+            f.seek(size - len(closing_bytes))
+            if f.read() != closing_bytes:
+                return None
+        
+        if not data:
+            return output_file
+        
+        if not self.config.get("include_internal_fields", False):
+            data = [
+                {k: v for k, v in row.items() if not k.startswith("_")}
+                for row in data
+            ]
+        
+        index = RowIndexWriter.resume(output_file) if self.row_index else None
+        
+        with open(output_file, 'r+b') as raw:
+            raw.seek(size - len(closing_bytes))
+            raw.truncate()
+            f = CountingWriter(raw, "utf-8", position=raw.tell())
+            
+            for record in data:
+                f.write(separator)
+                start = f.position
+                f.write(self._record_text(record))
+                if index:
+                    index.add(start, f.position)
+            
+            f.write(closing)
+        
+        if index:
+            index.save()
+        else:
+            # Un indice que no cubre los registros nuevos ya no sirve
+            index_path_for(output_file).unlink(missing_ok=True)
+        
+        logger.info(f"JSON: agregados {len(data)} registros a {output_file}")
+        return output_file
+    
+    def _records_layout(self) -> Tuple[str, str, str]:
+        """Apertura, separador y cierre de la lista de registros (como ``json.dump``)."""
+        if self.indent is None:
+            return "[", ", ", "]"
+        
+        pad = self._pad()
+        return "[\n" + pad, ",\n" + pad, "\n]"
+    
+    def _pad(self) -> str:
+        """Indentacion de un nivel."""
+        return " " * self.indent if isinstance(self.indent, int) else self.indent
+    
+    def _record_text(self, record: Dict[str, Any]) -> str:
+        """Serializa un registro anidado un nivel dentro de la lista."""
+        text = json.dumps(
+            record,
+            indent=self.indent,
+            ensure_ascii=self.ensure_ascii,
+            default=self._json_serializer
+        )
+        if self.indent is not None:
+            # Anidar un nivel: las lineas internas llevan un pad extra
+            text = text.replace("\n", "\n" + self._pad())
+        return text
+    
     def _to_columns(self, data: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
         """
         Convierte lista de diccionarios a formato columnar.
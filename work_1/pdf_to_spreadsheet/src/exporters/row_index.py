@@ -0,0 +1,327 @@
+"""
+Row Index
+=========
+
+Indice de offsets por fila para leer paginas de un archivo exportado
+sin recorrerlo completo.
+
+El indice se guarda junto al archivo (``<archivo>.idx``): una primera
+linea JSON con metadatos (formato, columnas, encoding, total de filas)
+seguida de pares ``(inicio, fin)`` en bytes por fila como enteros
+``uint64`` little-endian. Leer la pagina ``[offset, offset + limit)``
+cuesta O(limit): un seek en el indice y uno en el archivo de datos.
+"""
+
+import codecs
+import csv
+import io
+import itertools
+import json
+import struct
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Union
+
+from loguru import logger
+
+
+INDEX_SUFFIX = ".idx"
+INDEX_VERSION = 1
+
+_ENTRY = struct.Struct("<QQ")
+
+
+def index_path_for(data_file: Union[str, Path]) -> Path:
+    """Ruta del indice asociado a un archivo exportado."""
+    data_file = Path(data_file)
+    return data_file.with_name(data_file.name + INDEX_SUFFIX)
+
+
+class RowIndexWriter:
+    """
+    Acumula los offsets de cada fila mientras el exportador escribe.
+    """
+
+    def __init__(self, data_file: Union[str, Path], file_format: str, **metadata: Any):
+        """
+        Inicializa el escritor.
+
+        Args:
+            data_file: Archivo de datos que se esta escribiendo.
+            file_format: Formato del archivo (csv, json).
+            **metadata: Metadatos extra (columns, encoding, delimiter...).
+        """
+        self.data_file = Path(data_file)
+        self.file_format = file_format
+        self.metadata = metadata
+
+        self._entries = bytearray()
+        self._rows = 0
+
+    @classmethod
+    def resume(cls, data_file: Union[str, Path]) -> Optional["RowIndexWriter"]:
+        """
+        Continua el indice de un archivo al que se van a agregar filas.
+
+        Args:
+            data_file: Archivo de datos, antes de agregarle filas.
+
+        Returns:
+            Escritor con las filas ya indexadas (``save`` reescribe el
+            indice completo), o None si el archivo no tiene un indice al dia.
+        """
+        index = RowIndex.open(data_file)
+        if index is None:
+            return None
+
+        metadata = {
+            key: value for key, value in index.header.items()
+            if key not in ("version", "format", "rows", "data_size")
+        }
+        writer = cls(data_file, index.header["format"], **metadata)
+
+        with open(index.index_file, "rb") as f:
+            f.seek(index._entries_start)
+            writer._entries = bytearray(f.read())
+        writer._rows = index.total_rows
+
+        return writer
+
+    def add(self, start: int, end: int) -> None:
+        """
+        Registra una fila.
+
+        Args:
+            start: Byte donde empieza la fila.
+            end: Byte donde termina la fila (exclusivo).
+        """
+        self._entries += _ENTRY.pack(start, end)
+        self._rows += 1
+
+    def save(self) -> Path:
+        """
+        Escribe el indice junto al archivo de datos.
+
+        Returns:
+            Ruta del indice.
+        """
+        header = {
+            "version": INDEX_VERSION,
+            "format": self.file_format,
+            "rows": self._rows,
+            "data_size": self.data_file.stat().st_size,
+            **self.metadata
+        }
+
+        index_file = index_path_for(self.data_file)
+        with open(index_file, "wb") as f:
+            f.write(json.dumps(header).encode("utf-8") + b"\n")
+            f.write(self._entries)
+
+        return index_file
+
+
+class RowIndex:
+    """
+    Lector de paginas de un archivo exportado usando su indice.
+    """
+
+    def __init__(self, data_file: Union[str, Path]):
+        """
+        Abre el indice de un archivo exportado.
+
+        Args:
+            data_file: Archivo de datos (CSV o JSON).
+
+        Raises:
+            FileNotFoundError: Si el archivo no tiene indice.
+            ValueError: Si el indice esta desactualizado o es invalido.
+        """
+        self.data_file = Path(data_file)
+        self.index_file = index_path_for(self.data_file)
+
+        with open(self.index_file, "rb") as f:
+            self.header = json.loads(f.readline())
+            self._entries_start = f.tell()
+
+        if self.header.get("version") != INDEX_VERSION:
+            raise ValueError(f"Version de indice no soportada: {self.index_file}")
+
+        if self.header.get("data_size") != self.data_file.stat().st_size:
+            raise ValueError(f"Indice desactualizado: {self.index_file}")
+
+    @classmethod
+    def open(cls, data_file: Union[str, Path]) -> Optional["RowIndex"]:
+        """
+        Abre el indice si existe y es valido.
+
+        Returns:
+            RowIndex o None si no hay indice utilizable.
+        """
+        try:
+            return cls(data_file)
+        except FileNotFoundError:
+            return None
+        except (ValueError, OSError) as e:
+            logger.warning(f"Indice ignorado: {e}")
+            return None
+
+    @property
+    def total_rows(self) -> int:
+        """Cantidad de filas indexadas."""
+        return self.header["rows"]
+
+    @property
+    def columns(self) -> List[str]:
+        """Columnas conocidas del archivo (puede estar vacio)."""
+        return self.header.get("columns", [])
+
+    def read_rows(
+        self,
+        offset: int = 0,
+        limit: int = 20,
+        columns: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Lee una pagina de filas.
+
+        Args:
+            offset: Indice de la primera fila.
+            limit: Cantidad maxima de filas.
+            columns: Columnas a incluir (None = todas).
+
+        Returns:
+            Lista de filas como diccionarios.
+        """
+        offset = max(offset, 0)
+        limit = max(min(limit, self.total_rows - offset), 0)
+        if limit == 0:
+            return []
+
+        with open(self.index_file, "rb") as f:
+            f.seek(self._entries_start + offset * _ENTRY.size)
+            entries = list(_ENTRY.iter_unpack(f.read(limit * _ENTRY.size)))
+
+        start = entries[0][0]
+        end = entries[-1][1]
+
+        with open(self.data_file, "rb") as f:
+            f.seek(start)
+            chunk = f.read(end - start)
+
+        rows = [
+            self._decode_row(chunk[row_start - start:row_end - start])
+            for row_start, row_end in entries
+        ]
+
+        if columns:
+            rows = [{column: row.get(column) for column in columns} for row in rows]
+
+        return rows
+
+    def _decode_row(self, raw: bytes) -> Dict[str, Any]:
+        """Decodifica los bytes de una fila segun el formato."""
+        encoding = self.header.get("encoding", "utf-8")
+
+        if self.header["format"] == "csv":
+            reader = csv.reader(
+                io.StringIO(raw.decode(encoding)),
+                delimiter=self.header.get("delimiter", ",")
+            )
+            values = next(reader, [])
+            return dict(zip(self.columns, values))
+
+        return json.loads(raw.decode(encoding))
+
+
+def read_page(
+    data_file: Union[str, Path],
+    offset: int = 0,
+    limit: int = 20,
+    columns: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Lee una pagina de un archivo exportado, usando el indice si existe.
+
+    Sin indice (archivos anteriores o exportados con ``row_index: false``)
+    el CSV se recorre en streaming hasta ``offset + limit`` y el JSON se
+    carga completo.
+
+    Args:
+        data_file: Archivo CSV o JSON exportado.
+        offset: Indice de la primera fila.
+        limit: Cantidad maxima de filas.
+        columns: Columnas a incluir (None = todas).
+
+    Returns:
+        Diccionario con ``rows``, ``columns`` y ``total_rows`` (None si
+        no se conoce sin leer el archivo completo).
+    """
+    data_file = Path(data_file)
+    offset = max(offset, 0)
+    limit = max(limit, 0)
+
+    index = RowIndex.open(data_file)
+    if index is not None:
+        return {
+            "rows": index.read_rows(offset, limit, columns),
+            "columns": columns or index.columns,
+            "total_rows": index.total_rows
+        }
+
+    if data_file.suffix.lower() == ".csv":
+        with open(data_file, "r", encoding="utf-8", newline="") as f:
+            reader = csv.DictReader(f)
+            rows = list(itertools.islice(reader, offset, offset + limit))
+            all_columns = reader.fieldnames or []
+        total_rows = None
+    else:
+        with open(data_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            # orient=index -> {i: registro}; orient=columns -> un solo objeto
+            data = list(data.values()) if all(isinstance(v, dict) for v in data.values()) else [data]
+        rows = data[offset:offset + limit]
+        all_columns = list(rows[0].keys()) if rows and isinstance(rows[0], dict) else []
+        total_rows = len(data)
+
+    if columns:
+        rows = [{column: row.get(column) for column in columns} for row in rows]
+
+    return {
+        "rows": rows,
+        "columns": columns or all_columns,
+        "total_rows": total_rows
+    }
+
+
+class CountingWriter:
+    """
+    Envoltorio de un archivo binario que lleva la posicion en bytes.
+
+    Se usa como destino de ``csv.writer``/``json``: codifica el texto
+    (un BOM, si el encoding lo tiene, se escribe una sola vez) y evita
+    llamar a ``tell()`` en cada fila.
+    """
+
+    def __init__(self, raw: BinaryIO, encoding: str = "utf-8", position: int = 0):
+        """
+        Args:
+            raw: Archivo abierto en modo binario.
+            encoding: Encoding del texto escrito.
+            position: Bytes ya escritos (al agregar a un archivo existente,
+                cuyo BOM no se repite).
+        """
+        self.raw = raw
+        self.position = position
+
+        self._encoder = codecs.getincrementalencoder(encoding)()
+        if position:
+            # Estado "BOM ya escrito" de los encoders que lo emiten
+            self._encoder.setstate(0)
+
+    def write(self, text: str) -> int:
+        """Escribe texto y avanza la posicion."""
+        data = self._encoder.encode(text)
+        self.raw.write(data)
+        self.position += len(data)
+        return len(text)
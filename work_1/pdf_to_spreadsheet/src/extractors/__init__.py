@@ -8,10 +8,17 @@ Motores de extraccion de datos de PDFs.
 from .text_extractor import TextExtractor
 from .table_extractor import TableExtractor
 from .ocr_extractor import OCRExtractor
+from .layout import TemplateStore, fingerprint_page
+from .page_analyzer import PageAnalyzer
+from .document import ExtractedDocument
 
 
 __all__ = [
     "TextExtractor",
     "TableExtractor", 
     "OCRExtractor",
+    "TemplateStore",
+    "fingerprint_page",
+    "PageAnalyzer",
+    "ExtractedDocument",
 ]
@@ -0,0 +1,313 @@
+"""
+Extracted Document
+==================
+
+Resultado de extraccion perezoso con interfaz de diccionario.
+
+``text``, ``tables``, ``pages`` y ``words`` se calculan la primera vez
+que se consultan y se memorizan: un PDF cuyo texto no tiene datos no
+busca tablas hasta que alguien las pide, y las cajas de palabras solo
+se arman para las paginas que un parser consulta. Los parsers existentes
+siguen usando ``extracted["text"]`` o ``extracted.get("tables", [])``.
+
+El PDF queda abierto (con las paginas ya analizadas) hasta que se
+calculan las tablas o se llama a ``close()``.
+"""
+
+from collections.abc import Mapping
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, ContextManager, Dict, Iterator, List, Optional, Tuple, Union
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from .page_analyzer import AnalyzedPage, PageAnalyzer
+
+
+# Avance por pagina: (paginas procesadas, total de paginas)
+ProgressCallback = Callable[[int, int], None]
+
+# Contexto de una etapa ("extract_text", "extract_tables"): entrega el
+# callback de avance por pagina y al salir restaura la etapa anterior
+StageScope = Callable[[str], ContextManager[Optional[ProgressCallback]]]
+
+# Palabra compacta: (texto, x0, top, x1, bottom)
+RawWord = Tuple[str, float, float, float, float]
+
+
+@contextmanager
+def _no_stage(stage: str) -> Iterator[None]:
+    yield None
+
+
+class DocumentPages:
+    """
+    Cajas de palabras por pagina, armadas al consultar cada pagina.
+
+    Se comporta como una lista de diccionarios con ``number``, ``width``,
+    ``height`` y ``words`` (``text``, ``x0``, ``top``, ``x1``, ``bottom``).
+    """
+
+    def __init__(self, sizes: List[Tuple[float, float]], words: List[List[RawWord]]):
+        self._sizes = sizes
+        self._words = words
+        self._boxes: Dict[int, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("pagina fuera de rango")
+
+        if index not in self._boxes:
+            width, height = self._sizes[index]
+            self._boxes[index] = {
+                "number": index + 1,
+                "width": width,
+                "height": height,
+                "words": [
+                    {"text": text, "x0": x0, "top": top, "x1": x1, "bottom": bottom}
+                    for text, x0, top, x1, bottom in self._words[index]
+                ]
+            }
+        return self._boxes[index]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __eq__(self, other: Any) -> bool:
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return f"<DocumentPages {len(self)} paginas>"
+
+
+class ExtractedDocument(Mapping):
+    """
+    Datos extraidos de un PDF, calculados bajo demanda.
+
+    Claves (y propiedades): ``text``, ``tables``, ``pages``, ``words`` y
+    ``metadata``. Asignar una clave (p.ej. ``text`` tras OCR) reemplaza
+    el valor calculado.
+    """
+
+    KEYS = ("text", "tables", "pages", "words", "metadata")
+
+    def __init__(
+        self,
+        file_path: Union[str, Path],
+        analyzer: "PageAnalyzer",
+        extract_tables: bool = True,
+        stage_scope: Optional[StageScope] = None,
+        needs: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Prepara el documento sin leer el PDF.
+
+        Args:
+            file_path: Ruta al archivo PDF.
+            analyzer: Analizador con los extractores y ``max_pages``.
+            extract_tables: Buscar tablas al consultarlas.
+            stage_scope: Contexto de cada etapa calculada (tiempos y
+                progreso).
+            needs: Necesidades del parser (``max_pages``, ``tables``,
+                ``stop_when``).
+        """
+        self.file_path = Path(file_path)
+        self.metadata: Dict[str, Any] = {
+            "file_name": self.file_path.name,
+            "extraction_method": "text"
+        }
+
+        self._analyzer = analyzer
+        self._stage_scope = stage_scope or _no_stage
+        self._needs = needs or {}
+        self._extract_tables = extract_tables and self._needs.get("tables", True)
+
+        self._pdf: Any = None
+        self._analyzed: Optional[List["AnalyzedPage"]] = None
+
+        self._text: Optional[str] = None
+        self._tables: Optional[List[List[List[Any]]]] = None
+        self._pages: Optional[DocumentPages] = None
+        self._words: Optional[List[Dict[str, Any]]] = None
+
+    # -- Interfaz de diccionario ------------------------------------------
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key == "text":
+            self._text = value
+        elif key == "tables":
+            self._tables = value
+        elif key == "metadata":
+            self.metadata = value
+        else:
+            raise KeyError(f"No se puede reemplazar '{key}'")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.KEYS)
+
+    def __len__(self) -> int:
+        return len(self.KEYS)
+
+    def __repr__(self) -> str:
+        computed = [name for name in ("text", "tables") if getattr(self, f"_{name}") is not None]
+        return f"<ExtractedDocument {self.file_path.name} calculado={computed}>"
+
+    # -- Propiedades perezosas --------------------------------------------
+
+    @property
+    def text(self) -> str:
+        """Texto del documento (lee las paginas la primera vez)."""
+        if self._text is None:
+            self._read_pages()
+        return self._text
+
+    @property
+    def tables(self) -> List[List[List[Any]]]:
+        """Tablas del documento (las busca la primera vez)."""
+        if self._tables is None:
+            self._find_tables()
+        return self._tables
+
+    @property
+    def pages(self) -> DocumentPages:
+        """Cajas de palabras por pagina (vacio si no se uso pdfplumber)."""
+        if self._pages is None:
+            self._read_pages()
+        return self._pages
+
+    @property
+    def words(self) -> List[Dict[str, Any]]:
+        """Todas las cajas de palabras, cada una con su ``page``."""
+        if self._words is None:
+            self._words = [
+                dict(word, page=page["number"])
+                for page in self.pages
+                for word in page["words"]
+            ]
+        return self._words
+
+    # -- Calculo ----------------------------------------------------------
+
+    def _read_pages(self) -> None:
+        """Lee las paginas necesarias: texto y palabras."""
+        analyzer = self._analyzer
+        sizes: List[Tuple[float, float]] = []
+        words: List[List[RawWord]] = []
+        text = ""
+
+        with self._stage_scope("extract_text") as on_page:
+            self._pdf = analyzer.open(self.file_path)
+
+            if self._pdf is not None:
+                try:
+                    self._analyzed, text = analyzer.read_pages(self._pdf, on_page, self._needs)
+                except Exception as e:
+                    logger.debug(f"Error analizando paginas con pdfplumber: {e}")
+                    self.close()
+                    self._analyzed, text = None, ""
+
+            if self._analyzed:
+                for page in self._analyzed:
+                    sizes.append((round(float(page.width), 2), round(float(page.height), 2)))
+                    words.append([
+                        (
+                            word["text"],
+                            round(float(word["x0"]), 2),
+                            round(float(word["top"]), 2),
+                            round(float(word["x1"]), 2),
+                            round(float(word["bottom"]), 2),
+                        )
+                        for word in page.words
+                    ])
+                self.metadata["pages_read"] = len(self._analyzed)
+                self.metadata["total_pages"] = len(self._pdf.pages)
+
+            if not text.strip():
+                # Sin texto seleccionable (o sin pdfplumber): PyPDF2
+                text = analyzer.text_extractor.extract(self.file_path, None if self._analyzed else on_page)
+
+        self._text = text
+        self._pages = DocumentPages(sizes, words)
+
+        if not self._extract_tables:
+            self.close()
+
+    def _find_tables(self) -> None:
+        """Busca las tablas en las paginas ya leidas."""
+        if not self._extract_tables:
+            self._tables = []
+            return
+
+        if self._text is None:
+            self._read_pages()
+
+        table_extractor = self._analyzer.table_extractor
+
+        with self._stage_scope("extract_tables") as on_page:
+            if self._analyzed:
+                tables = table_extractor.extract(self.file_path, on_page, pdf=self._pdf, pages=self._analyzed)
+            else:
+                tables = table_extractor.extract(self.file_path, on_page)
+
+        self._tables = tables
+        self.metadata["table_strategy"] = table_extractor.last_strategy
+        self.metadata["layout_template"] = table_extractor.last_template
+        self.metadata["table_pages_skipped"] = table_extractor.last_skipped_pages
+        if tables:
+            self.metadata["extraction_method"] = "tables"
+
+        self.close()
+
+    def materialize(self) -> "ExtractedDocument":
+        """
+        Calcula texto y tablas ahora y cierra el PDF.
+
+        Necesario antes de enviar el documento a otro proceso (ver
+        ``src.isolation``): las cajas de palabras viajan compactas y se
+        arman alla al consultarlas.
+
+        Returns:
+            El mismo documento.
+        """
+        self.text
+        self.tables
+        return self
+
+    def close(self) -> None:
+        """Cierra el PDF y suelta las paginas analizadas (idempotente)."""
+        if self._pdf is not None:
+            try:
+                self._pdf.close()
+            except Exception as e:
+                logger.debug(f"Error cerrando {self.file_path.name}: {e}")
+        self._pdf = None
+        self._analyzed = None
+
+    def __enter__(self) -> "ExtractedDocument":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        self.materialize()
+        state = self.__dict__.copy()
+        state["_analyzer"] = None
+        state["_stage_scope"] = _no_stage
+        state["_needs"] = {}
+        return state
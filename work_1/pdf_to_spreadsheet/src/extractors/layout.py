@@ -0,0 +1,213 @@
+"""
+Layout Templates
+================
+
+Huella de diseno de un PDF y almacen de plantillas aprendidas.
+
+La huella se calcula con el texto estatico de la primera pagina: las
+etiquetas ("Numero de Factura:", "RFC:") de la mitad superior, las
+palabras sin digitos y las lineas horizontales largas del encabezado
+(logo, razon social, separadores), con posiciones redondeadas a una
+rejilla. Los valores (folios, fechas, montos) y los bordes de las tablas
+(su ancho depende del contenido) no entran, asi que todas las facturas
+de un mismo proveedor comparten huella.
+
+Cada plantilla guarda, por pagina, la estrategia de deteccion y las
+regiones donde se encontraron tablas. Con una plantilla conocida la
+deteccion de tablas empieza por esas regiones (``page.within_bbox``).
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from loguru import logger
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+
+# Rejilla (en puntos) para redondear posiciones
+GRID = 6.0
+
+# Fraccion superior de la pagina considerada encabezado
+HEADER_RATIO = 0.15
+
+# Las etiquetas debajo de esta fraccion se mueven con el largo de las tablas
+LABEL_RATIO = 0.5
+
+# Elementos estaticos minimos para confiar en una huella
+MIN_TOKENS = 3
+
+
+def _snap(value: Any) -> int:
+    return int(round(float(value) / GRID))
+
+
+def _has_digit(text: str) -> bool:
+    return any(ch.isdigit() for ch in text)
+
+
+def fingerprint_page(page: Any, words: Optional[List[Dict[str, Any]]] = None) -> Optional[str]:
+    """
+    Calcula la huella de diseno de una pagina.
+
+    Args:
+        page: Pagina de pdfplumber (normalmente la primera).
+        words: Palabras de ``page.extract_words()`` si ya se tienen.
+
+    Returns:
+        Huella hexadecimal o None si la pagina tiene muy poco texto
+        estatico (p.ej. escaneada).
+    """
+    if words is None:
+        words = page.extract_words()
+
+    width = float(page.width)
+    height = float(page.height)
+    tokens = set()
+
+    for word in words:
+        text = word["text"]
+        top = float(word["top"])
+
+        is_label = text.endswith(":") and top < height * LABEL_RATIO
+        is_header = top < height * HEADER_RATIO and not _has_digit(text)
+
+        if is_label or is_header:
+            tokens.add(f"w:{text.lower()}@{_snap(word['x0'])},{_snap(top)}")
+
+    if len(tokens) < MIN_TOKENS:
+        return None
+
+    for edge in list(page.lines) + list(page.rects):
+        top = float(edge["top"])
+        if top < height * HEADER_RATIO and float(edge["x1"]) - float(edge["x0"]) > width / 3:
+            tokens.add(f"h:{_snap(edge['x0'])},{_snap(top)},{_snap(edge['x1'])}")
+
+    payload = f"{round(width)}x{round(height)}|" + "|".join(sorted(tokens))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class TemplateStore:
+    """
+    Plantillas de diseno por huella, respaldadas por un archivo JSON.
+
+    El archivo se relee cuando cambia (otro proceso o el subproceso de
+    extraccion aprendio una plantilla) y se reescribe de forma atomica.
+    ``add`` relee y reescribe bajo un bloqueo de archivo (``<store>.lock``,
+    con ``fcntl``), asi los procesos de un pool no pierden las plantillas
+    que agregan los demas; sin ``fcntl`` solo se bloquea entre hilos.
+    """
+
+    def __init__(self, store_path: Union[str, Path]):
+        """
+        Carga el almacen existente.
+
+        Args:
+            store_path: Ruta del archivo JSON.
+        """
+        self.store_path = Path(store_path)
+        self.lock_path = self.store_path.with_name(self.store_path.name + ".lock")
+
+        self._lock = threading.Lock()
+        self._templates: Dict[str, Dict[str, Any]] = {}
+        self._mtime_ns: Optional[int] = None
+
+        self._refresh()
+
+    def _refresh(self, force: bool = False) -> None:
+        """
+        Relee el archivo si cambio desde la ultima lectura.
+
+        Args:
+            force: Releer aunque el mtime no cambie (dos escrituras en el
+                mismo tick del reloj del sistema de archivos).
+        """
+        try:
+            mtime_ns = self.store_path.stat().st_mtime_ns
+        except OSError:
+            return
+
+        if mtime_ns == self._mtime_ns and not force:
+            return
+
+        try:
+            with open(self.store_path, "r", encoding="utf-8") as f:
+                self._templates = json.load(f)
+            self._mtime_ns = mtime_ns
+        except (OSError, ValueError) as e:
+            logger.warning(f"No se pudo leer el almacen de plantillas {self.store_path}: {e}")
+
+    def get(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """
+        Obtiene la plantilla de una huella.
+
+        Args:
+            fingerprint: Huella de ``fingerprint_page``.
+
+        Returns:
+            Plantilla o None si no se conoce.
+        """
+        with self._lock:
+            self._refresh()
+            return self._templates.get(fingerprint)
+
+    def add(self, fingerprint: str, template: Dict[str, Any]) -> None:
+        """
+        Guarda (o reemplaza) la plantilla de una huella.
+
+        Args:
+            fingerprint: Huella de ``fingerprint_page``.
+            template: Plantilla con ``pages``.
+        """
+        with self._lock, self._file_lock():
+            self._refresh(force=True)
+            self._templates[fingerprint] = dict(template, learned_at=datetime.now().isoformat())
+            self._write()
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Bloqueo exclusivo entre procesos para leer, modificar y escribir."""
+        if not FCNTL_AVAILABLE:
+            yield
+            return
+
+        self.store_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _write(self) -> None:
+        """Reescribe el archivo de forma atomica."""
+        self.store_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.store_path.parent, suffix=".tmp")
+
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._templates, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.store_path)
+            self._mtime_ns = self.store_path.stat().st_mtime_ns
+        except OSError as e:
+            logger.warning(f"No se pudo guardar el almacen de plantillas {self.store_path}: {e}")
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._templates)
@@ -6,7 +6,7 @@ Extrae texto de PDFs escaneados usando OCR (Tesseract).
 """
 
 from pathlib import Path
-from typing import Optional, Union
+from typing import Callable, Optional, Union
 
 from loguru import logger
 
@@ -84,12 +84,18 @@ class OCRExtractor:
         """Indica si el OCR esta disponible."""
         return TESSERACT_AVAILABLE and PDF2IMAGE_AVAILABLE
     
-    def extract(self, file_path: Union[str, Path]) -> str:
+    def extract(
+        self,
+        file_path: Union[str, Path],
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> str:
         """
         Extrae texto de un PDF usando OCR.
         
         Args:
             file_path: Ruta al archivo PDF.
+            progress_callback: Funcion opcional llamada con
+                (paginas procesadas, total de paginas).
             
         Returns:
             Texto extraido por OCR.
@@ -104,17 +110,21 @@ class OCRExtractor:
             raise FileNotFoundError(f"Archivo no encontrado: {file_path}")
         
         try:
-            return self._extract_with_pdf2image(file_path)
+            return self._extract_with_pdf2image(file_path, progress_callback)
         except Exception as e:
             logger.error(f"Error en OCR: {e}")
             
             # Fallback: intentar renderizar con pdfplumber
             if PDFPLUMBER_AVAILABLE:
-                return self._extract_with_pdfplumber_render(file_path)
+                return self._extract_with_pdfplumber_render(file_path, progress_callback)
             
             return ""
     
-    def _extract_with_pdf2image(self, file_path: Path) -> str:
+    def _extract_with_pdf2image(
+        self,
+        file_path: Path,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> str:
         """Extrae texto convirtiendo PDF a imagenes con pdf2image."""
         text_parts = []
         
@@ -142,6 +152,9 @@ class OCRExtractor:
                 if page_text and page_text.strip():
                     text_parts.append(page_text)
                 
+                if progress_callback:
+                    progress_callback(i + 1, len(images))
+                
                 if (i + 1) % 5 == 0:
                     logger.debug(f"OCR: {i + 1}/{len(images)} paginas procesadas")
                     
@@ -151,7 +164,11 @@ class OCRExtractor:
         
         return "\n\n".join(text_parts)
     
-    def _extract_with_pdfplumber_render(self, file_path: Path) -> str:
+    def _extract_with_pdfplumber_render(
+        self,
+        file_path: Path,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> str:
         """
         Fallback: renderizar paginas con pdfplumber y aplicar OCR.
         
@@ -180,6 +197,9 @@ class OCRExtractor:
                         
                         if page_text and page_text.strip():
                             text_parts.append(page_text)
+                        
+                        if progress_callback:
+                            progress_callback(i + 1, pages_to_process)
                             
                     except Exception as e:
                         logger.debug(f"Error procesando pagina {i + 1}: {e}")
@@ -0,0 +1,257 @@
+"""
+Page Analyzer
+=============
+
+Analiza cada pagina de un PDF una sola vez para texto, palabras y tablas.
+
+Extraer texto y luego tablas con extractores separados abre el PDF dos
+veces: cada pagina se interpreta (pdfminer) dos veces y las palabras se
+vuelven a agrupar en ``extract_text``, en el prefiltro, en la huella de
+diseno y en la estrategia "text" de deteccion de tablas. Aqui el PDF se
+abre una vez, los caracteres de cada pagina se agrupan en palabras una
+vez y de esa agrupacion salen el texto, las cajas de palabras y las
+tablas (ambas estrategias), con el mismo resultado que los extractores
+por separado.
+
+Con las necesidades del parser (``BaseParser.extraction_needs``) las
+paginas se leen de forma perezosa: solo hasta ``max_pages`` o hasta que
+``stop_when`` acepta el texto leido, y las tablas se buscan solo en esas
+paginas (o en ninguna si el parser no las usa).
+
+``document()`` entrega un ``ExtractedDocument`` que hace cada paso solo
+cuando se consulta su resultado; ``analyze()`` los hace todos de una vez.
+"""
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from loguru import logger
+
+from .document import ExtractedDocument, StageScope
+from .table_extractor import TableExtractor
+from .text_extractor import TextExtractor
+
+try:
+    import pdfplumber
+    from pdfplumber.table import TableFinder, TableSettings
+    from pdfplumber.utils.text import WordExtractor
+    PDFPLUMBER_AVAILABLE = True
+except ImportError:
+    PDFPLUMBER_AVAILABLE = False
+
+
+# Avance por pagina: (paginas procesadas, total de paginas)
+ProgressCallback = Callable[[int, int], None]
+
+# Llamada al iniciar cada etapa ("extract_text", "extract_tables"); retorna
+# el callback de avance por pagina de esa etapa (o None)
+StageCallback = Callable[[str], Optional[ProgressCallback]]
+
+# Tolerancias de ``extract_words()`` y de la estrategia "text" por defecto
+_DEFAULT_WORD_SETTINGS = ({}, {"x_tolerance": 3, "y_tolerance": 3})
+
+
+class AnalyzedPage:
+    """
+    Pagina de pdfplumber con sus palabras agrupadas una sola vez.
+
+    Se comporta como la pagina original (los atributos se delegan), pero
+    ``extract_words()`` con las tolerancias por defecto y ``find_tables``
+    reutilizan las palabras ya agrupadas.
+    """
+
+    def __init__(self, page: Any):
+        """
+        Agrupa los caracteres de la pagina en palabras y renglones.
+
+        Args:
+            page: Pagina de pdfplumber.
+        """
+        self._page = page
+
+        wordmap = WordExtractor().extract_wordmap(page.chars)
+        self.words: List[Dict[str, Any]] = [word for word, _ in wordmap.tuples]
+
+        # Igual que page.extract_text() (que repite la agrupacion)
+        self.text: str = wordmap.to_textmap(
+            layout_bbox=page.bbox,
+            layout_width=page.width,
+            layout_height=page.height,
+            presorted=True
+        ).as_string
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._page, name)
+
+    def extract_words(self, **kwargs: Any) -> List[Dict[str, Any]]:
+        """Palabras de la pagina (las compartidas si no cambian las tolerancias)."""
+        if kwargs in _DEFAULT_WORD_SETTINGS:
+            return self.words
+        return self._page.extract_words(**kwargs)
+
+    def find_tables(self, table_settings: Optional[Dict[str, Any]] = None) -> List[Any]:
+        """Como ``page.find_tables``, pero la estrategia "text" usa las palabras compartidas."""
+        return TableFinder(self, TableSettings.resolve(table_settings)).tables
+
+
+class PageAnalyzer:
+    """
+    Extrae texto, cajas de palabras y tablas en una sola pasada por el PDF.
+
+    Sin pdfplumber, o si el PDF no tiene texto seleccionable, recurre a
+    ``TextExtractor`` (PyPDF2) y ``TableExtractor`` (tabula) como antes.
+    """
+
+    def __init__(
+        self,
+        text_extractor: TextExtractor,
+        table_extractor: TableExtractor,
+        max_pages: int = 100
+    ):
+        """
+        Inicializa el analizador.
+
+        Args:
+            text_extractor: Extractor de texto (respaldo).
+            table_extractor: Extractor de tablas (estrategia, plantillas,
+                prefiltro).
+            max_pages: Numero maximo de paginas a procesar.
+        """
+        self.text_extractor = text_extractor
+        self.table_extractor = table_extractor
+        self.max_pages = max_pages
+
+    def document(
+        self,
+        file_path: Union[str, Path],
+        extract_tables: bool = True,
+        stage_scope: Optional[StageScope] = None,
+        needs: Optional[Dict[str, Any]] = None
+    ) -> ExtractedDocument:
+        """
+        Prepara la extraccion perezosa de un PDF.
+
+        Args:
+            file_path: Ruta al archivo PDF.
+            extract_tables: Buscar tablas al consultarlas.
+            stage_scope: Contexto de cada etapa (ver ``ExtractedDocument``).
+            needs: Necesidades del parser (``max_pages``, ``tables``,
+                ``stop_when``); None lee todas las paginas.
+
+        Returns:
+            Documento sin leer; el PDF se abre al consultar sus datos.
+
+        Raises:
+            FileNotFoundError: Si el archivo no existe.
+            ValueError: Si el archivo no es un PDF.
+        """
+        file_path = Path(file_path)
+
+        if not file_path.exists():
+            raise FileNotFoundError(f"Archivo no encontrado: {file_path}")
+
+        if not file_path.suffix.lower() == ".pdf":
+            raise ValueError(f"El archivo no es un PDF: {file_path}")
+
+        return ExtractedDocument(file_path, self, extract_tables, stage_scope, needs)
+
+    def analyze(
+        self,
+        file_path: Union[str, Path],
+        extract_tables: bool = True,
+        stage_callback: Optional[StageCallback] = None,
+        needs: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Analiza un PDF completo (texto, cajas de palabras y tablas).
+
+        Args:
+            file_path: Ruta al archivo PDF.
+            extract_tables: Buscar tablas ademas del texto.
+            stage_callback: Funcion llamada al iniciar cada etapa.
+            needs: Necesidades del parser (``max_pages``, ``tables``,
+                ``stop_when``); None lee todas las paginas.
+
+        Returns:
+            Diccionario con ``text``, ``tables``, ``pages`` (cajas de
+            palabras por pagina, vacio si no se uso pdfplumber),
+            ``pages_read`` y ``total_pages``.
+
+        Raises:
+            FileNotFoundError: Si el archivo no existe.
+            ValueError: Si el archivo no es un PDF.
+        """
+        @contextmanager
+        def stage_scope(stage: str) -> Iterator[Optional[ProgressCallback]]:
+            yield stage_callback(stage) if stage_callback else None
+
+        with self.document(file_path, extract_tables, stage_scope, needs) as document:
+            document.materialize()
+            return {
+                "text": document.text,
+                "tables": document.tables,
+                "pages": list(document.pages),
+                "pages_read": document.metadata.get("pages_read", 0),
+                "total_pages": document.metadata.get("total_pages", 0)
+            }
+
+    def open(self, file_path: Path) -> Any:
+        """
+        Abre el PDF con pdfplumber.
+
+        Returns:
+            El PDF abierto, o None sin pdfplumber o si no se pudo abrir.
+        """
+        if not PDFPLUMBER_AVAILABLE:
+            return None
+
+        try:
+            return pdfplumber.open(file_path)
+        except Exception as e:
+            logger.debug(f"Error abriendo {file_path.name} con pdfplumber: {e}")
+            return None
+
+    def read_pages(
+        self,
+        pdf: Any,
+        progress_callback: Optional[ProgressCallback] = None,
+        needs: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[AnalyzedPage], str]:
+        """
+        Agrupa las palabras de las paginas necesarias y arma el texto.
+
+        Args:
+            pdf: PDF abierto con pdfplumber.
+            progress_callback: Avance por pagina.
+            needs: Necesidades del parser (``max_pages``, ``stop_when``).
+
+        Returns:
+            Paginas analizadas y texto del documento.
+        """
+        needs = needs or {}
+        pages = []
+        text_parts = []
+        pages_to_process = min(len(pdf.pages), self.max_pages)
+        if needs.get("max_pages"):
+            pages_to_process = min(pages_to_process, needs["max_pages"])
+        stop_when = needs.get("stop_when")
+
+        for i, page in enumerate(pdf.pages[:pages_to_process]):
+            analyzed = AnalyzedPage(page)
+            pages.append(analyzed)
+
+            if analyzed.text:
+                text_parts.append(analyzed.text)
+
+            if progress_callback:
+                progress_callback(i + 1, pages_to_process)
+
+            if (i + 1) % 10 == 0:
+                logger.debug(f"Analizadas {i + 1}/{pages_to_process} paginas")
+
+            if stop_when and i + 1 < pages_to_process and stop_when("\n\n".join(text_parts)):
+                logger.debug(f"El parser no necesita mas paginas: leidas {i + 1}/{len(pdf.pages)}")
+                break
+
+        return pages, "\n\n".join(text_parts)
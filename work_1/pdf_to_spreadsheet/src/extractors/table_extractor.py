@@ -5,11 +5,15 @@ Table Extractor
 Extrae tablas estructuradas de documentos PDF.
 """
 
+from collections import OrderedDict
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Any, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 from loguru import logger
 
+from .layout import TemplateStore, fingerprint_page
+
 try:
     import pdfplumber
     PDFPLUMBER_AVAILABLE = True
@@ -23,19 +27,109 @@ except ImportError:
     TABULA_AVAILABLE = False
 
 
+# Estrategias de deteccion de tablas de pdfplumber (bordes dibujados o texto alineado)
+STRATEGIES = ("lines", "text")
+
+# Disenos recordados por extractor
+STRATEGY_CACHE_SIZE = 256
+
+# Margen (en puntos) sobre las regiones de tabla de una plantilla
+REGION_MARGIN = 5.0
+
+# Bordes horizontales y verticales minimos de una tabla con lineas
+MIN_RULED_EDGES = 2
+
+# Renglones minimos con columnas separadas de una tabla sin lineas
+# (como ``min_words_vertical`` de la estrategia "text")
+MIN_ALIGNED_ROWS = 3
+
+# Separacion entre palabras, en alturas de renglon, que indica columnas
+COLUMN_GAP_RATIO = 1.0
+
+
+def may_contain_table(page: Any) -> bool:
+    """
+    Prefiltro barato: indica si una pagina puede contener una tabla.
+    
+    Una pagina es candidata si tiene bordes dibujados en ambas
+    direcciones (estrategia "lines") o al menos ``MIN_ALIGNED_ROWS``
+    renglones con un hueco entre palabras de mas de una altura de
+    renglon (columnas de la estrategia "text"). Portadas, notas en prosa
+    y paginas de firmas no cumplen ninguna de las dos condiciones.
+    
+    Es conservador: ante la duda la pagina se analiza completa.
+    
+    Args:
+        page: Pagina de pdfplumber.
+        
+    Returns:
+        False si la deteccion de tablas se puede omitir.
+    """
+    horizontal = vertical = 0
+    for edge in page.edges:
+        if edge["orientation"] == "h":
+            horizontal += 1
+        else:
+            vertical += 1
+    
+    if horizontal >= MIN_RULED_EDGES and vertical >= MIN_RULED_EDGES:
+        return True
+    
+    rows: Dict[int, List[Dict[str, Any]]] = {}
+    for word in page.extract_words():
+        rows.setdefault(round(float(word["top"])), []).append(word)
+    
+    aligned_rows = 0
+    for words in rows.values():
+        words.sort(key=lambda word: float(word["x0"]))
+        for left, right in zip(words, words[1:]):
+            height = float(left["bottom"]) - float(left["top"])
+            if float(right["x0"]) - float(left["x1"]) >= height * COLUMN_GAP_RATIO:
+                aligned_rows += 1
+                break
+        
+        if aligned_rows >= MIN_ALIGNED_ROWS:
+            return True
+    
+    return False
+
+
 class TableExtractor:
     """
     Extrae tablas de PDFs usando pdfplumber o tabula-py.
     
     Cada tabla se retorna como una lista de filas,
     donde cada fila es una lista de celdas.
+    
+    Con ``strategy="auto"`` la estrategia de pdfplumber se aprende por
+    documento: las primeras ``learn_pages`` paginas prueban "lines" y luego
+    "text" (como siempre); despues se usa primero la que gano y la otra
+    solo en las paginas donde la elegida no encuentra tablas. La eleccion
+    se recuerda por diseno (productor, creador y tamano de pagina) para
+    los documentos siguientes y queda en ``last_strategy``.
+    
+    Con un ``template_store`` los documentos cuya huella de diseno ya se
+    conoce (ver ``src.extractors.layout``) buscan tablas primero en las
+    regiones de su plantilla; una pagina donde las regiones no encuentran
+    nada (o que en la plantilla no tenia tablas) pasa por el prefiltro y
+    la deteccion completa, como sin plantilla. Los documentos nuevos con
+    tablas agregan su plantilla.
+    
+    Con ``prefilter`` las paginas que no pueden contener tablas (ver
+    ``may_contain_table``) no pasan por la deteccion; su numero queda en
+    ``last_skipped_pages``.
     """
     
     def __init__(
         self,
         max_pages: int = 100,
         min_rows: int = 2,
-        min_cols: int = 2
+        min_cols: int = 2,
+        strategy: str = "auto",
+        learn_pages: int = 3,
+        template_store: Optional[TemplateStore] = None,
+        learn_templates: bool = True,
+        prefilter: bool = True
     ):
         """
         Inicializa el extractor.
@@ -44,10 +138,32 @@ class TableExtractor:
             max_pages: Numero maximo de paginas a procesar.
             min_rows: Minimo de filas para considerar una tabla valida.
             min_cols: Minimo de columnas para considerar una tabla valida.
+            strategy: "auto" (aprender por documento), "lines" o "text"
+                (estrategia a probar primero en todas las paginas).
+            learn_pages: Paginas usadas para aprender la estrategia.
+            template_store: Almacen de plantillas de diseno (None = sin
+                plantillas).
+            learn_templates: Agregar al almacen los disenos nuevos.
+            prefilter: Omitir la deteccion en paginas sin indicios de
+                tablas.
         """
         self.max_pages = max_pages
         self.min_rows = min_rows
         self.min_cols = min_cols
+        self.strategy = strategy
+        self.learn_pages = max(1, learn_pages)
+        
+        # Estrategia ganadora por diseno de documento
+        self._strategy_cache: "OrderedDict[str, str]" = OrderedDict()
+        
+        self.template_store = template_store
+        self.learn_templates = learn_templates
+        self.prefilter = prefilter
+        
+        # Estrategia, plantilla y paginas omitidas del ultimo documento (para los metadatos)
+        self.last_strategy: Optional[Dict[str, Any]] = None
+        self.last_template: Optional[Dict[str, Any]] = None
+        self.last_skipped_pages = 0
         
         if not PDFPLUMBER_AVAILABLE and not TABULA_AVAILABLE:
             logger.warning(
@@ -57,13 +173,22 @@ class TableExtractor:
     
     def extract(
         self, 
-        file_path: Union[str, Path]
+        file_path: Union[str, Path],
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        pdf: Any = None,
+        pages: Optional[Sequence[Any]] = None
     ) -> List[List[List[Optional[str]]]]:
         """
         Extrae todas las tablas de un PDF.
         
         Args:
             file_path: Ruta al archivo PDF.
+            progress_callback: Funcion opcional llamada con
+                (paginas procesadas, total de paginas).
+            pdf: Documento de pdfplumber ya abierto (no se vuelve a abrir).
+            pages: Paginas a procesar de ``pdf`` (por defecto las primeras
+                ``max_pages``); p.ej. las de ``PageAnalyzer``, que
+                comparten palabras ya agrupadas.
             
         Returns:
             Lista de tablas. Cada tabla es una lista de filas,
@@ -75,10 +200,13 @@ class TableExtractor:
             raise FileNotFoundError(f"Archivo no encontrado: {file_path}")
         
         tables = []
+        self.last_strategy = None
+        self.last_template = None
+        self.last_skipped_pages = 0
         
         # Intentar con pdfplumber primero
-        if PDFPLUMBER_AVAILABLE:
-            tables = self._extract_with_pdfplumber(file_path)
+        if PDFPLUMBER_AVAILABLE or pdf is not None:
+            tables = self._extract_with_pdfplumber(file_path, progress_callback, pdf, pages)
         
         # Si no hay tablas, intentar con tabula
         if not tables and TABULA_AVAILABLE:
@@ -93,32 +221,66 @@ class TableExtractor:
     
     def _extract_with_pdfplumber(
         self, 
-        file_path: Path
+        file_path: Path,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        pdf: Any = None,
+        pages: Optional[Sequence[Any]] = None
     ) -> List[List[List[Optional[str]]]]:
         """Extrae tablas usando pdfplumber."""
         all_tables = []
         
         try:
-            with pdfplumber.open(file_path) as pdf:
-                pages_to_process = min(len(pdf.pages), self.max_pages)
+            with nullcontext(pdf) if pdf is not None else pdfplumber.open(file_path) as pdf:
+                if pages is None:
+                    pages = pdf.pages[:self.max_pages]
+                pages_to_process = len(pages)
                 
-                for page_num, page in enumerate(pdf.pages[:pages_to_process]):
-                    # Configuracion de extraccion de tablas
-                    table_settings = {
-                        "vertical_strategy": "lines",
-                        "horizontal_strategy": "lines",
-                        "snap_tolerance": 3,
-                        "join_tolerance": 3,
-                    }
+                layout = self._layout_key(pdf)
+                preferred, source = self._initial_strategy(layout)
+                wins = {name: 0 for name in STRATEGIES}
+                sampled_pages = 0
+                fallback_pages = 0
+                
+                fingerprint, template = self._match_template(pages)
+                regions: Dict[str, Dict[str, Any]] = {}
+                template_misses = 0
+                
+                for page_num, page in enumerate(pages):
+                    learned = template["pages"].get(str(page_num)) if template else None
+                    page_tables, used, bboxes = [], None, []
                     
-                    # Intentar extraer tablas con diferentes estrategias
-                    page_tables = page.extract_tables(table_settings)
+                    if learned and learned["tables"]:
+                        page_tables = self._extract_template_regions(page, learned)
+                        if not page_tables:
+                            # La plantilla fallo en esta pagina: deteccion normal
+                            template_misses += 1
                     
-                    if not page_tables:
-                        # Intentar con estrategia de texto
-                        table_settings["vertical_strategy"] = "text"
-                        table_settings["horizontal_strategy"] = "text"
-                        page_tables = page.extract_tables(table_settings)
+                    if page_tables:
+                        # Encontradas en las regiones de la plantilla
+                        pass
+                    elif self.prefilter and not may_contain_table(page):
+                        # Portada, prosa o firmas: sin deteccion
+                        self.last_skipped_pages += 1
+                        page_tables, used, bboxes = [], None, []
+                    elif preferred is None:
+                        # Aprendizaje: orden original, contando la estrategia ganadora
+                        page_tables, used, bboxes = self._extract_page_tables(page, STRATEGIES)
+                        if used:
+                            wins[used] += 1
+                        sampled_pages += 1
+                        if sampled_pages >= self.learn_pages:
+                            preferred = self._learned_strategy(layout, wins)
+                    else:
+                        order = (preferred,) + tuple(name for name in STRATEGIES if name != preferred)
+                        page_tables, used, bboxes = self._extract_page_tables(page, order)
+                        if used and used != preferred:
+                            fallback_pages += 1
+                    
+                    if fingerprint and template is None:
+                        regions[str(page_num)] = {
+                            "strategy": used,
+                            "tables": [self._table_region(page, bbox) for bbox in bboxes]
+                        }
                     
                     for table in page_tables:
                         if table:
@@ -127,14 +289,180 @@ class TableExtractor:
                             if cleaned_table:
                                 all_tables.append(cleaned_table)
                     
+                    if progress_callback:
+                        progress_callback(page_num + 1, pages_to_process)
+                    
                     if (page_num + 1) % 10 == 0:
                         logger.debug(f"Procesadas {page_num + 1}/{pages_to_process} paginas")
+                
+                if preferred is None:
+                    # Documento mas corto que el aprendizaje
+                    preferred = self._learned_strategy(layout, wins)
+                
+                if template is not None:
+                    self.last_template = {
+                        "fingerprint": fingerprint,
+                        "source": "matched",
+                        "misses": template_misses
+                    }
+                elif self.learn_templates and fingerprint and any(region["tables"] for region in regions.values()):
+                    self.template_store.add(fingerprint, {"pages": regions})
+                    self.last_template = {
+                        "fingerprint": fingerprint,
+                        "source": "learned",
+                        "misses": 0
+                    }
+                
+                self.last_strategy = {
+                    "strategy": preferred,
+                    "source": source,
+                    "layout": layout,
+                    "fallback_pages": fallback_pages
+                }
         
         except Exception as e:
             logger.debug(f"Error con pdfplumber tables: {e}")
         
         return all_tables
     
+    def _extract_page_tables(
+        self,
+        page: Any,
+        strategies: Sequence[str]
+    ) -> Tuple[List[List[List[Any]]], Optional[str], List[Tuple[float, float, float, float]]]:
+        """
+        Prueba las estrategias en orden hasta que una encuentre tablas.
+        
+        Returns:
+            Tupla (tablas de la pagina, estrategia que las encontro o None,
+            cajas de las tablas).
+        """
+        for strategy in strategies:
+            table_settings = {
+                "vertical_strategy": strategy,
+                "horizontal_strategy": strategy,
+                "snap_tolerance": 3,
+                "join_tolerance": 3,
+            }
+            found = page.find_tables(table_settings)
+            if found:
+                return [table.extract() for table in found], strategy, [table.bbox for table in found]
+        
+        return [], None, []
+    
+    def _match_template(
+        self,
+        pages: Sequence[Any]
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Busca la plantilla del documento por la huella de su primera pagina.
+        
+        Returns:
+            Tupla (huella o None, plantilla o None).
+        """
+        if self.template_store is None or not pages:
+            return None, None
+        
+        fingerprint = fingerprint_page(pages[0])
+        if fingerprint is None:
+            return None, None
+        
+        return fingerprint, self.template_store.get(fingerprint)
+    
+    def _extract_template_regions(self, page: Any, learned: Dict[str, Any]) -> List[List[List[Any]]]:
+        """Busca tablas solo dentro de las regiones de la plantilla para esta pagina."""
+        page_tables = []
+        strategies = (learned["strategy"],) if learned.get("strategy") else STRATEGIES
+        
+        for region in learned["tables"]:
+            x0, top, x1, bottom = page.bbox
+            bbox = (
+                max(region[0], x0),
+                max(region[1], top),
+                min(region[2], x1),
+                min(region[3], bottom)
+            )
+            if bbox[0] >= bbox[2] or bbox[1] >= bbox[3]:
+                continue
+            
+            found, _, _ = self._extract_page_tables(page.within_bbox(bbox), strategies)
+            page_tables.extend(found)
+        
+        return page_tables
+    
+    @staticmethod
+    def _table_region(page: Any, bbox: Tuple[float, float, float, float]) -> List[float]:
+        """
+        Region de plantilla para una tabla encontrada.
+        
+        Abarca el ancho de la pagina y llega hasta el pie: en otros
+        documentos del mismo diseno la tabla puede tener mas filas o
+        columnas mas anchas (p.ej. tablas centradas).
+        """
+        top = bbox[1]
+        return [
+            0.0,
+            round(max(float(top) - REGION_MARGIN, 0), 1),
+            round(float(page.width), 1),
+            round(float(page.height), 1)
+        ]
+    
+    def _initial_strategy(self, layout: str) -> Tuple[Optional[str], str]:
+        """
+        Estrategia con la que empieza un documento.
+        
+        Returns:
+            Tupla (estrategia o None si hay que aprenderla, origen:
+            "config", "cached" o "learned").
+        """
+        if self.strategy in STRATEGIES:
+            return self.strategy, "config"
+        
+        cached = self._strategy_cache.get(layout)
+        if cached:
+            self._strategy_cache.move_to_end(layout)
+            return cached, "cached"
+        
+        return None, "learned"
+    
+    def _learned_strategy(self, layout: str, wins: Dict[str, int]) -> str:
+        """Elige la estrategia ganadora (empate: "lines") y la recuerda si hubo tablas."""
+        strategy = "text" if wins["text"] > wins["lines"] else "lines"
+        
+        if any(wins.values()):
+            self.remember_strategy({"layout": layout, "strategy": strategy})
+        
+        return strategy
+    
+    def remember_strategy(self, strategy_info: Optional[Dict[str, Any]]) -> None:
+        """
+        Recuerda la estrategia de un diseno de documento.
+        
+        Permite llevar al extractor del proceso principal lo aprendido en
+        un subproceso de extraccion (ver ``last_strategy``).
+        
+        Args:
+            strategy_info: Diccionario con ``layout`` y ``strategy``.
+        """
+        if not strategy_info or strategy_info.get("strategy") not in STRATEGIES:
+            return
+        
+        self._strategy_cache[strategy_info["layout"]] = strategy_info["strategy"]
+        self._strategy_cache.move_to_end(strategy_info["layout"])
+        
+        while len(self._strategy_cache) > STRATEGY_CACHE_SIZE:
+            self._strategy_cache.popitem(last=False)
+    
+    @staticmethod
+    def _layout_key(pdf: Any) -> str:
+        """Clave de diseno: herramienta que genero el PDF y tamano de pagina."""
+        metadata = pdf.metadata or {}
+        size = ""
+        if pdf.pages:
+            first = pdf.pages[0]
+            size = f"{round(float(first.width))}x{round(float(first.height))}"
+        return f"{metadata.get('Producer', '')}|{metadata.get('Creator', '')}|{size}"
+    
     def _extract_with_tabula(
         self, 
         file_path: Path
@@ -6,7 +6,7 @@ Extrae texto plano de documentos PDF.
 """
 
 from pathlib import Path
-from typing import Optional, Union
+from typing import Callable, Optional, Union
 
 from loguru import logger
 
@@ -45,12 +45,18 @@ class TextExtractor:
                 "Instala con: pip install pdfplumber PyPDF2"
             )
     
-    def extract(self, file_path: Union[str, Path]) -> str:
+    def extract(
+        self,
+        file_path: Union[str, Path],
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> str:
         """
         Extrae todo el texto de un PDF.
         
         Args:
             file_path: Ruta al archivo PDF.
+            progress_callback: Funcion opcional llamada con
+                (paginas procesadas, total de paginas).
             
         Returns:
             Texto extraido del documento.
@@ -65,20 +71,24 @@ class TextExtractor:
         
         # Intentar con pdfplumber primero
         if PDFPLUMBER_AVAILABLE:
-            text = self._extract_with_pdfplumber(file_path)
+            text = self._extract_with_pdfplumber(file_path, progress_callback)
             if text and text.strip():
                 return text
         
         # Fallback a PyPDF2
         if PYPDF2_AVAILABLE:
-            text = self._extract_with_pypdf2(file_path)
+            text = self._extract_with_pypdf2(file_path, progress_callback)
             if text and text.strip():
                 return text
         
         logger.warning(f"No se pudo extraer texto de {file_path.name}")
         return ""
     
-    def _extract_with_pdfplumber(self, file_path: Path) -> str:
+    def _extract_with_pdfplumber(
+        self,
+        file_path: Path,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> str:
         """Extrae texto usando pdfplumber."""
         try:
             text_parts = []
@@ -92,6 +102,9 @@ class TextExtractor:
                     if page_text:
                         text_parts.append(page_text)
                     
+                    if progress_callback:
+                        progress_callback(i + 1, pages_to_process)
+                    
                     # Log progreso para documentos grandes
                     if (i + 1) % 10 == 0:
                         logger.debug(f"Procesadas {i + 1}/{pages_to_process} paginas")
@@ -102,7 +115,11 @@ class TextExtractor:
             logger.debug(f"Error con pdfplumber: {e}")
             return ""
     
-    def _extract_with_pypdf2(self, file_path: Path) -> str:
+    def _extract_with_pypdf2(
+        self,
+        file_path: Path,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> str:
         """Extrae texto usando PyPDF2."""
         try:
             text_parts = []
@@ -116,6 +133,9 @@ class TextExtractor:
                 
                 if page_text:
                     text_parts.append(page_text)
+                
+                if progress_callback:
+                    progress_callback(i + 1, pages_to_process)
             
             return "\n\n".join(text_parts)
             
@@ -0,0 +1,292 @@
+"""
+File Ledger
+===========
+
+Registro persistente de archivos ya procesados.
+
+Cada archivo se identifica por ruta, tamano, mtime y hash SHA-256 de su
+contenido. El registro es un archivo JSONL de solo-agregar (una linea
+por evento, resistente a cortes a mitad de escritura) que se compacta
+periodicamente a una linea por archivo.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from loguru import logger
+
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_signature(file_path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Calcula la firma de un archivo.
+
+    El stat se toma antes de leer, asi un archivo modificado durante el
+    hash queda registrado con el mtime anterior y se reprocesa.
+
+    Args:
+        file_path: Ruta del archivo.
+
+    Returns:
+        Diccionario con size, mtime_ns y sha256.
+    """
+    stat = os.stat(file_path)
+    digest = hashlib.sha256()
+
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": digest.hexdigest()
+    }
+
+
+class FileLedger:
+    """
+    Registro de archivos procesados respaldado por un archivo JSONL.
+
+    Seguro para usar desde varios hilos de un mismo proceso; se asume
+    un unico proceso escritor.
+    """
+
+    def __init__(self, ledger_path: Union[str, Path], compact_threshold: int = 1000):
+        """
+        Carga el registro existente.
+
+        Args:
+            ledger_path: Ruta del archivo JSONL.
+            compact_threshold: Lineas obsoletas toleradas antes de compactar.
+        """
+        self.ledger_path = Path(ledger_path)
+        self.compact_threshold = compact_threshold
+
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lines = 0
+
+        self.ledger_path.parent.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    def _load(self) -> None:
+        """Reproduce el archivo: la ultima linea de cada ruta gana."""
+        if not self.ledger_path.exists():
+            return
+
+        with open(self.ledger_path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+
+                self._lines += 1
+                try:
+                    entry = json.loads(line)
+                    path = entry["path"]
+                except (ValueError, KeyError):
+                    # Tipicamente una linea truncada por un corte abrupto
+                    logger.warning(f"Linea invalida en {self.ledger_path}:{line_number}")
+                    continue
+
+                if entry.get("deleted"):
+                    self._entries.pop(path, None)
+                else:
+                    self._entries[path] = entry
+
+        logger.debug(f"Ledger cargado: {len(self._entries)} archivos ({self._lines} lineas)")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._entries
+
+    def paths(self) -> List[str]:
+        """Rutas registradas."""
+        return list(self._entries)
+
+    def get(self, path: str) -> Optional[Dict[str, Any]]:
+        """Retorna la entrada registrada para una ruta (o None)."""
+        return self._entries.get(path)
+
+    def matches(self, path: str, size: int, mtime_ns: int) -> bool:
+        """
+        Verificacion rapida (sin leer el archivo) de que no cambio.
+
+        Args:
+            path: Ruta del archivo.
+            size: Tamano actual.
+            mtime_ns: mtime actual en nanosegundos.
+
+        Returns:
+            True si el registro tiene el mismo tamano y mtime.
+        """
+        entry = self._entries.get(path)
+        return entry is not None and entry["size"] == size and entry["mtime_ns"] == mtime_ns
+
+    def record(self, path: str, signature: Dict[str, Any], **extra: Any) -> None:
+        """
+        Registra un archivo procesado.
+
+        Args:
+            path: Ruta del archivo.
+            signature: Firma (ver ``file_signature``).
+            **extra: Datos adicionales a guardar (keys, status...).
+        """
+        entry = {
+            "path": path,
+            "size": signature["size"],
+            "mtime_ns": signature["mtime_ns"],
+            "sha256": signature["sha256"],
+            "processed_at": datetime.now().isoformat(),
+            **extra
+        }
+
+        with self._lock:
+            self._entries[path] = entry
+            self._append(entry)
+
+    def forget(self, path: str) -> None:
+        """Elimina una ruta del registro."""
+        with self._lock:
+            if self._entries.pop(path, None) is not None:
+                self._append({"path": path, "deleted": True})
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        """Agrega una linea y compacta si hay demasiadas obsoletas. Requiere ``_lock``."""
+        with open(self.ledger_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+        self._lines += 1
+
+        if self._lines - len(self._entries) > self.compact_threshold:
+            self._rewrite()
+
+    def compact(self, prune_missing: bool = False) -> int:
+        """
+        Reescribe el registro con una linea por archivo.
+
+        Args:
+            prune_missing: Descartar entradas de archivos que ya no existen.
+
+        Returns:
+            Numero de entradas descartadas.
+        """
+        with self._lock:
+            removed = 0
+
+            if prune_missing:
+                for path in list(self._entries):
+                    if not os.path.exists(path):
+                        del self._entries[path]
+                        removed += 1
+
+            if removed or self._lines != len(self._entries):
+                self._rewrite()
+
+        return removed
+
+    def _rewrite(self) -> None:
+        """Escribe el estado actual de forma atomica. Requiere ``_lock``."""
+        tmp_path = self.ledger_path.with_name(self.ledger_path.name + ".tmp")
+
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in self._entries.values():
+                f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp_path, self.ledger_path)
+        self._lines = len(self._entries)
+
+
+class RowStore:
+    """
+    Filas validadas por archivo, guardadas en un JSONL de solo-agregar.
+
+    Complementa al registro del modo incremental: el registro guarda
+    solo firmas y claves de deduplicacion, y las filas se leen de aqui
+    unicamente cuando el archivo combinado debe reconstruirse (archivos
+    eliminados o modificados, configuracion distinta). Se asume un unico
+    proceso escritor.
+    """
+
+    def __init__(self, store_path: Union[str, Path]):
+        """
+        Inicializa el almacen (no lee el archivo).
+
+        Args:
+            store_path: Ruta del archivo JSONL.
+        """
+        self.store_path = Path(store_path)
+        self.store_path.parent.mkdir(parents=True, exist_ok=True)
+
+    def add(self, path: str, rows: List[Dict[str, Any]]) -> None:
+        """
+        Guarda las filas de un archivo (reemplaza las anteriores).
+
+        Args:
+            path: Ruta del archivo procesado.
+            rows: Filas validadas del archivo.
+        """
+        with open(self.store_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"path": path, "rows": rows}) + "\n")
+
+    def load(self, paths: Optional[Iterable[str]] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Lee las filas guardadas: la ultima linea de cada ruta gana.
+
+        Args:
+            paths: Rutas a leer (None = todas).
+
+        Returns:
+            Diccionario ruta -> filas.
+        """
+        wanted = set(paths) if paths is not None else None
+        rows_by_path: Dict[str, List[Dict[str, Any]]] = {}
+
+        if not self.store_path.exists():
+            return rows_by_path
+
+        with open(self.store_path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+
+                try:
+                    entry = json.loads(line)
+                    path = entry["path"]
+                except (ValueError, KeyError):
+                    logger.warning(f"Linea invalida en {self.store_path}:{line_number}")
+                    continue
+
+                if wanted is None or path in wanted:
+                    rows_by_path[path] = entry.get("rows", [])
+
+        return rows_by_path
+
+    def rewrite(self, rows_by_path: Dict[str, List[Dict[str, Any]]]) -> None:
+        """
+        Reemplaza el contenido de forma atomica (una linea por archivo).
+
+        Args:
+            rows_by_path: Filas vigentes por ruta.
+        """
+        tmp_path = self.store_path.with_name(self.store_path.name + ".tmp")
+
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for path, rows in rows_by_path.items():
+                f.write(json.dumps({"path": path, "rows": rows}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp_path, self.store_path)
@@ -0,0 +1,162 @@
+"""
+Isolated Execution
+==================
+
+Ejecuta una funcion en un subproceso con limite de tiempo y de memoria.
+
+El subproceso se crea con ``fork``: hereda el pipeline ya construido (sin
+serializarlo ni volver a importar nada) y se mata al vencer el plazo, de
+modo que un PDF patologico (dibujos vectoriales enormes, xref roto) no
+bloquea al proceso que lo atiende. El limite de memoria es adicional a
+lo que el subproceso hereda, asi un padre grande (la API, un pool ya
+caliente) no agota el limite antes de abrir el PDF. Los eventos que la funcion emite
+mientras corre (etapas, paginas) se reenvian al proceso padre.
+
+Donde no hay ``fork`` (Windows) o el proceso actual es daemon, la funcion
+corre en el proceso actual sin limites.
+"""
+
+import multiprocessing
+import os
+import sys
+import time
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Optional, Tuple
+
+from loguru import logger
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+
+FORK_AVAILABLE = "fork" in multiprocessing.get_all_start_methods()
+
+# Recibe cada evento emitido por la funcion aislada
+EventCallback = Callable[[Any], None]
+
+
+def _ignore_event(event: Any) -> None:
+    pass
+
+
+def can_isolate() -> bool:
+    """Indica si se pueden crear subprocesos aislados desde este proceso."""
+    return FORK_AVAILABLE and not multiprocessing.current_process().daemon
+
+
+def _address_space_bytes() -> int:
+    """Espacio de direcciones actual del proceso (estimado sin ``/proc``)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # Sin /proc: memoria residente maxima (bytes en macOS, KB en el resto)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _child_main(
+    conn: Connection,
+    func: Callable[..., Any],
+    args: Tuple[Any, ...],
+    memory_mb: Optional[int]
+) -> None:
+    """Punto de entrada del subproceso: aplica el limite de memoria y ejecuta ``func``."""
+    if memory_mb and RESOURCE_AVAILABLE:
+        # RLIMIT_AS cubre tambien lo heredado del padre: el limite es lo
+        # que el subproceso ya ocupa mas ``memory_mb``
+        limit = _address_space_bytes() + memory_mb * 1024 * 1024
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+    def emit(event: Any) -> None:
+        conn.send(("event", event))
+
+    try:
+        result = func(*args, emit=emit)
+    except BaseException as e:
+        try:
+            conn.send(("error", e))
+        except Exception:
+            # Excepcion no serializable
+            conn.send(("error", RuntimeError(f"{type(e).__name__}: {e}")))
+    else:
+        conn.send(("result", result))
+    finally:
+        conn.close()
+
+
+def run_isolated(
+    func: Callable[..., Any],
+    args: Tuple[Any, ...] = (),
+    timeout: Optional[float] = None,
+    memory_mb: Optional[int] = None,
+    on_event: Optional[EventCallback] = None
+) -> Any:
+    """
+    Ejecuta ``func(*args, emit=...)`` en un subproceso con limites.
+
+    Args:
+        func: Funcion a ejecutar. Recibe ``emit``, que envia un evento
+            (serializable) al proceso padre.
+        args: Argumentos posicionales de ``func``.
+        timeout: Segundos maximos (None = sin limite).
+        memory_mb: Memoria en MB que el subproceso puede reservar ademas
+            de la heredada del padre (None o 0 = sin limite; requiere el
+            modulo ``resource``).
+        on_event: Funcion llamada en el proceso padre con cada evento.
+
+    Returns:
+        Valor retornado por ``func``.
+
+    Raises:
+        TimeoutError: Si se excede ``timeout`` (el subproceso se mata).
+        MemoryError: Si se excede ``memory_mb``.
+        RuntimeError: Si el subproceso termina sin responder (p.ej.
+            una senal).
+        Exception: Cualquier excepcion de ``func`` se relanza tal cual.
+    """
+    on_event = on_event or _ignore_event
+
+    if not can_isolate():
+        logger.debug("Subprocesos no disponibles, ejecutando sin limites")
+        return func(*args, emit=on_event)
+
+    context = multiprocessing.get_context("fork")
+    parent_conn, child_conn = context.Pipe(duplex=False)
+    process = context.Process(target=_child_main, args=(child_conn, func, args, memory_mb))
+    process.start()
+    child_conn.close()
+
+    deadline = time.monotonic() + timeout if timeout else None
+
+    try:
+        while True:
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not parent_conn.poll(remaining):
+                    raise TimeoutError(f"Se excedio el limite de {timeout:g} s")
+
+            try:
+                kind, payload = parent_conn.recv()
+            except EOFError:
+                process.join()
+                raise RuntimeError(f"El subproceso termino sin responder (codigo {process.exitcode})")
+
+            if kind == "event":
+                on_event(payload)
+            elif kind == "error":
+                raise payload
+            else:
+                return payload
+
+    finally:
+        parent_conn.close()
+        if process.is_alive():
+            process.kill()
+        process.join()
@@ -0,0 +1,143 @@
+"""
+Job Events
+==========
+
+Difunde cambios de estado de trabajos a clientes suscritos (SSE).
+
+Los workers escriben progreso y etapa en el ``JobStore``; el broker
+consulta la base de datos con un unico bucle compartido por todos los
+suscriptores (una consulta por intervalo, sin importar cuantos clientes
+haya) y solo notifica cuando el estado de un trabajo cambia.
+"""
+
+import asyncio
+from collections import defaultdict
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from .job_store import JobStore
+
+
+# Estados a partir de los cuales un trabajo ya no cambia
+TERMINAL_STATUSES = ("completed", "failed", "not_found")
+
+# Campos del trabajo incluidos en cada evento
+_EVENT_FIELDS = ("status", "progress", "stage", "error", "output_file", "files")
+
+
+def job_event(job_id: str, job: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Construye el evento publicado para un trabajo.
+
+    Args:
+        job_id: Identificador del trabajo.
+        job: Trabajo leido del store (None si ya no existe).
+
+    Returns:
+        Diccionario con el estado visible del trabajo.
+    """
+    if job is None:
+        return {"job_id": job_id, "status": "not_found"}
+
+    event = {"job_id": job_id}
+    event.update({field: job.get(field) for field in _EVENT_FIELDS})
+    return event
+
+
+class JobEventBroker:
+    """
+    Distribuye eventos de progreso de trabajos a colas por suscriptor.
+    """
+
+    def __init__(self, store: JobStore, poll_interval: float = 0.5, heartbeat: float = 15.0):
+        """
+        Inicializa el broker.
+
+        Args:
+            store: Almacen de trabajos a observar.
+            poll_interval: Segundos entre consultas a la base de datos.
+            heartbeat: Segundos sin cambios tras los cuales se emite un latido.
+        """
+        self.store = store
+        self.poll_interval = poll_interval
+        self.heartbeat = heartbeat
+
+        self._subscribers: Dict[str, List[asyncio.Queue]] = defaultdict(list)
+        self._last_events: Dict[str, Dict[str, Any]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def subscribe(self, job_id: str) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        Itera los eventos de un trabajo hasta que termina.
+
+        El primer evento es el estado actual. Se entrega ``None`` como
+        latido cuando no hubo cambios durante ``heartbeat`` segundos.
+
+        Args:
+            job_id: Identificador del trabajo.
+
+        Yields:
+            Eventos de estado (ver ``job_event``) o None.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        current = job_event(job_id, await loop.run_in_executor(None, self.store.get_job, job_id))
+        yield current
+
+        if current["status"] in TERMINAL_STATUSES:
+            return
+
+        self._subscribers[job_id].append(queue)
+        self._last_events.setdefault(job_id, current)
+        self._ensure_polling()
+
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=self.heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+
+                yield event
+
+                if event["status"] in TERMINAL_STATUSES:
+                    return
+        finally:
+            self._unsubscribe(job_id, queue)
+
+    def _unsubscribe(self, job_id: str, queue: asyncio.Queue) -> None:
+        """Elimina una cola y olvida el trabajo si no quedan suscriptores."""
+        queues = self._subscribers.get(job_id, [])
+
+        if queue in queues:
+            queues.remove(queue)
+
+        if not queues:
+            self._subscribers.pop(job_id, None)
+            self._last_events.pop(job_id, None)
+
+    def _ensure_polling(self) -> None:
+        """Arranca el bucle de consulta si no esta corriendo."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._poll())
+
+    async def _poll(self) -> None:
+        """Consulta los trabajos observados y publica los que cambiaron."""
+        loop = asyncio.get_running_loop()
+
+        while self._subscribers:
+            job_ids = list(self._subscribers)
+            jobs = await loop.run_in_executor(None, self.store.get_jobs, job_ids)
+
+            for job_id in job_ids:
+                event = job_event(job_id, jobs.get(job_id))
+
+                if event == self._last_events.get(job_id):
+                    continue
+
+                self._last_events[job_id] = event
+                for queue in self._subscribers.get(job_id, []):
+                    queue.put_nowait(event)
+
+            await asyncio.sleep(self.poll_interval)
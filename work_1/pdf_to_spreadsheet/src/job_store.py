@@ -0,0 +1,445 @@
+"""
+Job Store
+=========
+
+Cola de trabajos persistente respaldada por SQLite.
+
+La API solo encola trabajos y consulta su estado; los workers
+(ver ``worker.py``) toman trabajos pendientes desde la misma base de datos
+en procesos separados. No requiere ningun broker externo.
+"""
+
+import json
+import sqlite3
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+
+# Estados posibles de un trabajo
+JOB_STATUSES = ("pending", "processing", "completed", "failed")
+
+# Columnas que se serializan como JSON
+_JSON_COLUMNS = ("options", "result", "files")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL DEFAULT 'pending',
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT,
+    filename TEXT NOT NULL,
+    file_path TEXT,
+    parser_type TEXT NOT NULL DEFAULT 'auto',
+    output_format TEXT NOT NULL DEFAULT 'csv',
+    options TEXT,
+    progress INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    output_file TEXT,
+    worker_id TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    content_hash TEXT,
+    files TEXT,
+    stage TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at);
+"""
+
+# Columnas agregadas despues de la primera version del esquema
+_MIGRATIONS = {
+    "content_hash": "ALTER TABLE jobs ADD COLUMN content_hash TEXT",
+    "files": "ALTER TABLE jobs ADD COLUMN files TEXT",
+    "stage": "ALTER TABLE jobs ADD COLUMN stage TEXT",
+    "updated_at": "ALTER TABLE jobs ADD COLUMN updated_at TEXT",
+}
+
+_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_jobs_content_hash ON jobs (content_hash);
+"""
+
+
+class JobStore:
+    """
+    Almacen de trabajos en SQLite compartido entre la API y los workers.
+
+    Cada operacion abre su propia conexion, por lo que una instancia
+    puede usarse desde varios hilos y sobrevive a un fork del proceso.
+    """
+
+    def __init__(self, db_path: Union[str, Path] = "jobs.db", timeout: float = 30.0):
+        """
+        Inicializa el almacen y crea el esquema si no existe.
+
+        Args:
+            db_path: Ruta al archivo SQLite.
+            timeout: Segundos de espera ante una base de datos bloqueada.
+        """
+        self.db_path = Path(db_path)
+        self.timeout = timeout
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._migrate(conn)
+            conn.executescript(_INDEXES)
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        """Agrega columnas nuevas a bases de datos creadas con un esquema anterior."""
+        existing = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+
+        for column, statement in _MIGRATIONS.items():
+            if column not in existing:
+                conn.execute(statement)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Abre una conexion en modo autocommit y la cierra al terminar."""
+        conn = sqlite3.connect(
+            str(self.db_path),
+            timeout=self.timeout,
+            isolation_level=None
+        )
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def create_job(
+        self,
+        filename: str,
+        file_path: Optional[str] = None,
+        parser_type: str = "auto",
+        output_format: str = "csv",
+        options: Optional[Dict[str, Any]] = None,
+        job_id: Optional[str] = None,
+        content_hash: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Encola un nuevo trabajo en estado ``pending``.
+
+        Args:
+            filename: Nombre original del archivo subido.
+            file_path: Ruta del archivo a procesar.
+            parser_type: Parser solicitado (auto, invoice, report...).
+            output_format: Formato de salida (csv, json).
+            options: Opciones adicionales del trabajo.
+            job_id: Identificador explicito (se genera si es None).
+            content_hash: SHA-256 del archivo (para detectar duplicados).
+
+        Returns:
+            Diccionario con el trabajo creado.
+        """
+        job_id = job_id or uuid.uuid4().hex[:8]
+
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (job_id, status, created_at, filename, file_path, "
+                "parser_type, output_format, options, content_hash) "
+                "VALUES (?, 'pending', ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job_id,
+                    datetime.now().isoformat(),
+                    filename,
+                    file_path,
+                    parser_type,
+                    output_format,
+                    json.dumps(options or {}),
+                    content_hash
+                )
+            )
+
+        return self.get_job(job_id)
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Obtiene un trabajo por su identificador.
+
+        Args:
+            job_id: Identificador del trabajo.
+
+        Returns:
+            Diccionario con el trabajo o None si no existe.
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+
+        return self._row_to_dict(row) if row else None
+
+    def get_jobs(self, job_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Obtiene varios trabajos con una sola consulta.
+
+        Args:
+            job_ids: Identificadores de los trabajos.
+
+        Returns:
+            Diccionario {job_id: trabajo} (los inexistentes se omiten).
+        """
+        if not job_ids:
+            return {}
+
+        placeholders = ", ".join("?" for _ in job_ids)
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT * FROM jobs WHERE job_id IN ({placeholders})", list(job_ids)
+            ).fetchall()
+
+        return {row["job_id"]: self._row_to_dict(row) for row in rows}
+
+    def find_duplicate(
+        self,
+        content_hash: str,
+        parser_type: str = "auto",
+        output_format: str = "csv"
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Busca un trabajo previo con el mismo contenido y opciones.
+
+        Los trabajos fallidos se ignoran para permitir reintentos.
+
+        Args:
+            content_hash: SHA-256 del archivo.
+            parser_type: Parser solicitado.
+            output_format: Formato de salida.
+
+        Returns:
+            El trabajo mas reciente que coincide o None.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE content_hash = ? AND parser_type = ? "
+                "AND output_format = ? AND status != 'failed' "
+                "ORDER BY created_at DESC LIMIT 1",
+                (content_hash, parser_type, output_format)
+            ).fetchone()
+
+        return self._row_to_dict(row) if row else None
+
+    def list_jobs(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Lista trabajos, opcionalmente filtrados por estado.
+
+        Args:
+            status: Estado a filtrar (None = todos).
+
+        Returns:
+            Lista de trabajos ordenados por fecha de creacion.
+        """
+        with self._connect() as conn:
+            if status:
+                rows = conn.execute(
+                    "SELECT * FROM jobs WHERE status = ? ORDER BY created_at", (status,)
+                ).fetchall()
+            else:
+                rows = conn.execute("SELECT * FROM jobs ORDER BY created_at").fetchall()
+
+        return [self._row_to_dict(row) for row in rows]
+
+    def update_job(self, job_id: str, **fields: Any) -> None:
+        """
+        Actualiza campos de un trabajo.
+
+        Toda actualizacion renueva ``updated_at``: el progreso que reporta
+        el worker sirve tambien de latido (ver ``requeue_stale_jobs``).
+
+        Args:
+            job_id: Identificador del trabajo.
+            **fields: Columnas a actualizar.
+
+        Raises:
+            ValueError: Si se indica una columna o estado desconocido.
+        """
+        if not fields:
+            return
+
+        fields.setdefault("updated_at", datetime.now().isoformat())
+
+        if "status" in fields and fields["status"] not in JOB_STATUSES:
+            raise ValueError(f"Estado de trabajo desconocido: {fields['status']}")
+
+        columns = []
+        values = []
+
+        for column, value in fields.items():
+            if not column.isidentifier() or column == "job_id":
+                raise ValueError(f"Columna invalida: {column}")
+            if column in _JSON_COLUMNS and value is not None:
+                value = json.dumps(value)
+            columns.append(f"{column} = ?")
+            values.append(value)
+
+        values.append(job_id)
+
+        with self._connect() as conn:
+            conn.execute(f"UPDATE jobs SET {', '.join(columns)} WHERE job_id = ?", values)
+
+    def delete_job(self, job_id: str) -> bool:
+        """
+        Elimina un trabajo.
+
+        Args:
+            job_id: Identificador del trabajo.
+
+        Returns:
+            True si el trabajo existia.
+        """
+        with self._connect() as conn:
+            cursor = conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+
+        return cursor.rowcount > 0
+
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """
+        Renueva ``updated_at`` de un trabajo en curso del worker.
+
+        Args:
+            job_id: Identificador del trabajo.
+            worker_id: Worker que lo esta procesando.
+
+        Returns:
+            True si el trabajo sigue en ``processing`` a nombre del worker
+            (False si fue reencolado y otro worker lo tomo).
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET updated_at = ? "
+                "WHERE job_id = ? AND status = 'processing' AND worker_id = ?",
+                (datetime.now().isoformat(), job_id, worker_id)
+            )
+
+        return cursor.rowcount > 0
+
+    def is_owner(self, job_id: str, worker_id: str) -> bool:
+        """
+        Indica si el trabajo sigue asignado al worker.
+
+        Args:
+            job_id: Identificador del trabajo.
+            worker_id: Worker que lo reclamo.
+
+        Returns:
+            True si el trabajo existe y su ``worker_id`` es el indicado.
+        """
+        job = self.get_job(job_id)
+        return job is not None and job.get("worker_id") == worker_id
+
+    def claim_next_job(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Toma de forma atomica el trabajo pendiente mas antiguo.
+
+        ``BEGIN IMMEDIATE`` adquiere el bloqueo de escritura antes de leer,
+        asi dos workers nunca reclaman el mismo trabajo.
+
+        Args:
+            worker_id: Identificador del worker que reclama.
+
+        Returns:
+            El trabajo (ya en estado ``processing``) o None si la cola esta vacia.
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT job_id FROM jobs WHERE status = 'pending' "
+                    "ORDER BY created_at LIMIT 1"
+                ).fetchone()
+
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+
+                now = datetime.now().isoformat()
+                conn.execute(
+                    "UPDATE jobs SET status = 'processing', worker_id = ?, started_at = ?, "
+                    "updated_at = ?, attempts = attempts + 1 WHERE job_id = ?",
+                    (worker_id, now, now, row["job_id"])
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        return self.get_job(row["job_id"])
+
+    def requeue_stale_jobs(self, stale_after_seconds: float, max_attempts: int = 3) -> int:
+        """
+        Devuelve a la cola trabajos abandonados por un worker caido.
+
+        Un trabajo esta abandonado cuando su ultima actualizacion
+        (``updated_at``: progreso o latido del worker) es mas antigua que
+        ``stale_after_seconds``; un trabajo largo pero vivo no se reencola.
+        Los trabajos que superan ``max_attempts`` se marcan como fallidos.
+
+        Args:
+            stale_after_seconds: Segundos sin actualizaciones del worker.
+            max_attempts: Intentos maximos antes de marcar como fallido.
+
+        Returns:
+            Numero de trabajos reencolados.
+        """
+        cutoff = (datetime.now() - timedelta(seconds=stale_after_seconds)).isoformat()
+
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? "
+                    "WHERE status = 'processing' AND COALESCE(updated_at, started_at) < ? "
+                    "AND attempts >= ?",
+                    (
+                        "Worker abandono el trabajo demasiadas veces",
+                        datetime.now().isoformat(),
+                        cutoff,
+                        max_attempts
+                    )
+                )
+                cursor = conn.execute(
+                    "UPDATE jobs SET status = 'pending', worker_id = NULL, progress = 0, "
+                    "stage = NULL "
+                    "WHERE status = 'processing' AND COALESCE(updated_at, started_at) < ?",
+                    (cutoff,)
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        return cursor.rowcount
+
+    def count_by_status(self) -> Dict[str, int]:
+        """
+        Cuenta trabajos agrupados por estado.
+
+        Returns:
+            Diccionario {estado: cantidad} con todos los estados.
+        """
+        counts = {status: 0 for status in JOB_STATUSES}
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT status, COUNT(*) AS total FROM jobs GROUP BY status"
+            ).fetchall()
+
+        for row in rows:
+            counts[row["status"]] = row["total"]
+
+        return counts
+
+    def _row_to_dict(self, row: sqlite3.Row) -> Dict[str, Any]:
+        """Convierte una fila SQLite a diccionario, decodificando JSON."""
+        job = dict(row)
+
+        for column in _JSON_COLUMNS:
+            if job.get(column):
+                job[column] = json.loads(job[column])
+
+        return job
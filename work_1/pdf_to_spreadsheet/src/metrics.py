@@ -0,0 +1,387 @@
+"""
+Metrics
+=======
+
+Metricas de operacion en formato de texto de Prometheus.
+
+La API, los workers y el watcher corren en procesos distintos, por lo
+que los contadores e histogramas se acumulan en SQLite (una tabla
+``metrics``, por defecto dentro de la misma base de datos de trabajos)
+y cualquier proceso puede exponerlos. Cada archivo procesado se
+registra en una sola transaccion.
+
+Las tasas (paginas/s, filas/s) se obtienen en Prometheus con
+``rate()`` sobre los contadores ``*_total``.
+"""
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from loguru import logger
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Limites superiores de los histogramas (segundos)
+STAGE_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+QUEUE_BUCKETS = (0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0)
+
+# Metricas conocidas: nombre -> (tipo, descripcion, buckets)
+METRICS: Dict[str, Tuple[str, str, Tuple[float, ...]]] = {
+    "pdf2sheet_files_total": ("counter", "PDFs processed by outcome", ()),
+    "pdf2sheet_pages_total": ("counter", "PDF pages processed", ()),
+    "pdf2sheet_rows_total": ("counter", "Rows extracted", ()),
+    "pdf2sheet_ocr_pages_total": ("counter", "Pages processed with OCR", ()),
+    "pdf2sheet_input_bytes_total": ("counter", "PDF bytes read", ()),
+    "pdf2sheet_output_bytes_total": ("counter", "Output bytes written", ()),
+    "pdf2sheet_cache_hits_total": ("counter", "Files not reprocessed because their content was already processed", ()),
+    "pdf2sheet_failures_total": ("counter", "Failed files by pipeline stage", ()),
+    "pdf2sheet_stage_seconds": ("histogram", "Time spent per file in each pipeline stage", STAGE_BUCKETS),
+    "pdf2sheet_file_seconds": ("histogram", "Total pipeline time per file", STAGE_BUCKETS),
+    "pdf2sheet_queue_wait_seconds": ("histogram", "Time between enqueue and processing start", QUEUE_BUCKETS),
+    "pdf2sheet_jobs": ("gauge", "API jobs by status (pending = queue depth)", ()),
+    "pdf2sheet_watcher_files": ("gauge", "Watcher files waiting to settle or being processed", ()),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS metrics (
+    name TEXT NOT NULL,
+    labels TEXT NOT NULL DEFAULT '',
+    value REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (name, labels)
+);
+"""
+
+# Actualizacion pendiente: (nombre de la serie, etiquetas ya formateadas, incremento)
+_Update = Tuple[str, str, float]
+
+# Gauges calculados al momento de exponer: nombre -> [(etiquetas, valor)]
+Gauges = Dict[str, List[Tuple[Dict[str, str], float]]]
+
+
+def format_labels(labels: Dict[str, Any]) -> str:
+    """
+    Formatea etiquetas como ``clave="valor"`` ordenadas por clave.
+
+    Args:
+        labels: Etiquetas de la serie.
+
+    Returns:
+        Texto sin llaves (vacio si no hay etiquetas).
+    """
+    parts = []
+    for key in sorted(labels):
+        value = str(labels[key]).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{key}="{value}"')
+    return ",".join(parts)
+
+
+def _format_value(value: float) -> str:
+    """Formatea un valor evitando decimales innecesarios."""
+    if value == int(value):
+        return str(int(value))
+    return repr(round(value, 6))
+
+
+def _format_bound(bound: float) -> str:
+    """Formatea el limite ``le`` de un bucket."""
+    return "+Inf" if bound == float("inf") else repr(float(bound))
+
+
+class MetricsStore:
+    """
+    Contadores e histogramas persistentes compartidos entre procesos.
+    """
+
+    def __init__(self, db_path: Union[str, Path] = "jobs.db", timeout: float = 30.0):
+        """
+        Inicializa el almacen y crea la tabla si no existe.
+
+        Args:
+            db_path: Ruta al archivo SQLite (puede ser el de ``JobStore``).
+            timeout: Segundos de espera ante una base de datos bloqueada.
+        """
+        self.db_path = Path(db_path)
+        self.timeout = timeout
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Abre una conexion en modo autocommit y la cierra al terminar."""
+        conn = sqlite3.connect(str(self.db_path), timeout=self.timeout, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _apply(self, updates: List[_Update]) -> None:
+        """
+        Aplica todos los incrementos en una sola transaccion.
+
+        Las metricas son de mejor esfuerzo: un error de la base de datos
+        se registra en el log y nunca hace fallar el procesamiento.
+        """
+        if not updates:
+            return
+
+        try:
+            with self._connect() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    conn.executemany(
+                        "INSERT INTO metrics (name, labels, value) VALUES (?, ?, ?) "
+                        "ON CONFLICT (name, labels) DO UPDATE SET value = value + excluded.value",
+                        updates
+                    )
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+        except sqlite3.Error as e:
+            logger.warning(f"Metricas no registradas: {e}")
+
+    @staticmethod
+    def _counter(updates: List[_Update], name: str, value: float, **labels: Any) -> None:
+        """Agrega el incremento de un contador."""
+        if value:
+            updates.append((name, format_labels(labels), value))
+
+    @staticmethod
+    def _histogram(updates: List[_Update], name: str, value: float, **labels: Any) -> None:
+        """Agrega una observacion de histograma (buckets acumulativos, suma y cuenta)."""
+        label_text = format_labels(labels)
+        prefix = label_text + "," if label_text else ""
+
+        for bound in METRICS[name][2] + (float("inf"),):
+            if value <= bound:
+                updates.append((f"{name}_bucket", f'{prefix}le="{_format_bound(bound)}"', 1))
+
+        updates.append((f"{name}_sum", label_text, value))
+        updates.append((f"{name}_count", label_text, 1))
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        """
+        Incrementa un contador.
+
+        Args:
+            name: Nombre de la metrica (ver ``METRICS``).
+            value: Incremento.
+            **labels: Etiquetas de la serie.
+        """
+        updates: List[_Update] = []
+        self._counter(updates, name, value, **labels)
+        self._apply(updates)
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """
+        Registra una observacion en un histograma.
+
+        Args:
+            name: Nombre del histograma (ver ``METRICS``).
+            value: Valor observado (segundos).
+            **labels: Etiquetas de la serie.
+        """
+        updates: List[_Update] = []
+        self._histogram(updates, name, value, **labels)
+        self._apply(updates)
+
+    def observe_queue_wait(self, created_at: Optional[str], started_at: Optional[str], source: str) -> None:
+        """
+        Registra la espera en cola de un trabajo a partir de sus fechas ISO.
+
+        Args:
+            created_at: Fecha de encolado.
+            started_at: Fecha en que un worker lo tomo.
+            source: Origen (api, watcher).
+        """
+        if not created_at or not started_at:
+            return
+
+        try:
+            wait = (datetime.fromisoformat(started_at) - datetime.fromisoformat(created_at)).total_seconds()
+        except ValueError:
+            return
+
+        self.observe("pdf2sheet_queue_wait_seconds", max(wait, 0.0), source=source)
+
+    def record_results(self, results: Dict[str, Any], source: str) -> None:
+        """
+        Registra los resultados de ``process_file`` o ``process_files``.
+
+        Con ``files`` (lotes) se registra cada PDF con sus propios tiempos
+        y la deduplicacion/exportacion del lote aparte; sin ``files`` el
+        resultado corresponde a un solo PDF.
+
+        Args:
+            results: Resultados del pipeline.
+            source: Origen (api, watcher).
+        """
+        updates: List[_Update] = []
+        timings = results.get("timings") or {}
+        files = results.get("files")
+
+        if files is None:
+            if results.get("errors"):
+                status = "failed"
+            else:
+                status = "completed" if results.get("total_rows") else "empty"
+            self._file_updates(updates, timings, results.get("total_rows", 0), status, source)
+        else:
+            for file_result in files:
+                self._file_updates(
+                    updates,
+                    file_result.get("timings") or {},
+                    file_result.get("rows", 0),
+                    file_result.get("status", "completed"),
+                    source
+                )
+
+            # Etapas que solo existen a nivel de lote
+            for stage in ("dedup", "export"):
+                values = timings.get("stages", {}).get(stage)
+                if values:
+                    self._histogram(updates, "pdf2sheet_stage_seconds", values["seconds"], stage=stage)
+            self._counter(updates, "pdf2sheet_output_bytes_total", timings.get("output_bytes", 0), source=source)
+
+        self._apply(updates)
+
+    def _file_updates(
+        self,
+        updates: List[_Update],
+        timings: Dict[str, Any],
+        rows: int,
+        status: str,
+        source: str
+    ) -> None:
+        """Agrega los incrementos correspondientes a un PDF."""
+        stages = timings.get("stages", {})
+
+        self._counter(updates, "pdf2sheet_files_total", 1, source=source, status=status)
+        self._counter(updates, "pdf2sheet_pages_total", timings.get("pages", 0), source=source)
+        self._counter(updates, "pdf2sheet_rows_total", rows, source=source)
+        self._counter(updates, "pdf2sheet_ocr_pages_total", stages.get("ocr", {}).get("pages", 0), source=source)
+        self._counter(updates, "pdf2sheet_input_bytes_total", timings.get("input_bytes", 0), source=source)
+        self._counter(updates, "pdf2sheet_output_bytes_total", timings.get("output_bytes", 0), source=source)
+
+        failures = dict(timings.get("failures", {}))
+        if status == "failed" and not failures:
+            failures = {"unknown": 1}
+        for stage, count in failures.items():
+            self._counter(updates, "pdf2sheet_failures_total", count, source=source, stage=stage)
+
+        for stage, values in stages.items():
+            self._histogram(updates, "pdf2sheet_stage_seconds", values["seconds"], stage=stage)
+
+        if stages:
+            self._histogram(updates, "pdf2sheet_file_seconds", timings.get("total_seconds", 0.0), source=source)
+
+    def snapshot(self) -> Dict[Tuple[str, str], float]:
+        """Valores actuales: {(serie, etiquetas): valor}."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT name, labels, value FROM metrics").fetchall()
+        return {(name, labels): value for name, labels, value in rows}
+
+    def render(self, gauges: Optional[Gauges] = None) -> str:
+        """
+        Genera el texto de exposicion de Prometheus.
+
+        Args:
+            gauges: Valores instantaneos calculados por el llamador
+                (p.ej. trabajos por estado).
+
+        Returns:
+            Texto en formato de exposicion 0.0.4.
+        """
+        series: Dict[str, List[Tuple[str, str, float]]] = {}
+
+        for (name, labels), value in self.snapshot().items():
+            base = name
+            for suffix in ("_bucket", "_sum", "_count"):
+                if name.endswith(suffix) and name[:-len(suffix)] in METRICS:
+                    base = name[:-len(suffix)]
+            series.setdefault(base, []).append((name, labels, value))
+
+        for name, samples in (gauges or {}).items():
+            series[name] = [(name, format_labels(labels), value) for labels, value in samples]
+
+        # Los buckets nunca incrementados se exponen en 0 (serie completa)
+        for base, samples in series.items():
+            if METRICS.get(base, ("",))[0] != "histogram":
+                continue
+            present = {(name, labels) for name, labels, _ in samples}
+            for name, labels, _ in list(samples):
+                if name != f"{base}_count":
+                    continue
+                prefix = labels + "," if labels else ""
+                for bound in METRICS[base][2] + (float("inf"),):
+                    bucket_labels = f'{prefix}le="{_format_bound(bound)}"'
+                    if (f"{base}_bucket", bucket_labels) not in present:
+                        samples.append((f"{base}_bucket", bucket_labels, 0))
+
+        lines = []
+        for base in sorted(series):
+            metric_type, description, _ = METRICS.get(base, ("untyped", base, ()))
+            lines.append(f"# HELP {base} {description}")
+            lines.append(f"# TYPE {base} {metric_type}")
+
+            for name, labels, value in sorted(series[base], key=_sample_order):
+                sample = f"{name}{{{labels}}}" if labels else name
+                lines.append(f"{sample} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _sample_order(sample: Tuple[str, str, float]) -> Tuple[Any, ...]:
+    """Ordena muestras por serie, etiquetas y limite ``le`` numerico."""
+    name, labels, _ = sample
+    base_labels, _, bound = labels.partition('le="')
+    bound = bound.rstrip('"')
+    numeric = float("inf") if bound == "+Inf" else float(bound) if bound else 0.0
+    return (name, base_labels, numeric)
+
+
+def serve_metrics(
+    render: Callable[[], str],
+    port: int,
+    host: str = "0.0.0.0"
+) -> ThreadingHTTPServer:
+    """
+    Expone ``/metrics`` en un hilo de fondo (procesos sin API, p.ej. el watcher).
+
+    Args:
+        render: Funcion que retorna el texto de exposicion.
+        port: Puerto HTTP.
+        host: Interfaz donde escuchar.
+
+    Returns:
+        El servidor (``shutdown()`` para detenerlo).
+    """
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/metrics", "/api/metrics"):
+                self.send_error(404)
+                return
+
+            body = render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
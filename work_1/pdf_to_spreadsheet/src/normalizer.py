@@ -13,6 +13,72 @@ from dateutil import parser as date_parser
 from loguru import logger
 
 
+# Simbolos de moneda a eliminar
+CURRENCY_SYMBOLS = ["$", "USD", "MXN", "EUR", "COP", "ARS", "CLP"]
+
+
+def parse_number(value: str) -> Optional[float]:
+    """
+    Convierte un numero/moneda en formato americano o europeo a float.
+    
+    "1,234.56", "1.234,56", "1234,56", "$ 1,500" y "USD 500.00" son
+    validos; con un solo tipo de separador, una coma seguida de 1 o 2
+    digitos es decimal y varios separadores iguales son de miles.
+    
+    Args:
+        value: Numero en formato original.
+        
+    Returns:
+        Numero como float o None si no se puede parsear.
+    """
+    if not value:
+        return None
+    
+    # Limpiar simbolos de moneda
+    clean = value
+    for symbol in CURRENCY_SYMBOLS:
+        clean = clean.replace(symbol, "")
+    
+    # Limpiar espacios
+    clean = clean.strip()
+    
+    # Contar comas y puntos
+    comma_count = clean.count(",")
+    dot_count = clean.count(".")
+    
+    if comma_count == 1 and dot_count == 0:
+        if re.search(r',\d{1,2}$', clean):
+            # Formato europeo: 1234,56
+            clean = clean.replace(",", ".")
+        else:
+            # Separador de miles: 1,500
+            clean = clean.replace(",", "")
+    elif dot_count == 1 and comma_count == 0:
+        # Formato americano: 1234.56 (ya esta bien)
+        pass
+    elif comma_count >= 1 and dot_count >= 1:
+        # Formato mixto: determinar cual es decimal
+        last_comma = clean.rfind(",")
+        last_dot = clean.rfind(".")
+        
+        if last_comma > last_dot:
+            # Coma es decimal: 1.234,56 -> 1234.56
+            clean = clean.replace(".", "").replace(",", ".")
+        else:
+            # Punto es decimal: 1,234.56 -> 1234.56
+            clean = clean.replace(",", "")
+    else:
+        # Multiples del mismo separador: asumir miles
+        clean = clean.replace(",", "").replace(".", "")
+    
+    # Parsear como float
+    try:
+        return float(clean)
+    except ValueError:
+        logger.debug(f"No se pudo parsear numero: {value}")
+        return None
+
+
 class DataNormalizer:
     """
     Normaliza y limpia datos extraidos de PDFs.
@@ -32,9 +98,6 @@ class DataNormalizer:
         "octubre": "October", "noviembre": "November", "diciembre": "December"
     }
     
-    # Simbolos de moneda a eliminar
-    CURRENCY_SYMBOLS = ["$", "USD", "MXN", "EUR", "COP", "ARS", "CLP"]
-    
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """
         Inicializa el normalizador.
@@ -199,7 +262,7 @@ class DataNormalizer:
         # Por patron (numero con posibles separadores y simbolos de moneda)
         # Limpiar simbolos de moneda primero
         clean_value = value
-        for symbol in self.CURRENCY_SYMBOLS:
+        for symbol in CURRENCY_SYMBOLS:
             clean_value = clean_value.replace(symbol, "").strip()
         
         # Patron numerico
@@ -255,53 +318,7 @@ class DataNormalizer:
         Returns:
             Numero como float o None si no se puede parsear.
         """
-        if not value:
-            return None
-        
-        # Limpiar simbolos de moneda
-        clean = value
-        for symbol in self.CURRENCY_SYMBOLS:
-            clean = clean.replace(symbol, "")
-        
-        # Limpiar espacios
-        clean = clean.strip()
-        
-        # Determinar formato (europeo vs americano)
-        # Si tiene coma seguida de exactamente 2 digitos al final, es decimal
-        # Si tiene punto seguido de exactamente 2 digitos al final, es decimal
-        
-        # Contar comas y puntos
-        comma_count = clean.count(",")
-        dot_count = clean.count(".")
-        
-        if comma_count == 1 and dot_count == 0:
-            # Formato europeo: 1234,56
-            if re.search(r',\d{1,2}$', clean):
-                clean = clean.replace(",", ".")
-        elif dot_count == 1 and comma_count == 0:
-            # Formato americano: 1234.56 (ya esta bien)
-            pass
-        elif comma_count >= 1 and dot_count >= 1:
-            # Formato mixto: determinar cual es decimal
-            last_comma = clean.rfind(",")
-            last_dot = clean.rfind(".")
-            
-            if last_comma > last_dot:
-                # Coma es decimal: 1.234,56 -> 1234.56
-                clean = clean.replace(".", "").replace(",", ".")
-            else:
-                # Punto es decimal: 1,234.56 -> 1234.56
-                clean = clean.replace(",", "")
-        else:
-            # Multiples del mismo separador: asumir miles
-            clean = clean.replace(",", "").replace(".", "")
-        
-        # Parsear como float
-        try:
-            return float(clean)
-        except ValueError:
-            logger.debug(f"No se pudo parsear numero: {value}")
-            return None
+        return parse_number(value)
     
     def _normalize_text(self, value: str) -> str:
         """
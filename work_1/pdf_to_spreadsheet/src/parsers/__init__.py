@@ -11,6 +11,7 @@ from .base_parser import BaseParser
 from .invoice_parser import InvoiceParser
 from .report_parser import ReportParser
 from .financial_report_parser import FinancialReportParser
+from .classifier import DocumentClassifier
 
 
 # Available parsers registry
@@ -46,6 +47,9 @@ def detect_parser_type(extracted_data: Dict[str, Any], config: Dict[str, Any]) -
     """
     Automatically detect the appropriate parser type.
     
+    Builds a ``DocumentClassifier`` on every call; callers classifying many
+    documents should build one classifier and reuse it.
+    
     Args:
         extracted_data: Extracted data from PDF.
         config: Global configuration.
@@ -53,46 +57,7 @@ def detect_parser_type(extracted_data: Dict[str, Any], config: Dict[str, Any]) -
     Returns:
         Detected parser name.
     """
-    text = extracted_data.get("text", "").lower()
-    tables = extracted_data.get("tables", [])
-    
-    # Check for financial report keywords first
-    financial_keywords = [
-        "estados financieros", "financial statements", 
-        "balance general", "balance sheet",
-        "estado de resultados", "income statement",
-        "patrimonio", "stockholders equity",
-        "activo", "pasivo", "assets", "liabilities"
-    ]
-    financial_matches = sum(1 for kw in financial_keywords if kw in text)
-    if financial_matches >= 3:
-        return "financial_report"
-    
-    parsers_config = config.get("parsers", {})
-    
-    # Check keywords for each parser
-    for parser_name, parser_cfg in parsers_config.items():
-        if not parser_cfg.get("enabled", True):
-            continue
-        
-        if not parser_cfg.get("auto_detect", True):
-            continue
-        
-        keywords = parser_cfg.get("keywords", [])
-        
-        # Count keyword matches
-        matches = sum(1 for kw in keywords if kw.lower() in text)
-        
-        # If enough matches, use this parser
-        if matches >= 2:
-            return parser_name
-    
-    # If there are tables, use report parser
-    if tables:
-        return "report"
-    
-    # Default to invoice
-    return "invoice"
+    return DocumentClassifier(config).detect(extracted_data)
 
 
 __all__ = [
@@ -101,6 +66,7 @@ __all__ = [
     "ReportParser",
     "FinancialReportParser",
     "get_parser",
+    "DocumentClassifier",
     "detect_parser_type",
     "PARSERS",
 ]
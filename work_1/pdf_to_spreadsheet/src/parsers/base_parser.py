@@ -5,9 +5,10 @@ Base Parser
 Clase base abstracta para todos los parsers de documentos.
 """
 
+import heapq
 import re
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Sequence, Union
 
 from loguru import logger
 
@@ -29,6 +30,11 @@ class BaseParser(ABC):
     # Campos obligatorios (sobreescribir en subclases)
     REQUIRED_FIELDS: List[str] = []
     
+    # Demanda de extraccion (sobreescribir en subclases): paginas a leer
+    # (None = todas) y si el parser usa tablas
+    MAX_PAGES: Optional[int] = None
+    NEEDS_TABLES: bool = True
+    
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """
         Inicializa el parser.
@@ -48,6 +54,9 @@ class BaseParser(ABC):
             extracted_data: Diccionario con:
                 - text: Texto extraido del PDF
                 - tables: Lista de tablas extraidas
+                - pages: Cajas de palabras por pagina (``number``,
+                  ``width``, ``height``, ``words`` con ``text``, ``x0``,
+                  ``top``, ``x1``, ``bottom``); vacio sin pdfplumber
                 - metadata: Metadatos del documento
                 
         Returns:
@@ -55,6 +64,27 @@ class BaseParser(ABC):
         """
         pass
     
+    def extraction_needs(self) -> Dict[str, Any]:
+        """
+        Declara lo que el parser necesita de la extraccion.
+        
+        Con el tipo de parser conocido de antemano, la extraccion lee
+        paginas solo hasta cubrir estas necesidades.
+        
+        Returns:
+            Diccionario con:
+                - max_pages: Paginas a leer como maximo (None = todas;
+                  configurable con ``max_pages`` en la seccion del parser)
+                - tables: Si se deben buscar tablas
+                - stop_when: Funcion que recibe el texto leido hasta ahora
+                  y retorna True si ya basta (None = leer todo)
+        """
+        return {
+            "max_pages": self.config.get("max_pages", self.MAX_PAGES),
+            "tables": self.NEEDS_TABLES,
+            "stop_when": None,
+        }
+    
     def get_validation_rules(self) -> Dict[str, Any]:
         """
         Retorna las reglas de validacion para este parser.
@@ -108,18 +138,72 @@ class BaseParser(ABC):
         try:
             match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
             if match:
-                # If group specified, use that group
-                if group > 0:
-                    return match.group(group).strip()
-                # Otherwise, find first non-empty group
-                for g in match.groups():
-                    if g and g.strip():
-                        return g.strip()
+                return _match_value(match, group, default)
         except (re.error, IndexError) as e:
             logger.debug(f"Error extracting pattern '{pattern}': {e}")
         
         return default
     
+    def extract_fields(
+        self,
+        text: str,
+        patterns: Dict[str, str],
+        labels: Optional[Dict[str, Sequence[str]]] = None
+    ) -> Dict[str, Optional[str]]:
+        """
+        Extrae varios campos con un indice de etiquetas del texto.
+        
+        Da el mismo resultado que ``extract_pattern`` por cada campo (el
+        primer match de cada patron), pero en vez de recorrer el texto con
+        cada expresion regular (que prueba el patron en cada posicion) se
+        ubican una vez las etiquetas en el texto en minusculas y cada
+        patron se prueba solo donde empieza una de sus etiquetas.
+        
+        Args:
+            text: Texto donde buscar.
+            patterns: Patron regex de cada campo.
+            labels: Etiquetas (en minusculas) con las que empieza cualquier
+                match del patron de cada campo, p.ej. ``("total", "grand")``.
+                Los campos sin etiquetas se buscan con ``extract_pattern``.
+            
+        Returns:
+            Valor de cada campo (None si no hay match).
+        """
+        labels = labels or {}
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # Algun caracter cambia de largo al pasar a minusculas: las
+            # posiciones no coinciden
+            labels = {}
+        
+        positions: Dict[str, List[int]] = {}
+        result: Dict[str, Optional[str]] = {}
+        
+        for field, pattern in patterns.items():
+            field_labels = labels.get(field)
+            if not field_labels:
+                result[field] = self.extract_pattern(text, pattern)
+                continue
+            
+            result[field] = None
+            try:
+                compiled = re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+            except re.error as e:
+                logger.debug(f"Error extracting pattern '{pattern}': {e}")
+                continue
+            
+            for label in field_labels:
+                if label not in positions:
+                    positions[label] = _find_all(lowered, label)
+            
+            for position in heapq.merge(*(positions[label] for label in field_labels)):
+                match = compiled.match(text, position)
+                if match:
+                    result[field] = _match_value(match)
+                    break
+        
+        return result
+    
     def extract_all_patterns(
         self,
         text: str,
@@ -197,6 +281,10 @@ class BaseParser(ABC):
         """
         Limpia texto de caracteres no deseados.
         
+        Los saltos de linea se conservan (un renglon por linea, sin
+        renglones vacios) para que los patrones puedan anclarse a cada
+        renglon; dentro de cada renglon los espacios se normalizan a uno.
+        
         Args:
             text: Texto a limpiar.
             
@@ -209,10 +297,10 @@ class BaseParser(ABC):
         # Eliminar caracteres de control
         text = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]', '', text)
         
-        # Normalizar espacios
-        text = re.sub(r'\s+', ' ', text)
+        # Normalizar espacios dentro de cada renglon
+        lines = (" ".join(line.split()) for line in text.splitlines())
         
-        return text.strip()
+        return "\n".join(line for line in lines if line)
     
     def split_into_sections(
         self,
@@ -248,3 +336,25 @@ class BaseParser(ABC):
             sections[section_name] = text[start:end].strip()
         
         return sections
+
+
+def _match_value(match: "re.Match[str]", group: int = 0, default: Optional[str] = None) -> Optional[str]:
+    """Valor de un match: el grupo indicado o el primer grupo no vacio."""
+    if group > 0:
+        return match.group(group).strip()
+    
+    for g in match.groups():
+        if g and g.strip():
+            return g.strip()
+    
+    return default
+
+
+def _find_all(text: str, literal: str) -> List[int]:
+    """Posiciones de todas las apariciones de ``literal`` en ``text``."""
+    found = []
+    position = text.find(literal)
+    while position != -1:
+        found.append(position)
+        position = text.find(literal, position + 1)
+    return found
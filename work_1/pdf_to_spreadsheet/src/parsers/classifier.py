@@ -0,0 +1,179 @@
+"""
+Document Classifier
+===================
+
+Clasifica un documento por las palabras clave de su inicio.
+
+Las palabras clave de todos los parsers se reunen una vez (sin repetir
+las compartidas) y se buscan solo en los primeros ``sample_kb`` KB del
+texto, pasados a minusculas una vez (suficiente para la primera pagina o
+dos, donde estan titulos y encabezados), en vez de recorrer todo el
+documento por cada palabra y cada parser. Como solo mira el inicio,
+sirve tambien con el texto de la primera pagina antes de extraer el
+resto.
+
+La busqueda es ``palabra in muestra`` por cada palabra distinta: en
+CPython la busqueda de subcadenas es mas rapida que una expresion
+regular combinada (que prueba la alternancia en cada posicion) y
+encuentra tambien las palabras contenidas en otras ("total" en
+"subtotal").
+
+Cada parser suma el peso de sus palabras encontradas (1 por defecto) y
+gana el de mayor puntaje que alcance su umbral.
+"""
+
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Set, Tuple
+
+
+# Los estados financieros tienen prioridad sobre los demas parsers
+FINANCIAL_KEYWORDS = (
+    "estados financieros", "financial statements",
+    "balance general", "balance sheet",
+    "estado de resultados", "income statement",
+    "patrimonio", "stockholders equity",
+    "activo", "pasivo", "assets", "liabilities"
+)
+FINANCIAL_THRESHOLD = 3
+
+# Puntaje minimo por defecto de un parser configurado
+DEFAULT_THRESHOLD = 2
+
+# KB de texto que se revisan por defecto
+DEFAULT_SAMPLE_KB = 32
+
+
+def _keyword_weights(keywords: Any) -> Dict[str, float]:
+    """Normaliza ``keywords`` (lista, o mapa palabra -> peso) a minusculas."""
+    if isinstance(keywords, Mapping):
+        items = keywords.items()
+    else:
+        items = ((keyword, 1) for keyword in keywords or [])
+
+    weights: Dict[str, float] = {}
+    for keyword, weight in items:
+        keyword = str(keyword).lower()
+        if keyword:
+            weights[keyword] = float(weight)
+    return weights
+
+
+class DocumentClassifier:
+    """
+    Elige el parser de un documento a partir de sus palabras clave.
+
+    Se construye una vez desde la configuracion; ``classify`` y ``scores``
+    se pueden llamar con el texto completo o solo con el de la primera
+    pagina.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Reune las palabras clave de los parsers habilitados.
+
+        Args:
+            config: Configuracion global (``parsers`` y ``detection``).
+        """
+        detection = config.get("detection", {})
+        self.sample_chars = int(detection.get("sample_kb", DEFAULT_SAMPLE_KB) * 1024)
+
+        # (parser, {palabra: peso}, umbral) en el orden de la configuracion
+        self.rules: List[Tuple[str, Dict[str, float], float]] = [
+            ("financial_report", _keyword_weights(FINANCIAL_KEYWORDS), FINANCIAL_THRESHOLD)
+        ]
+
+        for parser_name, parser_cfg in config.get("parsers", {}).items():
+            if not parser_cfg.get("enabled", True):
+                continue
+
+            if not parser_cfg.get("auto_detect", True):
+                continue
+
+            self.rules.append((
+                parser_name,
+                _keyword_weights(parser_cfg.get("keywords", [])),
+                parser_cfg.get("detect_threshold", DEFAULT_THRESHOLD)
+            ))
+
+        self._keywords: FrozenSet[str] = frozenset(
+            keyword for _, weights, _ in self.rules for keyword in weights
+        )
+
+    def found_keywords(self, text: str) -> Set[str]:
+        """
+        Palabras clave presentes en el inicio del texto.
+
+        Args:
+            text: Texto del documento (o de su primera pagina).
+
+        Returns:
+            Conjunto de palabras clave (en minusculas) encontradas.
+        """
+        sample = text[:self.sample_chars].lower()
+        return {keyword for keyword in self._keywords if keyword in sample}
+
+    def scores(self, text: str) -> Dict[str, float]:
+        """
+        Puntaje de cada parser para el texto.
+
+        Args:
+            text: Texto del documento (o de su primera pagina).
+
+        Returns:
+            Diccionario parser -> suma de pesos de sus palabras encontradas.
+        """
+        found = self.found_keywords(text)
+        return {
+            name: sum(weight for keyword, weight in weights.items() if keyword in found)
+            for name, weights, _ in self.rules
+        }
+
+    def classify(self, text: str) -> Optional[str]:
+        """
+        Parser decidido por las palabras clave.
+
+        Los estados financieros ganan si alcanzan su umbral; si no, gana
+        el parser de mayor puntaje que alcance el suyo (el primero de la
+        configuracion en caso de empate).
+
+        Args:
+            text: Texto del documento (o de su primera pagina).
+
+        Returns:
+            Nombre del parser, o None si ninguno alcanza su umbral.
+        """
+        scores = self.scores(text)
+        best: Optional[str] = None
+
+        for name, _, threshold in self.rules:
+            score = scores[name]
+            if score < threshold:
+                continue
+            if name == "financial_report":
+                return name
+            if best is None or score > scores[best]:
+                best = name
+
+        return best
+
+    def detect(self, extracted_data: Mapping[str, Any]) -> str:
+        """
+        Parser para los datos extraidos.
+
+        Sin palabras clave decisivas, un documento con tablas va al parser
+        de reportes y el resto al de facturas. Las tablas solo se consultan
+        en ese caso (con extraccion perezosa no se buscan si no hace falta).
+
+        Args:
+            extracted_data: Datos extraidos (``text`` y ``tables``).
+
+        Returns:
+            Nombre del parser.
+        """
+        parser_type = self.classify(extracted_data.get("text", ""))
+        if parser_type:
+            return parser_type
+
+        if extracted_data.get("tables", []):
+            return "report"
+
+        return "invoice"
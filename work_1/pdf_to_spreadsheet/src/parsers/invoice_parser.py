@@ -6,10 +6,11 @@ Parser especializado para facturas y documentos fiscales.
 """
 
 import re
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 from loguru import logger
 
+from ..normalizer import parse_number
 from .base_parser import BaseParser
 
 
@@ -57,17 +58,71 @@ class InvoiceParser(BaseParser):
         "client": r"(?:cliente|customer|comprador|receptor)\s*[:.]?\s*(.+?)(?:\n|$)",
     }
     
-    # Patrones para detectar lineas de items
+    # Etiquetas con las que empieza cada patron: los patrones del
+    # encabezado solo se prueban donde aparece una (ver extract_fields)
+    FIELD_LABELS = {
+        "invoice_id": ("factura", "invoice", "folio", "no", "#"),
+        "date": ("fecha", "date", "emision"),
+        "vendor": ("proveedor", "vendor", "emisor", "razon social"),
+        "tax_id": ("rfc", "nif", "cif", "tax"),
+        "subtotal": ("sub",),
+        "tax": ("iva", "tax", "impuesto"),
+        "total": ("total", "grand", "importe"),
+        "client": ("cliente", "customer", "comprador", "receptor"),
+    }
+    
+    # Campos del encabezado en orden ("date_long" solo si no hay "date")
+    HEADER_FIELDS = ("invoice_id", "date", "vendor", "client", "tax_id", "subtotal", "tax", "total")
+    
+    # Patrones para detectar lineas de items, anclados a un renglon del
+    # texto limpio (espacios simples, sin cruzar saltos de linea): el costo
+    # es lineal en el largo del texto. Los importes aceptan coma o punto
+    # como decimal o de miles (1,234.56 y 1.234,56; ver ``parse_number``)
     ITEM_PATTERNS = {
         # Patron: cantidad, descripcion, precio unitario, total linea
-        "full_line": r"(\d+)\s+(.+?)\s+\$?([\d,\.]+)\s+\$?([\d,\.]+)",
+        "full_line": r"^(\d{1,6}) (.+) \$? ?(\d(?:[\d.,]*\d)?) \$? ?(\d(?:[\d.,]*\d)?)$",
         
         # Patron alternativo: descripcion y total
-        "simple_line": r"(.+?)\s+\$?([\d,\.]+)\s*$",
+        "simple_line": r"^(.+) \$? ?(\d(?:[\d.,]*\d)?)$",
     }
     
+    # Renglones mas largos no son items (parrafos sin saltos de linea)
+    MAX_ITEM_LINE = 300
+    
     REQUIRED_FIELDS = ["invoice_id", "date", "total"]
     
+    # Total con importe al inicio de un renglon (no subtotal ni encabezado
+    # de columna): aparece despues de los items, asi que al encontrarlo ya
+    # no faltan paginas
+    FINAL_TOTAL_PATTERN = (
+        r"^\s*(?:total\s*(?:a\s*pagar)?|grand\s*total|importe\s*total)"
+        r"\s*[:.]?\s*\$?\s*\d[\d,]*\.\d{2}\b"
+    )
+    
+    def extraction_needs(self) -> Dict[str, Any]:
+        """Lee paginas solo hasta encontrar los campos obligatorios."""
+        needs = super().extraction_needs()
+        needs["stop_when"] = self.has_required_fields
+        return needs
+    
+    def has_required_fields(self, text: str) -> bool:
+        """
+        Indica si el texto ya contiene los campos obligatorios.
+        
+        Args:
+            text: Texto de las paginas leidas hasta ahora (con saltos de
+                linea).
+            
+        Returns:
+            True si hay numero de factura, fecha y total final.
+        """
+        if not re.search(self.FINAL_TOTAL_PATTERN, text, re.IGNORECASE | re.MULTILINE):
+            return False
+        
+        header_text = self.clean_text(text)
+        fields = self._extract_header_fields(header_text, ("invoice_id", "date"))
+        return bool(fields["date"] and fields["invoice_id"])
+    
     def parse(self, extracted_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         Parsea datos de factura.
@@ -102,34 +157,50 @@ class InvoiceParser(BaseParser):
         
         # Si hay items, calcular totales si faltan
         if items and not invoice_data.get("subtotal"):
-            invoice_data["subtotal"] = sum(
-                float(item.get("line_total", 0) or 0) 
-                for item in items
-            )
+            invoice_data["subtotal"] = self._sum_line_totals(items)
         
         logger.debug(f"Factura parseada: {invoice_data.get('invoice_id', 'N/A')}")
         
         return [invoice_data]
     
-    def _extract_header_fields(self, text: str) -> Dict[str, Any]:
-        """Extrae campos del encabezado de la factura."""
-        result = {}
+    def _sum_line_totals(self, items: List[Dict[str, Any]]) -> Optional[float]:
+        """
+        Suma los importes de los items (coma o punto decimal).
         
-        # Extraer cada campo usando patrones
-        result["invoice_id"] = self.extract_pattern(text, self.PATTERNS["invoice_id"])
+        Returns:
+            Suma de los importes, o None si alguno no es un numero (un
+            subtotal parcial seria incorrecto).
+        """
+        subtotal = 0.0
+        
+        for item in items:
+            line_total = str(item.get("line_total") or "").strip()
+            if not line_total:
+                continue
+            
+            amount = parse_number(line_total)
+            if amount is None:
+                logger.warning(f"Importe de item no numerico, sin subtotal calculado: {line_total!r}")
+                return None
+            subtotal += amount
         
-        # Fecha (intentar varios patrones)
-        date = self.extract_pattern(text, self.PATTERNS["date"])
-        if not date:
-            date = self.extract_pattern(text, self.PATTERNS["date_long"])
-        result["date"] = date
+        return subtotal
+    
+    def _extract_header_fields(
+        self,
+        text: str,
+        fields: Sequence[str] = HEADER_FIELDS
+    ) -> Dict[str, Any]:
+        """Extrae campos del encabezado de la factura (primer match de cada uno)."""
+        result = self.extract_fields(
+            text,
+            {field: self.PATTERNS[field] for field in fields},
+            self.FIELD_LABELS
+        )
         
-        result["vendor"] = self.extract_pattern(text, self.PATTERNS["vendor"])
-        result["client"] = self.extract_pattern(text, self.PATTERNS["client"])
-        result["tax_id"] = self.extract_pattern(text, self.PATTERNS["tax_id"])
-        result["subtotal"] = self.extract_pattern(text, self.PATTERNS["subtotal"])
-        result["tax"] = self.extract_pattern(text, self.PATTERNS["tax"])
-        result["total"] = self.extract_pattern(text, self.PATTERNS["total"])
+        # Fecha (formato largo si no hay fecha numerica)
+        if "date" in result and not result["date"]:
+            result["date"] = self.extract_pattern(text, self.PATTERNS["date_long"])
         
         return result
     
@@ -172,18 +243,24 @@ class InvoiceParser(BaseParser):
         return items
     
     def _extract_items_from_text(self, text: str) -> List[Dict[str, Any]]:
-        """Extrae items del texto cuando no hay tablas."""
-        items = []
+        """
+        Extrae items del texto cuando no hay tablas.
         
-        # Intentar patron de linea completa
-        matches = re.findall(
-            self.ITEM_PATTERNS["full_line"], 
-            text, 
-            re.MULTILINE
-        )
+        Cada renglon del texto limpio (ver ``clean_text``) se prueba por
+        separado contra el patron anclado de linea completa.
+        """
+        items = []
+        full_line = re.compile(self.ITEM_PATTERNS["full_line"])
         
-        for match in matches:
-            qty, desc, unit_price, line_total = match
+        for line in text.split("\n"):
+            if len(line) > self.MAX_ITEM_LINE or not line[:1].isdigit():
+                continue
+            
+            match = full_line.match(line)
+            if not match:
+                continue
+            
+            qty, desc, unit_price, line_total = match.groups()
             items.append({
                 "quantity": qty,
                 "description": desc.strip(),
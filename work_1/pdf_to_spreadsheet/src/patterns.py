@@ -0,0 +1,196 @@
+"""
+Pattern Guard
+=============
+
+Compilacion y control de tiempo de los patrones regex de la configuracion.
+
+Las reglas de validacion (``parsers.*.validation.*.pattern``) aceptan
+expresiones regulares arbitrarias que se evaluan en cada fila; un patron
+con retroceso catastrofico (p.ej. ``(a+)+$``) puede colgar el pipeline.
+
+- Al iniciar, ``check_config_patterns`` compila todos los patrones (un
+  patron invalido es un error de configuracion) y los mide contra un
+  corpus de entradas adversas de largo creciente; los que exceden
+  ``pattern_warn_ms`` se reportan como patologicos.
+- En ejecucion, ``match_pattern`` usa el modulo ``regex`` (opcional) con
+  un limite de tiempo por evaluacion; sin ``regex`` se usa ``re`` sin
+  limite y solo queda la advertencia del inicio.
+"""
+
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+try:
+    import regex
+    REGEX_AVAILABLE = True
+except ImportError:
+    REGEX_AVAILABLE = False
+
+
+# Tiempo maximo de una evaluacion en ejecucion (solo con ``regex``)
+DEFAULT_TIMEOUT_MS = 250
+
+# Tiempo a partir del cual un patron se considera patologico al iniciar
+DEFAULT_WARN_MS = 50
+
+# Entradas adversas: una unidad repetida y un final que no coincide, que
+# fuerzan a los patrones con cuantificadores anidados o solapados a
+# probar todas las particiones
+ADVERSARIAL_UNITS = ("a", "1", " ", "a ", "1,", "-", "ab")
+ADVERSARIAL_LENGTHS = (8, 12, 16, 20, 24, 28, 32, 64, 256, 1024, 4096)
+ADVERSARIAL_TAIL = "!\n"
+
+# Patrones compilados: patron -> objeto compilado (``regex`` o ``re``)
+_compiled: Dict[str, Any] = {}
+
+# Patrones ya medidos en este proceso (los procesos hijos lo heredan)
+_checked: Dict[str, float] = {}
+
+
+def compile_pattern(pattern: str) -> Any:
+    """
+    Compila un patron una sola vez por proceso.
+
+    Args:
+        pattern: Expresion regular.
+
+    Returns:
+        Patron compilado con ``regex`` si esta instalado, si no con ``re``.
+
+    Raises:
+        re.error: Si el patron no es valido.
+    """
+    compiled = _compiled.get(pattern)
+    if compiled is None:
+        # Se valida siempre con re: es la sintaxis documentada
+        re_compiled = re.compile(pattern)
+        compiled = regex.compile(pattern) if REGEX_AVAILABLE else re_compiled
+        _compiled[pattern] = compiled
+    return compiled
+
+
+def match_pattern(pattern: str, text: str, timeout_ms: Optional[float] = DEFAULT_TIMEOUT_MS) -> bool:
+    """
+    Indica si el patron coincide al inicio del texto (como ``re.match``).
+
+    Args:
+        pattern: Expresion regular.
+        text: Texto a evaluar.
+        timeout_ms: Limite de tiempo de la evaluacion (solo con ``regex``;
+            None o 0 = sin limite).
+
+    Returns:
+        True si coincide.
+
+    Raises:
+        TimeoutError: Si la evaluacion excede ``timeout_ms``.
+        re.error: Si el patron no es valido.
+    """
+    compiled = compile_pattern(pattern)
+
+    if REGEX_AVAILABLE and timeout_ms:
+        return compiled.match(text, timeout=timeout_ms / 1000) is not None
+
+    return compiled.match(text) is not None
+
+
+def config_patterns(config: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """
+    Patrones regex de las reglas de validacion de la configuracion.
+
+    Args:
+        config: Configuracion global.
+
+    Returns:
+        Lista de (ubicacion en la configuracion, patron).
+    """
+    found = []
+    for parser_name, parser_cfg in (config.get("parsers") or {}).items():
+        if not isinstance(parser_cfg, dict):
+            continue
+        for field, rules in (parser_cfg.get("validation") or {}).items():
+            if isinstance(rules, dict) and isinstance(rules.get("pattern"), str):
+                found.append((f"parsers.{parser_name}.validation.{field}.pattern", rules["pattern"]))
+    return found
+
+
+def pattern_cost_ms(pattern: str, budget_ms: float = DEFAULT_WARN_MS) -> float:
+    """
+    Mide el peor tiempo del patron sobre el corpus de entradas adversas.
+
+    El largo de las entradas crece hasta que una evaluacion excede
+    ``budget_ms``, de modo que un patron exponencial se detecta en
+    entradas cortas sin colgar el arranque.
+
+    Args:
+        pattern: Expresion regular (ya valida).
+        budget_ms: Tiempo a partir del cual se deja de medir.
+
+    Returns:
+        Peor tiempo de una evaluacion en milisegundos.
+    """
+    compiled = compile_pattern(pattern)
+    timeout = {"timeout": budget_ms * 4 / 1000} if REGEX_AVAILABLE else {}
+    worst = 0.0
+
+    for unit in ADVERSARIAL_UNITS:
+        for length in ADVERSARIAL_LENGTHS:
+            text = unit * length + ADVERSARIAL_TAIL
+            started = time.perf_counter()
+            try:
+                compiled.match(text, **timeout)
+                compiled.search(text, **timeout)
+            except TimeoutError:
+                pass
+            elapsed = (time.perf_counter() - started) * 1000
+            worst = max(worst, elapsed)
+
+            if elapsed > budget_ms:
+                return worst
+
+    return worst
+
+
+def check_config_patterns(config: Dict[str, Any]) -> List[str]:
+    """
+    Compila y mide los patrones de la configuracion al iniciar.
+
+    Args:
+        config: Configuracion global (``validation.pattern_warn_ms``).
+
+    Returns:
+        Advertencias de patrones patologicos (tambien se registran).
+
+    Raises:
+        ValueError: Si algun patron no es una expresion regular valida.
+    """
+    warn_ms = config.get("validation", {}).get("pattern_warn_ms", DEFAULT_WARN_MS)
+    warnings = []
+
+    for location, pattern in config_patterns(config):
+        try:
+            compile_pattern(pattern)
+        except re.error as e:
+            raise ValueError(f"Patron invalido en {location}: {e}") from e
+
+        if not warn_ms:
+            continue
+
+        if pattern not in _checked:
+            _checked[pattern] = pattern_cost_ms(pattern, warn_ms)
+
+        cost = _checked[pattern]
+        if cost > warn_ms:
+            message = (
+                f"Patron posiblemente patologico en {location} ({pattern!r}): "
+                f"{cost:.0f} ms con una entrada adversa"
+            )
+            if not REGEX_AVAILABLE:
+                message += "; instale 'regex' para limitar su tiempo por evaluacion"
+            logger.warning(message)
+            warnings.append(message)
+
+    return warnings
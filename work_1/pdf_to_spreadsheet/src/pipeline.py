@@ -5,24 +5,47 @@ Main Pipeline
 Orquesta el proceso completo de extraccion de datos de PDFs.
 """
 
+import hashlib
+import json
+import os
+import queue
 import time
+from contextlib import contextmanager
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Sized, Tuple, Union
 
 from loguru import logger
 
-from .parsers import get_parser, detect_parser_type
+from .parsers import DocumentClassifier, get_parser
 from .extractors.text_extractor import TextExtractor
 from .extractors.table_extractor import TableExtractor
 from .extractors.ocr_extractor import OCRExtractor
+from .extractors.document import ExtractedDocument
+from .extractors.layout import TemplateStore
+from .extractors.page_analyzer import PageAnalyzer
+from .discovery import iter_pdfs, largest_first
+from .file_ledger import FileLedger, RowStore, file_signature
+from .isolation import run_isolated
 from .normalizer import DataNormalizer
+from .patterns import check_config_patterns
+from .progress import ProgressCallback, ProgressReporter
+from .timing import FileProfiler, StageTimings
 from .validator import DataValidator
 from .exporters.csv_exporter import CSVExporter
 from .exporters.json_exporter import JSONExporter
 from .exporters.gsheet_exporter import GSheetExporter
 
 
+# Manifiesto del modo incremental y filas por archivo (dentro del directorio de salida)
+MANIFEST_NAME = ".incremental_manifest.jsonl"
+ROWS_NAME = ".incremental_rows.jsonl"
+
+# Secciones de configuracion que no afectan las filas extraidas
+_FINGERPRINT_EXCLUDED = ("logging", "paths", "batch", "output", "discovery", "profiling")
+
+
 class Pipeline:
     """
     Pipeline principal para procesar PDFs.
@@ -58,35 +81,84 @@ class Pipeline:
         
         # Inicializar componentes
         self._init_extractors()
+        self._init_classifier()
         self._init_normalizer()
         self._init_validator()
         self._init_exporter()
+        self._init_profiler()
+        
+        # Reporter de progreso del archivo en curso (solo durante process_file)
+        self._progress: Optional[ProgressReporter] = None
+        
+        # Tiempos por etapa del archivo en curso y del ultimo terminado
+        self._file_timings: Optional[StageTimings] = None
+        self._stage: Optional[str] = None
+        self.last_file_timings: Optional[Dict[str, Any]] = None
+        self.last_file_error: Optional[str] = None
+        
+        # Dentro del subproceso de extraccion: envia etapas y paginas al padre
+        self._event_sink: Optional[Callable[[Any], None]] = None
+        self._forwarded_pages: Optional[Callable[[int, int], None]] = None
+        
+        # Documento del archivo en curso (texto y tablas se calculan bajo demanda)
+        self._document: Optional[ExtractedDocument] = None
         
         # Contadores
+        self.reset_stats()
+    
+    def reset_stats(self) -> None:
+        """Reinicia los contadores (permite reutilizar el pipeline entre trabajos)."""
         self.stats = {
             "total_files": 0,
             "successful_files": 0,
             "total_rows": 0,
             "errors": 0,
-            "warnings": 0
+            "warnings": 0,
+            "timeouts": 0,
+            "table_pages_skipped": 0
         }
+        self.timings = StageTimings()
     
     def _init_extractors(self) -> None:
         """Inicializa los extractores de datos."""
         extraction_config = self.config.get("extraction", {})
+        max_pages = extraction_config.get("max_pages", 100)
         
-        self.text_extractor = TextExtractor()
-        self.table_extractor = TableExtractor()
+        # Plantillas de diseno aprendidas (proveedores recurrentes)
+        templates_config = extraction_config.get("templates", {})
+        template_store = None
+        if templates_config.get("enabled", False):
+            template_store = TemplateStore(
+                templates_config.get("store", "./output/.layout_templates.json")
+            )
+        
+        self.text_extractor = TextExtractor(max_pages=max_pages)
+        self.table_extractor = TableExtractor(
+            max_pages=max_pages,
+            strategy=extraction_config.get("table_strategy", "auto"),
+            learn_pages=extraction_config.get("table_strategy_learn_pages", 3),
+            template_store=template_store,
+            learn_templates=templates_config.get("learn", True),
+            prefilter=extraction_config.get("table_prefilter", True)
+        )
+        
+        # Texto, palabras y tablas en una sola pasada por cada pagina
+        self.page_analyzer = PageAnalyzer(self.text_extractor, self.table_extractor, max_pages=max_pages)
         
         # OCR solo si esta habilitado
         if extraction_config.get("ocr_fallback", True):
             self.ocr_extractor = OCRExtractor(
                 language=extraction_config.get("ocr_language", "spa+eng"),
-                dpi=extraction_config.get("ocr_dpi", 300)
+                dpi=extraction_config.get("ocr_dpi", 300),
+                max_pages=max_pages
             )
         else:
             self.ocr_extractor = None
     
+    def _init_classifier(self) -> None:
+        """Compila las palabras clave de deteccion de parser una sola vez."""
+        self.classifier = DocumentClassifier(self.config)
+    
     def _init_normalizer(self) -> None:
         """Inicializa el normalizador de datos."""
         norm_config = self.config.get("normalization", {})
@@ -94,6 +166,8 @@ class Pipeline:
     
     def _init_validator(self) -> None:
         """Inicializa el validador de datos."""
+        # Compila y mide los patrones de validacion una vez, al iniciar
+        check_config_patterns(self.config)
         val_config = self.config.get("validation", {})
         self.validator = DataValidator(val_config)
     
@@ -111,10 +185,24 @@ class Pipeline:
         format_config = output_config.get(self.output_format, {})
         self.exporter = exporter_class(format_config)
     
+    def _init_profiler(self) -> None:
+        """Inicializa el perfilador por archivo si esta habilitado."""
+        profiling_config = self.config.get("profiling", {})
+        
+        if profiling_config.get("enabled", False):
+            self.profiler = FileProfiler(
+                profiling_config.get("output_dir", "logs/profiles"),
+                tool=profiling_config.get("tool", "cprofile")
+            )
+        else:
+            self.profiler = None
+    
     def process_file(
         self,
         file_path: Union[str, Path],
-        output_dir: Union[str, Path]
+        output_dir: Union[str, Path],
+        progress_callback: Optional[ProgressCallback] = None,
+        latest_output_fallback: bool = True
     ) -> Dict[str, Any]:
         """
         Procesa un archivo PDF individual.
@@ -122,6 +210,11 @@ class Pipeline:
         Args:
             file_path: Ruta al archivo PDF.
             output_dir: Directorio de salida.
+            progress_callback: Funcion opcional que recibe eventos de progreso
+                ({"stage", "progress", "page", "total_pages"}).
+            latest_output_fallback: Si no se exporto nada, reportar como
+                ``output_file`` el archivo mas reciente de ``output_dir``.
+                Debe ser False si otros procesos escriben en esa carpeta.
             
         Returns:
             Diccionario con resultados del procesamiento.
@@ -133,33 +226,37 @@ class Pipeline:
         logger.info(f"Procesando: {file_path.name}")
         
         self.stats["total_files"] += 1
+        self._begin_file(file_path)
         all_data = []
         
+        if progress_callback:
+            self._progress = ProgressReporter(progress_callback)
+        
         try:
-            # 1. Extraccion
-            extracted = self._extract_data(file_path)
+            # 1-2. Extraccion y parsing
+            parsed = self._extract_and_parse(file_path)
             
-            if not extracted.get("text") and not extracted.get("tables"):
+            if parsed is None:
                 logger.warning(f"No se pudo extraer datos de {file_path.name}")
                 self.stats["warnings"] += 1
-                return self._build_results(start_time, output_dir)
+                return self._build_results(start_time, output_dir, fallback=latest_output_fallback)
             
-            # 2. Parsing
-            parser = self._get_parser(extracted)
-            parsed_data = parser.parse(extracted)
+            parsed_data, validation_rules = parsed
             
             if not parsed_data:
                 logger.warning(f"Parser no retorno datos para {file_path.name}")
                 self.stats["warnings"] += 1
-                return self._build_results(start_time, output_dir)
+                return self._build_results(start_time, output_dir, fallback=latest_output_fallback)
             
             # 3. Normalizacion
+            self._report_stage("normalize")
             normalized_data = self.normalizer.normalize(parsed_data)
             
             # 4. Validacion
+            self._report_stage("validate")
             validated_data, validation_errors = self.validator.validate(
                 normalized_data, 
-                parser.get_validation_rules()
+                validation_rules
             )
             
             if validation_errors:
@@ -170,6 +267,7 @@ class Pipeline:
             # 5. Deduplicacion
             dedup_config = self.config.get("deduplication", {})
             if dedup_config.get("enabled", True):
+                self._report_stage("dedup")
                 validated_data = self._deduplicate(validated_data, dedup_config)
             
             all_data = validated_data
@@ -179,150 +277,810 @@ class Pipeline:
             # 6. Exportacion
             output_file = None
             if not self.dry_run and all_data:
+                self._report_stage("export")
                 output_file = self._export_data(all_data, output_dir, file_path.stem)
                 logger.info(f"Exportado a: {output_file}")
             
         except Exception as e:
             logger.error(f"Error procesando {file_path.name}: {e}")
             self.stats["errors"] += 1
+            self._record_failure(e)
             output_file = None
         
-        return self._build_results(start_time, output_dir, output_file)
+        finally:
+            # Notificar fin y soltar el reporter (el pipeline se reutiliza)
+            if self._progress:
+                self._progress.done()
+            self._progress = None
+            self._end_file()
+        
+        return self._build_results(start_time, output_dir, output_file, latest_output_fallback)
     
     def process_directory(
         self,
         input_dir: Union[str, Path],
-        output_dir: Union[str, Path]
+        output_dir: Union[str, Path],
+        max_workers: int = 1,
+        incremental: bool = False,
+        recursive: Optional[bool] = None,
+        include: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None
     ) -> Dict[str, Any]:
         """
         Procesa todos los PDFs en un directorio.
         
+        Los PDFs se descubren de forma perezosa (ver ``src.discovery``) y
+        se procesan a medida que aparecen, empezando por los mas grandes
+        dentro de la ventana ``discovery.order_window``.
+        
         Args:
             input_dir: Directorio con PDFs.
             output_dir: Directorio de salida.
+            max_workers: Procesos en paralelo (1 = secuencial).
+            incremental: Procesar solo PDFs nuevos o modificados
+                (ver ``process_incremental``).
+            recursive: Incluir subdirectorios (default: configuracion).
+            include: Patrones glob a incluir (default: configuracion).
+            exclude: Patrones glob a omitir (default: configuracion).
             
         Returns:
             Diccionario con resultados del procesamiento.
         """
-        start_time = time.time()
         input_dir = Path(input_dir)
         output_dir = Path(output_dir)
         
-        # Encontrar todos los PDFs
-        pdf_files = list(input_dir.glob("*.pdf")) + list(input_dir.glob("*.PDF"))
+        discovery = self.config.get("discovery", {})
+        pdf_files = largest_first(
+            iter_pdfs(
+                input_dir,
+                recursive=discovery.get("recursive", True) if recursive is None else recursive,
+                include=include or discovery.get("include"),
+                exclude=exclude or discovery.get("exclude")
+            ),
+            window=discovery.get("order_window", 1000)
+        )
+        
+        if incremental:
+            return self.process_incremental(pdf_files, output_dir, max_workers=max_workers)
+        
+        results = self.process_files(pdf_files, output_dir, max_workers=max_workers)
         
-        if not pdf_files:
+        if not results["files"]:
             logger.warning(f"No se encontraron PDFs en {input_dir}")
-            return self._build_results(start_time, output_dir)
+        else:
+            logger.info(f"Procesados {len(results['files'])} archivos PDF de {input_dir}")
         
-        logger.info(f"Encontrados {len(pdf_files)} archivos PDF")
+        return results
+    
+    def process_files(
+        self,
+        pdf_files: Iterable[Union[str, Path]],
+        output_dir: Union[str, Path],
+        combine: bool = True,
+        max_workers: int = 1,
+        base_name: Optional[str] = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Procesa un lote de PDFs con deduplicacion sobre todo el lote.
         
-        all_data = []
+        Args:
+            pdf_files: Rutas a los PDFs (lista o iterador; un iterador se
+                consume a medida que se procesa).
+            output_dir: Directorio de salida.
+            combine: True exporta un solo archivo; False uno por PDF.
+            max_workers: Procesos en paralelo (1 = secuencial).
+            base_name: Nombre base del archivo combinado.
+            progress_callback: Funcion llamada con el resultado de cada PDF
+                al terminarlo (filename, status, rows, index, total).
+            
+        Returns:
+            Diccionario con resultados del procesamiento. Incluye
+            ``files`` (resultado por PDF) y ``output_files``.
+        """
+        start_time = time.time()
+        output_dir = Path(output_dir)
         
-        for pdf_file in pdf_files:
-            try:
-                # Procesar cada archivo
-                extracted = self._extract_data(pdf_file)
-                
-                if not extracted.get("text") and not extracted.get("tables"):
-                    logger.warning(f"No se pudo extraer datos de {pdf_file.name}")
-                    self.stats["warnings"] += 1
-                    self.stats["total_files"] += 1
+        rows_by_file, file_results = self._collect_files(pdf_files, max_workers, progress_callback)
+        all_data = [row for rows in rows_by_file for row in rows]
+        
+        output_file, output_files = self._dedup_and_export(all_data, output_dir, combine, base_name)
+        
+        results = self._build_results(start_time, output_dir, output_file)
+        results["files"] = file_results
+        results["output_files"] = output_files
+        
+        return results
+    
+    def process_incremental(
+        self,
+        pdf_files: Iterable[Union[str, Path]],
+        output_dir: Union[str, Path],
+        max_workers: int = 1,
+        base_name: str = "resultado"
+    ) -> Dict[str, Any]:
+        """
+        Procesa solo los PDFs nuevos o modificados desde la ultima ejecucion.
+        
+        Un manifiesto en ``output_dir`` guarda por archivo su firma
+        (tamano, mtime, SHA-256), la huella de configuracion y las claves
+        de deduplicacion de sus filas. Si solo hay archivos nuevos, sus
+        filas (sin las claves ya presentes) se agregan al final del archivo
+        combinado. Si se eliminaron o modificaron archivos, o cambio la
+        configuracion, el archivo se reconstruye con las filas guardadas en
+        ``ROWS_NAME`` (ordenadas por ruta).
+        
+        Args:
+            pdf_files: Todos los PDFs del directorio.
+            output_dir: Directorio de salida.
+            max_workers: Procesos en paralelo (1 = secuencial).
+            base_name: Nombre base (fijo) del archivo combinado.
+        
+        Returns:
+            Diccionario con resultados. ``incremental`` resume cuantos
+            archivos se procesaron, se reutilizaron y se eliminaron, y si
+            el archivo combinado se reconstruyo.
+        """
+        start_time = time.time()
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        
+        manifest = FileLedger(output_dir / MANIFEST_NAME)
+        row_store = RowStore(output_dir / ROWS_NAME)
+        fingerprint = self.config_fingerprint()
+        key_columns = self.config.get("deduplication", {}).get("key_columns", [])
+        
+        current = {os.path.abspath(p): Path(p) for p in pdf_files}
+        reused: List[str] = []
+        signatures: Dict[str, Dict[str, Any]] = {}
+        to_process: List[str] = []
+        
+        for key, pdf_file in current.items():
+            entry = manifest.get(key)
+            
+            # Las entradas sin "keys" son de manifiestos anteriores (con filas)
+            if entry is None or entry.get("fingerprint") != fingerprint or "keys" not in entry:
+                to_process.append(key)
+                continue
+            
+            stat = pdf_file.stat()
+            if not manifest.matches(key, stat.st_size, stat.st_mtime_ns):
+                signature = file_signature(pdf_file)
+                if signature["sha256"] != entry["sha256"]:
+                    signatures[key] = signature
+                    to_process.append(key)
                     continue
                 
-                parser = self._get_parser(extracted)
-                parsed_data = parser.parse(extracted)
-                
-                if parsed_data:
-                    normalized_data = self.normalizer.normalize(parsed_data)
-                    validated_data, validation_errors = self.validator.validate(
-                        normalized_data,
-                        parser.get_validation_rules()
-                    )
-                    
-                    if validation_errors:
-                        for error in validation_errors:
-                            logger.warning(f"Validacion [{pdf_file.name}]: {error}")
-                        self.stats["warnings"] += len(validation_errors)
-                    
-                    # Agregar nombre de archivo fuente
-                    for row in validated_data:
-                        row["_source_file"] = pdf_file.name
-                    
-                    all_data.extend(validated_data)
-                    self.stats["total_rows"] += len(validated_data)
-                    self.stats["successful_files"] += 1
-                
-                self.stats["total_files"] += 1
-                
-            except Exception as e:
-                logger.error(f"Error procesando {pdf_file.name}: {e}")
-                self.stats["errors"] += 1
-                self.stats["total_files"] += 1
+                # Mismo contenido con otro mtime: solo refrescar la firma
+                if not self.dry_run:
+                    manifest.record(key, signature, fingerprint=fingerprint, keys=entry["keys"])
+            
+            reused.append(key)
+        
+        removed = [key for key in manifest.paths() if key not in current]
+        
+        logger.info(
+            f"Incremental: {len(to_process)} PDFs nuevos o modificados, "
+            f"{len(reused)} sin cambios, {len(removed)} eliminados"
+        )
+        
+        for key in to_process:
+            if key not in signatures:
+                signatures[key] = file_signature(current[key])
+        
+        rows_by_file, file_results = self._collect_files(
+            [current[key] for key in to_process], max_workers
+        )
+        
+        # Filas nuevas por archivo; los que ya estaban en el resultado obligan a reconstruir
+        new_rows: Dict[str, List[Dict[str, Any]]] = {}
+        rebuild = bool(removed)
+        
+        for key, rows, file_result in zip(to_process, rows_by_file, file_results):
+            if file_result["status"] == "failed":
+                # Conservar las filas anteriores; se reintentara en la proxima ejecucion
+                if manifest.get(key) is not None:
+                    reused.append(key)
+                continue
+            
+            new_rows[key] = rows
+            if manifest.get(key) is not None:
+                rebuild = True
+            if not self.dry_run:
+                row_store.add(key, rows)
+        
+        exported = None
+        if not rebuild:
+            seen = {digest for key in reused for digest in manifest.get(key)["keys"]}
+            new_data = [row for key in sorted(new_rows) for row in new_rows[key]]
+            exported = self._append_export(new_data, seen, key_columns, output_dir, base_name)
+        
+        if exported is None:
+            rebuild = True
+            exported = self._rebuild_incremental(
+                reused, new_rows, row_store, output_dir, base_name
+            )
+        
+        output_file, output_files = exported
+        
+        # El manifiesto se actualiza despues de exportar: un corte a mitad
+        # de camino deja los archivos como pendientes para la proxima ejecucion
+        if not self.dry_run:
+            for key, rows in new_rows.items():
+                keys = [self._key_digest(row, key_columns) for row in rows]
+                manifest.record(key, signatures[key], fingerprint=fingerprint, keys=keys)
+            for key in removed:
+                manifest.forget(key)
+        
+        results = self._build_results(start_time, output_dir, output_file)
+        results["files"] = file_results
+        results["output_files"] = output_files
+        results["incremental"] = {
+            "processed": len(to_process),
+            "unchanged": len(current) - len(to_process),
+            "removed": len(removed),
+            "rebuilt": rebuild
+        }
+        
+        return results
+    
+    def _append_export(
+        self,
+        new_data: List[Dict[str, Any]],
+        seen: Set[str],
+        key_columns: List[str],
+        output_dir: Path,
+        base_name: str
+    ) -> Optional[Tuple[Optional[Path], List[str]]]:
+        """
+        Agrega al archivo combinado las filas de archivos nuevos.
+        
+        Args:
+            new_data: Filas de los archivos nuevos.
+            seen: Claves (``_key_digest``) de las filas ya exportadas.
+            key_columns: Columnas clave de deduplicacion.
+            output_dir: Directorio de salida.
+            base_name: Nombre base del archivo combinado.
+        
+        Returns:
+            Tupla como ``_dedup_and_export``, o None si el archivo debe
+            reconstruirse (no existe, el formato no admite agregar, hay
+            columnas nuevas o ``keep: last`` reemplazaria filas exportadas).
+        """
+        append = getattr(self.exporter, "append", None)
+        if append is None:
+            return None
+        
+        dedup_config = self.config.get("deduplication", {})
+        if dedup_config.get("enabled", True) and new_data:
+            self.timings.start("dedup")
+            original_count = len(new_data)
+            
+            fresh = []
+            for row in new_data:
+                if self._key_digest(row, key_columns) not in seen:
+                    fresh.append(row)
+                elif dedup_config.get("keep", "first") == "last":
+                    self.timings.stop()
+                    return None
+            
+            new_data = self._deduplicate(fresh, dedup_config)
+            removed = original_count - len(new_data)
+            if removed > 0:
+                logger.info(f"Deduplicacion: eliminadas {removed} filas duplicadas")
+        
+        if self.dry_run:
+            self.timings.stop()
+            return None, []
+        
+        self.timings.start("export")
+        target = output_dir / f"{base_name}.{self.output_format}"
+        size_before = target.stat().st_size if target.exists() else 0
+        output_file = append(new_data, output_dir, base_name)
+        self.timings.stop()
+        
+        if output_file is None:
+            return None
+        
+        self.timings.output_bytes += os.path.getsize(str(output_file)) - size_before
+        logger.info(f"Agregadas {len(new_data)} filas a: {output_file}")
+        return output_file, [str(output_file)]
+    
+    def _rebuild_incremental(
+        self,
+        reused: List[str],
+        new_rows: Dict[str, List[Dict[str, Any]]],
+        row_store: RowStore,
+        output_dir: Path,
+        base_name: str
+    ) -> Tuple[Optional[Path], List[str]]:
+        """
+        Reconstruye el archivo combinado con todas las filas vigentes.
+        
+        Las filas de los archivos sin cambios se leen del almacen de filas;
+        las que falten (almacen borrado) se vuelven a extraer.
+        """
+        rows_by_key = row_store.load(reused)
+        rows_by_key.update(new_rows)
+        
+        missing = [key for key in reused if key not in rows_by_key]
+        if missing:
+            logger.warning(f"Incremental: {len(missing)} PDFs sin filas guardadas, se reprocesan")
+            rows_by_file, _ = self._collect_files([Path(key) for key in missing])
+            rows_by_key.update(zip(missing, rows_by_file))
+        
+        if not self.dry_run:
+            row_store.rewrite({key: rows_by_key[key] for key in sorted(rows_by_key)})
+        
+        all_data = [row for key in sorted(rows_by_key) for row in rows_by_key[key]]
+        return self._dedup_and_export(all_data, output_dir, True, base_name)
+
+    def config_fingerprint(self) -> str:
+        """
+        Huella de la configuracion que afecta las filas extraidas.
+        
+        Si cambia, el modo incremental reprocesa todos los archivos.
+        """
+        relevant = {
+            key: value for key, value in self.config.items()
+            if key not in _FINGERPRINT_EXCLUDED
+        }
+        payload = json.dumps(
+            {"config": relevant, "parser_type": self.parser_type},
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+    
+    def _collect_files(
+        self,
+        pdf_files: Iterable[Union[str, Path]],
+        max_workers: int = 1,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Tuple[List[List[Dict[str, Any]]], List[Dict[str, Any]]]:
+        """
+        Obtiene las filas validadas de cada PDF (en paralelo si corresponde).
+        
+        ``pdf_files`` puede ser un iterador: cada archivo se procesa (o se
+        envia al pool) en cuanto se obtiene. En ese caso ``total`` es None
+        en los avisos de progreso y se completa al terminar.
+        
+        Returns:
+            Tupla (filas por archivo, resultado por archivo), en el orden
+            de ``pdf_files``.
+        """
+        total = len(pdf_files) if isinstance(pdf_files, Sized) else None
+        
+        discovered: List[Path] = []
+        rows_by_file: List[List[Dict[str, Any]]] = []
+        file_results: List[Optional[Dict[str, Any]]] = []
+        
+        def track(files: Iterable[Union[str, Path]]) -> Iterator[Tuple[int, Path]]:
+            for pdf_file in files:
+                discovered.append(Path(pdf_file))
+                rows_by_file.append([])
+                file_results.append(None)
+                yield len(discovered) - 1, discovered[-1]
+        
+        def on_file_done(
+            index: int,
+            rows: List[Dict[str, Any]],
+            error: Optional[str],
+            timings: Optional[Dict[str, Any]] = None
+        ) -> None:
+            rows_by_file[index] = rows
+            if error:
+                status = "failed"
+            else:
+                status = "completed" if rows else "empty"
+            file_results[index] = {
+                "filename": discovered[index].name,
+                "status": status,
+                "rows": len(rows),
+                "error": error,
+                "index": index,
+                "total": total,
+                "timings": timings
+            }
+            if progress_callback:
+                progress_callback(file_results[index])
+        
+        if max_workers > 1 and (total is None or total > 1):
+            self._collect_parallel(track(pdf_files), max_workers, on_file_done)
+        else:
+            for index, pdf_file in track(pdf_files):
+                errors_before = self.stats["errors"]
+                rows = self._collect_rows(pdf_file)
+                error = None
+                if self.stats["errors"] > errors_before:
+                    error = self.last_file_error or "Error de procesamiento"
+                on_file_done(index, rows, error, self.last_file_timings)
+        
+        if total is None:
+            for file_result in file_results:
+                file_result["total"] = len(discovered)
         
+        return rows_by_file, file_results
+    
+    def _dedup_and_export(
+        self,
+        all_data: List[Dict[str, Any]],
+        output_dir: Path,
+        combine: bool = True,
+        base_name: Optional[str] = None
+    ) -> Tuple[Optional[Path], List[str]]:
+        """
+        Deduplica el dataset completo y lo exporta.
+        
+        Returns:
+            Tupla (archivo combinado o None, archivos exportados).
+        """
         # Deduplicar todo el dataset
         dedup_config = self.config.get("deduplication", {})
         if dedup_config.get("enabled", True) and all_data:
+            self.timings.start("dedup")
             original_count = len(all_data)
             all_data = self._deduplicate(all_data, dedup_config)
             removed = original_count - len(all_data)
             if removed > 0:
                 logger.info(f"Deduplicacion: eliminadas {removed} filas duplicadas")
         
-        # Exportar todo junto
+        output_file = None
+        output_files = []
+        
         if not self.dry_run and all_data:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_file = self._export_data(all_data, output_dir, f"resultado_{timestamp}")
-            logger.info(f"Exportado a: {output_file}")
+            self.timings.start("export")
+            if combine:
+                # Exportar todo junto
+                if not base_name:
+                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                    base_name = f"resultado_{timestamp}"
+                output_file = self._export_data(all_data, output_dir, base_name)
+                output_files.append(str(output_file))
+                logger.info(f"Exportado a: {output_file}")
+            else:
+                # Un archivo por PDF (despues de deduplicar todo el lote)
+                grouped: Dict[str, List[Dict[str, Any]]] = {}
+                for row in all_data:
+                    grouped.setdefault(row.get("_source_file", ""), []).append(row)
+                for source_name, rows in grouped.items():
+                    exported = self._export_data(rows, output_dir, Path(source_name).stem)
+                    output_files.append(str(exported))
+                    logger.info(f"Exportado a: {exported}")
+        
+        self.timings.stop()
+        return output_file, output_files
+    
+    def _collect_rows(self, pdf_file: Path) -> List[Dict[str, Any]]:
+        """
+        Extrae, parsea, normaliza y valida un PDF sin deduplicar ni exportar.
+        
+        Args:
+            pdf_file: Ruta al PDF.
+            
+        Returns:
+            Filas validadas, cada una con ``_source_file``.
+        """
+        self.stats["total_files"] += 1
+        self._begin_file(pdf_file)
+        
+        try:
+            parsed = self._extract_and_parse(pdf_file)
+            
+            if parsed is None:
+                logger.warning(f"No se pudo extraer datos de {pdf_file.name}")
+                self.stats["warnings"] += 1
+                return []
+            
+            parsed_data, validation_rules = parsed
+            
+            if not parsed_data:
+                return []
+            
+            self._report_stage("normalize")
+            normalized_data = self.normalizer.normalize(parsed_data)
+            self._report_stage("validate")
+            validated_data, validation_errors = self.validator.validate(
+                normalized_data,
+                validation_rules
+            )
+            
+            if validation_errors:
+                for error in validation_errors:
+                    logger.warning(f"Validacion [{pdf_file.name}]: {error}")
+                self.stats["warnings"] += len(validation_errors)
+            
+            # Agregar nombre de archivo fuente
+            for row in validated_data:
+                row["_source_file"] = pdf_file.name
+            
+            self.stats["total_rows"] += len(validated_data)
+            self.stats["successful_files"] += 1
+            
+            return validated_data
+            
+        except Exception as e:
+            logger.error(f"Error procesando {pdf_file.name}: {e}")
+            self.stats["errors"] += 1
+            self._record_failure(e)
+            return []
+        
+        finally:
+            self._end_file()
+    
+    def _collect_parallel(
+        self,
+        indexed_files: Iterable[Tuple[int, Path]],
+        max_workers: int,
+        on_file_done: Callable[[int, List[Dict[str, Any]], Optional[str]], None]
+    ) -> None:
+        """
+        Ejecuta ``_collect_rows`` en un pool de procesos.
+        
+        Cada proceso construye su propio pipeline una sola vez; las
+        estadisticas de cada archivo se suman a las de este pipeline.
+        Los archivos se envian al pool a medida que se descubren y los
+        terminados se atienden entre envio y envio.
+        """
+        completed: "queue.SimpleQueue[Future]" = queue.SimpleQueue()
+        pending: Dict[Future, Tuple[int, Path]] = {}
+        
+        def handle(future: Future) -> None:
+            index, pdf_file = pending.pop(future)
+            try:
+                rows, stats, timings, file_error = future.result()
+            except Exception as e:
+                logger.error(f"Error procesando {pdf_file.name}: {e}")
+                self.stats["total_files"] += 1
+                self.stats["errors"] += 1
+                on_file_done(index, [], str(e))
+                return
+            
+            for key, value in stats.items():
+                self.stats[key] = self.stats.get(key, 0) + value
+            
+            self.timings.merge(timings)
+            
+            error = (file_error or "Error de procesamiento") if stats.get("errors") else None
+            on_file_done(index, rows, error, timings)
         
-        return self._build_results(start_time, output_dir)
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_parallel_worker,
+            initargs=(self.config, self.output_format, self.parser_type)
+        ) as executor:
+            for index, pdf_file in indexed_files:
+                future = executor.submit(_collect_in_worker, str(pdf_file))
+                pending[future] = (index, pdf_file)
+                future.add_done_callback(completed.put)
+                
+                while not completed.empty():
+                    handle(completed.get())
+            
+            while pending:
+                handle(completed.get())
     
-    def _extract_data(self, file_path: Path) -> Dict[str, Any]:
-        """Extrae datos del PDF usando la estrategia configurada."""
+    def _extract_and_parse(
+        self,
+        file_path: Path
+    ) -> Optional[Tuple[List[Dict[str, Any]], Dict[str, Any]]]:
+        """
+        Extrae y parsea el PDF dentro de los limites de ``extraction``.
+        
+        Con ``timeout_seconds`` o ``max_memory_mb`` extraccion y parsing
+        corren en un subproceso que se mata al excederlos (ver
+        ``src.isolation``); el error resultante falla solo este archivo.
+        El parser consulta el documento perezoso en el mismo proceso, asi
+        las tablas y las paginas se leen solo si las necesita, con o sin
+        limites.
+        
+        Returns:
+            Tupla (filas parseadas, reglas de validacion del parser), o
+            None si el PDF no tiene texto ni tablas.
+        """
         extraction_config = self.config.get("extraction", {})
-        strategy = extraction_config.get("strategy", "auto")
-        prefer_tables = extraction_config.get("prefer_tables", True)
+        timeout = extraction_config.get("timeout_seconds")
+        memory_mb = extraction_config.get("max_memory_mb")
         
-        result = {
-            "text": "",
-            "tables": [],
-            "metadata": {
-                "file_name": file_path.name,
-                "extraction_method": None
-            }
+        if not timeout and not memory_mb:
+            return self._parse_document(file_path)
+        
+        parsed, metadata = run_isolated(
+            self._parse_isolated,
+            (file_path,),
+            timeout=timeout,
+            memory_mb=memory_mb,
+            on_event=self._forward_event
+        )
+        
+        # Lo aprendido en el subproceso sirve a los documentos siguientes
+        self.table_extractor.remember_strategy(metadata.get("table_strategy"))
+        self.stats["table_pages_skipped"] += metadata.get("table_pages_skipped", 0)
+        
+        return parsed
+    
+    def _parse_isolated(
+        self,
+        file_path: Path,
+        emit: Callable[[Any], None]
+    ) -> Tuple[Optional[Tuple[List[Dict[str, Any]], Dict[str, Any]]], Dict[str, Any]]:
+        """
+        Extraccion y parsing dentro del subproceso: etapas y paginas se envian al padre.
+        
+        Al padre llegan solo las filas parseadas y los contadores del
+        documento (estrategia de tablas aprendida, paginas omitidas).
+        """
+        self._event_sink = emit
+        parsed = self._parse_document(file_path)
+        
+        metadata = self._document.metadata if self._document is not None else {}
+        return parsed, {
+            "table_strategy": metadata.get("table_strategy"),
+            "table_pages_skipped": metadata.get("table_pages_skipped", 0)
         }
+    
+    def _parse_document(
+        self,
+        file_path: Path
+    ) -> Optional[Tuple[List[Dict[str, Any]], Dict[str, Any]]]:
+        """Extrae el documento (perezoso), detecta el tipo y lo parsea."""
+        extracted = self._extract_data(file_path)
+        
+        if not extracted.get("text") and not extracted.get("tables"):
+            return None
+        
+        parser = self._get_parser(extracted)
+        self._report_stage("parse")
+        return parser.parse(extracted), parser.get_validation_rules()
+    
+    def _forward_event(self, event: Tuple[Any, ...]) -> None:
+        """Aplica en este proceso una etapa o pagina reportada por el subproceso."""
+        if event[0] == "stage":
+            self._report_stage(event[1])
+            self._forwarded_pages = self._page_callback(event[1])
+        elif event[0] == "page" and self._forwarded_pages:
+            self._forwarded_pages(event[1], event[2])
+    
+    def _extract_data(self, file_path: Path) -> ExtractedDocument:
+        """Prepara la extraccion del PDF usando la estrategia configurada."""
+        extraction_config = self.config.get("extraction", {})
+        strategy = extraction_config.get("strategy", "auto")
+        prefer_tables = extraction_config.get("prefer_tables", True)
         
-        # Intentar extraccion de texto
-        text = self.text_extractor.extract(file_path)
-        result["text"] = text
+        # Con el parser conocido de antemano solo se leen las paginas que necesita
+        needs = None
+        if self.parser_type != "auto" and extraction_config.get("demand_driven", True):
+            needs = self._build_parser(self.parser_type).extraction_needs()
         
-        # Intentar extraccion de tablas si se prefiere
-        if prefer_tables or strategy == "table_first":
-            tables = self.table_extractor.extract(file_path)
-            result["tables"] = tables
-            if tables:
-                result["metadata"]["extraction_method"] = "tables"
+        # Texto (y tablas si se prefieren) abriendo el PDF una sola vez;
+        # cada parte se calcula al consultarla
+        with_tables = prefer_tables or strategy == "table_first"
+        document = self.page_analyzer.document(file_path, with_tables, self._stage_scope, needs)
+        self._document = document
         
-        # Si no hay texto ni tablas, intentar OCR
-        if not text and not result["tables"]:
+        # Si no hay texto ni tablas, intentar OCR (con texto no se buscan
+        # tablas todavia)
+        if not document.text and not document.tables:
             if self.ocr_extractor and extraction_config.get("ocr_fallback", True):
                 logger.info(f"Usando OCR para {file_path.name}")
-                text = self.ocr_extractor.extract(file_path)
-                result["text"] = text
-                result["metadata"]["extraction_method"] = "ocr"
+                self._report_stage("ocr")
+                document["text"] = self.ocr_extractor.extract(file_path, self._page_callback("ocr"))
+                document.metadata["extraction_method"] = "ocr"
         
-        if not result["metadata"]["extraction_method"]:
-            result["metadata"]["extraction_method"] = "text"
+        return document
+    
+    def _begin_file(self, file_path: Path) -> None:
+        """Inicia los tiempos (y el perfil, si esta habilitado) de un archivo."""
+        self._file_timings = StageTimings()
+        self._file_timings.files = 1
+        self._stage = None
+        self.last_file_error = None
         
-        return result
+        try:
+            self._file_timings.input_bytes = file_path.stat().st_size
+        except OSError:
+            pass
+        
+        if self.profiler:
+            self.profiler.start(file_path.stem)
+    
+    def _end_file(self) -> None:
+        """Cierra los tiempos del archivo en curso y los suma a los del lote."""
+        self._release_document()
+        
+        if self._file_timings is None:
+            return
+        
+        if self.profiler:
+            self.profiler.stop()
+        
+        self._file_timings.stop()
+        self.last_file_timings = self._file_timings.as_dict()
+        self.timings.merge(self.last_file_timings)
+        self._file_timings = None
+    
+    def _release_document(self) -> None:
+        """Cierra el documento del archivo en curso y suma sus contadores."""
+        if self._document is None:
+            return
+        
+        self.stats["table_pages_skipped"] += self._document.metadata.get("table_pages_skipped", 0)
+        self._document.close()
+        self._document = None
+    
+    def _record_failure(self, error: Exception) -> None:
+        """Atribuye una falla del archivo en curso a la etapa que se ejecutaba."""
+        self.last_file_error = f"{type(error).__name__}: {error}"
+        
+        if isinstance(error, TimeoutError):
+            self.stats["timeouts"] += 1
+        
+        if self._file_timings:
+            self._file_timings.fail()
+    
+    def _report_stage(self, stage: str) -> None:
+        """Marca el inicio de una etapa: la cronometra y notifica el progreso."""
+        self._stage = stage
+        
+        if self._event_sink:
+            self._event_sink(("stage", stage))
+            return
+        
+        if self._file_timings:
+            self._file_timings.start(stage)
+        if self._progress:
+            self._progress.stage(stage)
+    
+    @contextmanager
+    def _stage_scope(self, stage: str) -> Iterator[Optional[Callable[[int, int], None]]]:
+        """
+        Etapa de extraccion calculada bajo demanda.
+        
+        Entrega el callback de avance por pagina; al terminar retoma la
+        etapa interrumpida (p.ej. "parse" si el parser pidio las tablas).
+        """
+        previous = self._stage
+        self._report_stage(stage)
+        try:
+            yield self._page_callback(stage)
+        finally:
+            if previous:
+                self._report_stage(previous)
+            else:
+                self._stage = None
+    
+    def _page_callback(self, stage: str) -> Optional[Callable[[int, int], None]]:
+        """Callback de avance por pagina para los extractores (o None)."""
+        if self._event_sink:
+            sink = self._event_sink
+            return lambda page, total_pages: sink(("page", page, total_pages))
+        
+        timings = self._file_timings
+        progress = self._progress.page_callback(stage) if self._progress else None
+        
+        if timings is None:
+            return progress
+        
+        def on_page(page: int, total_pages: int) -> None:
+            timings.record_pages(stage, total_pages)
+            if progress:
+                progress(page, total_pages)
+        
+        return on_page
     
     def _get_parser(self, extracted: Dict[str, Any]) -> Any:
         """Obtiene el parser apropiado para los datos extraidos."""
+        self._report_stage("detect")
+        
         if self.parser_type == "auto":
-            parser_type = detect_parser_type(extracted, self.config)
+            parser_type = self.classifier.detect(extracted)
         else:
             parser_type = self.parser_type
         
+        return self._build_parser(parser_type)
+    
+    def _build_parser(self, parser_type: str) -> Any:
+        """Crea un parser con su seccion de ``parsers`` en la configuracion."""
         parser_config = self.config.get("parsers", {}).get(parser_type, {})
         return get_parser(parser_type, parser_config)
     
@@ -338,39 +1096,49 @@ class Pipeline:
         key_columns = config.get("key_columns", [])
         keep = config.get("keep", "first")
         
-        seen = set()
+        positions: Dict[Any, int] = {}
         result = []
         
         for row in data:
-            # Crear clave para comparacion
-            if key_columns:
-                key = tuple(row.get(col) for col in key_columns)
-            else:
-                # Usar todas las columnas excepto _source_file
-                key = tuple(
-                    (k, v) for k, v in sorted(row.items()) 
-                    if not k.startswith("_")
-                )
-            
-            if key not in seen:
-                seen.add(key)
+            key = self._row_key(row, key_columns)
+            
+            if key not in positions:
+                positions[key] = len(result)
                 result.append(row)
             elif keep == "last":
-                # Reemplazar con el ultimo
-                for i, r in enumerate(result):
-                    if key_columns:
-                        r_key = tuple(r.get(col) for col in key_columns)
-                    else:
-                        r_key = tuple(
-                            (k, v) for k, v in sorted(r.items())
-                            if not k.startswith("_")
-                        )
-                    if r_key == key:
-                        result[i] = row
-                        break
+                # Reemplazar con el ultimo, conservando la posicion original
+                result[positions[key]] = row
         
         return result
     
+    @staticmethod
+    def _row_key(row: Dict[str, Any], key_columns: List[str]) -> Tuple[Any, ...]:
+        """
+        Construye la clave de deduplicacion de una fila.
+        
+        Los valores no hashables (listas de items, diccionarios) se
+        serializan a JSON para poder usarse como clave.
+        """
+        def hashable(value: Any) -> Any:
+            if isinstance(value, (list, dict)):
+                return json.dumps(value, sort_keys=True, default=str)
+            return value
+        
+        if key_columns:
+            return tuple(hashable(row.get(col)) for col in key_columns)
+        
+        # Usar todas las columnas excepto las internas (_source_file, etc.)
+        return tuple(
+            (k, hashable(v)) for k, v in sorted(row.items())
+            if not k.startswith("_")
+        )
+    
+    @classmethod
+    def _key_digest(cls, row: Dict[str, Any], key_columns: List[str]) -> str:
+        """Resumen corto de la clave de deduplicacion (para el manifiesto)."""
+        payload = json.dumps(cls._row_key(row, key_columns), default=str)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+    
     def _export_data(
         self,
         data: List[Dict[str, Any]],
@@ -378,27 +1146,43 @@ class Pipeline:
         base_name: str
     ) -> Path:
         """Exporta los datos al formato configurado."""
-        return self.exporter.export(data, output_dir, base_name)
+        output_file = self.exporter.export(data, output_dir, base_name)
+        
+        if output_file and os.path.isfile(str(output_file)):
+            timings = self._file_timings or self.timings
+            timings.output_bytes += os.path.getsize(str(output_file))
+        
+        return output_file
     
     def _build_results(
         self, 
         start_time: float, 
         output_dir: Path,
-        output_file: Optional[Path] = None
+        output_file: Optional[Path] = None,
+        fallback: bool = True
     ) -> Dict[str, Any]:
-        """Construye el diccionario de resultados."""
+        """
+        Construye el diccionario de resultados.
+        
+        Sin ``output_file`` y con ``fallback`` se reporta el archivo mas
+        reciente de ``output_dir`` con la extension del formato.
+        """
         elapsed_time = time.time() - start_time
         
+        # Un retorno anticipado de process_file llega con el archivo en curso
+        self._end_file()
+        
         results = {
             **self.stats,
             "elapsed_time": elapsed_time,
-            "output_dir": str(output_dir)
+            "output_dir": str(output_dir),
+            "timings": self.timings.as_dict()
         }
         
         # Use provided output_file if available
         if output_file:
             results["output_file"] = str(output_file)
-        else:
+        elif fallback:
             # Fallback: search for most recent file with correct extension
             if self.output_format == "csv":
                 ext = ".csv"
@@ -414,3 +1198,31 @@ class Pipeline:
         
         return results
 
+
+# Pipeline propio de cada proceso del pool paralelo
+_worker_pipeline: Optional[Pipeline] = None
+
+
+def _init_parallel_worker(config: Dict[str, Any], output_format: str, parser_type: str) -> None:
+    """Inicializador del pool: construye un pipeline por proceso."""
+    global _worker_pipeline
+    _worker_pipeline = Pipeline(
+        config=config,
+        output_format=output_format,
+        parser_type=parser_type,
+        dry_run=True
+    )
+
+
+def _collect_in_worker(
+    file_path: str
+) -> Tuple[List[Dict[str, Any]], Dict[str, int], Dict[str, Any], Optional[str]]:
+    """Procesa un PDF dentro de un proceso del pool y retorna filas, contadores, tiempos y error."""
+    _worker_pipeline.reset_stats()
+    rows = _worker_pipeline._collect_rows(Path(file_path))
+    return (
+        rows,
+        dict(_worker_pipeline.stats),
+        _worker_pipeline.last_file_timings,
+        _worker_pipeline.last_file_error
+    )
@@ -0,0 +1,124 @@
+"""
+Pipeline Pool
+=============
+
+Reutiliza pipelines ya inicializados entre trabajos.
+
+Construir un ``Pipeline`` re-parsea el YAML e instancia extractores
+(incluida la verificacion de dependencias de OCR), normalizador,
+validador y exportador (el cliente de Google Sheets se autentica de nuevo).
+El pool construye cada pipeline una sola vez por proceso y solo recarga
+cuando cambia el mtime del archivo de configuracion.
+"""
+
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from loguru import logger
+
+from .config import load_config
+from .pipeline import Pipeline
+
+
+PoolKey = Tuple[str, str, bool]
+
+
+class PipelinePool:
+    """
+    Pool de pipelines "calientes" indexado por (formato, parser, dry_run).
+
+    Cada ``acquire`` entrega un pipeline de uso exclusivo con los
+    contadores reiniciados, de modo que las estadisticas de un trabajo
+    nunca se mezclan con las de otro aunque se use desde varios hilos.
+    """
+
+    def __init__(self, config_path: Union[str, Path] = "config.yaml"):
+        """
+        Inicializa el pool.
+
+        Args:
+            config_path: Ruta al archivo de configuracion YAML.
+        """
+        self.config_path = Path(config_path)
+
+        self._lock = threading.Lock()
+        self._config: Optional[Dict[str, Any]] = None
+        self._config_mtime: Optional[int] = None
+        self._generation = 0
+        self._idle: Dict[PoolKey, List[Pipeline]] = defaultdict(list)
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Configuracion vigente (recargada si el archivo cambio)."""
+        with self._lock:
+            self._reload_if_changed()
+            return self._config
+
+    def _reload_if_changed(self) -> None:
+        """Recarga la configuracion si cambio el mtime. Requiere ``_lock``."""
+        mtime = self.config_path.stat().st_mtime_ns
+
+        if self._config is not None and mtime == self._config_mtime:
+            return
+
+        if self._config is not None:
+            logger.info(f"Configuracion modificada, recargando: {self.config_path}")
+
+        self._config = load_config(str(self.config_path))
+        self._config_mtime = mtime
+        self._generation += 1
+        self._idle.clear()
+
+    @contextmanager
+    def acquire(
+        self,
+        output_format: str = "csv",
+        parser_type: str = "auto",
+        dry_run: bool = False
+    ) -> Iterator[Pipeline]:
+        """
+        Presta un pipeline listo para procesar un trabajo.
+
+        Args:
+            output_format: Formato de salida (csv, json, gsheet).
+            parser_type: Tipo de parser (auto, invoice, report...).
+            dry_run: Si es True, no escribe archivos de salida.
+
+        Yields:
+            Pipeline con estadisticas en cero.
+        """
+        key = (output_format, parser_type or "auto", dry_run)
+
+        with self._lock:
+            self._reload_if_changed()
+            generation = self._generation
+            config = self._config
+            idle = self._idle[key]
+            pipeline = idle.pop() if idle else None
+
+        if pipeline is None:
+            logger.debug(f"Creando pipeline para {key}")
+            pipeline = Pipeline(
+                config=config,
+                output_format=output_format,
+                parser_type=parser_type or "auto",
+                dry_run=dry_run
+            )
+
+        pipeline.reset_stats()
+
+        try:
+            yield pipeline
+        finally:
+            with self._lock:
+                # Descartar pipelines construidos con una configuracion anterior
+                if generation == self._generation:
+                    self._idle[key].append(pipeline)
+
+    def clear(self) -> None:
+        """Descarta todos los pipelines inactivos."""
+        with self._lock:
+            self._idle.clear()
@@ -0,0 +1,112 @@
+"""
+Progress Reporting
+==================
+
+Convierte las etapas del pipeline y el avance por pagina en eventos
+de progreso (0-100) para la API y el dashboard.
+"""
+
+import time
+from typing import Any, Callable, Dict
+
+
+# Rango de porcentaje global asignado a cada etapa
+STAGE_RANGES = {
+    "extract_text": (0, 35),
+    "extract_tables": (35, 70),
+    "ocr": (35, 70),
+    "detect": (70, 70),
+    "parse": (70, 80),
+    "normalize": (80, 85),
+    "validate": (85, 90),
+    "dedup": (90, 91),
+    "export": (91, 99),
+    "done": (100, 100),
+}
+
+
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+
+class ProgressReporter:
+    """
+    Emite eventos de progreso a partir de etapas y paginas procesadas.
+
+    Los cambios de etapa se emiten siempre; el avance por pagina se
+    limita a un evento cada ``min_interval`` segundos para no saturar
+    el destino (p.ej. la base de datos de trabajos).
+    """
+
+    def __init__(self, callback: ProgressCallback, min_interval: float = 0.5):
+        """
+        Inicializa el reporter.
+
+        Args:
+            callback: Funcion que recibe cada evento.
+            min_interval: Segundos minimos entre eventos de pagina.
+        """
+        self.callback = callback
+        self.min_interval = min_interval
+
+        self._last_emit = 0.0
+        self._last_progress = -1
+
+    def stage(self, name: str) -> None:
+        """
+        Notifica el inicio de una etapa.
+
+        Args:
+            name: Nombre de la etapa (ver ``STAGE_RANGES``).
+        """
+        start, _ = STAGE_RANGES.get(name, (self._last_progress, self._last_progress))
+        self._emit({"stage": name, "progress": max(start, 0)}, force=True)
+
+    def page(self, name: str, page: int, total_pages: int) -> None:
+        """
+        Notifica el avance por pagina dentro de una etapa.
+
+        Args:
+            name: Nombre de la etapa.
+            page: Paginas procesadas hasta ahora (1-indexed).
+            total_pages: Total de paginas a procesar en la etapa.
+        """
+        start, end = STAGE_RANGES.get(name, (0, 0))
+        fraction = page / total_pages if total_pages else 1.0
+        progress = int(start + (end - start) * fraction)
+
+        self._emit(
+            {
+                "stage": name,
+                "progress": progress,
+                "page": page,
+                "total_pages": total_pages
+            },
+            force=page == total_pages
+        )
+
+    def page_callback(self, name: str) -> Callable[[int, int], None]:
+        """
+        Retorna un callback ``(page, total_pages)`` para los extractores.
+
+        Args:
+            name: Nombre de la etapa.
+        """
+        return lambda page, total_pages: self.page(name, page, total_pages)
+
+    def done(self) -> None:
+        """Notifica que el procesamiento termino."""
+        self._emit({"stage": "done", "progress": 100}, force=True)
+
+    def _emit(self, event: Dict[str, Any], force: bool = False) -> None:
+        """Envia el evento si corresponde segun el limite de frecuencia."""
+        now = time.monotonic()
+
+        # El progreso nunca retrocede
+        event["progress"] = max(event["progress"], self._last_progress)
+
+        if not force and now - self._last_emit < self.min_interval:
+            return
+
+        self._last_emit = now
+        self._last_progress = event["progress"]
+        self.callback(event)
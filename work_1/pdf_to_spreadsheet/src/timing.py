@@ -0,0 +1,230 @@
+"""
+Stage Timing
+============
+
+Tiempos por etapa del pipeline y perfilado opcional por archivo.
+
+``StageTimings`` mide las etapas como vueltas de cronometro: iniciar
+una etapa cierra la anterior, de modo que el pipeline solo marca los
+limites (los mismos puntos donde ya reporta progreso). Los tiempos de
+cada archivo se acumulan en los del lote y viajan como diccionario
+desde los procesos del pool.
+"""
+
+import cProfile
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from loguru import logger
+
+try:
+    import pyinstrument
+    PYINSTRUMENT_AVAILABLE = True
+except ImportError:
+    PYINSTRUMENT_AVAILABLE = False
+
+
+# Etapas del pipeline, en orden de ejecucion
+STAGES = (
+    "extract_text",
+    "extract_tables",
+    "ocr",
+    "detect",
+    "parse",
+    "normalize",
+    "validate",
+    "dedup",
+    "export",
+)
+
+
+class StageTimings:
+    """
+    Acumula segundos y paginas por etapa, archivos y bytes procesados.
+    """
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = {}
+        self.pages: Dict[str, int] = {}
+        self.failures: Dict[str, int] = {}
+        self.files = 0
+        self.document_pages = 0
+        self.input_bytes = 0
+        self.output_bytes = 0
+
+        self._stage: Optional[str] = None
+        self._started = 0.0
+
+    def start(self, stage: str) -> None:
+        """
+        Inicia una etapa, cerrando la que estuviera en curso.
+
+        Args:
+            stage: Nombre de la etapa (ver ``STAGES``).
+        """
+        self.stop()
+        self._stage = stage
+        self._started = time.perf_counter()
+
+    def stop(self) -> None:
+        """Cierra la etapa en curso (si hay una)."""
+        if self._stage is None:
+            return
+
+        elapsed = time.perf_counter() - self._started
+        self.seconds[self._stage] = self.seconds.get(self._stage, 0.0) + elapsed
+        self._stage = None
+
+    def fail(self) -> None:
+        """Registra una falla en la etapa en curso."""
+        stage = self._stage or "unknown"
+        self.failures[stage] = self.failures.get(stage, 0) + 1
+
+    def record_pages(self, stage: str, pages: int) -> None:
+        """
+        Registra las paginas recorridas por una etapa en el archivo actual.
+
+        Args:
+            stage: Nombre de la etapa.
+            pages: Total de paginas de la etapa.
+        """
+        self.pages[stage] = max(self.pages.get(stage, 0), pages)
+        self.document_pages = max(self.document_pages, pages)
+
+    def merge(self, other: Dict[str, Any]) -> None:
+        """
+        Suma los tiempos de otro archivo o lote.
+
+        Args:
+            other: Diccionario producido por ``as_dict``.
+        """
+        for stage, values in other.get("stages", {}).items():
+            self.seconds[stage] = self.seconds.get(stage, 0.0) + values["seconds"]
+            if values.get("pages"):
+                self.pages[stage] = self.pages.get(stage, 0) + values["pages"]
+
+        for stage, count in other.get("failures", {}).items():
+            self.failures[stage] = self.failures.get(stage, 0) + count
+
+        self.files += other.get("files", 0)
+        self.document_pages += other.get("pages", 0)
+        self.input_bytes += other.get("input_bytes", 0)
+        self.output_bytes += other.get("output_bytes", 0)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Resume los tiempos (serializable a JSON).
+
+        Returns:
+            Diccionario con ``files``, ``pages``, ``input_bytes``,
+            ``output_bytes``, ``total_seconds``, ``failures`` (fallas por
+            etapa) y ``stages`` (por etapa: ``seconds`` y ``pages``), con
+            las etapas en orden de ejecucion.
+        """
+        ordered = [stage for stage in STAGES if stage in self.seconds]
+        ordered += sorted(stage for stage in self.seconds if stage not in STAGES)
+
+        return {
+            "files": self.files,
+            "pages": self.document_pages,
+            "input_bytes": self.input_bytes,
+            "output_bytes": self.output_bytes,
+            "total_seconds": round(sum(self.seconds.values()), 6),
+            "failures": dict(self.failures),
+            "stages": {
+                stage: {
+                    "seconds": round(self.seconds[stage], 6),
+                    "pages": self.pages.get(stage, 0)
+                }
+                for stage in ordered
+            }
+        }
+
+
+class FileProfiler:
+    """
+    Perfilado por archivo con cProfile o pyinstrument.
+
+    Cada archivo genera ``<nombre>_<timestamp>_<pid>.prof`` (cProfile, para
+    ``snakeviz`` o ``pstats``) o ``.html`` (pyinstrument) en ``output_dir``.
+    """
+
+    def __init__(self, output_dir: Union[str, Path], tool: str = "cprofile"):
+        """
+        Inicializa el perfilador.
+
+        Args:
+            output_dir: Directorio donde se escriben los perfiles.
+            tool: "cprofile" o "pyinstrument" (requiere pyinstrument;
+                si no esta instalado se usa cProfile).
+        """
+        self.output_dir = Path(output_dir)
+        self.tool = tool
+
+        if tool == "pyinstrument" and not PYINSTRUMENT_AVAILABLE:
+            logger.warning("pyinstrument no disponible, se usara cProfile. Instala con: pip install pyinstrument")
+            self.tool = "cprofile"
+
+        self._profiler: Any = None
+        self._name: Optional[str] = None
+
+    def start(self, name: str) -> None:
+        """
+        Comienza a perfilar un archivo.
+
+        Args:
+            name: Nombre base del perfil (tipicamente el stem del PDF).
+        """
+        try:
+            if self.tool == "pyinstrument":
+                self._profiler = pyinstrument.Profiler()
+                self._profiler.start()
+            else:
+                self._profiler = cProfile.Profile()
+                self._profiler.enable()
+        except ValueError as e:
+            # Solo un perfilador activo a la vez (p.ej. hilos de la API)
+            logger.warning(f"No se pudo perfilar {name}: {e}")
+            self._profiler = None
+
+        self._name = name
+
+    def stop(self) -> Optional[Path]:
+        """
+        Detiene el perfilado y escribe el resultado.
+
+        Returns:
+            Ruta del perfil o None si no habia uno en curso.
+        """
+        if self._profiler is None:
+            return None
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        if self.tool == "pyinstrument":
+            self._profiler.stop()
+            profile_path = self._profile_path(".html")
+            profile_path.write_text(self._profiler.output_html(), encoding="utf-8")
+        else:
+            self._profiler.disable()
+            profile_path = self._profile_path(".prof")
+            self._profiler.dump_stats(str(profile_path))
+
+        self._profiler = None
+        logger.debug(f"Perfil guardado: {profile_path}")
+        return profile_path
+
+    def _profile_path(self, suffix: str) -> Path:
+        """Ruta libre para el perfil (PDFs con el mismo nombre en otras carpetas)."""
+        base = f"{self._name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+        profile_path = self.output_dir / f"{base}{suffix}"
+
+        counter = 1
+        while profile_path.exists():
+            profile_path = self.output_dir / f"{base}_{counter}{suffix}"
+            counter += 1
+
+        return profile_path
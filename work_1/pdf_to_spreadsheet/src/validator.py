@@ -5,12 +5,13 @@ Data Validator
 Valida datos extraidos segun reglas configuradas.
 """
 
-import re
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 
 from loguru import logger
 
+from .patterns import DEFAULT_TIMEOUT_MS, match_pattern
+
 
 class DataValidator:
     """
@@ -33,6 +34,7 @@ class DataValidator:
         self.enabled = self.config.get("enabled", True)
         self.on_error = self.config.get("on_error", "warn")  # skip, warn, fail
         self.max_errors = self.config.get("max_errors", 10)
+        self.pattern_timeout_ms = self.config.get("pattern_timeout_ms", DEFAULT_TIMEOUT_MS)
         
         # Reglas globales
         self.global_rules = self.config.get("rules", {})
@@ -169,11 +171,18 @@ class DataValidator:
         
         # Validar patron (regex)
         if "pattern" in rules and isinstance(value, str):
-            pattern = rules["pattern"]
-            if not re.match(pattern, value):
+            try:
+                matched = match_pattern(rules["pattern"], value, self.pattern_timeout_ms)
+            except TimeoutError:
                 errors.append(
-                    f"Fila {row_idx + 1}: '{field}' no coincide con el patron esperado"
+                    f"Fila {row_idx + 1}: '{field}' excedio el tiempo del patron "
+                    f"({self.pattern_timeout_ms} ms)"
                 )
+            else:
+                if not matched:
+                    errors.append(
+                        f"Fila {row_idx + 1}: '{field}' no coincide con el patron esperado"
+                    )
         
         # Validar valores permitidos
         if "allowed_values" in rules:
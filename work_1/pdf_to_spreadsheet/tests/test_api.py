@@ -0,0 +1,316 @@
+"""
+Tests for REST API
+==================
+
+Pruebas de los endpoints de la API con ``TestClient``.
+"""
+
+import hashlib
+import importlib
+import os
+
+import pytest
+from src.exporters.csv_exporter import CSVExporter
+from src.exporters.json_exporter import JSONExporter
+from src.exporters.row_index import index_path_for
+from src.job_store import JobStore
+from src.metrics import MetricsStore
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(scope="module")
+def api(tmp_path_factory):
+    """Importa la API creando sus carpetas y base de datos fuera del repo."""
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("api"))
+    try:
+        return importlib.import_module("api")
+    finally:
+        os.chdir(cwd)
+
+
+@pytest.fixture
+def client(api, tmp_path, monkeypatch):
+    """Cliente con cola, metricas y carpetas temporales propias."""
+    monkeypatch.setattr(api, "UPLOAD_DIR", tmp_path / "uploads")
+    monkeypatch.setattr(api, "OUTPUT_DIR", tmp_path / "output")
+    monkeypatch.setattr(api, "job_store", JobStore(tmp_path / "jobs.db"))
+    monkeypatch.setattr(api, "metrics", MetricsStore(tmp_path / "jobs.db"))
+    api.UPLOAD_DIR.mkdir()
+    api.OUTPUT_DIR.mkdir()
+    return TestClient(api.app)
+
+
+def multipart_body(filename, content, boundary="limite"):
+    """Cuerpo multipart con un solo archivo en el campo ``file``."""
+    return (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        "Content-Type: application/pdf\r\n\r\n"
+    ).encode() + content + f"\r\n--{boundary}--\r\n".encode()
+
+
+class TestUpload:
+    """Pruebas para la recepcion de archivos en streaming."""
+
+    def test_upload_enqueues_job(self, api, client):
+        """Prueba que el archivo se guarda completo y con su hash."""
+        content = b"%PDF-1.4 factura" * 1000
+
+        response = client.post("/api/upload", files={"file": ("a.pdf", content, "application/pdf")})
+
+        assert response.status_code == 200
+        job = api.job_store.get_job(response.json()["job_id"])
+        assert job["status"] == "pending"
+        assert job["content_hash"] == hashlib.sha256(content).hexdigest()
+        with open(job["file_path"], "rb") as f:
+            assert f.read() == content
+        assert [p.name for p in api.UPLOAD_DIR.iterdir()] == [f"{job['job_id']}_a.pdf"]
+
+    def test_duplicate_upload_returns_existing_job(self, api, client):
+        """Prueba que el mismo contenido y opciones reutilizan el trabajo."""
+        files = {"file": ("a.pdf", b"%PDF-1.4 repetido", "application/pdf")}
+
+        first = client.post("/api/upload", files=files).json()
+        second = client.post("/api/upload", files=files).json()
+        other_format = client.post("/api/upload?output_format=json", files=files).json()
+
+        assert second["job_id"] == first["job_id"]
+        assert other_format["job_id"] != first["job_id"]
+        assert len(list(api.UPLOAD_DIR.iterdir())) == 2
+
+    def test_oversized_file_is_rejected_while_streaming(self, api, client, monkeypatch):
+        """Prueba el 413 al superar el limite y que no quedan archivos .part."""
+        monkeypatch.setattr(api, "MAX_UPLOAD_BYTES", 1024)
+
+        response = client.post(
+            "/api/upload",
+            content=multipart_body("a.pdf", b"x" * 4096),
+            headers={"Content-Type": "multipart/form-data; boundary=limite"}
+        )
+
+        assert response.status_code == 413
+        assert list(api.UPLOAD_DIR.iterdir()) == []
+
+    def test_declared_oversized_body_is_rejected_before_reading(self, api, client, monkeypatch):
+        """Prueba el 413 por Content-Length sin recibir el cuerpo."""
+        monkeypatch.setattr(api, "MAX_UPLOAD_BYTES", 0)
+        monkeypatch.setattr(api, "UPLOAD_CHUNK_SIZE", 16)
+
+        response = client.post("/api/upload", files={"file": ("a.pdf", b"x" * 64, "application/pdf")})
+
+        assert response.status_code == 413
+
+    @pytest.mark.parametrize("body, content_type", [
+        (b"sin limites", "multipart/form-data; boundary=limite"),
+        (multipart_body("a.pdf", b"%PDF-1.4")[:-12], "multipart/form-data; boundary=limite"),
+        (b"{}", "application/json"),
+    ], ids=["malformed", "truncated", "not-multipart"])
+    def test_bad_body_is_rejected(self, api, client, body, content_type):
+        """Prueba el 400 ante cuerpos invalidos y que no quedan archivos .part."""
+        response = client.post("/api/upload", content=body, headers={"Content-Type": content_type})
+
+        assert response.status_code == 400
+        assert list(api.UPLOAD_DIR.iterdir()) == []
+        assert sum(api.job_store.count_by_status().values()) == 0
+
+    def test_non_pdf_is_rejected_before_writing(self, api, client):
+        """Prueba que un nombre no permitido se rechaza sin escribir."""
+        response = client.post("/api/upload", files={"file": ("notas.txt", b"texto", "text/plain")})
+
+        assert response.status_code == 400
+        assert list(api.UPLOAD_DIR.iterdir()) == []
+
+    def test_batch_failure_removes_upload_folder(self, api, client):
+        """Prueba que un lote rechazado no deja su carpeta de subida."""
+        response = client.post("/api/batch", files=[
+            ("files", ("a.pdf", b"%PDF-1.4", "application/pdf")),
+            ("files", ("b.docx", b"doc", "application/octet-stream")),
+        ])
+
+        assert response.status_code == 400
+        assert list(api.UPLOAD_DIR.iterdir()) == []
+
+
+def completed_job(api, output_file):
+    """Registra un trabajo terminado con el archivo de salida indicado."""
+    job = api.job_store.create_job(output_file.name, output_format=output_file.suffix.lstrip("."))
+    api.job_store.update_job(job["job_id"], status="completed", output_file=str(output_file))
+    return job["job_id"]
+
+
+class TestDownload:
+    """Pruebas para la descarga comprimida, cacheable y reanudable."""
+
+    @pytest.fixture
+    def job_id(self, api, client):
+        """Trabajo terminado con un CSV que vale la pena comprimir."""
+        output_file = api.OUTPUT_DIR / "resultado.csv"
+        output_file.write_text("id,total\n" + "".join(f"{i},{i * 10}\n" for i in range(500)))
+        return completed_job(api, output_file)
+
+    def test_identity_download(self, api, client, job_id):
+        """Prueba la descarga sin compresion con su ETag."""
+        response = client.get(f"/api/download/{job_id}", headers={"Accept-Encoding": "identity"})
+
+        assert response.status_code == 200
+        assert response.content == (api.OUTPUT_DIR / "resultado.csv").read_bytes()
+        assert "content-encoding" not in response.headers
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert response.headers["etag"].startswith('"')
+
+    def test_gzip_download(self, api, client, job_id):
+        """Prueba la variante gzip, con ETag propio y cacheada junto al CSV."""
+        identity = client.get(f"/api/download/{job_id}", headers={"Accept-Encoding": "identity"})
+        response = client.get(f"/api/download/{job_id}", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.content == identity.content
+        assert response.headers["etag"] == identity.headers["etag"][:-1] + '-gzip"'
+        assert (api.OUTPUT_DIR / "resultado.csv.gz").exists()
+
+    def test_zstd_only_when_available(self, api, client, job_id, monkeypatch):
+        """Prueba que zstd no se ofrece sin ``zstandard``."""
+        monkeypatch.setattr("src.compression.ZSTD_AVAILABLE", False)
+
+        response = client.get(f"/api/download/{job_id}", headers={"Accept-Encoding": "zstd"})
+
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+
+    def test_zstd_download(self, api, client, job_id):
+        """Prueba la variante zstd cuando ``zstandard`` esta instalado."""
+        pytest.importorskip("zstandard")
+
+        response = client.get(f"/api/download/{job_id}", headers={"Accept-Encoding": "zstd, gzip"})
+
+        assert response.headers["content-encoding"] == "zstd"
+        assert response.content == (api.OUTPUT_DIR / "resultado.csv").read_bytes()
+
+    @pytest.mark.parametrize("if_none_match", ["{etag}", "W/{etag}", '"otro", {etag}', "*"])
+    def test_not_modified(self, client, job_id, if_none_match):
+        """Prueba el 304 con ETag fuerte, debil, en lista o ``*``."""
+        headers = {"Accept-Encoding": "identity"}
+        etag = client.get(f"/api/download/{job_id}", headers=headers).headers["etag"]
+
+        response = client.get(
+            f"/api/download/{job_id}",
+            headers={**headers, "If-None-Match": if_none_match.format(etag=etag)}
+        )
+
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert response.content == b""
+
+    def test_other_etag_is_modified(self, client, job_id):
+        """Prueba que un ETag de otra version descarga el archivo."""
+        response = client.get(
+            f"/api/download/{job_id}",
+            headers={"Accept-Encoding": "identity", "If-None-Match": '"otro"'}
+        )
+
+        assert response.status_code == 200
+
+    def test_range_resume(self, client, job_id):
+        """Prueba Range con If-Range vigente (206) y obsoleto (200 completo)."""
+        headers = {"Accept-Encoding": "gzip"}
+        full = client.get(f"/api/download/{job_id}", headers=headers)
+
+        partial = client.get(
+            f"/api/download/{job_id}",
+            headers={**headers, "Range": "bytes=0-99", "If-Range": full.headers["etag"]}
+        )
+        stale = client.get(
+            f"/api/download/{job_id}",
+            headers={**headers, "Range": "bytes=0-99", "If-Range": '"otro"'}
+        )
+
+        assert partial.status_code == 206
+        assert partial.headers["content-range"].startswith("bytes 0-99/")
+        assert partial.headers["content-encoding"] == "gzip"
+        assert stale.status_code == 200
+        assert stale.content == full.content
+
+    def test_pending_and_missing_jobs(self, api, client):
+        """Prueba 400 para un trabajo sin terminar y 404 si no existe."""
+        job = api.job_store.create_job("a.pdf")
+
+        assert client.get(f"/api/download/{job['job_id']}").status_code == 400
+        assert client.get("/api/download/noexiste").status_code == 404
+
+
+class TestPreview:
+    """Pruebas para la previsualizacion paginada."""
+
+    @pytest.fixture
+    def rows(self):
+        """Filas con un campo interno."""
+        return [{"id": i, "nombre": f"Fila {i}", "_source_file": "a.pdf"} for i in range(50)]
+
+    @pytest.fixture
+    def csv_job(self, api, client, rows):
+        """Trabajo terminado con un CSV indexado que incluye campos internos."""
+        exporter = CSVExporter({"include_internal_fields": True})
+        return completed_job(api, exporter.export(rows, api.OUTPUT_DIR, "resultado"))
+
+    def test_pages_follow_next_offset(self, client, csv_job):
+        """Prueba la paginacion completa siguiendo ``next_offset``."""
+        seen, offset = [], 0
+        while offset is not None:
+            page = client.get(f"/api/preview/{csv_job}", params={"offset": offset, "limit": 20}).json()
+            seen.extend(int(row["id"]) for row in page["rows"])
+            offset = page["next_offset"]
+
+        assert seen == list(range(50))
+        assert page["total_rows"] == 50
+        assert page["total_preview"] == 10
+
+    def test_page_hides_internal_fields(self, client, csv_job):
+        """Prueba una pagina intermedia sin las columnas internas."""
+        page = client.get(f"/api/preview/{csv_job}", params={"offset": 10, "limit": 2}).json()
+
+        assert page["columns"] == ["id", "nombre"]
+        assert page["rows"] == [{"id": "10", "nombre": "Fila 10"}, {"id": "11", "nombre": "Fila 11"}]
+        assert page["next_offset"] == 12
+
+    def test_column_projection(self, client, csv_job):
+        """Prueba la proyeccion de columnas en el orden pedido."""
+        page = client.get(
+            f"/api/preview/{csv_job}", params={"offset": 48, "limit": 5, "columns": "nombre, _source_file"}
+        ).json()
+
+        assert page["columns"] == ["nombre", "_source_file"]
+        assert page["rows"] == [
+            {"nombre": "Fila 48", "_source_file": "a.pdf"},
+            {"nombre": "Fila 49", "_source_file": "a.pdf"},
+        ]
+        assert page["next_offset"] is None
+
+    def test_json_preview(self, api, client, rows):
+        """Prueba la previsualizacion de un JSON indexado."""
+        job_id = completed_job(api, JSONExporter().export(rows, api.OUTPUT_DIR, "resultado"))
+
+        page = client.get(f"/api/preview/{job_id}", params={"offset": 5, "limit": 1}).json()
+
+        assert page["format"] == "json"
+        assert page["rows"] == [{"id": 5, "nombre": "Fila 5"}]
+        assert page["total_rows"] == 50
+
+    @pytest.mark.parametrize("params", [{"offset": -1}, {"limit": 0}, {"limit": 1001}])
+    def test_invalid_page_is_rejected(self, client, csv_job, params):
+        """Prueba el 400 ante offset o limit fuera de rango."""
+        assert client.get(f"/api/preview/{csv_job}", params=params).status_code == 400
+
+    def test_delete_removes_index_and_variants(self, api, client, csv_job):
+        """Prueba que borrar el trabajo elimina el indice y las variantes."""
+        output_file = api.OUTPUT_DIR / "resultado.csv"
+        client.get(f"/api/download/{csv_job}", headers={"Accept-Encoding": "gzip"})
+
+        assert client.delete(f"/api/jobs/{csv_job}").status_code == 200
+        assert not output_file.exists()
+        assert not index_path_for(output_file).exists()
+        assert list(api.OUTPUT_DIR.iterdir()) == []
@@ -0,0 +1,75 @@
+"""
+Tests for Benchmarks
+====================
+
+Pruebas unitarias para la suite de benchmarks.
+"""
+
+import json
+
+import pytest
+from bench.compare import compare_results, same_corpus
+
+
+def results(seconds, peak=1_000_000, params=None):
+    """Resultados minimos con una etapa."""
+    return {
+        "corpus": {"params": params or {"invoices": 10}, "files": {"invoice": 10}, "pages": 10},
+        "stages": {"extract_text": {"seconds": seconds, "peak_memory_bytes": peak}},
+    }
+
+
+class TestCompareResults:
+    """Pruebas para compare_results."""
+
+    def test_slower_stage_is_regression(self):
+        """Prueba que una etapa 50% mas lenta se marca como regresion."""
+        entry = compare_results(results(1.0), results(1.5))[0]
+
+        assert entry["time_change"] == 0.5
+        assert entry["regression"]
+
+    def test_change_within_threshold(self):
+        """Prueba que un cambio menor al umbral no es regresion."""
+        assert not compare_results(results(1.0), results(1.05))[0]["regression"]
+
+    def test_memory_regression(self):
+        """Prueba que la memoria pico tambien cuenta."""
+        entry = compare_results(results(1.0), results(1.0, peak=2_000_000))[0]
+
+        assert entry["memory_change"] == 1.0
+        assert entry["regression"]
+
+    def test_tiny_stages_are_noise(self):
+        """Prueba que un cambio de microsegundos no es regresion."""
+        assert not compare_results(results(0.0001), results(0.0003))[0]["regression"]
+
+    def test_same_corpus(self):
+        """Prueba la deteccion de corpus distintos."""
+        assert same_corpus(results(1.0), results(2.0))
+        assert not same_corpus(results(1.0), results(1.0, params={"invoices": 20}))
+
+
+def test_run_benchmark_on_small_corpus(tmp_path):
+    """Prueba una corrida completa sobre un corpus minimo."""
+    pytest.importorskip("reportlab")
+    from bench import generate_corpus, run_benchmark
+    from src.config import _validate_config
+
+    corpus = generate_corpus(
+        tmp_path,
+        invoices=1,
+        reports=1,
+        report_pages=2,
+        rows_per_page=5,
+        statements=1,
+        statement_items=6
+    )
+    result = run_benchmark(corpus, _validate_config({}), repeat=1, memory=False, exporters=["csv"])
+    stages = result["stages"]
+
+    assert result["corpus"]["pages"] >= 4
+    assert stages["extract_text"]["unit"] == "pages"
+    assert stages["parse_report"]["items"] == 10
+    assert {"parse_invoice", "parse_financial_report", "normalize", "validate", "export_csv"} <= set(stages)
+    json.dumps(result)
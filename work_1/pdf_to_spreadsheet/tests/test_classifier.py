@@ -0,0 +1,96 @@
+"""
+Tests for Document Classifier
+=============================
+
+Pruebas unitarias para la deteccion de parser por palabras clave.
+"""
+
+from src.parsers import DocumentClassifier, detect_parser_type
+
+
+CONFIG = {
+    "parsers": {
+        "invoice": {"keywords": ["factura", "invoice", "total", "subtotal"]},
+        "report": {"keywords": ["reporte", "informe", "tabla", "report"]},
+    }
+}
+
+
+class TestDocumentClassifier:
+    """Pruebas para DocumentClassifier."""
+
+    def test_keywords_inside_other_keywords(self):
+        """Prueba que "total" se encuentra dentro de "subtotal", como con ``in``."""
+        classifier = DocumentClassifier(CONFIG)
+
+        assert classifier.found_keywords("SUBTOTAL: $10.00") == {"subtotal", "total"}
+        assert classifier.classify("Subtotal $10.00") == "invoice"
+
+    def test_prefix_keywords(self):
+        """Prueba palabras que son prefijo de otras ("report" y "reporte")."""
+        classifier = DocumentClassifier(CONFIG)
+
+        assert classifier.found_keywords("Reporte mensual") == {"report", "reporte"}
+        assert classifier.scores("Reporte mensual")["report"] == 2
+
+    def test_financial_statements_first(self):
+        """Prueba que los estados financieros ganan al alcanzar su umbral."""
+        text = "Factura total. Balance general: activo, pasivo y patrimonio"
+
+        assert DocumentClassifier(CONFIG).classify(text) == "financial_report"
+
+    def test_highest_score_wins(self):
+        """Prueba que gana el parser con mas peso, no el primero configurado."""
+        text = "Factura total del informe: reporte con tabla"
+
+        assert DocumentClassifier(CONFIG).classify(text) == "report"
+
+    def test_weights_and_threshold(self):
+        """Prueba palabras con peso y umbral propio."""
+        config = {
+            "parsers": {
+                "invoice": {"keywords": {"factura": 2, "total": 1}, "detect_threshold": 3},
+                "report": {"keywords": ["reporte"], "detect_threshold": 1},
+            }
+        }
+        classifier = DocumentClassifier(config)
+
+        assert classifier.classify("Factura") is None
+        assert classifier.classify("Factura total") == "invoice"
+        assert classifier.classify("Reporte") == "report"
+
+    def test_disabled_parsers_are_ignored(self):
+        """Prueba que no se detectan parsers deshabilitados o sin auto_detect."""
+        config = {
+            "parsers": {
+                "invoice": {"enabled": False, "keywords": ["factura", "total"]},
+                "report": {"auto_detect": False, "keywords": ["reporte", "informe"]},
+            }
+        }
+
+        assert DocumentClassifier(config).classify("Factura total, reporte e informe") is None
+
+    def test_only_the_beginning_is_read(self):
+        """Prueba que solo se revisan los primeros ``sample_kb`` KB."""
+        classifier = DocumentClassifier({**CONFIG, "detection": {"sample_kb": 1}})
+        text = "x" * 2048 + " factura total"
+
+        assert classifier.classify(text) is None
+        assert classifier.classify(text[2048:]) == "invoice"
+
+    def test_tables_only_when_keywords_do_not_decide(self):
+        """Prueba el respaldo por tablas sin consultarlas si no hace falta."""
+        classifier = DocumentClassifier(CONFIG)
+
+        class Extracted(dict):
+            def get(self, key, default=None):
+                assert key != "tables", "no debia consultar las tablas"
+                return super().get(key, default)
+
+        assert classifier.detect(Extracted(text="Factura total")) == "invoice"
+        assert classifier.detect({"text": "Resumen", "tables": [[["a"]]]}) == "report"
+        assert classifier.detect({"text": "Resumen", "tables": []}) == "invoice"
+
+    def test_detect_parser_type(self):
+        """Prueba que la funcion del paquete usa el clasificador."""
+        assert detect_parser_type({"text": "Reporte e informe"}, CONFIG) == "report"
@@ -0,0 +1,94 @@
+"""
+Tests for Compression
+=====================
+
+Pruebas unitarias para las variantes comprimidas de descarga.
+"""
+
+import gzip
+import os
+
+import pytest
+from src import compression
+from src.compression import compressed_variant, etag_matches, negotiate_encoding, remove_variants, variant_path
+
+
+class TestNegotiateEncoding:
+    """Pruebas para la negociacion de Accept-Encoding."""
+
+    def test_no_header_means_identity(self):
+        """Prueba que sin header no se comprime."""
+        assert negotiate_encoding(None) is None
+        assert negotiate_encoding("identity") is None
+
+    def test_gzip_and_q_values(self, monkeypatch):
+        """Prueba seleccion por peso y rechazo con q=0."""
+        monkeypatch.setattr(compression, "ZSTD_AVAILABLE", False)
+
+        assert negotiate_encoding("deflate, gzip;q=0.5") == "gzip"
+        assert negotiate_encoding("gzip;q=0") is None
+        assert negotiate_encoding("*") == "gzip"
+        assert negotiate_encoding("zstd") is None
+
+    def test_prefers_zstd_when_available(self, monkeypatch):
+        """Prueba que zstd gana ante igual peso si esta instalado."""
+        monkeypatch.setattr(compression, "ZSTD_AVAILABLE", True)
+
+        assert negotiate_encoding("gzip, zstd") == "zstd"
+        assert negotiate_encoding("gzip, zstd;q=0.5") == "gzip"
+
+
+class TestEtagMatches:
+    """Pruebas para la evaluacion de If-None-Match."""
+
+    def test_weak_comparison(self):
+        """Prueba que W/ se ignora al comparar y la lista admite espacios."""
+        assert etag_matches('"abc"', '"abc"')
+        assert etag_matches('W/"abc"', '"abc"')
+        assert etag_matches('"x", W/"abc"', 'W/"abc"')
+        assert not etag_matches('"abcd"', '"abc"')
+        assert not etag_matches(None, '"abc"')
+
+    def test_star_matches_any(self):
+        """Prueba que ``*`` coincide con cualquier representacion."""
+        assert etag_matches("*", '"abc"')
+
+
+class TestCompressedVariant:
+    """Pruebas para la generacion de variantes."""
+
+    @pytest.fixture
+    def output_file(self, tmp_path):
+        """Archivo de salida de ejemplo."""
+        output_file = tmp_path / "out.csv"
+        output_file.write_text("a,b\n" + "1,2\n" * 1000)
+        return output_file
+
+    def test_gzip_variant_is_cached(self, output_file):
+        """Prueba que la variante se genera una vez y se reutiliza."""
+        variant = compressed_variant(output_file, "gzip")
+        first_bytes = variant.read_bytes()
+        first_stat = variant.stat()
+
+        assert gzip.decompress(first_bytes) == output_file.read_bytes()
+        assert compressed_variant(output_file, "gzip").stat().st_ino == first_stat.st_ino
+
+    def test_variant_regenerated_when_source_changes(self, output_file):
+        """Prueba que un cambio en el original regenera la variante."""
+        compressed_variant(output_file, "gzip")
+
+        output_file.write_text("a,b\n9,9\n")
+        stat = output_file.stat()
+        os.utime(output_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        variant = compressed_variant(output_file, "gzip")
+
+        assert gzip.decompress(variant.read_bytes()) == b"a,b\n9,9\n"
+
+    def test_remove_variants(self, output_file):
+        """Prueba que se eliminan las variantes de un archivo."""
+        compressed_variant(output_file, "gzip")
+
+        remove_variants(output_file)
+
+        assert not variant_path(output_file, "gzip").exists()
@@ -0,0 +1,95 @@
+"""
+Tests for Discovery
+===================
+
+Pruebas unitarias para el descubrimiento perezoso de PDFs.
+"""
+
+import pytest
+from src.discovery import iter_pdfs, largest_first
+
+
+class TestIterPdfs:
+    """Pruebas para iter_pdfs."""
+
+    @pytest.fixture
+    def tree(self, tmp_path):
+        """Arbol de ejemplo con subdirectorios y extensiones mixtas."""
+        (tmp_path / "sub" / "deep").mkdir(parents=True)
+        (tmp_path / "archivo").mkdir()
+        files = {
+            "a.pdf": 10,
+            "B.PDF": 30,
+            "notas.txt": 5,
+            "sub/c.Pdf": 20,
+            "sub/deep/d.pdf": 40,
+            "archivo/viejo.pdf": 50,
+        }
+        for name, size in files.items():
+            (tmp_path / name).write_bytes(b"x" * size)
+        return tmp_path
+
+    def names(self, entries):
+        return sorted(path.name for path, _ in entries)
+
+    def test_recursive_case_insensitive(self, tree):
+        """Prueba que se recorren subdirectorios y se acepta .PDF."""
+        assert self.names(iter_pdfs(tree)) == ["B.PDF", "a.pdf", "c.Pdf", "d.pdf", "viejo.pdf"]
+
+    def test_non_recursive(self, tree):
+        """Prueba que recursive=False se queda en la raiz."""
+        assert self.names(iter_pdfs(tree, recursive=False)) == ["B.PDF", "a.pdf"]
+
+    def test_exclude_prunes_directories(self, tree):
+        """Prueba que un patron de exclusion omite una carpeta completa."""
+        names = self.names(iter_pdfs(tree, exclude=["archivo"]))
+        assert "viejo.pdf" not in names
+        assert "d.pdf" in names
+
+    def test_include_and_exclude_by_relative_path(self, tree):
+        """Prueba patrones sobre la ruta relativa."""
+        # Como en fnmatch, "*" tambien abarca "/"
+        assert self.names(iter_pdfs(tree, include=["sub/*"])) == ["c.Pdf", "d.pdf"]
+        assert "d.pdf" not in self.names(iter_pdfs(tree, exclude=["sub/deep/*"]))
+
+    def test_reports_sizes(self, tree):
+        """Prueba que se entrega el tamano de cada archivo."""
+        sizes = {path.name: size for path, size in iter_pdfs(tree)}
+        assert sizes["d.pdf"] == 40
+
+    def test_is_lazy(self, tree):
+        """Prueba que el primer archivo se entrega sin recorrer todo."""
+        iterator = iter_pdfs(tree)
+        assert next(iterator)[0].suffix.lower() == ".pdf"
+
+    def test_missing_directory(self, tmp_path):
+        """Prueba que un directorio inexistente no produce archivos."""
+        assert list(iter_pdfs(tmp_path / "no_existe")) == []
+
+
+class TestLargestFirst:
+    """Pruebas para largest_first."""
+
+    entries = [("a", 1), ("b", 5), ("c", 3), ("d", 9), ("e", 2)]
+
+    def test_full_sort(self):
+        """Prueba que sin ventana se ordena todo por tamano."""
+        assert list(largest_first(self.entries, window=None)) == ["d", "b", "c", "e", "a"]
+
+    def test_window_zero_keeps_order(self):
+        """Prueba que window=0 conserva el orden de recorrido."""
+        assert list(largest_first(self.entries, window=0)) == ["a", "b", "c", "d", "e"]
+
+    def test_bounded_window_streams(self):
+        """Prueba que con ventana los archivos salen antes del final."""
+        consumed = []
+
+        def source():
+            for entry in self.entries:
+                consumed.append(entry[0])
+                yield entry
+
+        iterator = largest_first(source(), window=2)
+        assert next(iterator) == "b"
+        assert len(consumed) == 3
+        assert list(iterator) == ["d", "c", "e", "a"]
@@ -0,0 +1,145 @@
+"""
+Tests for Extracted Document
+============================
+
+Pruebas unitarias para el documento extraido bajo demanda.
+"""
+
+import pickle
+from contextlib import contextmanager
+
+import pytest
+from src.extractors import PageAnalyzer, TableExtractor, TextExtractor
+from src.isolation import can_isolate
+from src.pipeline import Pipeline
+
+
+pytest.importorskip("pdfplumber")
+
+
+@pytest.fixture(scope="module")
+def corpus(tmp_path_factory):
+    """Una factura y un reporte de dos paginas generados con reportlab."""
+    pytest.importorskip("reportlab")
+    from bench.corpus import generate_corpus
+
+    return generate_corpus(
+        tmp_path_factory.mktemp("pdfs"), invoices=1, invoice_items=4, reports=1, report_pages=2, statements=0
+    )
+
+
+def make_document(path, stages=None, **kwargs):
+    @contextmanager
+    def stage_scope(stage):
+        if stages is not None:
+            stages.append(stage)
+        yield None
+
+    return PageAnalyzer(TextExtractor(), TableExtractor()).document(path, stage_scope=stage_scope, **kwargs)
+
+
+class TestExtractedDocument:
+    """Pruebas para ExtractedDocument."""
+
+    def test_nothing_is_read_until_accessed(self, corpus):
+        """Prueba que cada parte se calcula al consultarla y una sola vez."""
+        stages = []
+        document = make_document(corpus["report"][0], stages)
+
+        assert stages == []
+
+        text = document.text
+        assert stages == ["extract_text"]
+        assert document._pdf is not None
+
+        tables = document.tables
+        assert stages == ["extract_text", "extract_tables"]
+        assert document._pdf is None
+
+        assert document.text is text
+        assert document.tables is tables
+        assert stages == ["extract_text", "extract_tables"]
+
+    def test_same_output_as_analyze(self, corpus):
+        """Prueba que el resultado es el del analisis completo."""
+        analysis = PageAnalyzer(TextExtractor(), TableExtractor()).analyze(corpus["report"][0])
+        document = make_document(corpus["report"][0])
+
+        assert document.text == analysis["text"]
+        assert document.tables == analysis["tables"]
+        assert document.pages == analysis["pages"]
+        assert document.metadata["extraction_method"] == "tables"
+        document.close()
+
+    def test_dict_interface(self, corpus):
+        """Prueba que los parsers lo usan como el diccionario de antes."""
+        document = make_document(corpus["invoice"][0])
+
+        assert set(document) == {"text", "tables", "pages", "words", "metadata"}
+        assert document["text"] == document.text
+        assert document.get("tables", []) == document.tables
+        assert document.get("otra") is None
+        assert document["metadata"]["file_name"] == corpus["invoice"][0].name
+
+        document["text"] = "texto de OCR"
+        assert document.get("text", "") == "texto de OCR"
+
+        with pytest.raises(KeyError):
+            document["pages"] = []
+
+    def test_pages_and_words(self, corpus):
+        """Prueba las cajas de palabras por pagina y planas."""
+        document = make_document(corpus["report"][0], extract_tables=False)
+
+        assert len(document.pages) == 2
+        second = document.pages[-1]
+        assert second["number"] == 2
+        assert document.pages[1] is second
+        assert set(second["words"][0]) == {"text", "x0", "top", "x1", "bottom"}
+
+        words = document.words
+        assert len(words) == sum(len(page["words"]) for page in document.pages)
+        assert words[-1]["page"] == 2
+
+        with pytest.raises(IndexError):
+            document.pages[2]
+
+    def test_pickle_materializes(self, corpus):
+        """Prueba que al enviarlo a otro proceso viaja ya calculado."""
+        document = make_document(corpus["report"][0])
+
+        copy = pickle.loads(pickle.dumps(document))
+
+        assert copy._analyzer is None
+        assert copy._text is not None and copy._tables is not None
+        assert copy.tables == document.tables
+        assert copy.pages == document.pages
+
+    def test_invalid_paths(self, tmp_path):
+        """Prueba que la ruta se valida al crear el documento."""
+        with pytest.raises(FileNotFoundError):
+            make_document(tmp_path / "no_existe.pdf")
+
+
+@pytest.mark.parametrize("limits", [
+    {},
+    pytest.param(
+        {"timeout_seconds": 60, "max_memory_mb": 1024},
+        marks=pytest.mark.skipif(not can_isolate(), reason="Requiere fork")
+    ),
+], ids=["direct", "isolated"])
+def test_pipeline_resumes_stage_after_lazy_tables(corpus, tmp_path, limits):
+    """Prueba que las tablas se buscan durante el parseo, tambien en el subproceso."""
+    events = []
+    pipeline = Pipeline(
+        {"extraction": {"ocr_fallback": False, **limits}},
+        output_format="json", parser_type="invoice", dry_run=True
+    )
+
+    result = pipeline.process_file(corpus["invoice"][0], tmp_path, events.append)
+
+    stages = [event["stage"] for event in events if event.get("page") is None]
+    assert stages[:5] == ["extract_text", "detect", "parse", "extract_tables", "parse"]
+    assert result["total_rows"] > 0
+    assert pipeline._document is None
+    assert "extract_tables" in pipeline.last_file_timings["stages"]
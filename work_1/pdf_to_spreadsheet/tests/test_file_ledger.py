@@ -0,0 +1,92 @@
+"""
+Tests for File Ledger
+=====================
+
+Pruebas unitarias para el registro persistente de archivos procesados.
+"""
+
+import pytest
+from src.file_ledger import FileLedger, RowStore, file_signature
+
+
+class TestFileLedger:
+    """Pruebas para FileLedger."""
+
+    @pytest.fixture
+    def pdf(self, tmp_path):
+        """Archivo de ejemplo."""
+        pdf = tmp_path / "a.pdf"
+        pdf.write_bytes(b"%PDF-1.4 contenido")
+        return pdf
+
+    def test_record_survives_reload(self, pdf, tmp_path):
+        """Prueba que el registro persiste entre instancias."""
+        ledger_path = tmp_path / "ledger.jsonl"
+        signature = file_signature(pdf)
+
+        FileLedger(ledger_path).record(str(pdf), signature, rows=3)
+        ledger = FileLedger(ledger_path)
+
+        assert ledger.matches(str(pdf), signature["size"], signature["mtime_ns"])
+        assert ledger.get(str(pdf))["rows"] == 3
+
+    def test_matches_detects_changes(self, pdf, tmp_path):
+        """Prueba que un cambio de tamano o mtime no coincide."""
+        ledger = FileLedger(tmp_path / "ledger.jsonl")
+        signature = file_signature(pdf)
+        ledger.record(str(pdf), signature)
+
+        assert not ledger.matches(str(pdf), signature["size"] + 1, signature["mtime_ns"])
+        assert not ledger.matches(str(pdf), signature["size"], signature["mtime_ns"] + 1)
+        assert not ledger.matches("otro.pdf", signature["size"], signature["mtime_ns"])
+
+    def test_truncated_line_is_ignored(self, pdf, tmp_path):
+        """Prueba que una linea cortada por un apagon no rompe la carga."""
+        ledger_path = tmp_path / "ledger.jsonl"
+        FileLedger(ledger_path).record(str(pdf), file_signature(pdf))
+
+        with open(ledger_path, "a", encoding="utf-8") as f:
+            f.write('{"path": "b.pdf", "si')
+
+        assert len(FileLedger(ledger_path)) == 1
+
+    def test_automatic_compaction(self, pdf, tmp_path):
+        """Prueba que las lineas obsoletas se compactan al superar el umbral."""
+        ledger_path = tmp_path / "ledger.jsonl"
+        ledger = FileLedger(ledger_path, compact_threshold=5)
+        signature = file_signature(pdf)
+
+        for _ in range(10):
+            ledger.record(str(pdf), signature)
+
+        assert len(ledger_path.read_text().splitlines()) <= 6
+
+    def test_compact_prunes_missing_files(self, pdf, tmp_path):
+        """Prueba que compactar descarta archivos eliminados."""
+        ledger_path = tmp_path / "ledger.jsonl"
+        ledger = FileLedger(ledger_path)
+        ledger.record(str(pdf), file_signature(pdf))
+        ledger.record(str(tmp_path / "borrado.pdf"), file_signature(pdf))
+
+        assert ledger.compact(prune_missing=True) == 1
+        assert len(ledger_path.read_text().splitlines()) == 1
+
+
+class TestRowStore:
+    """Pruebas para RowStore."""
+
+    def test_last_line_wins_and_rewrite_compacts(self, tmp_path):
+        """Prueba que las filas nuevas de una ruta reemplazan a las anteriores."""
+        store_path = tmp_path / "rows.jsonl"
+        store = RowStore(store_path)
+        store.add("a.pdf", [{"id": 1}])
+        store.add("b.pdf", [{"id": 2}])
+        store.add("a.pdf", [{"id": 3}])
+
+        assert RowStore(store_path).load() == {"a.pdf": [{"id": 3}], "b.pdf": [{"id": 2}]}
+        assert store.load(["b.pdf", "c.pdf"]) == {"b.pdf": [{"id": 2}]}
+
+        store.rewrite(store.load(["a.pdf"]))
+
+        assert store.load() == {"a.pdf": [{"id": 3}]}
+        assert len(store_path.read_text().splitlines()) == 1
@@ -5,6 +5,8 @@ Tests for Invoice Parser
 Pruebas unitarias para el parser de facturas.
 """
 
+import time
+
 import pytest
 from src.parsers.invoice_parser import InvoiceParser
 
@@ -147,3 +149,153 @@ class TestInvoiceParserEdgeCases:
         result = parser.parse({"text": text, "tables": []})
         
         assert result[0]["invoice_id"] is not None
+
+
+class TestInvoiceExtractionNeeds:
+    """Pruebas para la condicion de parada de la extraccion."""
+    
+    @pytest.fixture
+    def parser(self):
+        return InvoiceParser()
+    
+    def test_header_page_without_total(self, parser):
+        """Prueba que una primera pagina con items que continuan no basta."""
+        text = """Numero de Factura: INV-2024-001
+Fecha: 15/03/2024
+Cant. Descripcion Precio Unit. Total
+5 Producto A $100.00 $500.00"""
+        
+        assert not parser.has_required_fields(text)
+    
+    def test_subtotal_is_not_final_total(self, parser):
+        """Prueba que el subtotal no marca el fin de la factura."""
+        text = "Factura: FAC-001\nFecha: 01/01/2024\nSubtotal: $1,400.00"
+        
+        assert not parser.has_required_fields(text)
+    
+    def test_all_required_fields(self, parser, sample_invoice_text):
+        """Prueba que con numero, fecha y total final ya no se leen mas paginas."""
+        assert parser.has_required_fields(sample_invoice_text)
+        assert not parser.has_required_fields("TOTAL: $9,744.00")
+    
+    def test_extraction_needs(self, parser):
+        """Prueba lo que declara el parser y el limite configurable."""
+        needs = parser.extraction_needs()
+        
+        assert needs["tables"] is True
+        assert needs["max_pages"] is None
+        assert needs["stop_when"] == parser.has_required_fields
+        assert InvoiceParser({"max_pages": 2}).extraction_needs()["max_pages"] == 2
+
+
+
+class TestInvoiceFieldExtraction:
+    """Pruebas para la extraccion de campos por indice de etiquetas."""
+    
+    @pytest.fixture
+    def parser(self):
+        return InvoiceParser()
+    
+    def per_field(self, parser, text):
+        """Referencia: un re.search por campo."""
+        return {
+            field: parser.extract_pattern(text, parser.PATTERNS[field])
+            for field in parser.HEADER_FIELDS
+        }
+    
+    def test_same_as_one_search_per_field(self, parser, sample_invoice_text):
+        """Prueba que se obtiene el primer match de cada patron."""
+        texts = [
+            sample_invoice_text,
+            "Factura No. 12345 Fecha de emision: 2024-03-15 Total a pagar: $500.00",
+            "Invoice # A-77 Date: 01/02/2024 Vendor: Globex Tax ID: X1 Tax: 16.00 Grand Total 116.00",
+            "Folio: F9 Razon social: Initech Customer: Bob Sub total 10 IVA 1.6 Importe total 11.60",
+            "Subtotal: $1,400.00 Total: $1,624.00 Total 5",
+            "sin campos",
+        ]
+        
+        for text in texts:
+            text = parser.clean_text(text)
+            fields = parser._extract_header_fields(text)
+            expected = self.per_field(parser, text)
+            if not expected["date"]:
+                expected["date"] = parser.extract_pattern(text, parser.PATTERNS["date_long"])
+            
+            assert fields == expected
+    
+    def test_long_date_fallback(self, parser):
+        """Prueba la fecha en formato largo cuando no hay fecha numerica."""
+        fields = parser._extract_header_fields("Factura: F-1 emitida el 5 de marzo de 2024")
+        
+        assert fields["date"] == "5 de marzo de 2024"
+        assert fields["invoice_id"] == "F-1"
+    
+    def test_text_that_changes_length_when_lowered(self, parser):
+        """Prueba que sin posiciones confiables se busca campo por campo."""
+        text = "\u0130stanbul Factura: F-2 Total: 10.00"
+        
+        assert parser._extract_header_fields(text) == {
+            **self.per_field(parser, text),
+            "date": None,
+        }
+
+
+
+class TestInvoiceTextItems:
+    """Pruebas para los items extraidos renglon por renglon."""
+    
+    @pytest.fixture
+    def parser(self):
+        return InvoiceParser()
+    
+    def test_clean_text_keeps_lines(self, parser):
+        """Prueba que clean_text conserva los renglones y normaliza espacios."""
+        text = "  FACTURA \r\n\n  5   Producto A\t $100.00   $500.00 \x0c\n"
+        
+        assert parser.clean_text(text) == "FACTURA\n5 Producto A $100.00 $500.00"
+    
+    def test_items_per_line(self, parser, sample_invoice_text):
+        """Prueba que cada renglon de la tabla es un item y nada mas."""
+        items = parser.parse({"text": sample_invoice_text, "tables": []})[0]["items"]
+        
+        assert items == [
+            {"quantity": "10", "description": "Licencia Software Anual",
+             "unit_price": "500.00", "line_total": "5,000.00"},
+            {"quantity": "5", "description": "Horas de Implementacion",
+             "unit_price": "200.00", "line_total": "1,000.00"},
+            {"quantity": "3", "description": "Modulos Adicionales",
+             "unit_price": "800.00", "line_total": "2,400.00"},
+        ]
+    
+    def test_subtotal_from_items_with_thousands(self, parser):
+        """Prueba el subtotal calculado con importes con separador de miles."""
+        text = "Factura: F-1\nFecha: 01/01/2024\n2 Servidor $1,500.00 $3,000.00\n1 Soporte $ 250.00 $ 250.00"
+        
+        result = parser.parse({"text": text, "tables": []})[0]
+        
+        assert result["items_count"] == 2
+        assert result["subtotal"] == 3250.0
+    
+    def test_decimal_comma_amounts(self, parser):
+        """Prueba items y subtotal con importes en formato europeo."""
+        text = "Factura: F-1\nFecha: 01/01/2024\n2 Tornillo acero 1.234,56 2.469,12\n3 Tuerca 10,50 31,50"
+        
+        result = parser.parse({"text": text, "tables": []})[0]
+        
+        assert result["items"] == [
+            {"quantity": "2", "description": "Tornillo acero",
+             "unit_price": "1.234,56", "line_total": "2.469,12"},
+            {"quantity": "3", "description": "Tuerca",
+             "unit_price": "10,50", "line_total": "31,50"},
+        ]
+        assert result["subtotal"] == pytest.approx(2500.62)
+    
+    def test_long_text_without_items_is_linear(self, parser):
+        """Prueba que texto corrido con numeros no dispara backtracking."""
+        text = "\n".join(f"Clausula {i} del contrato aplica a 3 partes" for i in range(5000))
+        
+        start = time.perf_counter()
+        items = parser._extract_items_from_text(parser.clean_text(text))
+        
+        assert items == []
+        assert time.perf_counter() - start < 1.0
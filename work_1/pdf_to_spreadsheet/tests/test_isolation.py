@@ -0,0 +1,79 @@
+"""
+Tests for Isolation
+===================
+
+Pruebas unitarias para la ejecucion en subprocesos con limites.
+"""
+
+import os
+import time
+
+import pytest
+from src.isolation import RESOURCE_AVAILABLE, can_isolate, run_isolated
+
+
+pytestmark = pytest.mark.skipif(not can_isolate(), reason="Requiere fork")
+
+
+def pages(count, emit):
+    for page in range(1, count + 1):
+        emit(("page", page, count))
+    return os.getpid()
+
+
+def sleep_forever(emit):
+    emit("inicio")
+    time.sleep(60)
+
+
+def fail(emit):
+    raise ValueError("PDF invalido")
+
+
+def allocate(megabytes, emit):
+    return len(bytearray(megabytes * 1024 * 1024))
+
+
+class TestRunIsolated:
+    """Pruebas para run_isolated."""
+
+    def test_result_and_events(self):
+        """Prueba que se retorna el resultado y se reenvian los eventos."""
+        events = []
+
+        child_pid = run_isolated(pages, (3,), timeout=10, on_event=events.append)
+
+        assert child_pid != os.getpid()
+        assert events == [("page", 1, 3), ("page", 2, 3), ("page", 3, 3)]
+
+    def test_timeout_kills_subprocess(self):
+        """Prueba que un subproceso colgado se mata al vencer el plazo."""
+        events = []
+        started = time.monotonic()
+
+        with pytest.raises(TimeoutError):
+            run_isolated(sleep_forever, timeout=0.5, on_event=events.append)
+
+        assert time.monotonic() - started < 5
+        assert events == ["inicio"]
+
+    def test_exception_is_reraised(self):
+        """Prueba que la excepcion del subproceso llega al padre."""
+        with pytest.raises(ValueError, match="PDF invalido"):
+            run_isolated(fail, timeout=10)
+
+    @pytest.mark.skipif(not RESOURCE_AVAILABLE, reason="Requiere el modulo resource")
+    def test_memory_limit(self):
+        """Prueba que exceder el limite de memoria produce MemoryError."""
+        with pytest.raises(MemoryError):
+            run_isolated(allocate, (2048,), timeout=30, memory_mb=256)
+
+        assert run_isolated(allocate, (16,), timeout=30, memory_mb=256) == 16 * 1024 * 1024
+
+    @pytest.mark.skipif(not RESOURCE_AVAILABLE, reason="Requiere el modulo resource")
+    def test_memory_limit_excludes_inherited_memory(self):
+        """Prueba que la memoria del padre no cuenta para el limite del subproceso."""
+        inherited = bytearray(256 * 1024 * 1024)
+
+        assert run_isolated(allocate, (16,), timeout=30, memory_mb=64) == 16 * 1024 * 1024
+        assert len(inherited) == 256 * 1024 * 1024
@@ -0,0 +1,72 @@
+"""
+Tests for Job Events
+====================
+
+Pruebas unitarias para la difusion de progreso de trabajos.
+"""
+
+import asyncio
+
+import pytest
+from src.job_events import JobEventBroker
+from src.job_store import JobStore
+
+
+class TestJobEventBroker:
+    """Pruebas para JobEventBroker."""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        """Crea un almacen temporal."""
+        return JobStore(tmp_path / "jobs.db")
+
+    def test_streams_changes_until_completed(self, store):
+        """Prueba que se emiten los cambios y el stream termina al completar."""
+        job_id = store.create_job("a.pdf")["job_id"]
+        broker = JobEventBroker(store, poll_interval=0.01)
+
+        async def run():
+            events = []
+            async for event in broker.subscribe(job_id):
+                events.append(event)
+                if len(events) == 1:
+                    store.update_job(job_id, status="processing", progress=40, stage="parse")
+                elif event["progress"] == 40:
+                    store.update_job(job_id, status="completed", progress=100, stage="done")
+            return events
+
+        events = asyncio.run(asyncio.wait_for(run(), timeout=5))
+
+        assert [event["status"] for event in events] == ["pending", "processing", "completed"]
+        assert events[1]["stage"] == "parse"
+        assert broker._subscribers == {}
+
+    def test_finished_job_yields_single_event(self, store):
+        """Prueba que un trabajo ya terminado entrega solo su estado."""
+        job_id = store.create_job("a.pdf")["job_id"]
+        store.update_job(job_id, status="failed", error="boom")
+        broker = JobEventBroker(store)
+
+        async def run():
+            return [event async for event in broker.subscribe(job_id)]
+
+        events = asyncio.run(run())
+
+        assert len(events) == 1
+        assert events[0]["error"] == "boom"
+
+    def test_deleted_job_ends_stream(self, store):
+        """Prueba que un trabajo eliminado cierra el stream."""
+        job_id = store.create_job("a.pdf")["job_id"]
+        broker = JobEventBroker(store, poll_interval=0.01)
+
+        async def run():
+            events = []
+            async for event in broker.subscribe(job_id):
+                events.append(event)
+                store.delete_job(job_id)
+            return events
+
+        events = asyncio.run(asyncio.wait_for(run(), timeout=5))
+
+        assert events[-1]["status"] == "not_found"
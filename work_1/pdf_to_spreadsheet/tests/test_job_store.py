@@ -0,0 +1,162 @@
+"""
+Tests for Job Store
+===================
+
+Pruebas unitarias para la cola de trabajos en SQLite.
+"""
+
+import pytest
+from src.job_store import JobStore
+
+
+class TestJobStore:
+    """Pruebas para JobStore."""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        """Crea un almacen temporal."""
+        return JobStore(tmp_path / "jobs.db")
+
+    def test_create_and_get_job(self, store):
+        """Prueba que un trabajo creado queda pendiente."""
+        job = store.create_job("factura.pdf", "/tmp/factura.pdf", output_format="json")
+
+        assert job["status"] == "pending"
+        assert job["progress"] == 0
+        assert job["output_format"] == "json"
+        assert store.get_job(job["job_id"])["filename"] == "factura.pdf"
+
+    def test_get_missing_job(self, store):
+        """Prueba que un trabajo inexistente retorna None."""
+        assert store.get_job("no-existe") is None
+
+    def test_jobs_survive_reopen(self, tmp_path):
+        """Prueba que los trabajos persisten entre instancias."""
+        db_path = tmp_path / "jobs.db"
+        job = JobStore(db_path).create_job("a.pdf")
+
+        assert JobStore(db_path).get_job(job["job_id"]) is not None
+
+    def test_claim_next_job_is_fifo(self, store):
+        """Prueba que se reclama primero el trabajo mas antiguo."""
+        first = store.create_job("a.pdf")
+        store.create_job("b.pdf")
+
+        claimed = store.claim_next_job("worker-1")
+
+        assert claimed["job_id"] == first["job_id"]
+        assert claimed["status"] == "processing"
+        assert claimed["worker_id"] == "worker-1"
+        assert claimed["attempts"] == 1
+
+    def test_claim_never_returns_same_job_twice(self, store):
+        """Prueba que dos reclamos no obtienen el mismo trabajo."""
+        store.create_job("a.pdf")
+        store.create_job("b.pdf")
+
+        first = store.claim_next_job("worker-1")
+        second = store.claim_next_job("worker-2")
+
+        assert first["job_id"] != second["job_id"]
+        assert store.claim_next_job("worker-3") is None
+
+    def test_update_job_serializes_result(self, store):
+        """Prueba que el resultado se guarda y recupera como diccionario."""
+        job = store.create_job("a.pdf")
+
+        store.update_job(job["job_id"], status="completed", result={"total_rows": 3})
+
+        assert store.get_job(job["job_id"])["result"] == {"total_rows": 3}
+
+    def test_update_job_rejects_unknown_status(self, store):
+        """Prueba que un estado desconocido lanza error."""
+        job = store.create_job("a.pdf")
+
+        with pytest.raises(ValueError):
+            store.update_job(job["job_id"], status="exploded")
+
+    def test_requeue_stale_jobs(self, store):
+        """Prueba que trabajos abandonados vuelven a la cola."""
+        job = store.create_job("a.pdf")
+        store.claim_next_job("worker-1")
+
+        requeued = store.requeue_stale_jobs(stale_after_seconds=-1)
+
+        assert requeued == 1
+        assert store.get_job(job["job_id"])["status"] == "pending"
+
+    def test_requeue_skips_jobs_with_recent_heartbeat(self, store):
+        """Prueba que un trabajo largo pero con latido no se reencola."""
+        job = store.create_job("a.pdf")
+        store.claim_next_job("worker-1")
+        store.update_job(job["job_id"], started_at="2000-01-01T00:00:00")
+
+        assert store.heartbeat(job["job_id"], "worker-1") is True
+        assert store.requeue_stale_jobs(stale_after_seconds=60) == 0
+        assert store.get_job(job["job_id"])["status"] == "processing"
+
+        store.update_job(job["job_id"], updated_at="2000-01-01T00:00:00")
+
+        assert store.requeue_stale_jobs(stale_after_seconds=60) == 1
+
+    def test_heartbeat_and_owner_after_requeue(self, store):
+        """Prueba que el worker original pierde el trabajo reencolado."""
+        job = store.create_job("a.pdf")
+        store.claim_next_job("worker-1")
+        store.requeue_stale_jobs(stale_after_seconds=-1)
+        store.claim_next_job("worker-2")
+
+        assert store.heartbeat(job["job_id"], "worker-1") is False
+        assert store.is_owner(job["job_id"], "worker-1") is False
+        assert store.is_owner(job["job_id"], "worker-2") is True
+
+    def test_requeue_fails_after_max_attempts(self, store):
+        """Prueba que un trabajo que agota sus intentos se marca fallido."""
+        job = store.create_job("a.pdf")
+        store.claim_next_job("worker-1")
+
+        store.requeue_stale_jobs(stale_after_seconds=-1, max_attempts=1)
+
+        assert store.get_job(job["job_id"])["status"] == "failed"
+
+    def test_delete_and_count(self, store):
+        """Prueba eliminacion y conteo por estado."""
+        job = store.create_job("a.pdf")
+        store.create_job("b.pdf")
+
+        assert store.delete_job(job["job_id"]) is True
+        assert store.delete_job(job["job_id"]) is False
+        assert store.count_by_status()["pending"] == 1
+
+    def test_find_duplicate(self, store):
+        """Prueba deteccion de subidas duplicadas por hash y opciones."""
+        job = store.create_job("a.pdf", content_hash="abc", output_format="csv")
+
+        assert store.find_duplicate("abc", "auto", "csv")["job_id"] == job["job_id"]
+        assert store.find_duplicate("abc", "auto", "json") is None
+        assert store.find_duplicate("otro", "auto", "csv") is None
+
+    def test_find_duplicate_ignores_failed_jobs(self, store):
+        """Prueba que un trabajo fallido no bloquea el reintento."""
+        job = store.create_job("a.pdf", content_hash="abc")
+        store.update_job(job["job_id"], status="failed")
+
+        assert store.find_duplicate("abc") is None
+
+    def test_get_jobs_bulk(self, store):
+        """Prueba lectura de varios trabajos en una consulta."""
+        first = store.create_job("a.pdf")
+        second = store.create_job("b.pdf")
+
+        jobs = store.get_jobs([first["job_id"], second["job_id"], "no-existe"])
+
+        assert set(jobs) == {first["job_id"], second["job_id"]}
+        assert store.get_jobs([]) == {}
+
+    def test_stage_column(self, store):
+        """Prueba que la etapa actual se guarda con el progreso."""
+        job = store.create_job("a.pdf")
+
+        store.update_job(job["job_id"], progress=40, stage="parse")
+
+        assert store.get_job(job["job_id"])["stage"] == "parse"
@@ -0,0 +1,141 @@
+"""
+Tests for Layout Templates
+==========================
+
+Pruebas unitarias para la huella de diseno y el almacen de plantillas.
+"""
+
+import multiprocessing
+import os
+
+import pytest
+from src.extractors import TableExtractor
+from src.extractors.layout import FCNTL_AVAILABLE, TemplateStore, fingerprint_page
+
+
+def word(text, x0, top):
+    return {"text": text, "x0": x0, "x1": x0 + 6 * len(text), "top": top, "bottom": top + 10}
+
+
+class FakePage:
+    """Pagina con palabras y lineas fijas."""
+
+    width = 612
+    height = 792
+
+    def __init__(self, words, lines=()):
+        self.words = words
+        self.lines = list(lines)
+        self.rects = []
+
+    def extract_words(self):
+        return self.words
+
+
+def invoice_words(number, total):
+    """Factura del mismo proveedor con valores distintos."""
+    return [
+        word("ACME", 250, 40),
+        word("Numero", 96, 155), word("de", 136, 155), word("Factura:", 152, 155),
+        word(f"INV-{number}", 240, 155),
+        word("Fecha:", 96, 176), word(f"0{number}/01/2024", 240, 176),
+        word("RFC:", 96, 239), word("ACM123", 240, 239),
+        word("TOTAL:", 400, 420 + 20 * number), word(total, 480, 420 + 20 * number),
+    ]
+
+
+def add_templates(path, worker):
+    store = TemplateStore(path)
+    for index in range(20):
+        store.add(f"{worker}-{index}", {"pages": {}})
+
+
+class TestFingerprint:
+    """Pruebas para fingerprint_page."""
+
+    def test_same_template_different_values(self):
+        """Prueba que los valores y las etiquetas bajo la tabla no cambian la huella."""
+        first = fingerprint_page(FakePage(invoice_words(1, "$100.00")))
+        second = fingerprint_page(FakePage(invoice_words(7, "$9,999.00")))
+
+        assert first is not None
+        assert first == second
+
+    def test_different_template(self):
+        """Prueba que otro proveedor (otras etiquetas) cambia la huella."""
+        other = invoice_words(1, "$100.00")
+        other[0] = word("GLOBEX", 250, 40)
+
+        assert fingerprint_page(FakePage(other)) != fingerprint_page(FakePage(invoice_words(1, "$1")))
+
+    def test_ruled_lines_are_part_of_layout(self):
+        """Prueba que los separadores del encabezado distinguen disenos."""
+        words = invoice_words(1, "$1")
+        line = {"x0": 50, "x1": 560, "top": 80}
+
+        assert fingerprint_page(FakePage(words, [line])) != fingerprint_page(FakePage(words))
+
+    def test_too_little_static_text(self):
+        """Prueba que una pagina casi sin texto estatico no tiene huella."""
+        assert fingerprint_page(FakePage([word("123", 10, 10)])) is None
+
+
+class TestTemplateStore:
+    """Pruebas para TemplateStore."""
+
+    def test_persists_across_instances(self, tmp_path):
+        """Prueba que otra instancia (otro proceso) ve las plantillas."""
+        store = TemplateStore(tmp_path / "templates.json")
+        other = TemplateStore(tmp_path / "templates.json")
+
+        store.add("abc", {"pages": {"0": {"strategy": "lines", "tables": []}}})
+
+        assert other.get("abc")["pages"]["0"]["strategy"] == "lines"
+        assert len(other) == 1
+
+    def test_corrupt_file_is_ignored(self, tmp_path):
+        """Prueba que un archivo danado no impide extraer."""
+        path = tmp_path / "templates.json"
+        path.write_text("{no es json")
+
+        assert TemplateStore(path).get("abc") is None
+
+    def test_write_is_atomic(self, tmp_path):
+        """Prueba que no quedan temporales tras guardar."""
+        TemplateStore(tmp_path / "templates.json").add("abc", {"pages": {}})
+
+        assert [name for name in os.listdir(tmp_path) if name.endswith(".tmp")] == []
+
+    @pytest.mark.skipif(not FCNTL_AVAILABLE, reason="Requiere fcntl")
+    def test_concurrent_processes_keep_all_templates(self, tmp_path):
+        """Prueba que procesos que agregan a la vez no pierden plantillas ajenas."""
+        path = tmp_path / "templates.json"
+        context = multiprocessing.get_context("fork")
+        processes = [context.Process(target=add_templates, args=(path, worker)) for worker in range(4)]
+
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        assert len(TemplateStore(path)) == 4 * 20
+
+
+def test_invoices_of_one_template_share_fingerprint(tmp_path):
+    """Prueba con PDFs reales que facturas de un diseno comparten plantilla."""
+    pytest.importorskip("reportlab")
+    from bench.corpus import generate_corpus
+
+    corpus = generate_corpus(tmp_path / "pdfs", invoices=2, invoice_items=3, reports=1, report_pages=1, statements=0)
+    extractor = TableExtractor(template_store=TemplateStore(tmp_path / "templates.json"))
+
+    first = extractor.extract(corpus["invoice"][0])
+    assert extractor.last_template["source"] == "learned"
+
+    second = extractor.extract(corpus["invoice"][1])
+    assert extractor.last_template["source"] == "matched"
+    assert extractor.last_template["misses"] == 0
+    assert len(first) == len(second) == 1
+
+    extractor.extract(corpus["report"][0])
+    assert extractor.last_template["source"] == "learned"
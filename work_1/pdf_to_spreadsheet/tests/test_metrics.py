@@ -0,0 +1,140 @@
+"""
+Tests for Metrics
+=================
+
+Pruebas unitarias para las metricas en formato Prometheus.
+"""
+
+import urllib.request
+
+import pytest
+from src.metrics import MetricsStore, format_labels, serve_metrics
+
+
+def file_timings(pages=2, seconds=0.3, failures=None, ocr_pages=0):
+    """Tiempos de un PDF como los produce el pipeline."""
+    stages = {"extract_text": {"seconds": seconds, "pages": pages}}
+    if ocr_pages:
+        stages["ocr"] = {"seconds": 1.0, "pages": ocr_pages}
+    return {
+        "files": 1,
+        "pages": pages,
+        "input_bytes": 1000,
+        "output_bytes": 200,
+        "total_seconds": seconds,
+        "failures": failures or {},
+        "stages": stages
+    }
+
+
+class TestMetricsStore:
+    """Pruebas para MetricsStore."""
+
+    @pytest.fixture
+    def metrics(self, tmp_path):
+        return MetricsStore(tmp_path / "metrics.db")
+
+    def test_counters_accumulate_across_instances(self, metrics, tmp_path):
+        """Prueba que otro proceso (otra instancia) ve los mismos contadores."""
+        metrics.inc("pdf2sheet_cache_hits_total", source="api")
+        MetricsStore(tmp_path / "metrics.db").inc("pdf2sheet_cache_hits_total", source="api")
+
+        assert metrics.snapshot()[("pdf2sheet_cache_hits_total", 'source="api"')] == 2
+
+    def test_histogram_buckets_are_cumulative(self, metrics):
+        """Prueba que una observacion cuenta en todos los buckets mayores."""
+        metrics.observe("pdf2sheet_queue_wait_seconds", 3.0, source="api")
+        snapshot = metrics.snapshot()
+
+        bucket = 'pdf2sheet_queue_wait_seconds_bucket'
+        assert (bucket, 'source="api",le="1.0"') not in snapshot
+        assert snapshot[(bucket, 'source="api",le="5.0"')] == 1
+        assert snapshot[(bucket, 'source="api",le="+Inf"')] == 1
+        assert snapshot[("pdf2sheet_queue_wait_seconds_sum", 'source="api"')] == 3.0
+
+    def test_record_single_file_results(self, metrics):
+        """Prueba el registro del resultado de process_file."""
+        metrics.record_results(
+            {"total_rows": 4, "errors": 0, "timings": file_timings(ocr_pages=2)},
+            source="watcher"
+        )
+        snapshot = metrics.snapshot()
+
+        assert snapshot[("pdf2sheet_files_total", 'source="watcher",status="completed"')] == 1
+        assert snapshot[("pdf2sheet_pages_total", 'source="watcher"')] == 2
+        assert snapshot[("pdf2sheet_rows_total", 'source="watcher"')] == 4
+        assert snapshot[("pdf2sheet_ocr_pages_total", 'source="watcher"')] == 2
+        assert snapshot[("pdf2sheet_stage_seconds_count", 'stage="ocr"')] == 1
+
+    def test_record_batch_results_by_file(self, metrics):
+        """Prueba que un lote se registra por PDF y las fallas por etapa."""
+        results = {
+            "timings": {"output_bytes": 500, "stages": {"export": {"seconds": 0.1, "pages": 0}}},
+            "files": [
+                {"status": "completed", "rows": 3, "timings": file_timings()},
+                {"status": "failed", "rows": 0, "timings": file_timings(failures={"parse": 1})},
+                {"status": "failed", "rows": 0, "timings": None},
+            ]
+        }
+
+        metrics.record_results(results, source="api")
+        snapshot = metrics.snapshot()
+
+        assert snapshot[("pdf2sheet_files_total", 'source="api",status="failed"')] == 2
+        assert snapshot[("pdf2sheet_failures_total", 'source="api",stage="parse"')] == 1
+        assert snapshot[("pdf2sheet_failures_total", 'source="api",stage="unknown"')] == 1
+        assert snapshot[("pdf2sheet_stage_seconds_count", 'stage="export"')] == 1
+        assert snapshot[("pdf2sheet_pages_total", 'source="api"')] == 4
+
+    def test_queue_wait_from_job_dates(self, metrics):
+        """Prueba la espera en cola calculada desde fechas ISO."""
+        metrics.observe_queue_wait("2024-01-01T10:00:00", "2024-01-01T10:00:02.5", source="api")
+        metrics.observe_queue_wait(None, "2024-01-01T10:00:00", source="api")
+
+        snapshot = metrics.snapshot()
+        assert snapshot[("pdf2sheet_queue_wait_seconds_count", 'source="api"')] == 1
+        assert snapshot[("pdf2sheet_queue_wait_seconds_sum", 'source="api"')] == 2.5
+
+    def test_render_text_format(self, metrics):
+        """Prueba el formato de exposicion con gauges y buckets ordenados."""
+        metrics.observe("pdf2sheet_stage_seconds", 0.2, stage="parse")
+        text = metrics.render({"pdf2sheet_jobs": [({"status": "pending"}, 3)]})
+        lines = text.splitlines()
+
+        assert "# TYPE pdf2sheet_stage_seconds histogram" in lines
+        assert "# TYPE pdf2sheet_jobs gauge" in lines
+        assert 'pdf2sheet_jobs{status="pending"} 3' in lines
+
+        buckets = [line for line in lines if line.startswith("pdf2sheet_stage_seconds_bucket")]
+        assert buckets[0] == 'pdf2sheet_stage_seconds_bucket{stage="parse",le="0.01"} 0'
+        assert 'pdf2sheet_stage_seconds_bucket{stage="parse",le="0.25"} 1' in buckets
+        assert buckets[-1] == 'pdf2sheet_stage_seconds_bucket{stage="parse",le="+Inf"} 1'
+        assert text.endswith("\n")
+
+    def test_database_errors_do_not_raise(self, metrics):
+        """Prueba que las metricas son de mejor esfuerzo."""
+        metrics.db_path.unlink()
+        metrics.db_path.mkdir()
+
+        metrics.inc("pdf2sheet_cache_hits_total", source="api")
+
+    def test_serve_metrics(self, metrics):
+        """Prueba el servidor HTTP de metricas para procesos sin API."""
+        metrics.inc("pdf2sheet_cache_hits_total", source="watcher")
+        server = serve_metrics(metrics.render, port=0, host="127.0.0.1")
+
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url) as response:
+                body = response.read().decode("utf-8")
+                content_type = response.headers["Content-Type"]
+        finally:
+            server.shutdown()
+
+        assert content_type.startswith("text/plain; version=0.0.4")
+        assert 'pdf2sheet_cache_hits_total{source="watcher"} 1' in body
+
+
+def test_format_labels_escapes_values():
+    """Prueba el escape de comillas y barras en etiquetas."""
+    assert format_labels({"b": 'x"y', "a": "c\\d"}) == 'a="c\\\\d",b="x\\"y"'
@@ -92,6 +92,11 @@ class TestDataNormalizer:
         result = normalizer._normalize_number("USD 500.00")
         assert result == 500.00
     
+    def test_normalize_number_thousands_comma(self, normalizer):
+        """Prueba normalizacion de miles con una sola coma."""
+        result = normalizer._normalize_number("1,500")
+        assert result == 1500.0
+    
     def test_normalize_text_whitespace(self, normalizer):
         """Prueba normalizacion de espacios en texto."""
         result = normalizer._normalize_text("  texto   con   espacios  ")
@@ -0,0 +1,133 @@
+"""
+Tests for Page Analyzer
+=======================
+
+Pruebas unitarias para el analisis de paginas en una sola pasada.
+"""
+
+import pytest
+from src.extractors import PageAnalyzer, TableExtractor, TextExtractor
+from src.extractors.page_analyzer import AnalyzedPage
+
+
+pdfplumber = pytest.importorskip("pdfplumber")
+
+
+@pytest.fixture(scope="module")
+def corpus(tmp_path_factory):
+    """Facturas y un reporte de varias paginas generados con reportlab."""
+    pytest.importorskip("reportlab")
+    from bench.corpus import generate_corpus
+
+    return generate_corpus(
+        tmp_path_factory.mktemp("pdfs"), invoices=1, invoice_items=4, reports=1, report_pages=2, statements=1
+    )
+
+
+def make_analyzer():
+    return PageAnalyzer(TextExtractor(), TableExtractor())
+
+
+class TestPageAnalyzer:
+    """Pruebas para PageAnalyzer."""
+
+    def test_same_output_as_separate_extractors(self, corpus):
+        """Prueba que el texto y las tablas son los de los extractores por separado."""
+        for paths in corpus.values():
+            for path in paths:
+                analysis = make_analyzer().analyze(path)
+
+                assert analysis["text"] == TextExtractor().extract(path)
+                assert analysis["tables"] == TableExtractor().extract(path)
+
+    def test_word_boxes_per_page(self, corpus):
+        """Prueba las cajas de palabras por pagina."""
+        analysis = make_analyzer().analyze(corpus["report"][0])
+
+        assert [page["number"] for page in analysis["pages"]] == [1, 2]
+        first = analysis["pages"][0]
+        assert first["width"] == 612
+        word = first["words"][0]
+        assert set(word) == {"text", "x0", "top", "x1", "bottom"}
+        assert word["x0"] < word["x1"] and word["top"] < word["bottom"]
+
+    def test_stages_and_pages(self, corpus):
+        """Prueba que se reportan ambas etapas con su avance por pagina."""
+        events = []
+
+        def stage_callback(stage):
+            events.append(stage)
+            return lambda page, total: events.append((stage, page, total))
+
+        make_analyzer().analyze(corpus["report"][0], stage_callback=stage_callback)
+
+        assert events == [
+            "extract_text", ("extract_text", 1, 2), ("extract_text", 2, 2),
+            "extract_tables", ("extract_tables", 1, 2), ("extract_tables", 2, 2),
+        ]
+
+    def test_text_only(self, corpus):
+        """Prueba que sin tablas no se ejecuta la deteccion."""
+        analysis = make_analyzer().analyze(corpus["invoice"][0], extract_tables=False)
+
+        assert analysis["text"]
+        assert analysis["tables"] == []
+
+    def test_invalid_paths(self, tmp_path):
+        """Prueba los errores de archivo inexistente o que no es PDF."""
+        with pytest.raises(FileNotFoundError):
+            make_analyzer().analyze(tmp_path / "no_existe.pdf")
+
+        other = tmp_path / "datos.txt"
+        other.write_text("hola")
+        with pytest.raises(ValueError):
+            make_analyzer().analyze(other)
+
+
+class TestAnalyzedPage:
+    """Pruebas para AnalyzedPage."""
+
+    def test_words_are_shared(self, corpus):
+        """Prueba que las palabras por defecto no se vuelven a agrupar."""
+        with pdfplumber.open(corpus["invoice"][0]) as pdf:
+            page = AnalyzedPage(pdf.pages[0])
+
+            assert page.extract_words() is page.words
+            assert page.extract_words(x_tolerance=3, y_tolerance=3) is page.words
+            assert page.words == pdf.pages[0].extract_words()
+            assert page.extract_words(keep_blank_chars=True) is not page.words
+            assert page.text == pdf.pages[0].extract_text()
+            assert page.width == pdf.pages[0].width
+
+
+class TestExtractionNeeds:
+    """Pruebas para la lectura de paginas segun las necesidades del parser."""
+
+    def test_stop_when_satisfied(self, corpus):
+        """Prueba que se deja de leer al cumplirse la condicion."""
+        seen = []
+
+        def stop_when(text):
+            seen.append(text)
+            return True
+
+        analysis = make_analyzer().analyze(corpus["report"][0], needs={"stop_when": stop_when})
+
+        assert analysis["pages_read"] == 1
+        assert analysis["total_pages"] == 2
+        assert len(analysis["pages"]) == 1
+        assert len(analysis["tables"]) == 1
+        assert seen == [analysis["text"]]
+
+    def test_max_pages_and_no_tables(self, corpus):
+        """Prueba el limite de paginas y un parser que no usa tablas."""
+        analysis = make_analyzer().analyze(corpus["report"][0], needs={"max_pages": 1, "tables": False})
+
+        assert analysis["pages_read"] == 1
+        assert analysis["tables"] == []
+
+    def test_reads_everything_without_needs(self, corpus):
+        """Prueba que sin necesidades se leen todas las paginas."""
+        analysis = make_analyzer().analyze(corpus["report"][0])
+
+        assert analysis["pages_read"] == analysis["total_pages"] == 2
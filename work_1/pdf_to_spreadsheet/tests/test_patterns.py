@@ -0,0 +1,100 @@
+"""
+Tests for Pattern Guard
+=======================
+
+Pruebas unitarias para la compilacion y el control de tiempo de patrones.
+"""
+
+import pytest
+from src import patterns
+from src.patterns import check_config_patterns, config_patterns, match_pattern
+from src.pipeline import Pipeline
+from src.validator import DataValidator
+
+
+def parsers_config(**validation):
+    return {"parsers": {"invoice": {"validation": validation}, "report": {}}}
+
+
+@pytest.fixture(autouse=True)
+def fresh_memo(monkeypatch):
+    """Cada prueba mide sus patrones desde cero."""
+    monkeypatch.setattr(patterns, "_checked", {})
+
+
+class TestConfigPatterns:
+    """Pruebas para la revision de patrones al iniciar."""
+
+    def test_collects_validation_patterns(self):
+        """Prueba que se reunen solo las reglas con ``pattern``."""
+        config = parsers_config(invoice_id={"pattern": r"^F-\d+$"}, total={"type": "number"})
+
+        assert config_patterns(config) == [("parsers.invoice.validation.invoice_id.pattern", r"^F-\d+$")]
+
+    def test_invalid_pattern_names_its_location(self):
+        """Prueba que un patron invalido es un error de configuracion."""
+        config = parsers_config(invoice_id={"pattern": r"^F-(\d+$"})
+
+        with pytest.raises(ValueError, match=r"parsers\.invoice\.validation\.invoice_id\.pattern"):
+            check_config_patterns(config)
+
+    def test_fast_pattern_does_not_warn(self):
+        """Prueba que un patron lineal no se reporta."""
+        config = parsers_config(invoice_id={"pattern": r"^[A-Z]{1,4}-\d+$"})
+
+        assert check_config_patterns(config) == []
+
+    def test_pathological_pattern_warns(self):
+        """Prueba que un patron con retroceso catastrofico se reporta."""
+        config = parsers_config(invoice_id={"pattern": r"(a+)+$"})
+
+        warnings = check_config_patterns(config)
+
+        assert len(warnings) == 1
+        assert "parsers.invoice.validation.invoice_id.pattern" in warnings[0]
+
+    def test_measured_once_per_process(self, monkeypatch):
+        """Prueba que un patron repetido se mide una sola vez."""
+        calls = []
+        monkeypatch.setattr(patterns, "pattern_cost_ms", lambda pattern, budget: calls.append(pattern) or 0.0)
+        config = parsers_config(a={"pattern": r"^\d+$"}, b={"pattern": r"^\d+$"})
+
+        check_config_patterns(config)
+        check_config_patterns(config)
+
+        assert calls == [r"^\d+$"]
+
+    def test_pipeline_checks_at_startup(self):
+        """Prueba que el pipeline rechaza un patron invalido al crearse."""
+        config = {"extraction": {"ocr_fallback": False}, **parsers_config(total={"pattern": "["})}
+
+        with pytest.raises(ValueError):
+            Pipeline(config, output_format="json", dry_run=True)
+
+
+class TestPatternTimeout:
+    """Pruebas para el limite de tiempo en ejecucion."""
+
+    def test_match_like_re_match(self):
+        """Prueba que coincide desde el inicio, como ``re.match``."""
+        assert match_pattern(r"F-\d+", "F-12 extra")
+        assert not match_pattern(r"\d+", "F-12")
+
+    def test_validator_reports_timeout(self, monkeypatch):
+        """Prueba que una evaluacion cortada queda como error de la fila."""
+        def timeout(pattern, value, timeout_ms):
+            raise TimeoutError("regex timed out")
+
+        monkeypatch.setattr("src.validator.match_pattern", timeout)
+        validator = DataValidator({"pattern_timeout_ms": 5})
+
+        _, errors = validator.validate([{"codigo": "aaaa"}], {"codigo": {"pattern": r"(a+)+$"}})
+
+        assert errors == ["Fila 1: 'codigo' excedio el tiempo del patron (5 ms)"]
+
+    def test_regex_timeout(self):
+        """Prueba el corte real con el modulo ``regex``."""
+        pytest.importorskip("regex")
+
+        with pytest.raises(TimeoutError):
+            match_pattern(r"(a+)+$", "a" * 64 + "!", timeout_ms=10)
@@ -0,0 +1,296 @@
+"""
+Tests for Pipeline
+==================
+
+Pruebas unitarias para la orquestacion del pipeline.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+from src.pipeline import MANIFEST_NAME, Pipeline
+
+
+class TestPipelineBatch:
+    """Pruebas para procesamiento por lotes y deduplicacion."""
+
+    @pytest.fixture
+    def pipeline(self):
+        """Pipeline sin OCR con filas simuladas por archivo."""
+        pipeline = Pipeline({"extraction": {"ocr_fallback": False}}, output_format="json")
+
+        rows_by_name = {
+            "a.pdf": [{"id": "1", "items": [{"q": 1}]}, {"id": "2", "items": []}],
+            "b.pdf": [{"id": "1", "items": [{"q": 1}]}, {"id": "3", "items": []}],
+            "c.pdf": [],
+        }
+
+        def fake_collect(pdf_file):
+            pipeline.stats["total_files"] += 1
+            rows = [dict(row, _source_file=pdf_file.name) for row in rows_by_name[pdf_file.name]]
+            pipeline.stats["total_rows"] += len(rows)
+            return rows
+
+        pipeline._collect_rows = fake_collect
+        return pipeline
+
+    def test_deduplicate_handles_list_values(self, pipeline):
+        """Prueba que filas con listas (items de factura) se deduplican."""
+        data = [{"id": "1", "items": [1, 2]}, {"id": "1", "items": [1, 2]}]
+
+        assert len(pipeline._deduplicate(data, {})) == 1
+
+    def test_deduplicate_keep_last_preserves_position(self, pipeline):
+        """Prueba que keep=last reemplaza en la posicion original."""
+        data = [
+            {"id": "1", "v": "a"},
+            {"id": "2", "v": "b"},
+            {"id": "1", "v": "c"},
+        ]
+
+        result = pipeline._deduplicate(data, {"key_columns": ["id"], "keep": "last"})
+
+        assert [row["v"] for row in result] == ["c", "b"]
+
+    def test_process_files_combined_dedups_across_files(self, pipeline, tmp_path):
+        """Prueba que el lote combinado deduplica entre archivos."""
+        files = [tmp_path / name for name in ("a.pdf", "b.pdf", "c.pdf")]
+
+        result = pipeline.process_files(files, tmp_path / "out", base_name="lote")
+
+        with open(result["output_file"], encoding="utf-8") as f:
+            rows = json.load(f)
+
+        assert [row["id"] for row in rows] == ["1", "2", "3"]
+        assert [item["status"] for item in result["files"]] == ["completed", "completed", "empty"]
+
+    def test_process_files_per_file_exports(self, pipeline, tmp_path):
+        """Prueba exportacion por archivo despues de deduplicar el lote."""
+        files = [tmp_path / name for name in ("a.pdf", "b.pdf")]
+        progress = []
+
+        result = pipeline.process_files(
+            files, tmp_path / "out", combine=False, progress_callback=progress.append
+        )
+
+        assert sorted(p.split("/")[-1] for p in result["output_files"]) == ["a.json", "b.json"]
+        assert [item["filename"] for item in progress] == ["a.pdf", "b.pdf"]
+
+        with open(tmp_path / "out" / "b.json", encoding="utf-8") as f:
+            assert [row["id"] for row in json.load(f)] == ["3"]
+
+    def test_process_directory_discovers_recursively_largest_first(self, pipeline, tmp_path):
+        """Prueba que el directorio se recorre con subcarpetas y por tamano."""
+        input_dir = tmp_path / "in"
+        (input_dir / "sub").mkdir(parents=True)
+        (input_dir / "c.pdf").write_bytes(b"x" * 10)
+        (input_dir / "sub" / "b.pdf").write_bytes(b"x" * 30)
+        (input_dir / "A.PDF").write_bytes(b"x" * 20)
+        pipeline.dry_run = True
+
+        rows_by_name = {"c.pdf": [], "b.pdf": [{"id": "1"}], "A.PDF": [{"id": "2"}]}
+        pipeline._collect_rows = lambda pdf_file: rows_by_name[pdf_file.name]
+
+        result = pipeline.process_directory(input_dir, tmp_path / "out")
+
+        assert [item["filename"] for item in result["files"]] == ["b.pdf", "A.PDF", "c.pdf"]
+        assert all(item["total"] == 3 for item in result["files"])
+
+        result = pipeline.process_directory(input_dir, tmp_path / "out", exclude=["sub"])
+
+        assert [item["filename"] for item in result["files"]] == ["A.PDF", "c.pdf"]
+
+    def test_results_include_stage_timings(self, tmp_path):
+        """Prueba que los resultados incluyen tiempos por etapa y por archivo."""
+        pipeline = Pipeline({"extraction": {"ocr_fallback": False}}, output_format="json")
+
+        def fake_extract(file_path):
+            callback = pipeline._page_callback("extract_text")
+            callback(1, 2)
+            callback(2, 2)
+            return {"text": "hola", "tables": [], "metadata": {}}
+
+        pipeline._extract_data = fake_extract
+        pdf = tmp_path / "a.pdf"
+        pdf.write_bytes(b"x" * 50)
+
+        result = pipeline.process_files([pdf], tmp_path / "out")
+
+        timings = result["timings"]
+        assert timings["files"] == 1
+        assert timings["pages"] == 2
+        assert timings["input_bytes"] == 50
+        assert {"detect", "parse"} <= set(timings["stages"])
+        assert result["files"][0]["timings"]["stages"]["detect"]["seconds"] >= 0
+
+    def test_failure_is_attributed_to_stage(self, tmp_path):
+        """Prueba que una excepcion se registra en la etapa que la produjo."""
+        pipeline = Pipeline({"extraction": {"ocr_fallback": False}}, output_format="json")
+        pipeline._extract_data = lambda file_path: {"text": "hola", "tables": [], "metadata": {}}
+        pipeline.normalizer.normalize = lambda data: 1 / 0
+        pipeline._get_parser = lambda extracted: type(
+            "Parser", (), {
+                "parse": lambda self, data: [{"id": "1"}],
+                "get_validation_rules": lambda self: {}
+            }
+        )()
+
+        result = pipeline.process_files([tmp_path / "a.pdf"], tmp_path / "out")
+
+        assert result["files"][0]["status"] == "failed"
+        assert result["timings"]["failures"] == {"normalize": 1}
+
+    def test_extraction_timeout_fails_only_that_file(self, tmp_path):
+        """Prueba que un PDF que excede el tiempo se registra como error y el lote sigue."""
+        pipeline = Pipeline(
+            {"extraction": {"ocr_fallback": False, "timeout_seconds": 0.5}},
+            output_format="json"
+        )
+
+        def fake_extract(file_path):
+            pipeline._report_stage("extract_text")
+            if file_path.name == "colgado.pdf":
+                time.sleep(60)
+            return {"text": "hola", "tables": [], "metadata": {}}
+
+        pipeline._extract_data = fake_extract
+        pipeline._get_parser = lambda extracted: type(
+            "Parser", (), {
+                "parse": lambda self, data: [{"id": "1"}],
+                "get_validation_rules": lambda self: {}
+            }
+        )()
+
+        files = [tmp_path / "colgado.pdf", tmp_path / "ok.pdf"]
+        result = pipeline.process_files(files, tmp_path / "out")
+
+        hung, ok = result["files"]
+        assert hung["status"] == "failed"
+        assert hung["error"].startswith("TimeoutError")
+        assert ok["status"] == "completed"
+        assert result["timeouts"] == 1
+        assert result["timings"]["failures"] == {"extract_text": 1}
+
+
+class TestPipelineIncremental:
+    """Pruebas para el procesamiento incremental de directorios."""
+
+    @pytest.fixture
+    def pipeline(self):
+        """Pipeline que cuenta los archivos realmente procesados."""
+        pipeline = Pipeline({"extraction": {"ocr_fallback": False}}, output_format="json")
+        pipeline.collected = []
+
+        def fake_collect(pdf_file):
+            pipeline.collected.append(pdf_file.name)
+            content = pdf_file.read_text()
+            return [{"id": content, "_source_file": pdf_file.name}]
+
+        pipeline._collect_rows = fake_collect
+        return pipeline
+
+    def read_output(self, result):
+        """Lee los ids del archivo combinado."""
+        with open(result["output_file"], encoding="utf-8") as f:
+            return sorted(row["id"] for row in json.load(f))
+
+    def test_only_new_and_changed_files_are_processed(self, pipeline, tmp_path):
+        """Prueba que una segunda ejecucion reutiliza los archivos sin cambios."""
+        input_dir = tmp_path / "in"
+        input_dir.mkdir()
+        for name in ("a", "b", "c"):
+            (input_dir / f"{name}.pdf").write_text(name)
+
+        first = pipeline.process_directory(input_dir, tmp_path / "out", incremental=True)
+        assert self.read_output(first) == ["a", "b", "c"]
+
+        pipeline.collected.clear()
+        (input_dir / "b.pdf").write_text("b2")
+        (input_dir / "c.pdf").unlink()
+        (input_dir / "d.pdf").write_text("d")
+
+        second = pipeline.process_directory(input_dir, tmp_path / "out", incremental=True)
+
+        assert sorted(pipeline.collected) == ["b.pdf", "d.pdf"]
+        assert self.read_output(second) == ["a", "b2", "d"]
+        assert second["incremental"] == {
+            "processed": 2, "unchanged": 1, "removed": 1, "rebuilt": True
+        }
+
+    def test_new_files_are_appended(self, pipeline, tmp_path):
+        """Prueba que solo archivos nuevos se agregan sin reconstruir."""
+        input_dir = tmp_path / "in"
+        input_dir.mkdir()
+        for name in ("b", "c"):
+            (input_dir / f"{name}.pdf").write_text(name)
+
+        first = pipeline.process_directory(input_dir, tmp_path / "out", incremental=True)
+        output = Path(first["output_file"])
+        before = output.read_bytes()
+
+        pipeline.collected.clear()
+        (input_dir / "a.pdf").write_text("a")
+        (input_dir / "dup.pdf").write_text("b")
+
+        second = pipeline.process_directory(input_dir, tmp_path / "out", incremental=True)
+
+        assert sorted(pipeline.collected) == ["a.pdf", "dup.pdf"]
+        assert second["incremental"]["rebuilt"] is False
+        # Las filas existentes no se tocan y las nuevas van al final (sin la clave repetida)
+        with open(output, encoding="utf-8") as f:
+            assert [row["id"] for row in json.load(f)] == ["b", "c", "a"]
+        assert output.read_bytes().startswith(before[:-2])
+
+        with open(tmp_path / "out" / MANIFEST_NAME, encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f]
+        assert all("rows" not in entry and len(entry["keys"]) == 1 for entry in entries)
+
+    def test_removed_output_is_rebuilt_from_stored_rows(self, pipeline, tmp_path):
+        """Prueba que la reconstruccion usa las filas guardadas sin reprocesar."""
+        input_dir = tmp_path / "in"
+        input_dir.mkdir()
+        (input_dir / "a.pdf").write_text("a")
+
+        first = pipeline.process_directory(input_dir, tmp_path / "out", incremental=True)
+        Path(first["output_file"]).unlink()
+        pipeline.collected.clear()
+        (input_dir / "b.pdf").write_text("b")
+
+        second = pipeline.process_directory(input_dir, tmp_path / "out", incremental=True)
+
+        assert pipeline.collected == ["b.pdf"]
+        assert second["incremental"]["rebuilt"] is True
+        assert self.read_output(second) == ["a", "b"]
+
+    def test_touched_file_with_same_content_is_not_reprocessed(self, pipeline, tmp_path):
+        """Prueba que un cambio de mtime sin cambio de contenido se ignora."""
+        input_dir = tmp_path / "in"
+        input_dir.mkdir()
+        pdf = input_dir / "a.pdf"
+        pdf.write_text("a")
+
+        pipeline.process_directory(input_dir, tmp_path / "out", incremental=True)
+        pipeline.collected.clear()
+
+        stat = pdf.stat()
+        os.utime(pdf, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        pipeline.process_directory(input_dir, tmp_path / "out", incremental=True)
+
+        assert pipeline.collected == []
+
+    def test_config_change_reprocesses_everything(self, pipeline, tmp_path):
+        """Prueba que cambiar la configuracion invalida el manifiesto."""
+        input_dir = tmp_path / "in"
+        input_dir.mkdir()
+        (input_dir / "a.pdf").write_text("a")
+
+        pipeline.process_directory(input_dir, tmp_path / "out", incremental=True)
+        pipeline.collected.clear()
+
+        pipeline.config["normalization"] = {"trim_whitespace": False}
+        pipeline.process_directory(input_dir, tmp_path / "out", incremental=True)
+
+        assert pipeline.collected == ["a.pdf"]
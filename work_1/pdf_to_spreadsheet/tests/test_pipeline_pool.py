@@ -0,0 +1,80 @@
+"""
+Tests for Pipeline Pool
+=======================
+
+Pruebas unitarias para la reutilizacion de pipelines.
+"""
+
+import os
+
+import pytest
+from src.pipeline_pool import PipelinePool
+
+
+class TestPipelinePool:
+    """Pruebas para PipelinePool."""
+
+    @pytest.fixture
+    def config_file(self, tmp_path):
+        """Crea un archivo de configuracion temporal."""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("extraction:\n  ocr_fallback: false\n")
+        return config_file
+
+    @pytest.fixture
+    def pool(self, config_file):
+        """Crea un pool sobre la configuracion temporal."""
+        return PipelinePool(config_file)
+
+    def test_pipeline_is_reused(self, pool):
+        """Prueba que el mismo pipeline se reutiliza entre trabajos."""
+        with pool.acquire("csv") as first:
+            pass
+        with pool.acquire("csv") as second:
+            pass
+
+        assert first is second
+
+    def test_different_keys_get_different_pipelines(self, pool):
+        """Prueba que formatos distintos no comparten pipeline."""
+        with pool.acquire("csv") as csv_pipeline:
+            pass
+        with pool.acquire("json") as json_pipeline:
+            pass
+
+        assert csv_pipeline is not json_pipeline
+        assert json_pipeline.output_format == "json"
+
+    def test_concurrent_acquire_gets_separate_pipelines(self, pool):
+        """Prueba que un pipeline prestado no se entrega dos veces."""
+        with pool.acquire("csv") as first:
+            with pool.acquire("csv") as second:
+                assert first is not second
+
+    def test_stats_are_reset_per_job(self, pool):
+        """Prueba que las estadisticas no se arrastran entre trabajos."""
+        with pool.acquire("csv") as pipeline:
+            pipeline.stats["total_files"] = 5
+
+        with pool.acquire("csv") as pipeline:
+            assert pipeline.stats["total_files"] == 0
+
+    def test_none_parser_type_means_auto(self, pool):
+        """Prueba que parser_type None se interpreta como auto."""
+        with pool.acquire("csv", parser_type=None) as pipeline:
+            assert pipeline.parser_type == "auto"
+
+    def test_reload_on_config_change(self, pool, config_file):
+        """Prueba que un cambio de mtime recarga config y pipelines."""
+        with pool.acquire("csv") as before:
+            pass
+
+        config_file.write_text("extraction:\n  ocr_fallback: false\n  strategy: table_first\n")
+        stat = config_file.stat()
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        with pool.acquire("csv") as after:
+            pass
+
+        assert after is not before
+        assert pool.config["extraction"]["strategy"] == "table_first"
@@ -0,0 +1,73 @@
+"""
+Tests for Progress Reporting
+============================
+
+Pruebas unitarias para los eventos de progreso del pipeline.
+"""
+
+from src.progress import ProgressReporter, STAGE_RANGES
+
+
+class TestProgressReporter:
+    """Pruebas para ProgressReporter."""
+
+    def test_stage_emits_start_of_range(self):
+        """Prueba que cada etapa arranca en el inicio de su rango."""
+        events = []
+        reporter = ProgressReporter(events.append)
+
+        reporter.stage("parse")
+
+        assert events == [{"stage": "parse", "progress": STAGE_RANGES["parse"][0]}]
+
+    def test_page_progress_within_stage_range(self):
+        """Prueba que el avance por pagina se interpola dentro de la etapa."""
+        events = []
+        reporter = ProgressReporter(events.append, min_interval=0)
+
+        reporter.page("extract_text", 1, 2)
+        reporter.page("extract_text", 2, 2)
+
+        start, end = STAGE_RANGES["extract_text"]
+        assert [event["progress"] for event in events] == [(start + end) // 2, end]
+        assert events[-1]["total_pages"] == 2
+
+    def test_page_events_are_throttled(self):
+        """Prueba que las paginas intermedias se limitan pero la ultima no."""
+        events = []
+        reporter = ProgressReporter(events.append, min_interval=60)
+
+        reporter.stage("extract_text")
+        for page in range(1, 11):
+            reporter.page("extract_text", page, 10)
+
+        assert [event.get("page") for event in events] == [None, 10]
+
+    def test_progress_never_goes_backwards(self):
+        """Prueba que una etapa anterior no reduce el progreso."""
+        events = []
+        reporter = ProgressReporter(events.append)
+
+        reporter.stage("validate")
+        reporter.stage("extract_text")
+        reporter.done()
+
+        assert [event["progress"] for event in events] == [85, 85, 100]
+
+    def test_pipeline_reports_stages(self, tmp_path):
+        """Prueba que process_file emite etapas en orden y termina en 100."""
+        from src.pipeline import Pipeline
+
+        pipeline = Pipeline({"extraction": {"ocr_fallback": False}}, output_format="json")
+        pipeline._extract_data = lambda file_path: {
+            "text": "hola", "tables": [], "metadata": {}
+        }
+        events = []
+
+        pipeline.process_file(tmp_path / "a.pdf", tmp_path, progress_callback=events.append)
+
+        stages = [event["stage"] for event in events]
+        assert stages[:2] == ["detect", "parse"]
+        assert stages[-1] == "done"
+        assert events[-1]["progress"] == 100
+        assert pipeline._progress is None
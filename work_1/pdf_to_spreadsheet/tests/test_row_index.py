@@ -0,0 +1,104 @@
+"""
+Tests for Row Index
+===================
+
+Pruebas unitarias para el indice de filas y la previsualizacion paginada.
+"""
+
+import json
+
+import pytest
+from src.exporters.csv_exporter import CSVExporter
+from src.exporters.json_exporter import JSONExporter
+from src.exporters.row_index import RowIndex, index_path_for, read_page
+
+
+@pytest.fixture
+def data():
+    """Filas con saltos de linea, listas y caracteres no ASCII."""
+    return [
+        {"id": i, "descripcion": f"Linea {i}\nsegunda", "items": [i, {"p": "ñ"}]}
+        for i in range(50)
+    ]
+
+
+class TestRowIndex:
+    """Pruebas para el indice de offsets."""
+
+    def test_csv_page_with_projection(self, data, tmp_path):
+        """Prueba lectura de una pagina CSV con proyeccion de columnas."""
+        output = CSVExporter().export(data, tmp_path, "out")
+
+        index = RowIndex(output)
+        rows = index.read_rows(10, 3, ["descripcion", "id"])
+
+        assert index.total_rows == 50
+        assert rows == [
+            {"descripcion": f"Linea {i}\nsegunda", "id": str(i)} for i in (10, 11, 12)
+        ]
+
+    @pytest.mark.parametrize("indent", [2, None])
+    def test_json_output_unchanged_and_indexed(self, data, tmp_path, indent):
+        """Prueba que el JSON indexado es identico a json.dump."""
+        output = JSONExporter({"indent": indent}).export(data, tmp_path, "out")
+
+        with open(output, encoding="utf-8") as f:
+            assert f.read() == json.dumps(data, indent=indent, ensure_ascii=False)
+
+        assert RowIndex(output).read_rows(48, 10) == data[48:]
+
+    def test_stale_index_is_ignored(self, data, tmp_path):
+        """Prueba que un archivo modificado despues de exportar no usa el indice."""
+        output = CSVExporter().export(data, tmp_path, "out")
+
+        with open(output, "a", encoding="utf-8") as f:
+            f.write("99,extra,[]\n")
+
+        assert RowIndex.open(output) is None
+        assert read_page(output, 50, 5)["rows"][0]["id"] == "99"
+
+    def test_read_page_without_index(self, data, tmp_path):
+        """Prueba el modo sin indice (exportado con row_index: false)."""
+        output = JSONExporter({"row_index": False}).export(data, tmp_path, "out")
+
+        page = read_page(output, 5, 2, ["id"])
+
+        assert not index_path_for(output).exists()
+        assert page == {"rows": [{"id": 5}, {"id": 6}], "columns": ["id"], "total_rows": 50}
+
+
+class TestAppend:
+    """Pruebas para agregar filas a un archivo exportado."""
+
+    @pytest.mark.parametrize("exporter", [
+        CSVExporter(),
+        CSVExporter({"encoding": "utf-8-sig"}),
+        JSONExporter(),
+        JSONExporter({"indent": None})
+    ], ids=["csv", "csv-bom", "json", "json-compact"])
+    def test_append_matches_full_export(self, exporter, data, tmp_path):
+        """Prueba que exportar y agregar da el mismo archivo e indice que exportar todo."""
+        full = exporter.export(data, tmp_path / "full", "out")
+        output = exporter.export(data[:30], tmp_path / "appended", "out")
+
+        assert exporter.append(data[30:], tmp_path / "appended", "out") == output
+        assert output.read_bytes() == full.read_bytes()
+
+        index = RowIndex.open(output)
+        assert index is not None
+        assert index.total_rows == 50
+        assert index.read_rows(28, 4) == RowIndex(full).read_rows(28, 4)
+
+    @pytest.mark.parametrize("exporter", [CSVExporter(), JSONExporter()], ids=["csv", "json"])
+    def test_append_requires_existing_file(self, exporter, data, tmp_path):
+        """Prueba que sin archivo previo hay que exportar todo."""
+        assert exporter.append(data, tmp_path, "out") is None
+
+    def test_csv_append_with_new_column_is_refused(self, data, tmp_path):
+        """Prueba que una columna nueva obliga a reescribir el CSV."""
+        exporter = CSVExporter()
+        output = exporter.export(data, tmp_path, "out")
+        before = output.read_bytes()
+
+        assert exporter.append([{"id": 99, "nueva": "x"}], tmp_path, "out") is None
+        assert output.read_bytes() == before
@@ -0,0 +1,228 @@
+"""
+Tests for Table Extractor
+=========================
+
+Pruebas unitarias para la seleccion de estrategia de deteccion de tablas.
+"""
+
+import pytest
+from src.extractors import table_extractor
+from src.extractors.table_extractor import TableExtractor, may_contain_table
+
+
+TABLE = [["ID", "Monto"], ["1", "10"], ["2", "20"]]
+
+# Bordes de una tabla con lineas (pasa el prefiltro)
+RULED = [{"orientation": "h"}] * 3 + [{"orientation": "v"}] * 3
+
+
+class FakePage:
+    """Pagina que solo encuentra tablas con ciertas estrategias."""
+
+    width = 612
+    height = 792
+
+    def __init__(self, strategies, calls):
+        self.strategies = strategies
+        self.calls = calls
+        self.edges = RULED if strategies else []
+
+    def extract_words(self):
+        return [word("Texto", 72, 100), word("corrido", 110, 100)]
+
+    def find_tables(self, settings):
+        strategy = settings["vertical_strategy"]
+        self.calls.append(strategy)
+        return [FakeTable()] if strategy in self.strategies else []
+
+
+def word(text, x0, top):
+    return {"text": text, "x0": x0, "x1": x0 + 6 * len(text), "top": top, "bottom": top + 10}
+
+
+class FakeTable:
+    bbox = (50, 100, 550, 300)
+
+    def extract(self):
+        return TABLE
+
+
+class FakePDF:
+    def __init__(self, pages, producer="ReportLab"):
+        self.pages = pages
+        self.metadata = {"Producer": producer}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+class TestTableStrategy:
+    """Pruebas para la estrategia adaptativa por documento."""
+
+    @pytest.fixture
+    def open_pdf(self, monkeypatch, tmp_path):
+        """Simula pdfplumber.open con paginas definidas por cada prueba."""
+        calls = []
+        documents = {}
+
+        def fake_open(path):
+            return FakePDF(
+                [FakePage(strategies, calls) for strategies in documents[path.name]["pages"]],
+                documents[path.name].get("producer", "ReportLab")
+            )
+
+        monkeypatch.setattr(table_extractor, "PDFPLUMBER_AVAILABLE", True)
+        monkeypatch.setattr(table_extractor, "TABULA_AVAILABLE", False)
+        fake_module = type("pdfplumber", (), {"open": staticmethod(fake_open)})
+        monkeypatch.setattr(table_extractor, "pdfplumber", fake_module, raising=False)
+
+        def make(name, pages, producer="ReportLab"):
+            documents[name] = {"pages": pages, "producer": producer}
+            path = tmp_path / name
+            path.write_bytes(b"%PDF")
+            return path
+
+        make.calls = calls
+        return make
+
+    def test_text_aligned_document_skips_lines_after_learning(self, open_pdf):
+        """Prueba que tras aprender "text" ya no se prueba "lines" en cada pagina."""
+        pdf = open_pdf("reporte.pdf", [{"text"}] * 6)
+        extractor = TableExtractor(learn_pages=2)
+
+        tables = extractor.extract(pdf)
+
+        assert len(tables) == 6
+        assert open_pdf.calls == ["lines", "text", "lines", "text"] + ["text"] * 4
+        assert extractor.last_strategy["strategy"] == "text"
+        assert extractor.last_strategy["source"] == "learned"
+
+    def test_page_level_fallback(self, open_pdf):
+        """Prueba que una pagina sin tablas con la estrategia elegida usa la otra."""
+        pdf = open_pdf("mixto.pdf", [{"text"}, {"lines"}, {"text"}])
+        extractor = TableExtractor(learn_pages=1)
+
+        tables = extractor.extract(pdf)
+
+        assert len(tables) == 3
+        assert extractor.last_strategy["fallback_pages"] == 1
+
+    def test_ruled_tables_keep_original_order(self, open_pdf):
+        """Prueba que con bordes se conserva el orden lines -> text."""
+        pdf = open_pdf("factura.pdf", [{"lines", "text"}] * 3)
+        extractor = TableExtractor(learn_pages=1)
+
+        extractor.extract(pdf)
+
+        assert open_pdf.calls == ["lines"] * 3
+        assert extractor.last_strategy["strategy"] == "lines"
+
+    def test_strategy_is_cached_for_similar_documents(self, open_pdf):
+        """Prueba que un documento del mismo diseno reutiliza la estrategia."""
+        extractor = TableExtractor(learn_pages=2)
+        extractor.extract(open_pdf("a.pdf", [{"text"}] * 2))
+        open_pdf.calls.clear()
+
+        extractor.extract(open_pdf("b.pdf", [{"text"}] * 2))
+
+        assert open_pdf.calls == ["text", "text"]
+        assert extractor.last_strategy["source"] == "cached"
+
+        open_pdf.calls.clear()
+        extractor.extract(open_pdf("c.pdf", [{"text"}] * 2, producer="Otro"))
+        assert open_pdf.calls[0] == "lines"
+
+    def test_remember_strategy_from_metadata(self, open_pdf):
+        """Prueba que lo aprendido en otro proceso se puede recordar."""
+        learner = TableExtractor(learn_pages=1)
+        learner.extract(open_pdf("a.pdf", [{"text"}]))
+
+        extractor = TableExtractor()
+        extractor.remember_strategy(learner.last_strategy)
+        open_pdf.calls.clear()
+        extractor.extract(open_pdf("b.pdf", [{"text"}]))
+
+        assert open_pdf.calls == ["text"]
+
+    def test_fixed_strategy(self, open_pdf):
+        """Prueba una estrategia fija desde la configuracion."""
+        extractor = TableExtractor(strategy="text")
+        extractor.extract(open_pdf("a.pdf", [{"text"}] * 2))
+
+        assert open_pdf.calls == ["text", "text"]
+        assert extractor.last_strategy["source"] == "config"
+
+    def test_prefilter_skips_pages_without_tables(self, open_pdf):
+        """Prueba que portada y prosa no pasan por la deteccion ni cuentan para aprender."""
+        pdf = open_pdf("estados.pdf", [set(), set(), {"text"}, {"text"}])
+        extractor = TableExtractor(learn_pages=1)
+
+        tables = extractor.extract(pdf)
+
+        assert len(tables) == 2
+        assert open_pdf.calls == ["lines", "text", "text"]
+        assert extractor.last_skipped_pages == 2
+        assert extractor.last_strategy["strategy"] == "text"
+
+    def test_prefilter_disabled(self, open_pdf):
+        """Prueba que sin prefiltro se analizan todas las paginas."""
+        extractor = TableExtractor(prefilter=False)
+        extractor.extract(open_pdf("a.pdf", [set(), {"lines"}]))
+
+        assert open_pdf.calls[:2] == ["lines", "text"]
+        assert extractor.last_skipped_pages == 0
+
+    def test_template_page_without_tables_is_still_searched(self, open_pdf, monkeypatch):
+        """Prueba que una pagina sin tablas en la plantilla no se da por vacia."""
+        template = {"pages": {"0": {"strategy": None, "tables": []}, "1": {"strategy": None, "tables": []}}}
+        extractor = TableExtractor(template_store=object())
+        monkeypatch.setattr(extractor, "_match_template", lambda pages: ("abc", template))
+
+        tables = extractor.extract(open_pdf("a.pdf", [set(), {"lines"}]))
+
+        assert len(tables) == 1
+        assert extractor.last_skipped_pages == 1
+        assert extractor.last_template == {"fingerprint": "abc", "source": "matched", "misses": 0}
+
+
+class FakeLayoutPage:
+    def __init__(self, words, edges=()):
+        self.words = words
+        self.edges = list(edges)
+
+    def extract_words(self):
+        return self.words
+
+
+class TestMayContainTable:
+    """Pruebas para el prefiltro de paginas."""
+
+    def test_ruled_page(self):
+        """Prueba que los bordes en ambas direcciones bastan."""
+        assert may_contain_table(FakeLayoutPage([], RULED))
+
+    def test_horizontal_rules_only_need_columns(self):
+        """Prueba que solo lineas horizontales (separadores) no bastan."""
+        assert not may_contain_table(FakeLayoutPage([], [{"orientation": "h"}] * 4))
+
+    def test_text_columns(self):
+        """Prueba que tres renglones con columnas separadas son candidatos."""
+        words = []
+        for row in range(3):
+            words += [word("Ventas", 72, 100 + 14 * row), word("1,200.00", 400, 100 + 14 * row)]
+
+        assert may_contain_table(FakeLayoutPage(words))
+
+    def test_prose(self):
+        """Prueba que la prosa (espacios normales) no es candidata."""
+        words = []
+        for row in range(10):
+            x0 = 72
+            for text in ("La", "empresa", "registro", "un", "incremento"):
+                words.append(word(text, x0, 100 + 14 * row))
+                x0 += 6 * len(text) + 3
+
+        assert not may_contain_table(FakeLayoutPage(words))
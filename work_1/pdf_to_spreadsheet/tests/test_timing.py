@@ -0,0 +1,85 @@
+"""
+Tests for Stage Timing
+======================
+
+Pruebas unitarias para los tiempos por etapa y el perfilado por archivo.
+"""
+
+import pstats
+
+from src.timing import FileProfiler, StageTimings
+
+
+class TestStageTimings:
+    """Pruebas para StageTimings."""
+
+    def test_start_closes_previous_stage(self):
+        """Prueba que iniciar una etapa cierra la anterior."""
+        timings = StageTimings()
+        timings.start("parse")
+        timings.start("normalize")
+        timings.stop()
+
+        result = timings.as_dict()
+
+        assert list(result["stages"]) == ["parse", "normalize"]
+        assert all(values["seconds"] >= 0 for values in result["stages"].values())
+
+    def test_stages_follow_pipeline_order(self):
+        """Prueba que las etapas se reportan en orden de ejecucion."""
+        timings = StageTimings()
+        for stage in ("export", "extract_text", "parse"):
+            timings.start(stage)
+        timings.stop()
+
+        assert list(timings.as_dict()["stages"]) == ["extract_text", "parse", "export"]
+
+    def test_merge_sums_files(self):
+        """Prueba que los tiempos de varios archivos se suman."""
+        single = StageTimings()
+        single.files = 1
+        single.input_bytes = 100
+        single.start("extract_text")
+        single.record_pages("extract_text", 3)
+        single.stop()
+
+        total = StageTimings()
+        total.merge(single.as_dict())
+        total.merge(single.as_dict())
+        result = total.as_dict()
+
+        assert result["files"] == 2
+        assert result["pages"] == 6
+        assert result["input_bytes"] == 200
+        assert result["stages"]["extract_text"]["pages"] == 6
+
+
+class TestFileProfiler:
+    """Pruebas para FileProfiler."""
+
+    def test_cprofile_dump(self, tmp_path):
+        """Prueba que se genera un perfil legible por pstats."""
+        profiler = FileProfiler(tmp_path, tool="cprofile")
+        profiler.start("factura")
+        sum(range(1000))
+        profile_path = profiler.stop()
+
+        assert profile_path.suffix == ".prof"
+        assert profile_path.name.startswith("factura_")
+        assert pstats.Stats(str(profile_path)).total_calls > 0
+
+    def test_same_name_does_not_overwrite(self, tmp_path):
+        """Prueba que dos PDFs con el mismo nombre generan dos perfiles."""
+        profiler = FileProfiler(tmp_path)
+
+        paths = []
+        for _ in range(2):
+            profiler.start("factura")
+            paths.append(profiler.stop())
+
+        assert paths[0] != paths[1]
+
+    def test_stop_without_start(self, tmp_path):
+        """Prueba que detener sin perfil en curso no escribe nada."""
+        assert FileProfiler(tmp_path).stop() is None
+        assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,118 @@
+"""
+Tests for Folder Watcher
+========================
+
+Pruebas unitarias para la cola y la deteccion de archivos listos.
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+from src.file_ledger import file_signature
+
+watcher = pytest.importorskip("watcher")
+
+
+class TestPDFHandler:
+    """Pruebas para PDFHandler (sin arrancar workers)."""
+
+    @pytest.fixture
+    def handler(self, tmp_path):
+        """Handler con ventana de estabilidad nula."""
+        return watcher.PDFHandler(output_dir=str(tmp_path / "out"), cooldown=0)
+
+    def test_enqueue_only_pdfs_once(self, handler, tmp_path):
+        """Prueba que solo se encolan PDFs y sin duplicados."""
+        pdf = tmp_path / "a.PDF"
+        pdf.write_bytes(b"%PDF-1.4")
+
+        assert handler.enqueue(pdf) is True
+        assert handler.enqueue(pdf) is False
+        assert handler.enqueue(tmp_path / "notas.txt") is False
+        assert handler.enqueue(tmp_path / "no-existe.pdf") is False
+
+    def test_ready_after_size_and_mtime_are_stable(self, handler, tmp_path):
+        """Prueba que un archivo en escritura espera a estabilizarse."""
+        pdf = tmp_path / "a.pdf"
+        pdf.write_bytes(b"%PDF-1.4 parcial")
+        handler.enqueue(pdf)
+
+        # Primera observacion: solo registra la firma
+        assert handler.poll_ready() == []
+
+        pdf.write_bytes(b"%PDF-1.4 parcial y mas contenido")
+        assert handler.poll_ready() == []
+
+        assert handler.poll_ready() == [str(pdf)]
+        assert handler.enqueue(pdf) is False
+
+    def test_empty_file_is_not_ready(self, handler, tmp_path):
+        """Prueba que un archivo vacio sigue esperando."""
+        pdf = tmp_path / "a.pdf"
+        pdf.touch()
+        handler.enqueue(pdf)
+
+        handler.poll_ready()
+
+        assert handler.poll_ready() == []
+
+    def test_deleted_file_is_dropped(self, handler, tmp_path):
+        """Prueba que un archivo eliminado sale de la cola."""
+        pdf = tmp_path / "a.pdf"
+        pdf.write_bytes(b"%PDF-1.4")
+        handler.enqueue(pdf)
+        pdf.unlink()
+
+        assert handler.poll_ready() == []
+        assert handler._candidates == {}
+
+    def test_restart_scan_skips_processed_files(self, tmp_path):
+        """Prueba que tras reiniciar solo se encolan archivos nuevos o cambiados."""
+        input_dir = tmp_path / "in"
+        (input_dir / "sub").mkdir(parents=True)
+        for name in ("a.pdf", "b.PDF", "sub/c.pdf", "notas.txt"):
+            (input_dir / name).write_bytes(b"%PDF-1.4 " + name.encode())
+
+        first = watcher.PDFHandler(output_dir=str(tmp_path / "out"), cooldown=0)
+        assert first.scan_existing(str(input_dir)) == 2
+        assert first.scan_existing(str(input_dir), recursive=True) == 1
+
+        # Simular que todo se proceso antes de reiniciar
+        for key in list(first._candidates):
+            first._record_result(key, {"signature": file_signature(key), "total_rows": 1})
+
+        (input_dir / "a.pdf").write_bytes(b"%PDF-1.4 modificado")
+        (input_dir / "d.pdf").write_bytes(b"%PDF-1.4 nuevo")
+
+        second = watcher.PDFHandler(output_dir=str(tmp_path / "out"), cooldown=0)
+        second.scan_existing(str(input_dir), recursive=True)
+
+        assert sorted(Path(key).name for key in second._candidates) == ["a.pdf", "d.pdf"]
+
+    def test_failed_files_are_retried(self, tmp_path):
+        """Prueba que un archivo que fallo no queda registrado como procesado."""
+        input_dir = tmp_path / "in"
+        input_dir.mkdir()
+        pdf = input_dir / "a.pdf"
+        pdf.write_bytes(b"%PDF-1.4")
+        key = os.path.abspath(pdf)
+
+        first = watcher.PDFHandler(output_dir=str(tmp_path / "out"), cooldown=0)
+        first._record_result(key, {"signature": file_signature(key), "errors": 1, "timeouts": 1})
+
+        assert key not in first.ledger
+
+        second = watcher.PDFHandler(output_dir=str(tmp_path / "out"), cooldown=0)
+
+        assert second.scan_existing(str(input_dir)) == 1
+
+    def test_unchanged_content_is_skipped(self, tmp_path):
+        """Prueba que un archivo tocado pero identico no se reprocesa."""
+        pdf = tmp_path / "a.pdf"
+        pdf.write_bytes(b"%PDF-1.4")
+        known_hash = file_signature(pdf)["sha256"]
+
+        result = watcher.process_pdf(None, str(pdf), str(tmp_path), known_hash=known_hash)
+
+        assert result["skipped"] is True
@@ -0,0 +1,143 @@
+"""
+Tests for Job Worker
+====================
+
+Pruebas unitarias para el procesamiento de trabajos de la cola.
+"""
+
+import zipfile
+from contextlib import contextmanager
+
+import pytest
+from src.job_store import JobStore
+from src.pipeline import Pipeline
+
+worker = pytest.importorskip("worker")
+
+
+class FakePool:
+    """Pool con un solo pipeline cuyas filas se simulan por archivo."""
+
+    def __init__(self, rows_by_name):
+        self.config = {}
+        self.pipeline = Pipeline({"extraction": {"ocr_fallback": False}}, output_format="json")
+
+        def fake_collect(pdf_file):
+            self.pipeline.stats["total_files"] += 1
+            rows = [dict(row, _source_file=pdf_file.name) for row in rows_by_name.get(pdf_file.name, [])]
+            self.pipeline.stats["total_rows"] += len(rows)
+            return rows
+
+        self.pipeline._collect_rows = fake_collect
+
+    @contextmanager
+    def acquire(self, output_format="csv", parser_type="auto"):
+        self.pipeline.reset_stats()
+        yield self.pipeline
+
+
+class TestProcessBatch:
+    """Pruebas para trabajos por lote."""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        """Crea un almacen temporal."""
+        return JobStore(tmp_path / "jobs.db")
+
+    def claim_batch(self, store, tmp_path, name, files, combine):
+        """Encola y reclama un lote con los PDFs indicados."""
+        batch_dir = tmp_path / "uploads" / name
+        batch_dir.mkdir(parents=True)
+        for filename in files:
+            (batch_dir / filename).write_bytes(b"%PDF-1.4")
+
+        store.create_job(
+            filename=f"{len(files)} files",
+            file_path=str(batch_dir),
+            output_format="json",
+            options={"batch": True, "combine": combine},
+            job_id=name
+        )
+        return store.claim_next_job("w1")
+
+    def test_per_file_batches_do_not_share_exports(self, store, tmp_path):
+        """Prueba que dos lotes con los mismos nombres no se pisan."""
+        output_dir = tmp_path / "out"
+        pool_a = FakePool({"0000_factura.pdf": [{"id": "a"}]})
+        pool_b = FakePool({"0000_factura.pdf": [{"id": "b"}]})
+
+        job_a = self.claim_batch(store, tmp_path, "a", ["0000_factura.pdf"], combine=False)
+        job_b = self.claim_batch(store, tmp_path, "b", ["0000_factura.pdf"], combine=False)
+        worker.process_batch(store, job_a, pool_a, str(output_dir))
+        worker.process_batch(store, job_b, pool_b, str(output_dir))
+
+        for job_id, expected in (("a", '"a"'), ("b", '"b"')):
+            job = store.get_job(job_id)
+            assert job["output_file"] == str(output_dir / f"batch_{job_id}.zip")
+            assert job["result"]["output_files"] == ["0000_factura.json"]
+            with zipfile.ZipFile(job["output_file"]) as archive:
+                assert archive.namelist() == ["0000_factura.json"]
+                assert expected in archive.read("0000_factura.json").decode("utf-8")
+
+        # Solo quedan los zips: sin carpetas ni exportaciones sueltas
+        assert sorted(p.name for p in output_dir.iterdir()) == ["batch_a.zip", "batch_b.zip"]
+
+    def test_combined_batch_exports_one_file(self, store, tmp_path):
+        """Prueba que el lote combinado se exporta como batch_<job_id>."""
+        output_dir = tmp_path / "out"
+        pool = FakePool({"0000_a.pdf": [{"id": "1"}], "0001_b.pdf": [{"id": "2"}]})
+
+        job = self.claim_batch(store, tmp_path, "c", ["0000_a.pdf", "0001_b.pdf"], combine=True)
+        worker.process_batch(store, job, pool, str(output_dir))
+
+        job = store.get_job("c")
+        assert job["status"] == "completed"
+        assert job["output_file"] == str(output_dir / "batch_c.json")
+        assert job["result"]["total_rows"] == 2
+
+
+class TestRunJob:
+    """Pruebas para trabajos de un solo archivo."""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        """Crea un almacen temporal."""
+        return JobStore(tmp_path / "jobs.db")
+
+    @pytest.fixture
+    def pool(self):
+        """Pool cuyo pipeline no extrae datos de ningun PDF."""
+        pool = FakePool({})
+        pool.pipeline._extract_data = lambda file_path: {"text": "", "tables": []}
+        return pool
+
+    def test_empty_job_does_not_report_other_exports(self, store, pool, tmp_path):
+        """Prueba que un trabajo sin datos no apunta a la salida de otro."""
+        output_dir = tmp_path / "out"
+        output_dir.mkdir()
+        (output_dir / "otro_trabajo.json").write_text("[]")
+        pdf = tmp_path / "vacio.pdf"
+        pdf.write_bytes(b"%PDF-1.4")
+
+        store.create_job("vacio.pdf", file_path=str(pdf), output_format="json", job_id="vacio")
+        worker._run_job(store, store.claim_next_job("w1"), pool, str(output_dir))
+
+        job = store.get_job("vacio")
+        assert job["status"] == "completed"
+        assert job["output_file"] is None
+
+    def test_reassigned_job_keeps_new_owner_state(self, store, pool, tmp_path):
+        """Prueba que el worker original no pisa un trabajo reasignado."""
+        pdf = tmp_path / "a.pdf"
+        pdf.write_bytes(b"%PDF-1.4")
+
+        store.create_job("a.pdf", file_path=str(pdf), job_id="a")
+        stale = store.claim_next_job("w1")
+        store.requeue_stale_jobs(stale_after_seconds=-1)
+        store.claim_next_job("w2")
+
+        worker._run_job(store, stale, pool, str(tmp_path / "out"))
+
+        job = store.get_job("a")
+        assert job["status"] == "processing"
+        assert job["worker_id"] == "w2"
@@ -5,11 +5,14 @@ Folder Watcher
 Monitors a directory for new PDF files and processes them automatically.
 """
 
+import os
 import sys
+import threading
 import time
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from loguru import logger
 
@@ -24,12 +27,86 @@ except ImportError:
 # Add parent to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.config import load_config
-from src.pipeline import Pipeline
+from src.file_ledger import FileLedger, file_signature
+from src.metrics import MetricsStore, serve_metrics
+from src.pipeline_pool import PipelinePool
+
+
+# Pipeline pool of each worker process (set by _init_watch_worker)
+_worker_pool: Optional[PipelinePool] = None
+
+
+def process_pdf(
+    pool: PipelinePool,
+    file_path: str,
+    output_dir: str,
+    output_format: str = "csv",
+    parser_type: Optional[str] = None,
+    known_hash: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Process one PDF with a pipeline borrowed from ``pool``.
+    
+    The file is hashed first; if its content matches ``known_hash`` (it
+    was only touched or copied over itself) processing is skipped.
+    
+    Returns:
+        Pipeline results (total_rows, output_file, ...) plus the file
+        ``signature``, or ``{"skipped": True, "signature": ...}``.
+    """
+    signature = file_signature(file_path)
+    
+    if known_hash and signature["sha256"] == known_hash:
+        return {"skipped": True, "signature": signature}
+    
+    with pool.acquire(
+        output_format=output_format,
+        parser_type=parser_type or "auto"
+    ) as pipeline:
+        result = pipeline.process_file(file_path, output_dir)
+    
+    result["signature"] = signature
+    return result
+
+
+def _init_watch_worker(config_path: str) -> None:
+    """Create the per-process pipeline pool of a watcher worker."""
+    global _worker_pool
+    _worker_pool = PipelinePool(config_path)
+
+
+def _process_in_worker(
+    file_path: str,
+    output_dir: str,
+    output_format: str,
+    parser_type: Optional[str],
+    known_hash: Optional[str],
+    submitted_at: Optional[float] = None
+) -> Dict[str, Any]:
+    """Entry point executed in a watcher worker process."""
+    queue_wait = time.time() - submitted_at if submitted_at else None
+    
+    result = process_pdf(
+        _worker_pool, file_path, output_dir, output_format, parser_type, known_hash
+    )
+    
+    if queue_wait is not None:
+        result["queue_wait"] = max(queue_wait, 0.0)
+    return result
 
 
 class PDFHandler(FileSystemEventHandler):
-    """Handles PDF file creation events."""
+    """
+    Handles PDF file creation events.
+    
+    Event callbacks only register the path. A scheduler thread polls the
+    registered files and, once a file's size and mtime have not changed
+    for ``cooldown`` seconds, submits it to a pool of worker processes.
+    
+    Processed files are recorded in a persistent ledger (path, size,
+    mtime, SHA-256) so restarts neither redo nor miss work. Failed files
+    are not recorded, so they are retried.
+    """
     
     def __init__(
         self,
@@ -37,7 +114,11 @@ class PDFHandler(FileSystemEventHandler):
         config_path: str = "config.yaml",
         output_format: str = "csv",
         parser_type: Optional[str] = None,
-        cooldown: int = 2
+        cooldown: float = 2,
+        workers: int = 2,
+        poll_interval: float = 0.5,
+        ledger_path: Optional[str] = None,
+        metrics_db: Optional[str] = None
     ):
         """
         Initialize the PDF handler.
@@ -47,7 +128,15 @@ class PDFHandler(FileSystemEventHandler):
             config_path: Path to configuration file.
             output_format: Output format (csv, json, xlsx).
             parser_type: Parser to use (None for auto-detect).
-            cooldown: Seconds to wait before processing (allows file to finish copying).
+            cooldown: Seconds a file's size and mtime must stay unchanged
+                before it is considered fully copied.
+            workers: Number of worker processes draining the queue.
+            poll_interval: Seconds between readiness checks.
+            ledger_path: Processed-file ledger (default: .watcher_ledger.jsonl
+                in the output directory).
+            metrics_db: SQLite file for metrics (default: .watcher_metrics.db
+                in the output directory; point it at the API job store to
+                see watcher metrics on /api/metrics).
         """
         super().__init__()
         self.output_dir = output_dir
@@ -55,68 +144,315 @@ class PDFHandler(FileSystemEventHandler):
         self.output_format = output_format
         self.parser_type = parser_type
         self.cooldown = cooldown
+        self.workers = max(1, workers)
+        self.poll_interval = poll_interval
+        
+        # Track processed files across restarts
+        self.ledger = FileLedger(ledger_path or Path(output_dir) / ".watcher_ledger.jsonl")
         
-        # Track processed files to avoid duplicates
-        self.processed_files = set()
+        # Throughput, timings and failures (shared with the API if same file)
+        self.metrics = MetricsStore(metrics_db or Path(output_dir) / ".watcher_metrics.db")
         
-        # Load config
-        self.config = load_config(config_path)
+        # Warm pipelines, rebuilt only when the config file changes
+        self.pipeline_pool = PipelinePool(config_path)
         
-        logger.info(f"PDF Handler initialized. Output: {output_dir}, Format: {output_format}")
+        # Files waiting to settle: path -> ((size, mtime_ns), stable since)
+        self._lock = threading.Lock()
+        self._candidates: Dict[str, Tuple[Optional[Tuple[int, int]], float]] = {}
+        self._in_flight: Set[str] = set()
+        
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._scheduler: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        
+        logger.info(
+            f"PDF Handler initialized. Output: {output_dir}, Format: {output_format}, "
+            f"Workers: {self.workers}"
+        )
+    
+    def start(self) -> None:
+        """Start the worker processes and the readiness scheduler."""
+        self._stop_event.clear()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_watch_worker,
+            initargs=(self.config_path,)
+        )
+        self._scheduler = threading.Thread(
+            target=self._scheduler_loop, name="pdf-watcher-scheduler", daemon=True
+        )
+        self._scheduler.start()
+    
+    def stop(self, wait: bool = True) -> None:
+        """
+        Stop scheduling new files and shut the worker pool down.
+        
+        Args:
+            wait: Finish files already submitted (False cancels queued ones).
+        """
+        self._stop_event.set()
+        
+        if self._scheduler:
+            self._scheduler.join()
+            self._scheduler = None
+        
+        if self._executor:
+            self._executor.shutdown(wait=wait, cancel_futures=not wait)
+            self._executor = None
     
     def on_created(self, event):
         """Handle file creation event."""
-        if event.is_directory:
-            return
+        if not event.is_directory:
+            self.enqueue(Path(event.src_path))
+    
+    def on_moved(self, event):
+        """Handle files renamed into the watched folder (atomic copies)."""
+        if not event.is_directory:
+            self.enqueue(Path(event.dest_path))
+    
+    def on_modified(self, event):
+        """Handle files overwritten in place."""
+        if not event.is_directory:
+            self.enqueue(Path(event.src_path))
+    
+    def enqueue(self, file_path: Path, stat: Optional[os.stat_result] = None) -> bool:
+        """
+        Register a file to be processed once it is ready.
         
-        file_path = Path(event.src_path)
+        Args:
+            file_path: PDF path.
+            stat: Known stat result (avoids a second stat during scans).
         
+        Returns:
+            True if the file was queued, False if ignored or already known.
+        """
         # Only process PDF files
         if file_path.suffix.lower() != '.pdf':
-            return
+            return False
         
-        # Skip already processed files
-        if str(file_path) in self.processed_files:
-            return
+        key = os.path.abspath(file_path)
+        
+        try:
+            stat = stat or os.stat(key)
+        except FileNotFoundError:
+            return False
+        
+        # Same size and mtime as when it was processed: nothing to do
+        if self.ledger.matches(key, stat.st_size, stat.st_mtime_ns):
+            return False
+        
+        with self._lock:
+            # Skip files already waiting or running
+            if key in self._candidates or key in self._in_flight:
+                return False
+            self._candidates[key] = (None, time.monotonic())
         
         logger.info(f"New PDF detected: {file_path.name}")
+        return True
+    
+    def scan_existing(self, input_dir: str, recursive: bool = False) -> int:
+        """
+        Queue PDFs that are new or changed since they were last processed.
+        
+        Run at startup to catch up on files dropped while the watcher was
+        down. Uses ``os.scandir``, whose cached stat results make the
+        unchanged-file check free of extra system calls on most platforms.
+        Ledger entries for files that no longer exist are compacted away.
+        
+        Returns:
+            Number of files queued.
+        """
+        queued = 0
+        pending_dirs = [input_dir]
+        
+        while pending_dirs:
+            try:
+                entries = os.scandir(pending_dirs.pop())
+            except OSError as e:
+                logger.warning(f"Cannot scan directory: {e}")
+                continue
+            
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            pending_dirs.append(entry.path)
+                    elif entry.name.lower().endswith(".pdf") and entry.is_file():
+                        if self.enqueue(Path(entry.path), entry.stat()):
+                            queued += 1
+        
+        pruned = self.ledger.compact(prune_missing=True)
+        
+        logger.info(
+            f"Catch-up scan: {queued} new or changed PDFs queued, "
+            f"{len(self.ledger)} already processed"
+            + (f", {pruned} removed from ledger" if pruned else "")
+        )
+        return queued
+    
+    def _scheduler_loop(self) -> None:
+        """Poll waiting files until the handler is stopped."""
+        while not self._stop_event.wait(self.poll_interval):
+            try:
+                for file_path in self.poll_ready():
+                    self._submit(file_path)
+            except Exception as e:
+                logger.error(f"Watcher scheduler error: {e}")
+    
+    def poll_ready(self) -> List[str]:
+        """
+        Check waiting files and return those that are ready.
+        
+        A file is ready when it is non-empty and its size and mtime have
+        not changed for ``cooldown`` seconds. Files that disappear are
+        dropped. Ready files move to the in-flight set.
+        """
+        now = time.monotonic()
+        ready = []
+        
+        with self._lock:
+            candidates = list(self._candidates.items())
+        
+        for key, (signature, since) in candidates:
+            try:
+                stat = Path(key).stat()
+            except FileNotFoundError:
+                with self._lock:
+                    self._candidates.pop(key, None)
+                continue
+            
+            current = (stat.st_size, stat.st_mtime_ns)
+            
+            with self._lock:
+                if current != signature:
+                    # Still being written: restart the stability window
+                    self._candidates[key] = (current, now)
+                elif stat.st_size > 0 and now - since >= self.cooldown:
+                    del self._candidates[key]
+                    self._in_flight.add(key)
+                    ready.append(key)
         
-        # Wait for file to finish copying
-        time.sleep(self.cooldown)
+        return ready
+    
+    def _submit(self, file_path: str) -> None:
+        """Hand a ready file to the worker pool."""
+        logger.info(f"Processing: {Path(file_path).name}")
+        
+        entry = self.ledger.get(file_path)
+        
+        try:
+            future = self._executor.submit(
+                _process_in_worker,
+                file_path,
+                self.output_dir,
+                self.output_format,
+                self.parser_type,
+                entry["sha256"] if entry else None,
+                time.time()
+            )
+        except Exception as e:
+            logger.error(f"Failed to queue {Path(file_path).name}: {e}")
+            with self._lock:
+                self._in_flight.discard(file_path)
+            return
         
-        # Process the file
-        self.process_file(file_path)
+        future.add_done_callback(lambda f: self._on_done(file_path, f))
+    
+    def _on_done(self, file_path: str, future: Future) -> None:
+        """Record the outcome of a file processed by a worker."""
+        name = Path(file_path).name
+        
+        with self._lock:
+            self._in_flight.discard(file_path)
+        
+        if future.cancelled():
+            return
+        
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.error(f"Failed to process {name}: {e}")
+            self.metrics.inc("pdf2sheet_failures_total", source="watcher", stage="worker")
+            return
+        
+        self._record_result(file_path, result)
     
     def process_file(self, file_path: Path):
-        """Process a single PDF file."""
+        """Process a single PDF file in the current process."""
         try:
             logger.info(f"Processing: {file_path.name}")
             
-            # Create pipeline
-            pipeline = Pipeline(
-                config=self.config,
-                output_format=self.output_format,
-                parser_type=self.parser_type,
-                dry_run=False
-            )
-            
-            # Process file
-            result = pipeline.process_file(str(file_path), self.output_dir)
+            key = os.path.abspath(file_path)
+            entry = self.ledger.get(key)
             
-            # Mark as processed
-            self.processed_files.add(str(file_path))
-            
-            # Log results
-            logger.success(
-                f"Completed: {file_path.name} - "
-                f"{result.get('total_rows', 0)} rows extracted"
+            # Process file with a reused pipeline
+            result = process_pdf(
+                self.pipeline_pool,
+                key,
+                self.output_dir,
+                self.output_format,
+                self.parser_type,
+                entry["sha256"] if entry else None
             )
             
-            if result.get('output_file'):
-                logger.info(f"Output: {result['output_file']}")
+            self._record_result(key, result)
             
         except Exception as e:
             logger.error(f"Failed to process {file_path.name}: {e}")
+    
+    def _record_result(self, file_path: str, result: Dict[str, Any]) -> None:
+        """
+        Mark a successfully processed file in the ledger and log its results.
+        
+        Files that failed or timed out are left out of the ledger, so the
+        next change event or catch-up scan retries them.
+        """
+        signature = result.pop("signature")
+        queue_wait = result.pop("queue_wait", None)
+        
+        if queue_wait is not None:
+            self.metrics.observe("pdf2sheet_queue_wait_seconds", queue_wait, source="watcher")
+        
+        if result.get("errors"):
+            self.metrics.record_results(result, source="watcher")
+            logger.error(
+                f"Failed: {Path(file_path).name} - will be retried when it changes "
+                f"or on the next scan"
+            )
+            return
+        
+        if result.get("skipped"):
+            # Content unchanged: only refresh size/mtime in the ledger
+            previous = self.ledger.get(file_path) or {}
+            self.ledger.record(file_path, signature, rows=previous.get("rows"))
+            self.metrics.inc("pdf2sheet_cache_hits_total", source="watcher")
+            logger.info(f"Unchanged: {Path(file_path).name}")
+            return
+        
+        self.ledger.record(file_path, signature, rows=result.get("total_rows", 0))
+        self.metrics.record_results(result, source="watcher")
+        
+        # Log results
+        logger.success(
+            f"Completed: {Path(file_path).name} - "
+            f"{result.get('total_rows', 0)} rows extracted"
+        )
+        
+        if result.get('output_file'):
+            logger.info(f"Output: {result['output_file']}")
+    
+    def render_metrics(self) -> str:
+        """Prometheus text exposition including the watcher's queue depth."""
+        with self._lock:
+            waiting = len(self._candidates)
+            in_flight = len(self._in_flight)
+        
+        return self.metrics.render({
+            "pdf2sheet_watcher_files": [
+                ({"state": "waiting"}, waiting),
+                ({"state": "in_flight"}, in_flight)
+            ]
+        })
 
 
 def watch_folder(
@@ -125,7 +461,12 @@ def watch_folder(
     config_path: str = "config.yaml",
     output_format: str = "csv",
     parser_type: Optional[str] = None,
-    recursive: bool = False
+    recursive: bool = False,
+    workers: int = 2,
+    cooldown: float = 2,
+    ledger_path: Optional[str] = None,
+    metrics_db: Optional[str] = None,
+    metrics_port: Optional[int] = None
 ):
     """
     Watch a folder for new PDF files and process them automatically.
@@ -137,6 +478,11 @@ def watch_folder(
         output_format: Output format (csv, json, xlsx).
         parser_type: Parser to use (None for auto-detect).
         recursive: Watch subdirectories as well.
+        workers: Number of files processed concurrently.
+        cooldown: Seconds a file must stay unchanged before processing.
+        ledger_path: Processed-file ledger (default: inside output_dir).
+        metrics_db: Metrics database (default: inside output_dir).
+        metrics_port: Serve Prometheus metrics on this port (/metrics).
     """
     if not WATCHDOG_AVAILABLE:
         raise ImportError("watchdog is required. Install with: pip install watchdog")
@@ -150,13 +496,23 @@ def watch_folder(
         output_dir=output_dir,
         config_path=config_path,
         output_format=output_format,
-        parser_type=parser_type
+        parser_type=parser_type,
+        cooldown=cooldown,
+        workers=workers,
+        ledger_path=ledger_path,
+        metrics_db=metrics_db
     )
+    handler.start()
+    
+    metrics_server = serve_metrics(handler.render_metrics, metrics_port) if metrics_port else None
     
     observer = Observer()
     observer.schedule(handler, input_dir, recursive=recursive)
     observer.start()
     
+    # Catch up on files dropped while the watcher was not running
+    handler.scan_existing(input_dir, recursive=recursive)
+    
     print()
     print("=" * 50)
     print("  PDF Folder Watcher")
@@ -166,6 +522,9 @@ def watch_folder(
     print(f"  Output:    {output_dir}")
     print(f"  Format:    {output_format}")
     print(f"  Recursive: {recursive}")
+    print(f"  Workers:   {workers}")
+    if metrics_port:
+        print(f"  Metrics:   http://localhost:{metrics_port}/metrics")
     print()
     print("  Drop PDF files into the watched folder to process them.")
     print("  Press Ctrl+C to stop.")
@@ -180,6 +539,9 @@ def watch_folder(
         observer.stop()
     
     observer.join()
+    handler.stop()
+    if metrics_server:
+        metrics_server.shutdown()
     print("Watcher stopped.")
 
 
@@ -223,6 +585,40 @@ def main():
         help="Watch subdirectories recursively"
     )
     
+    parser.add_argument(
+        "-w", "--workers",
+        type=int,
+        default=2,
+        help="Number of PDFs processed concurrently (default: 2)"
+    )
+    
+    parser.add_argument(
+        "--cooldown",
+        type=float,
+        default=2,
+        help="Seconds a file's size/mtime must stay unchanged before processing (default: 2)"
+    )
+    
+    parser.add_argument(
+        "--ledger",
+        default=None,
+        help="Processed-file ledger (default: <output>/.watcher_ledger.jsonl)"
+    )
+    
+    parser.add_argument(
+        "--metrics-db",
+        default=os.environ.get("PDF2SHEET_METRICS_DB"),
+        help="Metrics database; use the API job store to include watcher "
+             "metrics in /api/metrics (default: <output>/.watcher_metrics.db)"
+    )
+    
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Serve Prometheus metrics on this port at /metrics"
+    )
+    
     parser.add_argument(
         "-c", "--config",
         default="config.yaml",
@@ -237,7 +633,12 @@ def main():
         config_path=args.config,
         output_format=args.format,
         parser_type=args.parser,
-        recursive=args.recursive
+        recursive=args.recursive,
+        workers=args.workers,
+        cooldown=args.cooldown,
+        ledger_path=args.ledger,
+        metrics_db=args.metrics_db,
+        metrics_port=args.metrics_port
     )
 
 
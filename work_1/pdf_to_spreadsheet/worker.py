@@ -0,0 +1,489 @@
+"""
+Job Worker
+==========
+
+Pulls queued jobs from the SQLite job store and processes them in
+separate worker processes, so the API only has to enqueue.
+"""
+
+import multiprocessing
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from loguru import logger
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.job_store import JobStore
+from src.metrics import MetricsStore
+from src.pipeline_pool import PipelinePool
+
+
+# Default seconds between heartbeats of a running job
+HEARTBEAT_INTERVAL = 30.0
+
+# Held while the heartbeat thread writes to the store. Jobs fork while it
+# runs (extraction limits, batch pools), and a fork taken mid-write would
+# leave the child with that thread's locks held and nobody to release them
+_heartbeat_lock = threading.Lock()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(
+        before=_heartbeat_lock.acquire,
+        after_in_parent=_heartbeat_lock.release,
+        after_in_child=_heartbeat_lock.release
+    )
+
+
+@contextmanager
+def heartbeat(store: JobStore, job_id: str, worker_id: str, interval: float) -> Iterator[None]:
+    """
+    Keep a claimed job's ``updated_at`` fresh while it is processed.
+
+    Progress events already refresh it, but a single slow page (or a
+    large file inside a batch) may report nothing for a long time; the
+    background thread keeps such a job from being requeued as stale.
+
+    Args:
+        store: Job store the job was claimed from.
+        job_id: Job being processed.
+        worker_id: Worker that claimed the job.
+        interval: Seconds between heartbeats.
+    """
+    stop = threading.Event()
+
+    def beat() -> None:
+        while not stop.wait(interval):
+            with _heartbeat_lock:
+                try:
+                    store.heartbeat(job_id, worker_id)
+                except Exception as e:
+                    logger.warning(f"Heartbeat for job {job_id} failed: {e}")
+
+    thread = threading.Thread(target=beat, name=f"heartbeat-{job_id}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def process_job(
+    store: JobStore,
+    job: Dict[str, Any],
+    pool: PipelinePool,
+    output_dir: str,
+    metrics: Optional[MetricsStore] = None,
+    heartbeat_interval: float = HEARTBEAT_INTERVAL
+) -> None:
+    """
+    Process a single claimed job and record its outcome in the store.
+
+    Args:
+        store: Job store the job was claimed from.
+        job: Job dictionary (status already ``processing``).
+        pool: Pool of warm pipelines for this worker process.
+        output_dir: Directory to save processed files.
+        metrics: Metrics store for throughput, timings and failures.
+        heartbeat_interval: Seconds between heartbeats while processing.
+    """
+    job_id = job["job_id"]
+    file_path = job["file_path"]
+    worker_id = job.get("worker_id")
+
+    if metrics:
+        metrics.observe_queue_wait(job.get("created_at"), job.get("started_at"), source="api")
+
+    with heartbeat(store, job_id, worker_id, heartbeat_interval):
+        _run_job(store, job, pool, output_dir, metrics)
+
+    # A job requeued as stale may already belong to another worker that
+    # is still reading the upload: only the current owner cleans it up
+    if not store.is_owner(job_id, worker_id):
+        logger.warning(f"Job {job_id} was reassigned; leaving its upload in place")
+        return
+
+    # Clean up uploaded file (or batch directory)
+    if os.path.isdir(file_path):
+        shutil.rmtree(file_path, ignore_errors=True)
+    else:
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
+
+
+def _run_job(
+    store: JobStore,
+    job: Dict[str, Any],
+    pool: PipelinePool,
+    output_dir: str,
+    metrics: Optional[MetricsStore] = None
+) -> None:
+    """Process a claimed job and record completion or failure."""
+    job_id = job["job_id"]
+    file_path = job["file_path"]
+    worker_id = job.get("worker_id")
+    options = job.get("options") or {}
+
+    try:
+        if options.get("batch"):
+            process_batch(store, job, pool, output_dir, metrics)
+            return
+
+        def on_progress(event: Dict[str, Any]) -> None:
+            # Events are already throttled by the pipeline's ProgressReporter
+            store.update_job(job_id, progress=event["progress"], stage=event["stage"])
+
+        with pool.acquire(
+            output_format=job.get("output_format", "csv"),
+            parser_type=job.get("parser_type") or "auto"
+        ) as pipeline:
+            # output/ is shared by every worker: never report another job's export
+            result = pipeline.process_file(
+                file_path, output_dir, progress_callback=on_progress, latest_output_fallback=False
+            )
+
+        if metrics:
+            metrics.record_results(result, source="api")
+
+        _finish_job(
+            store,
+            job_id,
+            worker_id,
+            status="completed",
+            progress=100,
+            stage="done",
+            finished_at=datetime.now().isoformat(),
+            output_file=str(result["output_file"]) if result.get("output_file") else None,
+            result={
+                "total_rows": result.get("total_rows", 0),
+                "errors": result.get("errors", 0),
+                "warnings": result.get("warnings", 0),
+                "elapsed_time": result.get("elapsed_time", 0)
+            }
+        )
+
+    except Exception as e:
+        logger.error(f"Job {job_id} failed: {e}")
+        if metrics:
+            metrics.inc("pdf2sheet_failures_total", source="api", stage="job")
+        _finish_job(
+            store,
+            job_id,
+            worker_id,
+            status="failed",
+            error=str(e),
+            finished_at=datetime.now().isoformat()
+        )
+
+
+def _finish_job(store: JobStore, job_id: str, worker_id: Optional[str], **fields: Any) -> bool:
+    """
+    Record a job's outcome unless it was requeued to another worker.
+
+    A job requeued as stale keeps running here until it ends; by then
+    another worker may own (or have finished) it, so its outcome wins.
+
+    Returns:
+        True if the outcome was recorded.
+    """
+    if not store.is_owner(job_id, worker_id):
+        logger.warning(f"Job {job_id} was reassigned; discarding this worker's outcome")
+        return False
+
+    store.update_job(job_id, **fields)
+    return True
+
+
+def process_batch(
+    store: JobStore,
+    job: Dict[str, Any],
+    pool: PipelinePool,
+    output_dir: str,
+    metrics: Optional[MetricsStore] = None
+) -> None:
+    """
+    Process a batch job: every PDF in the job's upload directory.
+
+    Files are processed in parallel, deduplicated across the whole batch
+    and exported either combined or per file. Per-file exports go to a
+    folder of their own (upload names repeat across batches, and a
+    requeued job may still be running in its previous worker), which is
+    zipped for download and then removed. Per-file progress is written
+    to the job's ``files`` column.
+
+    Args:
+        store: Job store the job was claimed from.
+        job: Batch job dictionary.
+        pool: Pool of warm pipelines for this worker process.
+        output_dir: Directory to save processed files.
+        metrics: Metrics store for throughput, timings and failures.
+    """
+    job_id = job["job_id"]
+    options = job.get("options") or {}
+    combine = options.get("combine", True)
+    export_dir = Path(output_dir)
+    if not combine:
+        export_dir.mkdir(parents=True, exist_ok=True)
+        export_dir = Path(tempfile.mkdtemp(prefix=f"batch_{job_id}_", dir=output_dir))
+
+    pdf_files = sorted(
+        path for path in Path(job["file_path"]).iterdir()
+        if path.suffix.lower() == ".pdf"
+    )
+    files_status = [{"filename": path.name, "status": "pending", "rows": 0} for path in pdf_files]
+    store.update_job(job_id, files=files_status)
+
+    def on_file_done(file_result: Dict[str, Any]) -> None:
+        files_status[file_result["index"]] = {
+            "filename": file_result["filename"],
+            "status": file_result["status"],
+            "rows": file_result["rows"],
+            "error": file_result["error"]
+        }
+        done = sum(1 for item in files_status if item["status"] != "pending")
+        # Reserve the last 5% for dedup and export
+        store.update_job(
+            job_id,
+            files=files_status,
+            progress=int(done / len(files_status) * 95),
+            stage="batch"
+        )
+
+    try:
+        with pool.acquire(
+            output_format=job.get("output_format", "csv"),
+            parser_type=job.get("parser_type") or "auto"
+        ) as pipeline:
+            result = pipeline.process_files(
+                pdf_files,
+                export_dir,
+                combine=combine,
+                max_workers=pool.config.get("batch", {}).get("max_workers", 1),
+                base_name=f"batch_{job_id}",
+                progress_callback=on_file_done
+            )
+
+        output_files = result.get("output_files", [])
+
+        if combine:
+            output_file = output_files[0] if output_files else None
+        elif output_files:
+            # Bundle per-file exports into a single download, published
+            # whole so a concurrent run of the same job cannot interleave
+            output_file = str(Path(output_dir) / f"batch_{job_id}.zip")
+            partial = export_dir / "batch.zip.part"
+            with zipfile.ZipFile(partial, "w", zipfile.ZIP_DEFLATED) as archive:
+                for exported in output_files:
+                    archive.write(exported, arcname=os.path.basename(exported))
+            os.replace(partial, output_file)
+            # Only the zip outlives the job; its members are listed by name
+            output_files = [os.path.basename(exported) for exported in output_files]
+        else:
+            output_file = None
+    finally:
+        if not combine:
+            shutil.rmtree(export_dir, ignore_errors=True)
+
+    if metrics:
+        metrics.record_results(result, source="api")
+
+    _finish_job(
+        store,
+        job_id,
+        job.get("worker_id"),
+        status="completed",
+        progress=100,
+        stage="done",
+        finished_at=datetime.now().isoformat(),
+        output_file=output_file,
+        files=files_status,
+        result={
+            "total_files": result.get("total_files", 0),
+            "successful_files": result.get("successful_files", 0),
+            "total_rows": result.get("total_rows", 0),
+            "errors": result.get("errors", 0),
+            "warnings": result.get("warnings", 0),
+            "elapsed_time": result.get("elapsed_time", 0),
+            "output_files": output_files
+        }
+    )
+
+
+def run_worker(
+    db_path: str = "jobs.db",
+    config_path: str = "config.yaml",
+    output_dir: str = "output",
+    poll_interval: float = 1.0,
+    stale_after: float = 600.0,
+    max_jobs: Optional[int] = None,
+    metrics_db: Optional[str] = None
+) -> int:
+    """
+    Run a worker loop that claims and processes pending jobs.
+
+    Args:
+        db_path: Path to the SQLite job store.
+        config_path: Path to configuration file.
+        output_dir: Directory to save processed files.
+        poll_interval: Seconds to sleep when the queue is empty.
+        stale_after: Seconds without progress or heartbeat after which a
+            ``processing`` job is requeued.
+        max_jobs: Stop after this many jobs (None runs forever).
+        metrics_db: SQLite file for metrics (default: the job store).
+
+    Returns:
+        Number of jobs processed.
+    """
+    worker_id = f"{socket.gethostname()}-{os.getpid()}"
+    # Several heartbeats fit in the stale window, so live jobs stay claimed
+    heartbeat_interval = min(HEARTBEAT_INTERVAL, stale_after / 4)
+    store = JobStore(db_path)
+    pool = PipelinePool(config_path)
+    metrics = MetricsStore(metrics_db or db_path)
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+    logger.info(f"Worker {worker_id} started. DB: {db_path}, Output: {output_dir}")
+
+    processed = 0
+
+    while max_jobs is None or processed < max_jobs:
+        store.requeue_stale_jobs(stale_after)
+
+        job = store.claim_next_job(worker_id)
+
+        if job is None:
+            if max_jobs is not None:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        logger.info(f"Worker {worker_id} processing job {job['job_id']}: {job['filename']}")
+        process_job(store, job, pool, output_dir, metrics, heartbeat_interval)
+        processed += 1
+
+    return processed
+
+
+def start_workers(num_workers: int, **worker_kwargs: Any) -> None:
+    """
+    Start N worker processes and wait for them.
+
+    Args:
+        num_workers: Number of worker processes.
+        **worker_kwargs: Arguments forwarded to ``run_worker``.
+    """
+    processes = []
+
+    for _ in range(num_workers):
+        process = multiprocessing.Process(target=run_worker, kwargs=worker_kwargs)
+        process.start()
+        processes.append(process)
+
+    print()
+    print("=" * 50)
+    print("  PDF Job Workers")
+    print("=" * 50)
+    print()
+    print(f"  Workers:   {num_workers}")
+    print(f"  Job DB:    {worker_kwargs.get('db_path', 'jobs.db')}")
+    print(f"  Output:    {worker_kwargs.get('output_dir', 'output')}")
+    print()
+    print("  Press Ctrl+C to stop.")
+    print()
+    print("-" * 50)
+
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        print("\nStopping workers...")
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+
+    print("Workers stopped.")
+
+
+def main():
+    """CLI entry point for job workers."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Process PDF jobs queued by the REST API."
+    )
+
+    parser.add_argument(
+        "-w", "--workers",
+        type=int,
+        default=2,
+        help="Number of worker processes (default: 2)"
+    )
+
+    parser.add_argument(
+        "-d", "--db",
+        default=os.environ.get("PDF2SHEET_JOBS_DB", "jobs.db"),
+        help="Path to the SQLite job store (default: $PDF2SHEET_JOBS_DB or jobs.db)"
+    )
+
+    parser.add_argument(
+        "-o", "--output",
+        default="output",
+        help="Directory to save processed files (default: output)"
+    )
+
+    parser.add_argument(
+        "-c", "--config",
+        default="config.yaml",
+        help="Path to configuration file"
+    )
+
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=1.0,
+        help="Seconds to wait when the queue is empty (default: 1.0)"
+    )
+
+    parser.add_argument(
+        "--stale-after",
+        type=float,
+        default=600.0,
+        help="Seconds without progress or heartbeat before a job is requeued (default: 600)"
+    )
+
+    parser.add_argument(
+        "--metrics-db",
+        default=os.environ.get("PDF2SHEET_METRICS_DB"),
+        help="SQLite file for metrics served on /api/metrics (default: the job store)"
+    )
+
+    args = parser.parse_args()
+
+    start_workers(
+        args.workers,
+        db_path=args.db,
+        config_path=args.config,
+        output_dir=args.output,
+        poll_interval=args.poll_interval,
+        stale_after=args.stale_after,
+        metrics_db=args.metrics_db
+    )
+
+
+if __name__ == "__main__":
+    main()